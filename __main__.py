@@ -0,0 +1,8 @@
+"""
+Permet de lancer l'outil en ligne de commande avec python -m bibliotheque_project (voir core/cli.py).
+"""
+import sys
+
+from bibliotheque_project.core.cli import main
+
+sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Benchmarks des opérations principales de la Bibliotheque.
+
+Pour chaque taille de catalogue, on construit une bibliothèque synthétique puis on chronomètre :
+- ajout de livres (ajouter_livre)
+- recherches (rechercher_par_titre, rechercher_par_auteur, rechercher_par_mot_clef)
+- listing des livres disponibles
+- emprunts / retours
+- statistiques
+
+Les résultats sont écrits en JSON pour être comparés d'une version à l'autre :
+
+    python -m bibliotheque_project.benchmarks.bench_bibliotheque --tailles 1000 100000 --sortie bench.json
+    python -m bibliotheque_project.benchmarks.bench_bibliotheque --tailles 1000 --comparer bench.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+
+TAILLES_DEFAUT = [1_000, 100_000]
+TAILLES_POSSIBLES = [1_000, 100_000, 1_000_000, 10_000_000]
+NB_AUTEURS = 5_000
+NB_EMPRUNTS_MESURES = 1_000
+STATISTIQUES = ["nombre_total_livres", "nombre_total_utilisateurs",
+                "distribution_emprunts_par_utilisateur", "histogramme_emprunts", "resume_emprunts"]
+
+
+def construire_bibliotheque(taille: int) -> Bibliotheque:
+    """
+    Construit une bibliothèque synthétique déterministe de `taille` livres et taille // 10 utilisateurs.
+
+    Args:
+        taille (int): Nombre de livres.
+
+    Returns:
+        Bibliotheque: La bibliothèque construite.
+    """
+    biblio = Bibliotheque()
+    for i in range(taille):
+        biblio.ajouter_livre(f"Livre Exemple {i}", f"Auteur {i % NB_AUTEURS}")
+    for i in range(max(1, taille // 10)):
+        biblio.creer_utilisateur(f"Utilisateur_{i}")
+    return biblio
+
+
+def mesurer(fonction: Callable[[], object], repetitions: int, nb_operations: int = 1) -> Dict[str, float]:
+    """
+    Chronomètre plusieurs exécutions d'une fonction.
+
+    Args:
+        fonction (Callable[[], object]): Fonction à chronométrer.
+        repetitions (int): Nombre d'exécutions.
+        nb_operations (int, optionnel): Nombre d'opérations effectuées par exécution. Par défaut 1.
+
+    Returns:
+        Dict[str, float]: Temps par opération (médian, minimum, maximum) en secondes et débit en opérations/s.
+    """
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        fonction()
+        durees.append((time.perf_counter() - debut) / nb_operations)
+    return resumer(durees)
+
+
+def resumer(durees: List[float]) -> Dict[str, float]:
+    """
+    Résume une série de temps par opération.
+
+    Args:
+        durees (List[float]): Temps par opération de chaque répétition, en secondes.
+
+    Returns:
+        Dict[str, float]: Temps médian, minimum et maximum en secondes et débit en opérations/s.
+    """
+    mediane = statistics.median(durees)
+    return {
+        "repetitions": len(durees),
+        "mediane_s": mediane,
+        "min_s": min(durees),
+        "max_s": max(durees),
+        "ops_par_s": 1 / mediane if mediane > 0 else float("inf"),
+    }
+
+
+def benchmark_taille(taille: int, repetitions: int) -> Dict[str, Dict[str, float]]:
+    """
+    Exécute tous les benchmarks pour une taille de catalogue.
+
+    Args:
+        taille (int): Nombre de livres du catalogue.
+        repetitions (int): Nombre de répétitions de chaque mesure.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Mesures par nom d'opération.
+    """
+    resultats: Dict[str, Dict[str, float]] = {}
+
+    debut = time.perf_counter()
+    biblio = construire_bibliotheque(taille)
+    resultats["ajouter_livre"] = mesurer(lambda: biblio.ajouter_livre("Livre Ajout", "Auteur Ajout"), repetitions)
+    resultats["construction"] = resumer([time.perf_counter() - debut])
+
+    recherches = {
+        "rechercher_par_titre": (biblio.rechercher_par_titre, "exemple 42"),
+        "rechercher_par_auteur": (biblio.rechercher_par_auteur, "auteur 17"),
+        "rechercher_par_mot_clef": (biblio.rechercher_par_mot_clef, "42"),
+    }
+    for nom, (methode, requete) in recherches.items():
+        resultats[nom] = mesurer(lambda: methode(requete), repetitions)
+
+    utilisateurs = [u.id for u in biblio.lister_utilisateurs()]
+    livres = [livre.id for livre in biblio.lister_tous_les_livres()[:NB_EMPRUNTS_MESURES]]
+    couples = [(utilisateurs[i % len(utilisateurs)], livre_id) for i, livre_id in enumerate(livres)]
+
+    def emprunter_tout() -> None:
+        for utilisateur_id, livre_id in couples:
+            biblio.emprunter(utilisateur_id, livre_id)
+
+    def rendre_tout() -> None:
+        for utilisateur_id, livre_id in couples:
+            biblio.rendre(utilisateur_id, livre_id)
+
+    # Chaque série d'emprunts est suivie de la série de retours correspondante
+    durees_emprunt, durees_retour = [], []
+    for repetition in range(repetitions):
+        durees_emprunt.append(mesurer(emprunter_tout, 1, len(couples))["mediane_s"])
+        if repetition == 0:
+            # Listing et statistiques sont mesurés pendant que des livres sont empruntés
+            resultats["lister_livres_disponibles"] = mesurer(biblio.lister_livres_disponibles, repetitions)
+            for nom in STATISTIQUES:
+                resultats[nom] = mesurer(getattr(biblio, nom), repetitions)
+        durees_retour.append(mesurer(rendre_tout, 1, len(couples))["mediane_s"])
+    resultats["emprunter"] = resumer(durees_emprunt)
+    resultats["rendre"] = resumer(durees_retour)
+    return resultats
+
+
+def executer_benchmarks(tailles: List[int], repetitions: int = 5) -> Dict:
+    """
+    Exécute les benchmarks pour plusieurs tailles de catalogue.
+
+    Args:
+        tailles (List[int]): Tailles de catalogue à mesurer.
+        repetitions (int, optionnel): Nombre de répétitions de chaque mesure. Par défaut 5.
+
+    Returns:
+        Dict: Résultats sérialisables en JSON ({"meta": ..., "resultats": {taille: {operation: mesures}}}).
+    """
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plateforme": platform.platform(),
+            "repetitions": repetitions,
+        },
+        "resultats": {str(taille): benchmark_taille(taille, repetitions) for taille in tailles},
+    }
+
+
+def comparer(reference: Dict, actuel: Dict, seuil: float = 1.2) -> List[str]:
+    """
+    Compare deux séries de résultats et liste les régressions (temps médian multiplié par plus que `seuil`).
+
+    Args:
+        reference (Dict): Résultats de référence (version précédente).
+        actuel (Dict): Résultats à vérifier.
+        seuil (float, optionnel): Rapport de temps médian toléré. Par défaut 1.2.
+
+    Returns:
+        List[str]: Description des régressions détectées (vide si aucune).
+    """
+    regressions = []
+    for taille, operations in actuel["resultats"].items():
+        for operation, mesure in operations.items():
+            ancienne = reference.get("resultats", {}).get(taille, {}).get(operation)
+            if not ancienne or ancienne["mediane_s"] <= 0:
+                continue
+            rapport = mesure["mediane_s"] / ancienne["mediane_s"]
+            if rapport > seuil:
+                regressions.append(f"{operation} (taille={taille}) : x{rapport:.2f} "
+                                   f"({ancienne['mediane_s']:.3e}s -> {mesure['mediane_s']:.3e}s)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée en ligne de commande.
+
+    Args:
+        argv (List[str], optionnel): Arguments de la ligne de commande. Par défaut sys.argv[1:].
+
+    Returns:
+        int: Code de sortie (1 si des régressions ont été détectées, 0 sinon).
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks de la Bibliotheque")
+    parser.add_argument("--tailles", type=int, nargs="+", default=TAILLES_DEFAUT,
+                        help=f"Tailles de catalogue (par exemple {TAILLES_POSSIBLES})")
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--sortie", help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--comparer", help="Fichier JSON de référence pour détecter les régressions")
+    parser.add_argument("--seuil", type=float, default=1.2, help="Rapport de temps toléré avant régression")
+    args = parser.parse_args(argv)
+
+    resultats = executer_benchmarks(args.tailles, args.repetitions)
+    for taille, operations in resultats["resultats"].items():
+        print(f"--- {taille} livres ---")
+        for operation, mesure in operations.items():
+            print(f"{operation:<40} {mesure['mediane_s']:.3e} s")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as fichier:
+            json.dump(resultats, fichier, indent=2)
+
+    if args.comparer:
+        with open(args.comparer, encoding="utf-8") as fichier:
+            regressions = comparer(json.load(fichier), resultats, args.seuil)
+        for regression in regressions:
+            print("Régression :", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Test de charge du service HTTP/JSON (core/serveur.py).
+
+Un serveur local est démarré sur une bibliothèque synthétique (voir bench_bibliotheque.construire_bibliotheque),
+puis plusieurs clients, chacun dans un thread et sur sa propre connexion persistante, envoient pendant une durée
+donnée les opérations d'un GenerateurCharge (emprunts, retours, recherches selon une loi de Zipf).
+Chaque taille de lot est mesurée séparément : 1 envoie une requête par opération, N > 1 regroupe N opérations
+par requête POST /lot. Le rapport donne le débit en requêtes/s et en opérations/s et les latences (p50, p99, max)
+par type de requête :
+
+    python -m bibliotheque_project.benchmarks.charge_serveur --taille 100000 --clients 8 --duree 10 --lots 1 50
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from bibliotheque_project.benchmarks.bench_bibliotheque import construire_bibliotheque
+from bibliotheque_project.core.generateur_charge import GenerateurCharge
+from bibliotheque_project.core.serveur import ClientBibliotheque, servir
+
+
+def percentile(durees_triees: List[int], q: float) -> float:
+    """
+    Retourne un percentile (méthode du rang le plus proche) d'une série triée de durées.
+
+    Args:
+        durees_triees (List[int]): Durées en nanosecondes, triées.
+        q (float): Percentile entre 0 et 100.
+
+    Returns:
+        float: Durée en millisecondes, 0 si la série est vide.
+    """
+    if not durees_triees:
+        return 0.0
+    rang = max(1, int(q / 100 * len(durees_triees) + 0.5))
+    return durees_triees[min(rang, len(durees_triees)) - 1] / 1e6
+
+
+def client_charge(hote: str, port: int, generateur: GenerateurCharge, fin: float, taille_lot: int) -> Dict:
+    """
+    Envoie des opérations au serveur jusqu'à l'instant de fin, en mesurant la latence de chaque requête.
+
+    Args:
+        hote (str): Adresse du serveur.
+        port (int): Port du serveur.
+        generateur (GenerateurCharge): Générateur des opérations de ce client.
+        fin (float): Instant (time.perf_counter) auquel s'arrêter.
+        taille_lot (int): Nombre d'opérations par requête (1 pour une requête par opération).
+
+    Returns:
+        Dict: "durees" ({type de requête: durées en ns}), "operations" et "erreurs".
+    """
+    client = ClientBibliotheque(hote, port)
+    actions = {
+        "emprunter": lambda op: client.emprunter(op.utilisateur_id, op.livre_id),
+        "rendre": lambda op: client.rendre(op.utilisateur_id, op.livre_id),
+        "rechercher": lambda op: client.rechercher_par_mot_clef(op.requete),
+    }
+    durees: Dict[str, List[int]] = {}
+    nb_operations = nb_erreurs = 0
+    try:
+        while time.perf_counter() < fin:
+            if taille_lot == 1:
+                operation = generateur.suivante()
+                debut = time.perf_counter_ns()
+                try:
+                    actions[operation.type](operation)
+                except (KeyError, ValueError):
+                    nb_erreurs += 1
+                    generateur.signaler_echec(operation)
+                durees.setdefault(operation.type, []).append(time.perf_counter_ns() - debut)
+                nb_operations += 1
+                continue
+            operations = [generateur.suivante() for _ in range(taille_lot)]
+            requetes = []
+            for op in operations:
+                if op.type == "rechercher":
+                    requetes.append(("rechercher", {"mot_clef": op.requete}))
+                else:
+                    requetes.append((op.type, {"utilisateur_id": op.utilisateur_id, "livre_id": op.livre_id}))
+            debut = time.perf_counter_ns()
+            resultats = client.lot(requetes)
+            durees.setdefault("lot", []).append(time.perf_counter_ns() - debut)
+            for operation, resultat in zip(operations, resultats):
+                if "erreur" in resultat:
+                    nb_erreurs += 1
+                    generateur.signaler_echec(operation)
+            nb_operations += taille_lot
+    finally:
+        client.fermer()
+    return {"durees": durees, "operations": nb_operations, "erreurs": nb_erreurs}
+
+
+def executer_charge(hote: str, port: int, ids_livres: Sequence[int], ids_utilisateurs: Sequence[int],
+                    nb_clients: int = 4, duree: float = 5.0, taille_lot: int = 1, seed: int = 42) -> Dict:
+    """
+    Exécute un test de charge contre un serveur déjà démarré.
+
+    Args:
+        hote (str): Adresse du serveur.
+        port (int): Port du serveur.
+        ids_livres (Sequence[int]): IDs des livres du serveur (un range évite de matérialiser la liste).
+        ids_utilisateurs (Sequence[int]): IDs des utilisateurs du serveur.
+        nb_clients (int, optionnel): Nombre de clients simultanés. Par défaut 4.
+        duree (float, optionnel): Durée du test en secondes. Par défaut 5.
+        taille_lot (int, optionnel): Nombre d'opérations par requête. Par défaut 1.
+        seed (int, optionnel): Seed des générateurs (le client i utilise seed + i). Par défaut 42.
+
+    Returns:
+        Dict: Nombre de requêtes et d'opérations, erreurs, débits et latences par type de requête.
+    """
+    # Chaque client emprunte pour ses propres utilisateurs, pour que ses retours restent valides
+    generateurs = [GenerateurCharge(ids_livres, ids_utilisateurs[i::nb_clients], seed=seed + i)
+                   for i in range(min(nb_clients, len(ids_utilisateurs)))]
+    rapports: List[Dict] = [{}] * len(generateurs)
+    debut = time.perf_counter()
+    fin = debut + duree
+
+    def lancer(index: int) -> None:
+        rapports[index] = client_charge(hote, port, generateurs[index], fin, taille_lot)
+
+    threads = [threading.Thread(target=lancer, args=(i,)) for i in range(len(generateurs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ecoule = time.perf_counter() - debut
+
+    durees: Dict[str, List[int]] = {}
+    for rapport in rapports:
+        for type_requete, valeurs in rapport.get("durees", {}).items():
+            durees.setdefault(type_requete, []).extend(valeurs)
+    latences = {}
+    for type_requete, valeurs in sorted(durees.items()):
+        valeurs.sort()
+        latences[type_requete] = {"requetes": len(valeurs), "p50_ms": percentile(valeurs, 50),
+                                  "p99_ms": percentile(valeurs, 99), "max_ms": valeurs[-1] / 1e6}
+    nb_requetes = sum(len(valeurs) for valeurs in durees.values())
+    nb_operations = sum(rapport.get("operations", 0) for rapport in rapports)
+    return {
+        "clients": len(generateurs),
+        "taille_lot": taille_lot,
+        "duree_s": ecoule,
+        "requetes": nb_requetes,
+        "operations": nb_operations,
+        "erreurs": sum(rapport.get("erreurs", 0) for rapport in rapports),
+        "requetes_par_s": nb_requetes / ecoule,
+        "operations_par_s": nb_operations / ecoule,
+        "latences": latences,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée en ligne de commande.
+
+    Args:
+        argv (List[str], optionnel): Arguments de la ligne de commande. Par défaut sys.argv[1:].
+
+    Returns:
+        int: Code de sortie.
+    """
+    parser = argparse.ArgumentParser(description="Test de charge du service HTTP/JSON de la Bibliotheque")
+    parser.add_argument("--taille", type=int, default=10_000, help="Nombre de livres du catalogue synthétique")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--duree", type=float, default=5.0, help="Durée de chaque mesure en secondes")
+    parser.add_argument("--lots", type=int, nargs="+", default=[1, 50], help="Tailles de lot à mesurer")
+    parser.add_argument("--sortie", help="Fichier JSON où écrire les résultats")
+    args = parser.parse_args(argv)
+
+    resultats = []
+    for taille_lot in args.lots:
+        # Une bibliothèque neuve par mesure, pour que les mesures ne dépendent pas les unes des autres
+        biblio = construire_bibliotheque(args.taille)
+        serveur = servir(biblio)
+        try:
+            hote, port = serveur.server_address[:2]
+            livres, utilisateurs = biblio.lister_tous_les_livres(), biblio.lister_utilisateurs()
+            rapport = executer_charge(hote, port, range(livres[0].id, livres[-1].id + 1),
+                                      range(utilisateurs[0].id, utilisateurs[-1].id + 1),
+                                      args.clients, args.duree, taille_lot)
+        finally:
+            serveur.shutdown()
+            serveur.server_close()
+        resultats.append(rapport)
+        print(f"--- lot de {taille_lot} : {rapport['requetes_par_s']:.0f} requêtes/s, "
+              f"{rapport['operations_par_s']:.0f} opérations/s, {rapport['erreurs']} erreurs ---")
+        for type_requete, mesure in rapport["latences"].items():
+            print(f"{type_requete:<12} {mesure['requetes']:>8} requêtes  p50 {mesure['p50_ms']:.3f} ms  "
+                  f"p99 {mesure['p99_ms']:.3f} ms  max {mesure['max_ms']:.3f} ms")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as fichier:
+            json.dump(resultats, fichier, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
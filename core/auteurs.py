@@ -0,0 +1,173 @@
+"""
+Dictionnaire des auteurs : chaque auteur distinct reçoit un ID, un nom canonique partagé par tous ses livres
+et un nom normalisé (en minuscules), calculé une seule fois.
+
+Les catalogues comptent bien moins d'auteurs que de livres : une recherche par auteur compare la requête
+aux seuls noms normalisés des auteurs distincts (via un index de trigrammes sur ces noms), puis développe
+les auteurs trouvés en leurs livres. Le dictionnaire a la même interface (ajouter, retirer, candidats)
+qu'IndexTrigrammes, qu'il remplace pour le champ auteur de la Bibliotheque.
+"""
+from typing import Dict, List, Optional, Set
+
+from bibliotheque_project.core.index_recherche import IndexTrigrammes
+
+
+class DictionnaireAuteurs:
+    """
+    Auteurs distincts (ID -> nom canonique, nom normalisé) et liste des livres de chaque auteur.
+    """
+
+    def __init__(self) -> None:
+        """
+        Crée un dictionnaire vide.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._ids: Dict[str, int] = {}  # Nom canonique -> ID de l'auteur
+        self._noms: List[Optional[str]] = []  # Par ID ; None pour un auteur qui n'a plus de livre
+        self._normalises: List[Optional[str]] = []
+        self._livres: List[Set[int]] = []
+        self._index = IndexTrigrammes()  # Trigrammes des noms normalisés -> IDs des auteurs
+
+    def ajouter(self, livre_id: int, auteur: str) -> str:
+        """
+        Rattache un livre à son auteur, créé au besoin.
+
+        Args:
+            livre_id (int): ID du livre.
+            auteur (str): Nom de l'auteur.
+
+        Returns:
+            str: Le nom canonique de l'auteur, à conserver dans le livre à la place de sa propre copie.
+        """
+        auteur_id = self._ids.get(auteur)
+        if auteur_id is None:
+            auteur_id = len(self._noms)
+            self._ids[auteur] = auteur_id
+            self._noms.append(auteur)
+            self._normalises.append(auteur.lower())
+            self._livres.append(set())
+            self._index.ajouter(auteur_id, auteur)
+        self._livres[auteur_id].add(livre_id)
+        return self._noms[auteur_id]
+
+    def retirer(self, livre_id: int, auteur: str) -> None:
+        """
+        Détache un livre de son auteur ; l'auteur est oublié quand il n'a plus de livre.
+
+        Args:
+            livre_id (int): ID du livre.
+            auteur (str): Nom de l'auteur du livre.
+
+        Returns:
+            None
+        """
+        auteur_id = self._ids.get(auteur)
+        if auteur_id is None:
+            return
+        livres = self._livres[auteur_id]
+        livres.discard(livre_id)
+        if not livres:
+            del self._ids[auteur]
+            self._index.retirer(auteur_id, auteur)
+            self._noms[auteur_id] = self._normalises[auteur_id] = None
+
+    def auteurs(self, query: str) -> List[int]:
+        """
+        Retourne les IDs des auteurs dont le nom contient la requête (insensible à la casse).
+
+        Args:
+            query (str): Chaîne recherchée.
+
+        Returns:
+            List[int]: IDs des auteurs trouvés, par ID croissant.
+        """
+        q = query.lower()
+        candidats = self._index.candidats(q)
+        normalises = self._normalises
+        if candidats is None:
+            return [auteur_id for auteur_id, nom in enumerate(normalises) if nom is not None and q in nom]
+        return [auteur_id for auteur_id in sorted(candidats) if q in normalises[auteur_id]]
+
+    def candidats(self, query: str) -> Set[int]:
+        """
+        Retourne les IDs des livres dont l'auteur contient la requête. Contrairement à IndexTrigrammes,
+        le résultat est exact et la requête peut faire moins de 3 caractères.
+
+        Args:
+            query (str): Chaîne recherchée.
+
+        Returns:
+            Set[int]: IDs des livres trouvés.
+        """
+        resultat: Set[int] = set()
+        for auteur_id in self.auteurs(query):
+            resultat |= self._livres[auteur_id]
+        return resultat
+
+    def identifiant(self, auteur: str) -> int:
+        """
+        Retourne l'ID d'un auteur.
+
+        Args:
+            auteur (str): Nom exact de l'auteur.
+
+        Raises:
+            KeyError: Si aucun livre n'a cet auteur.
+
+        Returns:
+            int: ID de l'auteur.
+        """
+        auteur_id = self._ids.get(auteur)
+        if auteur_id is None:
+            raise KeyError(f"Aucun auteur nommé {auteur!r}.")
+        return auteur_id
+
+    def nom(self, auteur_id: int) -> str:
+        """
+        Retourne le nom canonique d'un auteur.
+
+        Args:
+            auteur_id (int): ID de l'auteur.
+
+        Raises:
+            KeyError: Si l'auteur n'existe pas.
+
+        Returns:
+            str: Nom de l'auteur.
+        """
+        if not 0 <= auteur_id < len(self._noms) or self._noms[auteur_id] is None:
+            raise KeyError(f"Aucun auteur avec id={auteur_id}.")
+        return self._noms[auteur_id]
+
+    def livres(self, auteur_id: int) -> List[int]:
+        """
+        Retourne les IDs des livres d'un auteur.
+
+        Args:
+            auteur_id (int): ID de l'auteur.
+
+        Raises:
+            KeyError: Si l'auteur n'existe pas.
+
+        Returns:
+            List[int]: IDs des livres, triés.
+        """
+        self.nom(auteur_id)
+        return sorted(self._livres[auteur_id])
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre d'auteurs distincts.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'auteurs ayant au moins un livre.
+        """
+        return len(self._ids)
@@ -1,26 +1,107 @@
-from typing import List, Dict
-from collections import Counter
-import matplotlib.pyplot as plt
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+import heapq
+import logging
+import re
+import threading
+import weakref
 from bibliotheque_project.models.utilisateur import Utilisateur
 from bibliotheque_project.models.livre import Livre, StatusLivre
+from bibliotheque_project.models.oeuvre import Oeuvre
+from bibliotheque_project.core.echeances import Echeance, EcheancierEmprunts
+from bibliotheque_project.core.reservations import FileReservations
+from bibliotheque_project.core.quotas import GestionnaireQuotas, PolitiqueQuota
+from bibliotheque_project.core.recommandations import MoteurRecommandations
+from bibliotheque_project.core.metriques import METHODES_MESUREES, HookMetriques, Metriques
+from bibliotheque_project.core.hooks import GestionnaireHooks, Hook
+from bibliotheque_project.core.auteurs import DictionnaireAuteurs
+from bibliotheque_project.core.ids_tries import IdsTries, suite_apres
+from bibliotheque_project.core.index_recherche import IndexTrigrammes
+from bibliotheque_project.core.index_secondaires import GestionnaireIndex, IndexSecondaire
+from bibliotheque_project.core.purge import BUDGET_TRANCHE, LIVRES, PAUSE_ENTRE_TRANCHES, UTILISATEURS, Purge
+from bibliotheque_project.core.recherche_parallele import RechercheParallele
+from bibliotheque_project.core import requete as langage_requetes
+from bibliotheque_project.core.catalogue_mmap import (CAPACITE_CACHE_DEFAUT, CatalogueMappe, IndexTrigrammesMappe,
+                                                       LivresMappes)
+from bibliotheque_project.core.statistiques import StatistiquesEmprunts
+from bibliotheque_project.core.instantanes import Instantane
+from bibliotheque_project.core import flux_modifications as flux
+
+logger = logging.getLogger("bibliotheque_project.flux_modifications")
+
+DUREE_EMPRUNT_DEFAUT = timedelta(days=21)
+CHAMPS_RECHERCHE = ["titre", "auteur"]
+SEUIL_RECHERCHE_PARALLELE = 50_000  # En deçà, un parcours séquentiel coûte moins que l'envoi des tâches au pool
+# Méthodes de configuration des hooks elles-mêmes, qu'on n'enveloppe pas
+METHODES_NON_OBSERVABLES = ["ajouter_hook", "retirer_hook", "activer_metriques", "desactiver_metriques"]
+
+
+class ConflitVersion(ValueError):
+    """
+    Levée par une mise à jour conditionnelle quand un livre ou un utilisateur a changé depuis sa lecture.
+    """
+
+    def __init__(self, nature: str, objet_id: int, version_attendue: int, version_actuelle: int) -> None:
+        """
+        Crée l'erreur.
+
+        Args:
+            nature (str): "livre" ou "utilisateur".
+            objet_id (int): ID de l'objet modifié entre-temps.
+            version_attendue (int): Version lue par l'appelant.
+            version_actuelle (int): Version actuelle de l'objet.
+
+        Returns:
+            None
+        """
+        super().__init__(f"Conflit de version sur le {nature} id={objet_id} : "
+                         f"version {version_attendue} attendue, version actuelle {version_actuelle}.")
+        self.nature = nature
+        self.objet_id = objet_id
+        self.version_attendue = version_attendue
+        self.version_actuelle = version_actuelle
+
 
 class Bibliotheque:
     """
     Représente la bibliothèque et gère les livres, utilisateurs et emprunts.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, duree_emprunt: timedelta = DUREE_EMPRUNT_DEFAUT) -> None:
         """
-        Initialise la bibliothèque avec des dictionnaires pour les livres et utilisateurs.
+        Initialise la bibliothèque avec des dictionnaires pour les livres, œuvres et utilisateurs,
+        l'index de recherche des titres, le dictionnaire des auteurs, les index secondaires, un échéancier des dates de retour, les files de réservations, les quotas d'emprunt
+        le moteur de recommandations et les compteurs d'emprunts pour les statistiques.
 
         Args:
-            Aucun
+            duree_emprunt (timedelta, optionnel): Durée d'un emprunt. Par défaut 21 jours.
 
         Returns:
             None
         """
         self._livres: Dict[int, Livre] = {}
+        self._ids_livres = IdsTries()  # IDs des livres en mémoire (hors catalogue ouvert par ouvrir_catalogue), triés
         self._utilisateurs: Dict[int, Utilisateur] = {}
+        self._oeuvres: Dict[int, Oeuvre] = {}
+        self._index_titres = IndexTrigrammes()
+        self._auteurs = DictionnaireAuteurs()
+        self._index_secondaires = GestionnaireIndex()
+        self.duree_emprunt: timedelta = duree_emprunt
+        self._echeancier = EcheancierEmprunts()
+        self._reservations = FileReservations()
+        self._quotas = GestionnaireQuotas()
+        self._recommandations = MoteurRecommandations()
+        self._statistiques = StatistiquesEmprunts()
+        self._instantanes: "weakref.WeakSet[Instantane]" = weakref.WeakSet()
+        self._verrou_instantanes = threading.Lock()
+        self._abonnes: List[Callable[[Dict], None]] = []
+        self.abonnes_en_echec: List[Tuple[Callable[[Dict], None], Exception]] = []
+        self._sequence: int = 0
+        self._recherche_parallele: Optional[RechercheParallele] = None
+        self.seuil_recherche_parallele: int = 0
+        self.metriques: Optional[Metriques] = None
+        self._hook_metriques: Optional[HookMetriques] = None
+        self._hooks = GestionnaireHooks(self, methodes_exclues=METHODES_NON_OBSERVABLES)
 
     # ---------- Gestion livres ----------
     def ajouter_livre(self, titre: str, auteur: str) -> Livre:
@@ -35,9 +116,123 @@ class Bibliotheque:
             Livre: L'objet Livre ajouté a la bibliothèque
         """
         livre = Livre(titre, auteur)
-        self._livres[livre.id] = livre
+        self._enregistrer_livre(livre)
         return livre
 
+    def ajouter_livres(self, livres: Iterable[Livre],
+                       postings_titres: Optional[Dict[str, Iterable[int]]] = None) -> int:
+        """
+        Ajoute en une fois des livres déjà construits (par exemple lors d'un import par lots).
+        Les IDs sont vérifiés avant toute insertion : en cas de doublon, aucun livre n'est ajouté.
+
+        Args:
+            livres (Iterable[Livre]): Livres à ajouter.
+            postings_titres (Dict[str, Iterable[int]], optionnel): Index partiel (trigramme -> IDs) des titres
+                de ces livres, déjà construit (par exemple par import_export.importer_livres_parallele). Il est fusionné
+                tel quel au lieu d'indexer chaque titre.
+
+        Raises:
+            ValueError: Si un ID est déjà utilisé dans la bibliothèque ou en double parmi les livres fournis.
+
+        Returns:
+            int: Nombre de livres ajoutés.
+        """
+        livres = list(livres)
+        nouveaux = {livre.id: livre for livre in livres}
+        if len(nouveaux) < len(livres):
+            raise ValueError("Des livres fournis ont le même ID.")
+        doublons = [livre_id for livre_id in nouveaux if livre_id in self._livres]
+        if doublons:
+            raise ValueError(f"IDs de livres déjà utilisés : {sorted(doublons)[:10]}.")
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(livres_ids=nouveaux)
+            self._livres.update(nouveaux)
+        self._ids_livres.ajouter_tous(nouveaux)
+        if postings_titres is not None:
+            self._index_titres.fusionner(postings_titres)
+        else:
+            for livre in livres:
+                self._index_titres.ajouter(livre.id, livre.titre)
+        auteurs = self._auteurs
+        for livre in livres:
+            livre.auteur = auteurs.ajouter(livre.id, livre.auteur)
+        self._index_secondaires.inserer(livres)
+        if self._abonnes:
+            for livre in livres:
+                self._publier(flux.LIVRE_AJOUTE, flux.evenement_livre_ajoute, livre)
+        return len(nouveaux)
+
+    def ouvrir_catalogue(self, chemin: str, capacite_cache: int = CAPACITE_CACHE_DEFAUT) -> int:
+        """
+        Adosse la bibliothèque à un catalogue en lecture seule écrit par catalogue_mmap.ecrire_catalogue, ouvert par mmap :
+        les livres et leurs index de recherche ne sont ni relus ni reconstruits, et plusieurs processus partagent
+        les mêmes pages en mémoire. Les modifications ultérieures (emprunts, ajouts, suppressions) sont gardées en mémoire,
+        et les livres lus le plus récemment dans un cache LRU borné (voir statistiques_cache).
+
+        Args:
+            chemin (str): Fichier du catalogue.
+            capacite_cache (int, optionnel): Nombre maximal de livres non modifiés gardés en mémoire.
+                Par défaut CAPACITE_CACHE_DEFAUT.
+
+        Raises:
+            ValueError: Si la bibliothèque contient déjà des livres, si le fichier n'est pas un catalogue
+                ou si la capacité est négative.
+
+        Returns:
+            int: Nombre de livres du catalogue.
+        """
+        if self._livres:
+            raise ValueError("Un catalogue ne peut être ouvert que dans une bibliothèque sans livres.")
+        catalogue = CatalogueMappe(chemin)
+        try:
+            self._livres = LivresMappes(catalogue, capacite_cache)
+        except ValueError:
+            catalogue.fermer()
+            raise
+        self._index_titres = IndexTrigrammesMappe(catalogue, "titre")
+        self._auteurs = IndexTrigrammesMappe(catalogue, "auteur")
+        if len(catalogue):
+            Livre._next_id = max(Livre._next_id, catalogue.ids[len(catalogue) - 1] + 1)
+        for nom in self._index_secondaires.noms():
+            self.reconstruire_index(nom, en_arriere_plan=False)
+        return len(catalogue)
+
+    def statistiques_cache(self) -> Optional[Dict[str, float]]:
+        """
+        Retourne les compteurs du cache des livres d'un catalogue ouvert par ouvrir_catalogue
+        (succès, échecs, taux de succès, évictions, taille et capacité).
+
+        Args:
+            Aucun
+
+        Returns:
+            Optional[Dict[str, float]]: Les compteurs (voir LivresMappes.statistiques_cache), ou None si les livres
+                sont tous en mémoire.
+        """
+        if isinstance(self._livres, LivresMappes):
+            return self._livres.statistiques_cache()
+        return None
+
+    def _enregistrer_livre(self, livre: Livre) -> None:
+        """
+        Enregistre un livre dans le catalogue, l'index des titres, le dictionnaire des auteurs
+        (le livre reçoit le nom canonique de son auteur) et les index secondaires.
+
+        Args:
+            livre (Livre): Le livre à enregistrer.
+
+        Returns:
+            None
+        """
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(livres_ids=(livre.id,))
+            self._livres[livre.id] = livre
+        self._ids_livres.ajouter(livre.id)
+        self._index_titres.ajouter(livre.id, livre.titre)
+        livre.auteur = self._auteurs.ajouter(livre.id, livre.auteur)
+        self._index_secondaires.inserer((livre,))
+        self._publier(flux.LIVRE_AJOUTE, flux.evenement_livre_ajoute, livre)
+
     def supprimer_livre(self, livre_id: int) -> bool:
         """
         Supprime un livre uniquement s'il est disponible.
@@ -58,9 +253,73 @@ class Bibliotheque:
             raise KeyError(f"Aucun livre avec id={livre_id}.")
         if not livre.est_disponible():
             raise ValueError("Impossible de supprimer un livre emprunté.")
-        del self._livres[livre_id]
+        self._retirer_livre(livre)
         return True
 
+    def _retirer_livre(self, livre: Livre) -> None:
+        """
+        Retire un livre disponible du catalogue, des index, des réservations, des recommandations et de son œuvre
+        (sans vérification : voir supprimer_livre et purger_livres).
+
+        Args:
+            livre (Livre): Le livre à retirer.
+
+        Returns:
+            None
+        """
+        livre_id = livre.id
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(livres_ids=(livre_id,))
+            del self._livres[livre_id]
+        self._ids_livres.retirer(livre_id)
+        self._index_titres.retirer(livre_id, livre.titre)
+        self._auteurs.retirer(livre_id, livre.auteur)
+        self._index_secondaires.supprimer(livre_id)
+        self._reservations.annuler_livre(livre_id)
+        self._recommandations.oublier_livre(livre_id)
+        if livre.oeuvre_id is not None:
+            self._oeuvres[livre.oeuvre_id].retirer_exemplaire(livre.exemplaire)
+        self._publier(flux.LIVRE_SUPPRIME, dict, livre_id=livre_id)
+
+    def modifier_livre(self, livre_id: int, titre: Optional[str] = None, auteur: Optional[str] = None) -> Livre:
+        """
+        Modifie le titre et/ou l'auteur d'un livre. L'index des titres, le dictionnaire des auteurs et les index
+        secondaires sont mis à jour pour ce seul livre, et la version du livre augmente.
+
+        Args:
+            livre_id (int): ID du livre.
+            titre (str, optionnel): Nouveau titre. Par défaut inchangé.
+            auteur (str, optionnel): Nouvel auteur. Par défaut inchangé.
+
+        Raises:
+            KeyError: Si le livre n'existe pas.
+            ValueError: Si le livre est l'exemplaire d'une œuvre (titre et auteur sont ceux de l'œuvre).
+
+        Returns:
+            Livre: Le livre modifié.
+        """
+        livre = self._livres.get(livre_id)
+        if livre is None:
+            raise KeyError(f"Aucun livre avec id={livre_id}.")
+        if livre.oeuvre_id is not None:
+            raise ValueError("Le titre et l'auteur d'un exemplaire sont ceux de son œuvre.")
+        if (titre is None or titre == livre.titre) and (auteur is None or auteur == livre.auteur):
+            return livre
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(livres_ids=(livre_id,))
+            if titre is not None and titre != livre.titre:
+                self._index_titres.retirer(livre_id, livre.titre)
+                livre.titre = titre
+                self._index_titres.ajouter(livre_id, titre)
+            if auteur is not None and auteur != livre.auteur:
+                self._auteurs.retirer(livre_id, livre.auteur)
+                livre.auteur = self._auteurs.ajouter(livre_id, auteur)
+            livre.version += 1
+            self._livres[livre_id] = livre  # Écriture immédiate pour un catalogue ouvert par ouvrir_catalogue
+        self._index_secondaires.mettre_a_jour(livre)
+        self._publier(flux.LIVRE_MODIFIE, dict, livre_id=livre_id, titre=livre.titre, auteur=livre.auteur)
+        return livre
+
     def modifier_status(self, livre_id: int, status: StatusLivre) -> None:
         """
         Modifie le statut du livre (disponible/emprunté).
@@ -81,7 +340,12 @@ class Bibliotheque:
         livre = self._livres.get(livre_id)
         if livre is None:
             raise KeyError(f"Aucun livre avec id={livre_id}.")
-        livre.status = status
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(livres_ids=(livre_id,))
+            livre.status = status
+            livre.version += 1
+            self._enregistrer_statut(livre)
+        self._publier(flux.STATUT_MODIFIE, dict, livre_id=livre_id, status=status.value)
 
     def lister_tous_les_livres(self) -> List[Livre]:
         """
@@ -94,6 +358,31 @@ class Bibliotheque:
         """
         return list(self._livres.values())
 
+    def iterer_livres(self) -> Iterator[Livre]:
+        """
+        Parcourt tous les livres sans en construire la liste (exports, purges, compaction d'un dépôt).
+        La bibliothèque ne doit pas être modifiée pendant le parcours.
+
+        Args:
+            Aucun
+
+        Returns:
+            Iterator[Livre]: Les livres.
+        """
+        yield from self._livres.values()
+
+    def livre(self, livre_id: int) -> Optional[Livre]:
+        """
+        Retourne un livre par son ID.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            Optional[Livre]: Le livre, None s'il n'existe pas.
+        """
+        return self._livres.get(livre_id)
+
     def lister_livres_disponibles(self) -> List[Livre]:
         """
         Retourne la liste des livres disponibles, c'est à dire non emprunté.
@@ -105,9 +394,41 @@ class Bibliotheque:
         """
         return [livre for livre in self._livres.values() if livre.est_disponible()]
 
+    def page_livres(self, curseur: int, limite: int, disponibles: bool = False) -> List[Livre]:
+        """
+        Retourne les livres d'ID strictement supérieur au curseur, par ID croissant (pagination).
+        La page est lue dans la liste triée des IDs (et dans celle du catalogue ouvert par ouvrir_catalogue) à partir
+        du curseur : son coût dépend de la taille de la page, pas de la valeur des IDs.
+
+        Args:
+            curseur (int): Dernier ID de la page précédente (0 pour la première page).
+            limite (int): Nombre maximal de livres.
+            disponibles (bool, optionnel): Ne retient que les livres disponibles. Par défaut False.
+
+        Returns:
+            List[Livre]: Les livres de la page.
+        """
+        livres = self._livres
+        ids = self._ids_livres.apres(curseur)
+        if isinstance(livres, LivresMappes):
+            ids = heapq.merge(suite_apres(livres.catalogue.ids, curseur), ids)
+        page: List[Livre] = []
+        precedent = None
+        for livre_id in ids:
+            if livre_id == precedent:  # Livre du catalogue supprimé puis réajouté avec le même ID
+                continue
+            precedent = livre_id
+            livre = livres.get(livre_id)
+            if livre is not None and (not disponibles or livre.est_disponible()):
+                page.append(livre)
+                if len(page) >= limite:
+                    break
+        return page
+
     def rechercher_par_titre(self, query: str) -> List[Livre]:
         """
         Recherche des livres dont le titre contient la chaîne fournie (insensible à la casse).
+        À partir de 3 caractères, seuls les candidats de l'index de trigrammes sont vérifiés.
 
         Args:
             query (str) : Chaîne de recherche qui se retrouve dans le titre
@@ -116,11 +437,12 @@ class Bibliotheque:
             List[Livre]: Liste des livres correspondants, c'est à dire retrouvant la chaine fournie dans leurs titres.
         """
         q = query.lower() #Convertie la chaine de caractère en minuscule
-        return [livre for livre in self._livres.values() if q in livre.titre.lower()]
+        return self._filtrer(self._index_titres.candidats(q), lambda livre: q in livre.titre.lower(), q, ["titre"])
 
     def rechercher_par_auteur(self, query: str) -> List[Livre]:
         """
         Recherche des livres dont l'auteur contient la chaine fournie (insensible à la casse).
+        La requête n'est comparée qu'aux auteurs distincts du dictionnaire des auteurs, puis étendue à leurs livres.
 
         Args:
             query (str): Chaine de recherche qui se retrouve dans l'auteur
@@ -129,7 +451,11 @@ class Bibliotheque:
             List[Livre]: Liste des livres correspondants, c'est à dire retrouvant la chaine fournie dans l'auteur.
         """
         q = query.lower()
-        return [livre for livre in self._livres.values() if q in livre.auteur.lower()]
+        ids = self._auteurs.candidats(q)  # Résultat exact : aucun livre à revérifier
+        if ids is None:
+            return self._filtrer(None, lambda livre: q in livre.auteur.lower(), q, ["auteur"])
+        livres = self._livres
+        return [livres[livre_id] for livre_id in sorted(ids)]
 
     def rechercher_par_mot_clef(self, query: str) -> List[Livre]:
         """
@@ -142,189 +468,1223 @@ class Bibliotheque:
             List[Livre]: Liste des livres correspondants, c'est à dire où les mots clé apparaissent dans l'auteur ou le titre du livre.
         """
         q = query.lower()
-        return [livre for livre in self._livres.values() if q in livre.titre.lower() or q in livre.auteur.lower()]
+        candidats = self._index_titres.candidats(q)
+        if candidats is not None:
+            candidats |= self._auteurs.candidats(q)
+        return self._filtrer(candidats, lambda livre: q in livre.titre.lower() or q in livre.auteur.lower(),
+                             q, CHAMPS_RECHERCHE)
 
-    # ---------- Gestion utilisateurs ----------
-    def creer_utilisateur(self, nom: str) -> Utilisateur:
+    def rechercher_par_expression(self, motif: str, champ: Optional[str] = None) -> List[Livre]:
         """
-        Crée un nouvel utilisateur et l'ajoute à la bibliothèque.
+        Recherche des livres dont le titre ou l'auteur contient une correspondance d'une expression régulière
+        (sensible à la casse, sauf drapeau (?i) dans le motif). Aucun index ne s'applique : tout le catalogue
+        est parcouru, en parallèle si la recherche parallèle est activée.
 
         Args:
-            nom (str): Nom de l'utilisateur.
+            motif (str): Expression régulière (module re).
+            champ (str, optionnel): "titre" ou "auteur" ; par défaut les deux.
+
+        Raises:
+            ValueError: Si le motif est invalide ou le champ inconnu.
 
         Returns:
-            Utilisateur: L'objet Utilisateur créé.
+            List[Livre]: Les livres trouvés, dans l'ordre du catalogue.
         """
-        u = Utilisateur(nom)
-        self._utilisateurs[u.id] = u
-        return u
-
-    def supprimer_utilisateur(self, utilisateur_id: int) -> bool:
+        if champ is not None and champ not in CHAMPS_RECHERCHE:
+            raise ValueError(f"Champ de recherche inconnu : {champ!r}.")
+        try:
+            expression = re.compile(motif)
+        except re.error as e:
+            raise ValueError(f"Expression régulière invalide : {e}.") from None
+        champs = [champ] if champ else CHAMPS_RECHERCHE
+        return self._filtrer(None, lambda livre: any(expression.search(getattr(livre, c)) for c in champs),
+                             motif, champs, expression=True)
+
+    def rechercher_par_requete(self, requete: str) -> List[Livre]:
         """
-        Supprime un utilisateur uniquement s'il n'a aucun livre emprunté et qu'il existe.
+        Recherche des livres avec le langage de requêtes de core/requete.py : ET / OU / NON, "phrases",
+        préfixes de champ (auteur:hugo), jokers (mis*bles) et expressions régulières (/^Les/).
+        La requête est compilée en opérations sur les index ; seuls les candidats qu'ils ne tranchent pas
+        sont vérifiés, et le catalogue n'est parcouru en entier que si aucun index ne s'applique.
 
         Args:
-            utilisateur_id (int): ID de l'utilisateur.
+            requete (str): La requête.
 
         Raises:
-            KeyError: Si l'utilisateur n'existe pas.
-            ValueError: Si l'utilisateur a encore des livres empruntés.
+            ValueError: Si la requête est vide ou mal formée.
 
         Returns:
-            bool: True si la suppression a réussi.
+            List[Livre]: Les livres trouvés, dans l'ordre des IDs (dans l'ordre du catalogue pour un parcours complet).
         """
-        u = self._utilisateurs.get(utilisateur_id)
-        if u is None:
-            raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
-        if u.livres_empruntes:
-            raise ValueError("Impossible de supprimer un utilisateur qui a des livres empruntés.")
-        del self._utilisateurs[utilisateur_id]
-        return True
+        noeud = langage_requetes.compiler(requete)
+        ids, exact = noeud.candidats(self._index_titres, self._auteurs)
+        if ids is not None and exact:
+            livres = self._livres
+            return [livres[livre_id] for livre_id in sorted(ids) if livre_id in livres]
+        if isinstance(noeud, langage_requetes.Terme):  # Même parcours que les recherches simples, parallèle au besoin
+            return self._filtrer(ids, noeud.verifier, noeud.texte, noeud.champs)
+        return self._filtrer(ids, noeud.verifier)
+
+    def _filtrer(self, candidats: Optional[Iterable[int]], predicat, requete: str = "",
+                 champs: Sequence[str] = (), expression: bool = False) -> List[Livre]:
+        """
+        Retourne les livres candidats qui vérifient un prédicat. Sans candidats, le catalogue est parcouru
+        en entier, par la recherche parallèle si elle est activée et que le catalogue dépasse son seuil.
 
-    def lister_utilisateurs(self) -> List[Utilisateur]:
+        Args:
+            candidats (Iterable[int], optionnel): IDs des livres à vérifier, ou None pour parcourir tout le catalogue.
+            predicat (Callable[[Livre], bool]): Condition à vérifier.
+            requete (str, optionnel): Requête en minuscules (ou expression régulière), pour la recherche parallèle.
+            champs (Sequence[str], optionnel): Champs examinés par le prédicat, pour la recherche parallèle.
+            expression (bool, optionnel): La requête est une expression régulière. Par défaut False.
+
+        Returns:
+            List[Livre]: Les livres retenus, dans l'ordre des IDs pour les candidats d'un index,
+                dans l'ordre du catalogue pour un parcours complet.
         """
-        Retourne la liste de tous les utilisateurs.
+        if candidats is None:
+            if self._recherche_parallele is not None and champs and len(self._livres) >= self.seuil_recherche_parallele:
+                return self._recherche_parallele.rechercher(requete, champs, predicat, expression)
+            return [livre for livre in self._livres.values() if predicat(livre)]
+        livres = self._livres
+        return [livres[livre_id] for livre_id in sorted(candidats) if livre_id in livres and predicat(livres[livre_id])]
+
+    def activer_recherche_parallele(self, nb_processus: Optional[int] = None,
+                                    seuil: int = SEUIL_RECHERCHE_PARALLELE) -> None:
+        """
+        Active le parcours parallèle (voir core/recherche_parallele.py) pour les recherches qu'aucun index
+        n'accélère : requêtes de moins de 3 caractères (par titre ou mot-clé ; les recherches par auteur passent
+        par le dictionnaire des auteurs) et expressions régulières. Les résultats sont identiques au parcours séquentiel.
+
+        Args:
+            nb_processus (int, optionnel): Nombre de processus du pool. Par défaut le nombre de cœurs.
+            seuil (int, optionnel): Nombre de livres en deçà duquel le parcours reste séquentiel.
+                Par défaut SEUIL_RECHERCHE_PARALLELE.
+
+        Returns:
+            None
+        """
+        self.desactiver_recherche_parallele()
+        self._recherche_parallele = RechercheParallele(self, nb_processus)
+        self.seuil_recherche_parallele = seuil
+
+    def desactiver_recherche_parallele(self) -> None:
+        """
+        Arrête le pool de la recherche parallèle et libère sa mémoire partagée.
 
         Args:
             Aucun
 
         Returns:
-            List[Utilisateur]: Liste des utilisateurs.
+            None
         """
-        return list(self._utilisateurs.values())
+        if self._recherche_parallele is not None:
+            self._recherche_parallele.fermer()
+            self._recherche_parallele = None
 
-    # ---------- Emprunts / Retours ----------
-    def emprunter(self, utilisateur_id: int, livre_id: int) -> None:
+    # ---------- Index secondaires ----------
+    def ajouter_index(self, index: IndexSecondaire, en_arriere_plan: bool = False) -> Optional[threading.Thread]:
         """
-        Permet à un utilisateur s'il existe d'emprunter un livre si ce dernier est disponible et existe
-        Met à jour le statut du livre et la liste d'emprunts de l'utilisateur.
+        Enregistre un index secondaire (voir core/index_secondaires.py) et le remplit avec les livres existants.
+        Il reçoit ensuite chaque ajout, modification (titre, auteur, statut) et suppression de livre.
 
         Args:
-            utilisateur_id (int): ID de l'utilisateur.
-            livre_id (int): ID du livre à emprunter.
+            index (IndexSecondaire): L'index, vide.
+            en_arriere_plan (bool, optionnel): Remplit l'index dans un thread. Par défaut False.
 
         Raises:
-            KeyError: Si l'utilisateur ou le livre n'existe pas.
-            ValueError: Si le livre n'est pas disponible.
+            ValueError: Si un index porte déjà ce nom.
 
         Returns:
-            None
+            Optional[threading.Thread]: Le thread qui remplit l'index, ou None s'il est déjà rempli.
         """
-        u = self._utilisateurs.get(utilisateur_id)
-        livre = self._livres.get(livre_id)
-        if u is None:
-            raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
-        if livre is None:
-            raise KeyError(f"Aucun livre avec id={livre_id}.")
-        if not livre.est_disponible():
-            raise ValueError("Le livre n'est pas disponible pour emprunt.")
-        livre.emprunter()
-        u.emprunter_livre(livre_id)
+        self._index_secondaires.ajouter(index)
+        return self.reconstruire_index(index.nom, en_arriere_plan)
 
-    def rendre(self, utilisateur_id: int, livre_id: int) -> None:
+    def retirer_index(self, nom: str) -> None:
         """
-        Permet à un utilisateur existant de rendre un livre qui est enregistré dans la bibliothèque et qu'il a emprunté.
-        Met à jour le statut du livre et retire le livre de la liste d'emprunts de l'utilisateur.
+        Retire un index secondaire.
 
         Args:
-            utilisateur_id (int): ID de l'utilisateur.
-            livre_id (int): ID du livre à rendre.
+            nom (str): Nom de l'index.
 
         Raises:
-            KeyError: Si l'utilisateur ou le livre n'existe pas.
-            ValueError: Si l'utilisateur n'a pas emprunté ce livre.
+            KeyError: Si aucun index ne porte ce nom.
 
         Returns:
             None
         """
-        u = self._utilisateurs.get(utilisateur_id)
-        livre = self._livres.get(livre_id)
-        if u is None:
-            raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
-        if livre is None:
-            raise KeyError(f"Aucun livre avec id={livre_id}.")
-        if livre_id not in u.livres_empruntes:
-            raise ValueError("Cet utilisateur n'a pas emprunté ce livre.")
-        livre.rendre()
-        u.rendre_livre(livre_id)
+        self._index_secondaires.retirer(nom)
 
-    # ---------- Statistiques ----------
-    def nombre_total_livres(self) -> int:
+    def index_secondaire(self, nom: str) -> IndexSecondaire:
         """
-        Retourne le nombre total de livres dans la bibliothèque.
+        Retourne un index secondaire.
 
         Args:
-            Aucun
+            nom (str): Nom de l'index.
+
+        Raises:
+            KeyError: Si aucun index ne porte ce nom.
 
         Returns:
-            int: Nombre total de livres.
+            IndexSecondaire: L'index.
         """
-        return len(self._livres)
+        return self._index_secondaires.obtenir(nom)
 
-    def nombre_total_utilisateurs(self) -> int:
+    def reconstruire_index(self, nom: str, en_arriere_plan: bool = True) -> Optional[threading.Thread]:
         """
-        Retourne le nombre total d'utilisateurs dans la bibliothèque.
+        Reconstruit un index secondaire à partir des livres. En arrière-plan, l'index reste utilisable et tenu à jour
+        pendant la reconstruction ; les livres modifiés entre-temps sont réindexés avant que le nouvel état le remplace.
 
         Args:
-            Aucun
+            nom (str): Nom de l'index.
+            en_arriere_plan (bool, optionnel): Reconstruit dans un thread. Par défaut True.
+
+        Raises:
+            KeyError: Si aucun index ne porte ce nom.
+            ValueError: Si une reconstruction de cet index est déjà en cours.
 
         Returns:
-            int: Nombre total d'utilisateurs.
+            Optional[threading.Thread]: Le thread de la reconstruction, ou None si elle est terminée.
         """
-        return len(self._utilisateurs)
+        return self._index_secondaires.reconstruire(nom, list(self._livres.values()), self._livres, en_arriere_plan)
 
-    def distribution_emprunts_par_utilisateur(self) -> Dict[int, int]:
+    # ---------- Gestion des œuvres et exemplaires ----------
+    def ajouter_oeuvre(self, titre: str, auteur: str, nb_exemplaires: int = 1) -> Oeuvre:
         """
-        Retourne un dictionnaire {utilisateur_id: nombre_emprunts}.
+        Ajoute une œuvre et ses exemplaires. Chaque exemplaire est un Livre qui partage le titre et l'auteur de l'œuvre.
 
         Args:
-            Aucun
+            titre (str): Titre de l'œuvre.
+            auteur (str): Auteur de l'œuvre.
+            nb_exemplaires (int, optionnel): Nombre d'exemplaires à créer. Par défaut 1.
 
         Returns:
-            Dict[int,int]: Distribution des emprunts par utilisateur.
+            Oeuvre: L'œuvre ajoutée.
         """
-        return {u.id: u.nb_emprunts() for u in self._utilisateurs.values()}
+        oeuvre = Oeuvre(titre, auteur)
+        self._oeuvres[oeuvre.id] = oeuvre
+        for _ in range(nb_exemplaires):
+            self.ajouter_exemplaire(oeuvre.id)
+        return oeuvre
 
-    def histogramme_emprunts(self) -> Dict[int, int]:
+    def ajouter_exemplaire(self, oeuvre_id: int) -> Livre:
+        """
+        Ajoute un nouvel exemplaire d'une œuvre existante.
+
+        Args:
+            oeuvre_id (int): ID de l'œuvre.
+
+        Raises:
+            KeyError: Si l'œuvre n'existe pas.
+
+        Returns:
+            Livre: Le Livre représentant le nouvel exemplaire.
+        """
+        oeuvre = self._oeuvres.get(oeuvre_id)
+        if oeuvre is None:
+            raise KeyError(f"Aucune oeuvre avec id={oeuvre_id}.")
+        livre = Livre(oeuvre.titre, oeuvre.auteur)
+        livre.oeuvre_id = oeuvre.id
+        livre.exemplaire = oeuvre.ajouter_exemplaire(livre.id)
+        self._enregistrer_livre(livre)
+        return livre
+
+    def lister_oeuvres(self) -> List[Oeuvre]:
         """
-        Retourne un histogramme des emprunts {nombre_emprunts: nombre_utilisateurs}.
+        Retourne la liste de toutes les œuvres.
 
         Args:
             Aucun
 
         Returns:
-            Dict[int,int]: Histogramme des emprunts.
+            List[Oeuvre]: Liste des œuvres.
+        """
+        return list(self._oeuvres.values())
+
+    def rechercher_oeuvres(self, query: str) -> List[Oeuvre]:
         """
-        counts = [u.nb_emprunts() for u in self._utilisateurs.values()]
-        return dict(Counter(counts))
+        Recherche les œuvres dont le titre ou l'auteur contient la chaine fournie (insensible à la casse).
+        Contrairement à rechercher_par_mot_clef, chaque œuvre n'apparait qu'une fois quel que soit son nombre d'exemplaires.
 
+        Args:
+            query (str): Chaîne de recherche.
 
+        Returns:
+            List[Oeuvre]: Liste des œuvres correspondantes.
+        """
+        q = query.lower()
+        return [oeuvre for oeuvre in self._oeuvres.values() if q in oeuvre.titre.lower() or q in oeuvre.auteur.lower()]
 
-    def afficher_histogramme_emprunts(self) -> None:
+    def _enregistrer_statut(self, livre: Livre) -> None:
         """
-        Affiche un histogramme des emprunts par utilisateur avec matplotlib.
+        Propage le nouveau statut d'un livre : réécriture dans le stockage des livres (écriture immédiate,
+        pour un catalogue ouvert par ouvrir_catalogue), index secondaires et vecteur de statuts de son œuvre.
 
         Args:
-            Aucun
+            livre (Livre): Le livre dont le statut vient de changer.
 
         Returns:
             None
         """
-        counts = [u.nb_emprunts() for u in self._utilisateurs.values()]
-        if not counts:
-            print("Aucun utilisateur pour afficher l'histogramme.")
-            return
+        self._livres[livre.id] = livre
+        self._index_secondaires.mettre_a_jour(livre)
+        if livre.oeuvre_id is not None:
+            self._oeuvres[livre.oeuvre_id].definir_disponibilite(livre.exemplaire, livre.est_disponible())
 
-        histo = Counter(counts)
-        x = list(histo.keys())
-        y = list(histo.values())
+    # ---------- Gestion utilisateurs ----------
+    def creer_utilisateur(self, nom: str, categorie: str = "standard") -> Utilisateur:
+        """
+        Crée un nouvel utilisateur et l'ajoute à la bibliothèque.
+
+        Args:
+            nom (str): Nom de l'utilisateur.
+            categorie (str, optionnel): Catégorie de l'utilisateur, utilisée pour les quotas. Par défaut "standard".
+
+        Returns:
+            Utilisateur: L'objet Utilisateur créé.
+        """
+        u = Utilisateur(nom, categorie)
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(utilisateurs_ids=(u.id,))
+            self._utilisateurs[u.id] = u
+        self._statistiques.ajouter_utilisateur(u.id)
+        self._publier(flux.UTILISATEUR_CREE, flux.evenement_utilisateur_cree, u)
+        return u
+
+    def ajouter_utilisateurs(self, utilisateurs: Iterable[Utilisateur]) -> int:
+        """
+        Ajoute en une fois des utilisateurs déjà construits (par exemple lors d'un import par lots).
+        Les IDs sont vérifiés avant toute insertion : en cas de doublon, aucun utilisateur n'est ajouté.
+
+        Args:
+            utilisateurs (Iterable[Utilisateur]): Utilisateurs à ajouter, sans emprunt en cours.
+
+        Raises:
+            ValueError: Si un ID est déjà utilisé, en double, ou si un utilisateur a des emprunts en cours.
+
+        Returns:
+            int: Nombre d'utilisateurs ajoutés.
+        """
+        utilisateurs = list(utilisateurs)
+        nouveaux = {u.id: u for u in utilisateurs}
+        if len(nouveaux) < len(utilisateurs):
+            raise ValueError("Des utilisateurs fournis ont le même ID.")
+        doublons = nouveaux.keys() & self._utilisateurs.keys()
+        if doublons:
+            raise ValueError(f"IDs d'utilisateurs déjà utilisés : {sorted(doublons)[:10]}.")
+        if any(u.livres_empruntes for u in nouveaux.values()):
+            raise ValueError("Les emprunts des utilisateurs ajoutés doivent être restaurés avec restaurer_emprunts.")
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(utilisateurs_ids=nouveaux)
+            self._utilisateurs.update(nouveaux)
+        for u in nouveaux.values():
+            self._statistiques.ajouter_utilisateur(u.id)
+            self._publier(flux.UTILISATEUR_CREE, flux.evenement_utilisateur_cree, u)
+        return len(nouveaux)
+
+    def supprimer_utilisateur(self, utilisateur_id: int) -> bool:
+        """
+        Supprime un utilisateur uniquement s'il n'a aucun livre emprunté et qu'il existe.
+        Ses réservations sont annulées.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Raises:
+            KeyError: Si l'utilisateur n'existe pas.
+            ValueError: Si l'utilisateur a encore des livres empruntés.
+
+        Returns:
+            bool: True si la suppression a réussi.
+        """
+        u = self._utilisateurs.get(utilisateur_id)
+        if u is None:
+            raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
+        if u.livres_empruntes:
+            raise ValueError("Impossible de supprimer un utilisateur qui a des livres empruntés.")
+        self._retirer_utilisateur(u)
+        return True
+
+    def _retirer_utilisateur(self, u: Utilisateur) -> None:
+        """
+        Retire un utilisateur sans emprunt, ses statistiques, ses réservations et son quota
+        (sans vérification : voir supprimer_utilisateur et purger_utilisateurs).
+
+        Args:
+            u (Utilisateur): L'utilisateur à retirer.
+
+        Returns:
+            None
+        """
+        utilisateur_id = u.id
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes(utilisateurs_ids=(utilisateur_id,))
+            del self._utilisateurs[utilisateur_id]
+        self._statistiques.retirer_utilisateur(utilisateur_id)
+        self._reservations.annuler_utilisateur(utilisateur_id)
+        self._quotas.oublier(utilisateur_id)
+        self._publier(flux.UTILISATEUR_SUPPRIME, dict, utilisateur_id=utilisateur_id)
+
+    def lister_utilisateurs(self) -> List[Utilisateur]:
+        """
+        Retourne la liste de tous les utilisateurs.
+
+        Args:
+            Aucun
+
+        Returns:
+            List[Utilisateur]: Liste des utilisateurs.
+        """
+        return list(self._utilisateurs.values())
+
+    def iterer_utilisateurs(self) -> Iterator[Utilisateur]:
+        """
+        Parcourt tous les utilisateurs sans en construire la liste (exports, purges).
+        La bibliothèque ne doit pas être modifiée pendant le parcours.
+
+        Args:
+            Aucun
+
+        Returns:
+            Iterator[Utilisateur]: Les utilisateurs.
+        """
+        yield from self._utilisateurs.values()
+
+    def utilisateur(self, utilisateur_id: int) -> Optional[Utilisateur]:
+        """
+        Retourne un utilisateur par son ID.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Returns:
+            Optional[Utilisateur]: L'utilisateur, None s'il n'existe pas.
+        """
+        return self._utilisateurs.get(utilisateur_id)
+
+    def definir_quota(self, categorie: str, politique: Optional[PolitiqueQuota]) -> None:
+        """
+        Définit la politique de quota d'emprunt d'une catégorie d'utilisateurs.
+
+        Args:
+            categorie (str): Catégorie d'utilisateurs concernée.
+            politique (PolitiqueQuota, optionnel): Politique à appliquer, None pour retirer toute limite.
+
+        Returns:
+            None
+        """
+        self._quotas.definir_politique(categorie, politique)
+
+    # ---------- Emprunts / Retours ----------
+    def emprunter(self, utilisateur_id: int, livre_id: int, date_retour: Optional[datetime] = None) -> None:
+        """
+        Permet à un utilisateur s'il existe d'emprunter un livre si ce dernier est disponible et existe
+        Met à jour le statut du livre, la liste d'emprunts de l'utilisateur et enregistre la date de retour prévue.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre à emprunter.
+            date_retour (datetime, optionnel): Date de retour prévue. Par défaut maintenant + duree_emprunt.
+
+        Raises:
+            KeyError: Si l'utilisateur ou le livre n'existe pas.
+            ValueError: Si le livre n'est pas disponible ou si un quota de l'utilisateur est atteint.
+
+        Returns:
+            None
+        """
+        u = self._utilisateurs.get(utilisateur_id)
+        livre = self._livres.get(livre_id)
+        if u is None:
+            raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
+        if livre is None:
+            raise KeyError(f"Aucun livre avec id={livre_id}.")
+        if not livre.est_disponible():
+            raise ValueError("Le livre n'est pas disponible pour emprunt.")
+        maintenant = datetime.now()
+        self._quotas.verifier(u, maintenant)
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes((livre_id,), (utilisateur_id,))
+            livre.emprunter()
+            u.emprunter_livre(livre_id)
+            self._enregistrer_statut(livre)
+        self._statistiques.modifier(utilisateur_id, 1)
+        self._quotas.enregistrer(u, maintenant)
+        self._recommandations.enregistrer_emprunt(utilisateur_id, livre_id)
+        if date_retour is None:
+            date_retour = maintenant + self.duree_emprunt
+        self._echeancier.ajouter(livre_id, utilisateur_id, date_retour)
+        self._publier(flux.EMPRUNT, flux.evenement_emprunt, utilisateur_id, livre_id, date_retour)
+
+    def emprunter_oeuvre(self, utilisateur_id: int, oeuvre_id: int, date_retour: Optional[datetime] = None) -> Livre:
+        """
+        Fait emprunter à un utilisateur n'importe quel exemplaire disponible d'une œuvre (choisi en O(1)).
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            oeuvre_id (int): ID de l'œuvre à emprunter.
+            date_retour (datetime, optionnel): Date de retour prévue. Par défaut maintenant + duree_emprunt.
+
+        Raises:
+            KeyError: Si l'utilisateur ou l'œuvre n'existe pas.
+            ValueError: Si aucun exemplaire n'est disponible.
+
+        Returns:
+            Livre: L'exemplaire emprunté.
+        """
+        oeuvre = self._oeuvres.get(oeuvre_id)
+        if oeuvre is None:
+            raise KeyError(f"Aucune oeuvre avec id={oeuvre_id}.")
+        livre_id = oeuvre.prendre_exemplaire()
+        if livre_id is None:
+            raise ValueError("Aucun exemplaire de cette oeuvre n'est disponible pour emprunt.")
+        self.emprunter(utilisateur_id, livre_id, date_retour)
+        return self._livres[livre_id]
+
+    def restaurer_emprunts(self, emprunts: Iterable[Tuple[int, int, Optional[datetime]]]) -> int:
+        """
+        Restaure des emprunts en cours (par exemple lors d'un import) sans appliquer les quotas
+        ni compter de nouveaux emprunts pour les recommandations.
+        Le lot est vérifié avant toute modification : en cas d'erreur, aucun emprunt n'est restauré.
+
+        Args:
+            emprunts (Iterable[Tuple[int, int, Optional[datetime]]]): Triplets (utilisateur_id, livre_id, date_retour).
+                Sans date de retour, elle vaut maintenant + duree_emprunt.
+
+        Raises:
+            KeyError: Si un utilisateur ou un livre n'existe pas.
+            ValueError: Si un livre n'est pas disponible ou apparaît deux fois.
+
+        Returns:
+            int: Nombre d'emprunts restaurés.
+        """
+        emprunts = list(emprunts)
+        vus = set()
+        for utilisateur_id, livre_id, _ in emprunts:
+            if utilisateur_id not in self._utilisateurs:
+                raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
+            livre = self._livres.get(livre_id)
+            if livre is None:
+                raise KeyError(f"Aucun livre avec id={livre_id}.")
+            if not livre.est_disponible() or livre_id in vus:
+                raise ValueError(f"Le livre id={livre_id} n'est pas disponible pour emprunt.")
+            vus.add(livre_id)
+        date_defaut = datetime.now() + self.duree_emprunt
+        for utilisateur_id, livre_id, date_retour in emprunts:
+            livre = self._livres[livre_id]
+            with self._verrou_instantanes:
+                self._conserver_pour_instantanes((livre_id,), (utilisateur_id,))
+                livre.emprunter()
+                self._utilisateurs[utilisateur_id].emprunter_livre(livre_id)
+                self._enregistrer_statut(livre)
+            self._statistiques.modifier(utilisateur_id, 1)
+            self._echeancier.ajouter(livre_id, utilisateur_id, date_retour or date_defaut)
+            self._publier(flux.EMPRUNT, flux.evenement_emprunt, utilisateur_id, livre_id, date_retour or date_defaut)
+        return len(emprunts)
+
+    def rendre(self, utilisateur_id: int, livre_id: int) -> Optional[int]:
+        """
+        Permet à un utilisateur existant de rendre un livre qui est enregistré dans la bibliothèque et qu'il a emprunté.
+        Met à jour le statut du livre, retire le livre de la liste d'emprunts de l'utilisateur et son échéance.
+        Si le livre est réservé, il est automatiquement emprunté par le premier utilisateur de la file d'attente
+        qui peut l'emprunter (ceux dont un quota est atteint gardent leur place dans la file).
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre à rendre.
+
+        Raises:
+            KeyError: Si l'utilisateur ou le livre n'existe pas.
+            ValueError: Si l'utilisateur n'a pas emprunté ce livre.
+
+        Returns:
+            Optional[int]: ID de l'utilisateur à qui le livre a été attribué, None si personne ne l'attendait.
+        """
+        u = self._utilisateurs.get(utilisateur_id)
+        livre = self._livres.get(livre_id)
+        if u is None:
+            raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
+        if livre is None:
+            raise KeyError(f"Aucun livre avec id={livre_id}.")
+        if livre_id not in u.livres_empruntes:
+            raise ValueError("Cet utilisateur n'a pas emprunté ce livre.")
+        with self._verrou_instantanes:
+            self._conserver_pour_instantanes((livre_id,), (utilisateur_id,))
+            livre.rendre()
+            u.rendre_livre(livre_id)
+            self._enregistrer_statut(livre)
+        self._statistiques.modifier(utilisateur_id, -1)
+        self._echeancier.retirer(livre_id)
+        self._publier(flux.RETOUR, dict, utilisateur_id=utilisateur_id, livre_id=livre_id)
+        return self._attribuer_au_suivant(livre_id)
+
+    def _attribuer_au_suivant(self, livre_id: int) -> Optional[int]:
+        """
+        Fait emprunter un livre rendu au premier utilisateur de sa file d'attente pouvant l'emprunter.
+        Un utilisateur qui ne le peut pas (quota atteint) est passé mais garde sa place pour le prochain retour.
+        La file est parcourue sans copie, jusqu'au premier utilisateur pouvant emprunter.
+
+        Args:
+            livre_id (int): ID du livre rendu.
+
+        Returns:
+            Optional[int]: ID de l'utilisateur servi, None si la file est vide ou si personne ne peut l'emprunter
+                (le livre reste alors disponible).
+        """
+        if not self._livres[livre_id].est_disponible():
+            return None
+        maintenant = datetime.now()
+
+        def peut_emprunter(utilisateur_id: int) -> bool:
+            try:
+                self._quotas.verifier(self._utilisateurs[utilisateur_id], maintenant)
+            except ValueError:
+                return False
+            return True
+
+        utilisateur_id = self._reservations.suivant(livre_id, peut_emprunter)
+        if utilisateur_id is not None:
+            self.emprunter(utilisateur_id, livre_id)
+        return utilisateur_id
+
+    # ---------- Mises à jour conditionnelles ----------
+    def emprunter_si_version(self, utilisateur_id: int, livre_id: int, version_livre: int,
+                             version_utilisateur: Optional[int] = None, date_retour: Optional[datetime] = None) -> int:
+        """
+        Emprunte un livre seulement si le livre (et l'utilisateur, si sa version est fournie) n'a pas changé
+        depuis que l'appelant l'a lu : un client peut lire, décider puis écrire sans qu'un verrou soit tenu
+        entre les deux, et échoue immédiatement si quelqu'un l'a devancé.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre à emprunter.
+            version_livre (int): Version du livre lue par l'appelant.
+            version_utilisateur (int, optionnel): Version de l'utilisateur lue par l'appelant. Par défaut non vérifiée.
+            date_retour (datetime, optionnel): Date de retour prévue. Par défaut maintenant + duree_emprunt.
+
+        Raises:
+            KeyError: Si l'utilisateur ou le livre n'existe pas.
+            ConflitVersion: Si une version ne correspond plus.
+            ValueError: Pour les mêmes raisons qu'emprunter.
+
+        Returns:
+            int: Nouvelle version du livre.
+        """
+        self._verifier_versions(utilisateur_id, livre_id, version_livre, version_utilisateur)
+        self.emprunter(utilisateur_id, livre_id, date_retour)
+        return self._livres[livre_id].version
+
+    def rendre_si_version(self, utilisateur_id: int, livre_id: int, version_livre: int,
+                          version_utilisateur: Optional[int] = None) -> Optional[int]:
+        """
+        Rend un livre seulement si le livre (et l'utilisateur, si sa version est fournie) n'a pas changé
+        depuis que l'appelant l'a lu.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre à rendre.
+            version_livre (int): Version du livre lue par l'appelant.
+            version_utilisateur (int, optionnel): Version de l'utilisateur lue par l'appelant. Par défaut non vérifiée.
+
+        Raises:
+            KeyError: Si l'utilisateur ou le livre n'existe pas.
+            ConflitVersion: Si une version ne correspond plus.
+            ValueError: Si l'utilisateur n'a pas emprunté ce livre.
+
+        Returns:
+            Optional[int]: ID de l'utilisateur à qui le livre a été attribué, comme rendre.
+        """
+        self._verifier_versions(utilisateur_id, livre_id, version_livre, version_utilisateur)
+        return self.rendre(utilisateur_id, livre_id)
+
+    def modifier_status_si_version(self, livre_id: int, status: StatusLivre, version_livre: int) -> int:
+        """
+        Modifie le statut d'un livre seulement s'il n'a pas changé depuis que l'appelant l'a lu.
+
+        Args:
+            livre_id (int): ID du livre.
+            status (StatusLivre): Nouveau statut.
+            version_livre (int): Version du livre lue par l'appelant.
+
+        Raises:
+            KeyError: Si le livre n'existe pas.
+            ConflitVersion: Si la version ne correspond plus.
+            ValueError: Si le statut fourni est invalide.
+
+        Returns:
+            int: Nouvelle version du livre.
+        """
+        self._verifier_versions(None, livre_id, version_livre, None)
+        self.modifier_status(livre_id, status)
+        return self._livres[livre_id].version
+
+    def _verifier_versions(self, utilisateur_id: Optional[int], livre_id: int, version_livre: int,
+                           version_utilisateur: Optional[int]) -> None:
+        """
+        Vérifie les versions attendues par une mise à jour conditionnelle.
+
+        Args:
+            utilisateur_id (int, optionnel): ID de l'utilisateur, None s'il n'est pas concerné.
+            livre_id (int): ID du livre.
+            version_livre (int): Version attendue du livre.
+            version_utilisateur (int, optionnel): Version attendue de l'utilisateur, None pour ne pas la vérifier.
+
+        Raises:
+            KeyError: Si le livre ou l'utilisateur n'existe pas.
+            ConflitVersion: Si une version ne correspond plus.
+
+        Returns:
+            None
+        """
+        livre = self._livres.get(livre_id)
+        if livre is None:
+            raise KeyError(f"Aucun livre avec id={livre_id}.")
+        if livre.version != version_livre:
+            raise ConflitVersion("livre", livre_id, version_livre, livre.version)
+        if version_utilisateur is not None:
+            u = self._utilisateurs.get(utilisateur_id)
+            if u is None:
+                raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
+            if u.version != version_utilisateur:
+                raise ConflitVersion("utilisateur", utilisateur_id, version_utilisateur, u.version)
+
+    # ---------- Purges ----------
+    def purger_livres(self, predicat: Callable[[Livre], bool], budget: float = BUDGET_TRANCHE,
+                      verrou=None, pause: float = PAUSE_ENTRE_TRANCHES) -> int:
+        """
+        Supprime les livres disponibles qui vérifient un prédicat (par exemple les livres jamais empruntés),
+        par tranches d'au plus budget secondes (voir core/purge.py). Le verrou éventuel n'est tenu que
+        le temps d'une tranche : les autres threads ne sont jamais bloqués plus longtemps.
+
+        Args:
+            predicat (Callable[[Livre], bool]): Condition de suppression.
+            budget (float, optionnel): Durée maximale d'une tranche, en secondes. Par défaut BUDGET_TRANCHE.
+            verrou (AbstractContextManager, optionnel): Verrou qui protège la bibliothèque, pris pour chaque tranche.
+            pause (float, optionnel): Attente entre deux tranches, en secondes. Par défaut PAUSE_ENTRE_TRANCHES.
+
+        Raises:
+            ValueError: Si le budget n'est pas strictement positif.
+
+        Returns:
+            int: Nombre de livres supprimés.
+        """
+        return Purge(self, LIVRES, predicat, budget).executer(verrou, pause)
+
+    def purger_utilisateurs(self, predicat: Callable[[Utilisateur], bool], budget: float = BUDGET_TRANCHE,
+                            verrou=None, pause: float = PAUSE_ENTRE_TRANCHES) -> int:
+        """
+        Supprime les utilisateurs sans emprunt en cours qui vérifient un prédicat (par exemple les utilisateurs
+        inactifs créés avant un ID donné), par tranches d'au plus budget secondes (voir purger_livres).
+
+        Args:
+            predicat (Callable[[Utilisateur], bool]): Condition de suppression.
+            budget (float, optionnel): Durée maximale d'une tranche, en secondes. Par défaut BUDGET_TRANCHE.
+            verrou (AbstractContextManager, optionnel): Verrou qui protège la bibliothèque, pris pour chaque tranche.
+            pause (float, optionnel): Attente entre deux tranches, en secondes. Par défaut PAUSE_ENTRE_TRANCHES.
+
+        Raises:
+            ValueError: Si le budget n'est pas strictement positif.
+
+        Returns:
+            int: Nombre d'utilisateurs supprimés.
+        """
+        return Purge(self, UTILISATEURS, predicat, budget).executer(verrou, pause)
+
+    # ---------- Réservations ----------
+    def reserver(self, utilisateur_id: int, livre_id: int) -> int:
+        """
+        Place un utilisateur dans la file d'attente d'un livre actuellement emprunté.
+        Le livre lui sera attribué automatiquement à son tour lors d'un retour.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre à réserver.
+
+        Raises:
+            KeyError: Si l'utilisateur ou le livre n'existe pas.
+            ValueError: Si le livre est disponible, déjà emprunté par cet utilisateur ou déjà réservé par lui.
+
+        Returns:
+            int: Position de l'utilisateur dans la file d'attente (1 = prochain servi).
+        """
+        u = self._utilisateurs.get(utilisateur_id)
+        livre = self._livres.get(livre_id)
+        if u is None:
+            raise KeyError(f"Aucun utilisateur avec id={utilisateur_id}.")
+        if livre is None:
+            raise KeyError(f"Aucun livre avec id={livre_id}.")
+        if livre.est_disponible():
+            raise ValueError("Le livre est disponible, il peut être emprunté directement.")
+        if livre_id in u.livres_empruntes:
+            raise ValueError("Cet utilisateur a déjà emprunté ce livre.")
+        return self._reservations.reserver(utilisateur_id, livre_id)
+
+    def annuler_reservation(self, utilisateur_id: int, livre_id: int) -> None:
+        """
+        Annule la réservation d'un utilisateur sur un livre.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre.
+
+        Raises:
+            ValueError: Si l'utilisateur n'a pas réservé ce livre.
+
+        Returns:
+            None
+        """
+        self._reservations.annuler(utilisateur_id, livre_id)
+
+    def file_reservations(self, livre_id: int) -> List[int]:
+        """
+        Retourne la file d'attente d'un livre dans l'ordre de passage.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            List[int]: IDs des utilisateurs en attente.
+        """
+        return self._reservations.file(livre_id)
+
+    def reservations_utilisateur(self, utilisateur_id: int) -> List[int]:
+        """
+        Retourne les livres réservés par un utilisateur.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Returns:
+            List[int]: IDs des livres réservés.
+        """
+        return self._reservations.reservations(utilisateur_id)
+
+    # ---------- Recommandations ----------
+    def recommandations(self, livre_id: int, k: int = 5) -> List[Livre]:
+        """
+        Retourne les livres les plus souvent empruntés par les utilisateurs qui ont aussi emprunté ce livre.
+
+        Args:
+            livre_id (int): ID du livre de référence.
+            k (int, optionnel): Nombre maximal de recommandations. Par défaut 5.
+
+        Returns:
+            List[Livre]: Les livres recommandés, du plus au moins co-emprunté.
+        """
+        ids = self._recommandations.recommandations(livre_id, k, filtre=self._livres.__contains__)
+        return [self._livres[i] for i in ids]
+
+    def livres_populaires(self, k: int = 10) -> List[Livre]:
+        """
+        Retourne les livres les plus empruntés.
+
+        Args:
+            k (int, optionnel): Nombre de livres souhaités. Par défaut 10.
+
+        Returns:
+            List[Livre]: Les livres les plus empruntés, du plus au moins emprunté.
+        """
+        ids = self._recommandations.populaires(k, filtre=self._livres.__contains__)
+        return [self._livres[i] for i in ids]
+
+    def nombre_emprunts_livre(self, livre_id: int) -> int:
+        """
+        Retourne le nombre de fois qu'un livre a été emprunté.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            int: Nombre d'emprunts (0 pour un livre jamais emprunté).
+        """
+        return self._recommandations.nombre_emprunts(livre_id)
+
+    def reconstruire_recommandations(self, emprunts: Iterable[Tuple[int, int]]) -> None:
+        """
+        Recalcule les recommandations à partir d'un historique complet d'emprunts (reconstruction nocturne vectorisée).
+
+        Args:
+            emprunts (Iterable[Tuple[int, int]]): Emprunts (utilisateur_id, livre_id) du plus ancien au plus récent.
+
+        Returns:
+            None
+        """
+        self._recommandations.reconstruire(emprunts)
+
+    # ---------- Échéances ----------
+    def date_retour(self, livre_id: int) -> Optional[datetime]:
+        """
+        Retourne la date de retour prévue d'un livre emprunté.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            Optional[datetime]: Date de retour prévue, None si le livre n'est pas emprunté via la bibliothèque.
+        """
+        return self._echeancier.date_retour(livre_id)
+
+    def emprunts_en_retard(self, maintenant: Optional[datetime] = None) -> List[Echeance]:
+        """
+        Retourne les emprunts dont la date de retour est dépassée, du plus ancien au plus récent.
+        Seuls les emprunts en retard sont parcourus : O(k log n) pour k retards.
+
+        Args:
+            maintenant (datetime, optionnel): Date de référence. Par défaut la date courante.
+
+        Returns:
+            List[Echeance]: Les emprunts en retard.
+        """
+        if maintenant is None:
+            maintenant = datetime.now()
+        return self._echeancier.en_retard(maintenant)
+
+    def prochaines_echeances(self, n: int) -> List[Echeance]:
+        """
+        Retourne les n prochains emprunts à rendre, du plus proche au plus lointain.
+
+        Args:
+            n (int): Nombre d'échéances souhaitées.
+
+        Returns:
+            List[Echeance]: Les n prochaines échéances.
+        """
+        return self._echeancier.prochaines(n)
+
+    # ---------- Statistiques ----------
+    def nombre_total_livres(self) -> int:
+        """
+        Retourne le nombre total de livres dans la bibliothèque.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre total de livres.
+        """
+        return len(self._livres)
+
+    def nombre_total_utilisateurs(self) -> int:
+        """
+        Retourne le nombre total d'utilisateurs dans la bibliothèque.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre total d'utilisateurs.
+        """
+        return len(self._utilisateurs)
+
+    def distribution_emprunts_par_utilisateur(self) -> Dict[int, int]:
+        """
+        Retourne un dictionnaire {utilisateur_id: nombre_emprunts}, calculé sans parcourir les utilisateurs.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[int,int]: Distribution des emprunts par utilisateur.
+        """
+        return self._statistiques.distribution()
+
+    def histogramme_emprunts(self) -> Dict[int, int]:
+        """
+        Retourne un histogramme des emprunts {nombre_emprunts: nombre_utilisateurs}, calculé sans parcourir les utilisateurs.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[int,int]: Histogramme des emprunts.
+        """
+        return self._statistiques.histogramme()
+
+    def resume_emprunts(self, quantiles: Iterable[float] = (50, 90, 99)) -> Dict[str, object]:
+        """
+        Retourne un résumé des emprunts en cours par utilisateur : moyenne, percentiles,
+        coefficient de Gini et part des emprunts détenue par les 10 % plus gros emprunteurs.
+
+        Args:
+            quantiles (Iterable[float], optionnel): Percentiles souhaités (entre 0 et 100). Par défaut 50, 90 et 99.
+
+        Returns:
+            Dict[str, object]: Clés "utilisateurs", "moyenne", "percentiles" ({percentile: valeur}), "gini"
+                et "concentration_top_10".
+        """
+        return {
+            "utilisateurs": len(self._statistiques),
+            "moyenne": self._statistiques.moyenne(),
+            "percentiles": self._statistiques.percentiles(quantiles),
+            "gini": self._statistiques.gini(),
+            "concentration_top_10": self._statistiques.concentration(0.1),
+        }
+
+    def top_emprunteurs(self, n: int = 10) -> List[Tuple[Utilisateur, int]]:
+        """
+        Retourne les n utilisateurs ayant le plus d'emprunts en cours.
+
+        Args:
+            n (int, optionnel): Nombre d'utilisateurs. Par défaut 10.
+
+        Returns:
+            List[Tuple[Utilisateur, int]]: Couples (utilisateur, nombre_emprunts), du plus grand au plus petit
+                nombre d'emprunts (à égalité, par ID croissant).
+        """
+        return [(self._utilisateurs[uid], nb) for uid, nb in self._statistiques.top_emprunteurs(n)]
+
+
+    def afficher_histogramme_emprunts(self) -> None:
+        """
+        Affiche un histogramme des emprunts par utilisateur avec matplotlib.
+        Au-delà de 50 nombres d'emprunts distincts, les barres regroupent plusieurs valeurs.
+        Pour un serveur ou un environnement sans écran, utiliser enregistrer_histogramme_emprunts.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        x, y, largeur = self._statistiques.histogramme_classes()
+        if not x:
+            print("Aucun utilisateur pour afficher l'histogramme.")
+            return
+
+        import matplotlib.pyplot as plt  # Importé à la demande : pyplot alourdit fortement le démarrage
+
+        plt.bar(x, y, width=0.8 * largeur, color='skyblue')
+        plt.xlabel("Nombre d'emprunts")
+        plt.ylabel("Nombre d'utilisateurs")
+        plt.title("Histogramme des emprunts par utilisateur")
+        if largeur == 1:
+            plt.xticks(x)  # pour afficher chaque nombre d'emprunts
+        plt.show()
+
+    def enregistrer_histogramme_emprunts(self, destination, format: Optional[str] = None,
+                                         nb_classes_max: int = 50, dpi: int = 100) -> None:
+        """
+        Dessine l'histogramme des emprunts par utilisateur dans un fichier ou un tampon, sans fenêtre
+        (backend non interactif, sans l'état global de pyplot). Au-delà de nb_classes_max nombres d'emprunts
+        distincts, les barres regroupent plusieurs valeurs.
+
+        Args:
+            destination (str | BinaryIO): Chemin du fichier ou tampon binaire (par exemple io.BytesIO).
+            format (str, optionnel): "png", "svg", "pdf"... Par défaut, déduit de l'extension (png pour un tampon).
+            nb_classes_max (int, optionnel): Nombre maximal de barres. Par défaut 50.
+            dpi (int, optionnel): Résolution des images matricielles. Par défaut 100.
+
+        Raises:
+            ValueError: S'il n'y a aucun utilisateur.
+
+        Returns:
+            None
+        """
+        from matplotlib.figure import Figure
+
+        x, y, largeur = self._statistiques.histogramme_classes(nb_classes_max)
+        if not x:
+            raise ValueError("Aucun utilisateur pour afficher l'histogramme.")
+        figure = Figure(figsize=(8, 5))
+        axes = figure.subplots()
+        axes.bar(x, y, width=0.8 * largeur, color='skyblue')
+        axes.set_xlabel("Nombre d'emprunts" if largeur == 1 else f"Nombre d'emprunts (classes de {largeur})")
+        axes.set_ylabel("Nombre d'utilisateurs")
+        axes.set_title("Histogramme des emprunts par utilisateur")
+        if largeur == 1 and len(x) <= 20:
+            axes.set_xticks(x)
+        figure.savefig(destination, format=format, dpi=dpi)
+    # ---------- Instantanés ----------
+    def instantane(self) -> Instantane:
+        """
+        Crée un instantané en lecture seule des livres et utilisateurs, en temps constant.
+        Les rapports longs peuvent le parcourir pendant que les emprunts et retours continuent :
+        il voit la bibliothèque telle qu'elle était à sa création. À fermer après usage (ou bloc with).
+
+        Args:
+            Aucun
+
+        Returns:
+            Instantane: L'instantané (livres(), utilisateurs(), histogramme_emprunts(), ...).
+        """
+        with self._verrou_instantanes:
+            instantane = Instantane(self)
+            self._instantanes.add(instantane)
+        return instantane
+
+    def _fermer_instantane(self, instantane: Instantane) -> None:
+        """
+        Cesse de conserver des états pour un instantané.
+
+        Args:
+            instantane (Instantane): L'instantané fermé.
+
+        Returns:
+            None
+        """
+        with self._verrou_instantanes:
+            self._instantanes.discard(instantane)
+
+    def _conserver_pour_instantanes(self, livres_ids: Iterable[int] = (), utilisateurs_ids: Iterable[int] = ()) -> None:
+        """
+        Confie aux instantanés ouverts l'état actuel des livres et utilisateurs sur le point d'être modifiés.
+        Sans instantané ouvert, ne coûte qu'un test. L'appelant détient _verrou_instantanes et effectue
+        la modification sous ce même verrou, que prend aussi instantane() : un instantané voit chaque modification
+        entière ou pas du tout (jamais un livre emprunté absent de la liste de son emprunteur).
+
+        Args:
+            livres_ids (Iterable[int], optionnel): IDs des livres qui vont être créés, modifiés ou supprimés.
+            utilisateurs_ids (Iterable[int], optionnel): IDs des utilisateurs qui vont être créés, modifiés ou supprimés.
+
+        Returns:
+            None
+        """
+        if not self._instantanes:
+            return
+        livres_ids, utilisateurs_ids = list(livres_ids), list(utilisateurs_ids)
+        for instantane in self._instantanes:
+            for livre_id in livres_ids:
+                instantane.conserver_livre(livre_id)
+            for utilisateur_id in utilisateurs_ids:
+                instantane.conserver_utilisateur(utilisateur_id)
+
+    # ---------- Flux des modifications ----------
+    def abonner(self, abonne: Callable[[Dict], None], rejouer_etat: bool = False) -> None:
+        """
+        Abonne une fonction aux événements publiés après chaque modification (voir core/flux_modifications.py),
+        par exemple un EcrivainFlux qui les transmet à des répliques via un tube ou une socket.
+        Les abonnés sont appelés dans le thread qui modifie la bibliothèque. Un abonné qui lève une exception
+        n'interrompt pas la modification : il est désabonné (il a manqué un événement), l'erreur est journalisée
+        et le couple (abonné, exception) est ajouté à abonnes_en_echec.
+
+        Args:
+            abonne (Callable[[Dict], None]): Fonction appelée avec chaque événement.
+            rejouer_etat (bool, optionnel): Envoie d'abord à l'abonné des événements de séquence 0 décrivant
+                l'état actuel (livres, utilisateurs, emprunts), suivis d'un événement fin_etat_initial. Par défaut False.
+
+        Returns:
+            None
+        """
+        if rejouer_etat:
+            empruntes = set()
+            for livre in self._livres.values():
+                abonne({"seq": 0, "type": flux.LIVRE_AJOUTE, **flux.evenement_livre_ajoute(livre)})
+            for u in self._utilisateurs.values():
+                abonne({"seq": 0, "type": flux.UTILISATEUR_CREE, **flux.evenement_utilisateur_cree(u)})
+            for u in self._utilisateurs.values():
+                for livre_id in u.livres_empruntes:
+                    empruntes.add(livre_id)
+                    abonne({"seq": 0, "type": flux.EMPRUNT,
+                            **flux.evenement_emprunt(u.id, livre_id, self._echeancier.date_retour(livre_id))})
+            for livre in self._livres.values():
+                if not livre.est_disponible() and livre.id not in empruntes:
+                    abonne({"seq": 0, "type": flux.STATUT_MODIFIE, "livre_id": livre.id, "status": livre.status.value})
+            abonne({"seq": self._sequence, "type": flux.FIN_ETAT_INITIAL})
+        self._abonnes.append(abonne)
+
+    def desabonner(self, abonne: Callable[[Dict], None]) -> None:
+        """
+        Désabonne une fonction des événements.
+
+        Args:
+            abonne (Callable[[Dict], None]): Fonction précédemment abonnée.
+
+        Returns:
+            None
+        """
+        if abonne in self._abonnes:
+            self._abonnes.remove(abonne)
+
+    def _publier(self, type_evenement: str, fabrique: Callable[..., Dict], *args, **kwargs) -> None:
+        """
+        Publie un événement aux abonnés. Sans abonné, les données de l'événement ne sont même pas construites.
+        Un abonné en erreur est désabonné et noté dans abonnes_en_echec : la modification, déjà appliquée,
+        se poursuit (par exemple l'attribution d'un livre rendu au suivant de la file d'attente).
+
+        Args:
+            type_evenement (str): Type de l'événement (flux.LIVRE_AJOUTE, flux.EMPRUNT...).
+            fabrique (Callable[..., Dict]): Construit les données de l'événement à partir de args et kwargs.
+            *args: Arguments de la fabrique.
+            **kwargs: Arguments nommés de la fabrique.
+
+        Returns:
+            None
+        """
+        if not self._abonnes:
+            return
+        self._sequence += 1
+        evenement = {"seq": self._sequence, "type": type_evenement, **fabrique(*args, **kwargs)}
+        for abonne in list(self._abonnes):
+            try:
+                abonne(evenement)
+            except Exception as erreur:
+                logger.exception("Abonné %r désabonné après une erreur sur l'événement %s", abonne, evenement["seq"])
+                self.desabonner(abonne)
+                self.abonnes_en_echec.append((abonne, erreur))
+
+    # ---------- Métriques ----------
+    def activer_metriques(self, metriques: Optional[Metriques] = None) -> Metriques:
+        """
+        Active la mesure des appels, erreurs et latences des emprunts, retours, recherches et statistiques.
+
+        Args:
+            metriques (Metriques, optionnel): Métriques à alimenter. Par défaut, de nouvelles métriques vides.
+
+        Returns:
+            Metriques: Les métriques alimentées (instantane(), exporter_prometheus(), ...).
+        """
+        self.desactiver_metriques()
+        self.metriques = metriques if metriques is not None else Metriques()
+        self._hook_metriques = HookMetriques(self.metriques)
+        self.ajouter_hook(self._hook_metriques, METHODES_MESUREES)
+        return self.metriques
+
+    def desactiver_metriques(self) -> None:
+        """
+        Désactive la mesure : les méthodes sont de nouveau appelées sans aucun surcoût.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        if self._hook_metriques is not None:
+            self.retirer_hook(self._hook_metriques)
+        self._hook_metriques = None
+        self.metriques = None
+
+    # ---------- Hooks ----------
+    def ajouter_hook(self, hook: Hook, methodes: Optional[Iterable[str]] = None) -> None:
+        """
+        Enregistre un hook appelé avant et après les méthodes publiques observées (avec durée, résultat et erreur).
+        Voir par exemple JournalOperationsLentes dans core/hooks.py.
+
+        Args:
+            hook (Hook): Le hook à enregistrer.
+            methodes (Iterable[str], optionnel): Noms des méthodes observées. Par défaut toutes les méthodes publiques.
+
+        Raises:
+            ValueError: Si une méthode n'existe pas ou n'est pas observable.
+
+        Returns:
+            None
+        """
+        self._hooks.ajouter(hook, methodes)
+
+    def retirer_hook(self, hook: Hook) -> None:
+        """
+        Retire un hook. Les méthodes qui ne sont plus observées retrouvent leur coût d'origine.
+
+        Args:
+            hook (Hook): Le hook à retirer.
+
+        Returns:
+            None
+        """
+        self._hooks.retirer(hook)
 
-        plt.bar(x, y, color='skyblue')
-        plt.xlabel("Nombre d'emprunts")
-        plt.ylabel("Nombre d'utilisateurs")
-        plt.title("Histogramme des emprunts par utilisateur")
-        plt.xticks(x)  # pour afficher chaque nombre d'emprunts
-        plt.show()
     # ---------- Utilitaires pour affichage ----------
     def affiche_livres(self) -> None:
         """
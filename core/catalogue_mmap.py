@@ -0,0 +1,671 @@
+"""
+Catalogue de livres en lecture seule sur disque, ouvert par mmap.
+
+Le fichier est écrit une fois (ecrire_catalogue) puis ouvert sans être relu ni reconstruit : les processus qui
+l'ouvrent partagent les mêmes pages du cache du système et démarrent en quelques millisecondes, quelle que soit
+la taille du catalogue. Organisation (entiers dans l'ordre des octets de la machine, sections alignées sur 8 octets) :
+- en-tête : signature, version, marqueur d'ordre des octets, nombre de livres et position de chaque section
+- ids : IDs des livres, triés (int64), retrouvés par recherche dichotomique
+- status : statut de chaque livre (uint8 : 0 disponible, 1 emprunté)
+- offsets : 2 * n + 1 positions (uint64) dans le tas ; titre i = tas[offsets[2i]:offsets[2i+1]], auteur à la suite
+- tas : titres et auteurs en UTF-8
+- index_titre, index_auteur : index de trigrammes prêts à l'emploi (voir core/index_recherche.py) : clés triées,
+  et pour chacune la liste triée des positions (uint32) des livres qui la contiennent
+
+LivresMappes présente le catalogue comme le dictionnaire {id: Livre} de la Bibliotheque, avec une petite couche
+modifiable en mémoire (livres modifiés ou ajoutés, IDs supprimés) et un cache LRU borné des livres lus.
+IndexTrigrammesMappe fait de même pour les index de recherche (les auteurs des livres ajoutés vont dans
+un DictionnaireAuteurs, voir core/auteurs.py).
+"""
+import bisect
+import mmap
+import struct
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from bibliotheque_project.core.auteurs import DictionnaireAuteurs
+from bibliotheque_project.core.index_recherche import TAILLE_NGRAMME, IndexTrigrammes, trigrammes
+from bibliotheque_project.models.livre import Livre, StatusLivre
+
+SIGNATURE = b"BIBCAT01"
+VERSION = 1
+MARQUEUR_ORDRE = 0x01020304
+SECTIONS = ["ids", "status", "offsets", "tas", "index_titre", "index_auteur", "fin"]
+ENTETE = struct.Struct("=8sIIQ" + "Q" * len(SECTIONS))
+CODES_STATUS = {StatusLivre.DISPONIBLE: 0, StatusLivre.EMPRUNTE: 1}
+STATUS_PAR_CODE = {code: status for status, code in CODES_STATUS.items()}
+CAPACITE_CACHE_DEFAUT = 100_000  # Livres non modifiés gardés en mémoire par LivresMappes
+
+
+def ecrire_catalogue(livres: Iterable[Livre], chemin: str, conserver_status: bool = True) -> int:
+    """
+    Écrit un catalogue au format mappable.
+
+    Args:
+        livres (Iterable[Livre]): Livres à écrire (dans n'importe quel ordre).
+        chemin (str): Fichier à écrire.
+        conserver_status (bool, optionnel): Écrit le statut de chaque livre ; sinon tous sont écrits disponibles
+            (utile quand les emprunts sont restaurés à part). Par défaut True.
+
+    Returns:
+        int: Nombre de livres écrits.
+    """
+    livres = sorted(livres, key=lambda livre: livre.id)
+    ids = array("q", (livre.id for livre in livres))
+    status = bytes(CODES_STATUS[livre.status] if conserver_status else 0 for livre in livres)
+    offsets = array("Q", [0])
+    tas = bytearray()
+    postings: Dict[str, Dict[str, array]] = {"titre": {}, "auteur": {}}
+    for position, livre in enumerate(livres):
+        for champ in ("titre", "auteur"):
+            texte = getattr(livre, champ)
+            tas += texte.encode("utf-8")
+            offsets.append(len(tas))
+            index = postings[champ]
+            for trigramme in trigrammes(texte.lower()):
+                positions = index.get(trigramme)
+                if positions is None:
+                    index[trigramme] = array("I", [position])
+                else:
+                    positions.append(position)
+
+    with open(chemin, "wb") as fichier:
+        fichier.write(bytes(ENTETE.size))
+        debuts = []
+        for contenu in (ids.tobytes(), status, offsets.tobytes(), bytes(tas),
+                        _section_index(postings["titre"]), _section_index(postings["auteur"])):
+            fichier.write(bytes(-fichier.tell() % 8))
+            debuts.append(fichier.tell())
+            fichier.write(contenu)
+        debuts.append(fichier.tell())
+        fichier.seek(0)
+        fichier.write(ENTETE.pack(SIGNATURE, VERSION, MARQUEUR_ORDRE, len(livres), *debuts))
+    return len(livres)
+
+
+def _section_index(postings: Dict[str, array]) -> bytes:
+    """
+    Sérialise un index de trigrammes : nombre de clés, positions des clés dans leur tas, positions des listes
+    dans le tableau des postings, tas des clés (complété à 8 octets) puis postings.
+
+    Args:
+        postings (Dict[str, array]): Trigramme -> positions triées des livres.
+
+    Returns:
+        bytes: La section.
+    """
+    cles = sorted(postings, key=lambda trigramme: trigramme.encode("utf-8"))
+    offsets_cles = array("Q", [0])
+    offsets_postings = array("Q", [0])
+    tas_cles = bytearray()
+    tableau = array("I")
+    for trigramme in cles:
+        tas_cles += trigramme.encode("utf-8")
+        offsets_cles.append(len(tas_cles))
+        tableau.extend(postings[trigramme])
+        offsets_postings.append(len(tableau))
+    tas_cles += bytes(-len(tas_cles) % 8)
+    return b"".join([struct.pack("=Q", len(cles)), offsets_cles.tobytes(), offsets_postings.tobytes(),
+                     bytes(tas_cles), tableau.tobytes()])
+
+
+class CatalogueMappe:
+    """
+    Catalogue ouvert en lecture seule par mmap. Les livres sont désignés par leur position (0..n-1, par ID croissant).
+    """
+
+    def __init__(self, chemin: str) -> None:
+        """
+        Ouvre le catalogue : seul l'en-tête est lu.
+
+        Args:
+            chemin (str): Fichier écrit par ecrire_catalogue.
+
+        Raises:
+            ValueError: Si le fichier n'est pas un catalogue de ce format.
+
+        Returns:
+            None
+        """
+        self.chemin = chemin
+        with open(chemin, "rb") as fichier:
+            self._mmap = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        signature, version, marqueur, self._nb, *debuts = ENTETE.unpack_from(self._mmap)
+        if signature != SIGNATURE or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{chemin} n'est pas un catalogue au format {SIGNATURE.decode()}.")
+        if marqueur != MARQUEUR_ORDRE:
+            self._mmap.close()
+            raise ValueError(f"{chemin} a été écrit sur une machine d'ordre des octets différent.")
+        self._debuts = dict(zip(SECTIONS, debuts))
+        vue = memoryview(self._mmap)
+        self._vue = vue
+        self.ids = vue[self._debuts["ids"]:self._debuts["ids"] + 8 * self._nb].cast("q")
+        self._status = vue[self._debuts["status"]:self._debuts["status"] + self._nb]
+        self._offsets = vue[self._debuts["offsets"]:self._debuts["offsets"] + 8 * (2 * self._nb + 1)].cast("Q")
+        self._sections_index = {champ: self._ouvrir_index(self._debuts[f"index_{champ}"]) for champ in ("titre", "auteur")}
+
+    def _ouvrir_index(self, debut: int) -> Tuple[int, memoryview, memoryview, int, memoryview]:
+        """
+        Retrouve les parties d'une section d'index.
+
+        Args:
+            debut (int): Position de la section dans le fichier.
+
+        Returns:
+            Tuple: Nombre de clés, positions des clés, positions des listes, début du tas des clés, postings.
+        """
+        nb_cles = struct.unpack_from("=Q", self._mmap, debut)[0]
+        position = debut + 8
+        offsets_cles = self._vue[position:position + 8 * (nb_cles + 1)].cast("Q")
+        position += 8 * (nb_cles + 1)
+        offsets_postings = self._vue[position:position + 8 * (nb_cles + 1)].cast("Q")
+        position += 8 * (nb_cles + 1)
+        debut_tas = position
+        position += offsets_cles[nb_cles] + (-offsets_cles[nb_cles] % 8)
+        postings = self._vue[position:position + 4 * offsets_postings[nb_cles]].cast("I")
+        return nb_cles, offsets_cles, offsets_postings, debut_tas, postings
+
+    def position(self, livre_id: int) -> Optional[int]:
+        """
+        Retrouve la position d'un livre par recherche dichotomique sur les IDs.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            Optional[int]: Position du livre, ou None s'il n'est pas dans le catalogue.
+        """
+        position = bisect.bisect_left(self.ids, livre_id)
+        if position < self._nb and self.ids[position] == livre_id:
+            return position
+        return None
+
+    def livre(self, position: int) -> Livre:
+        """
+        Construit le livre situé à une position.
+
+        Args:
+            position (int): Position du livre.
+
+        Returns:
+            Livre: Un nouvel objet Livre.
+        """
+        debut_tas = self._debuts["tas"]
+        debut, milieu, fin = self._offsets[2 * position], self._offsets[2 * position + 1], self._offsets[2 * position + 2]
+        return Livre(self._mmap[debut_tas + debut:debut_tas + milieu].decode("utf-8"),
+                     self._mmap[debut_tas + milieu:debut_tas + fin].decode("utf-8"),
+                     STATUS_PAR_CODE[self._status[position]], livre_id=self.ids[position])
+
+    def texte(self, position: int, champ: str) -> str:
+        """
+        Lit le titre ou l'auteur d'un livre sans construire le livre.
+
+        Args:
+            position (int): Position du livre.
+            champ (str): "titre" ou "auteur".
+
+        Returns:
+            str: Le texte du champ.
+        """
+        i = 2 * position + (champ == "auteur")
+        debut_tas = self._debuts["tas"]
+        return self._mmap[debut_tas + self._offsets[i]:debut_tas + self._offsets[i + 1]].decode("utf-8")
+
+    def status(self, position: int) -> StatusLivre:
+        """
+        Lit le statut d'un livre tel qu'écrit dans le catalogue.
+
+        Args:
+            position (int): Position du livre.
+
+        Returns:
+            StatusLivre: Le statut.
+        """
+        return STATUS_PAR_CODE[self._status[position]]
+
+    def postings(self, champ: str, trigramme: str) -> memoryview:
+        """
+        Retourne les positions des livres dont le champ contient un trigramme, par recherche dichotomique
+        sur les clés de l'index.
+
+        Args:
+            champ (str): "titre" ou "auteur".
+            trigramme (str): Trigramme en minuscules.
+
+        Returns:
+            memoryview: Positions triées (vide si le trigramme est absent).
+        """
+        nb_cles, offsets_cles, offsets_postings, debut_tas, postings = self._sections_index[champ]
+        cle = trigramme.encode("utf-8")
+        bas, haut = 0, nb_cles
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            if self._mmap[debut_tas + offsets_cles[milieu]:debut_tas + offsets_cles[milieu + 1]] < cle:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        if bas < nb_cles and self._mmap[debut_tas + offsets_cles[bas]:debut_tas + offsets_cles[bas + 1]] == cle:
+            return postings[offsets_postings[bas]:offsets_postings[bas + 1]]
+        return postings[0:0]
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de livres du catalogue.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre de livres.
+        """
+        return self._nb
+
+    def fermer(self) -> None:
+        """
+        Ferme le catalogue.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        for champ, (_, offsets_cles, offsets_postings, _, postings) in self._sections_index.items():
+            for vue in (offsets_cles, offsets_postings, postings):
+                vue.release()
+        for vue in (self.ids, self._status, self._offsets, self._vue):
+            vue.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "CatalogueMappe":
+        """
+        Permet d'utiliser le catalogue dans un bloc with.
+
+        Args:
+            Aucun
+
+        Returns:
+            CatalogueMappe: Le catalogue lui-même.
+        """
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """
+        Ferme le catalogue à la sortie du bloc with.
+
+        Args:
+            *exc: Informations sur une éventuelle exception (ignorées).
+
+        Returns:
+            None
+        """
+        self.fermer()
+
+
+class LivresMappes(MutableMapping):
+    """
+    Dictionnaire {id: Livre} adossé à un CatalogueMappe, avec une couche modifiable en mémoire et un cache borné.
+
+    Trois niveaux servent un livre lu par son ID (livres[id], livres.get(id)) :
+    - la couche des modifications : livres ajoutés et livres du catalogue dont l'état diffère du fichier
+      (emprunté, titre ou auteur modifié, exemplaire d'une œuvre). Elle n'est jamais évincée ;
+    - un cache LRU des livres identiques au catalogue, borné à capacite_cache livres ;
+    - le catalogue lui-même, où le livre est reconstruit en cas d'échec du cache.
+    Le cache est à écriture immédiate : la Bibliotheque réécrit (livres[id] = livre) chaque livre dont le statut
+    change, qui passe ainsi dans la couche des modifications. Un livre rendu retourne dans le cache : sa version,
+    qui n'est pas écrite dans le fichier, est gardée dans une table compacte (ID -> version) et rendue au livre
+    chaque fois qu'il est reconstruit, pour les mises à jour conditionnelles.
+    Un livre évincé puis relu est un nouvel objet : il ne faut pas conserver les livres lus pour les modifier.
+    Les parcours (values, items) ne remplissent pas le cache.
+    """
+
+    def __init__(self, catalogue: CatalogueMappe, capacite_cache: int = CAPACITE_CACHE_DEFAUT) -> None:
+        """
+        Crée la vue.
+
+        Args:
+            catalogue (CatalogueMappe): Catalogue de base.
+            capacite_cache (int, optionnel): Nombre maximal de livres non modifiés gardés en mémoire
+                (0 pour aucun). Par défaut CAPACITE_CACHE_DEFAUT.
+
+        Raises:
+            ValueError: Si la capacité est négative.
+
+        Returns:
+            None
+        """
+        if capacite_cache < 0:
+            raise ValueError("La capacité du cache doit être positive ou nulle.")
+        self.catalogue = catalogue
+        self.capacite_cache = capacite_cache
+        self._modifies: Dict[int, Livre] = {}  # Livres du catalogue dont l'état diffère du fichier
+        self._ajoutes: Dict[int, Livre] = {}  # Livres absents du catalogue
+        self._supprimes: Set[int] = set()  # IDs du catalogue supprimés
+        self._versions: Dict[int, int] = {}  # Versions non nulles des livres du catalogue
+        self._cache: "OrderedDict[int, Livre]" = OrderedDict()  # Livres identiques au catalogue, du moins récent au plus récent
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __getitem__(self, livre_id: int) -> Livre:
+        """
+        Retourne un livre depuis la couche des modifications, le cache ou, à défaut, le catalogue.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Raises:
+            KeyError: Si le livre n'existe pas.
+
+        Returns:
+            Livre: Le livre.
+        """
+        livre = self._modifies.get(livre_id) or self._ajoutes.get(livre_id)
+        if livre is None:
+            livre = self._cache.get(livre_id)
+            if livre is not None:
+                self._cache.move_to_end(livre_id)
+        if livre is not None:
+            self.succes += 1
+            return livre
+        position = self.catalogue.position(livre_id) if livre_id not in self._supprimes else None
+        if position is None:
+            raise KeyError(livre_id)
+        self.echecs += 1
+        livre = self._construire(position, livre_id)
+        self._mettre_en_cache(livre)
+        return livre
+
+    def __setitem__(self, livre_id: int, livre: Livre) -> None:
+        """
+        Ajoute, remplace ou réécrit un livre : un livre du catalogue va dans la couche des modifications
+        si son état diffère du fichier, dans le cache sinon.
+
+        Args:
+            livre_id (int): ID du livre.
+            livre (Livre): Le livre.
+
+        Returns:
+            None
+        """
+        position = self.catalogue.position(livre_id)
+        if position is None:
+            self._ajoutes[livre_id] = livre
+            return
+        self._supprimes.discard(livre_id)
+        if livre.version:
+            self._versions[livre_id] = livre.version
+        else:
+            self._versions.pop(livre_id, None)
+        catalogue = self.catalogue
+        if (livre.oeuvre_id is None and livre.status == catalogue.status(position)
+                and livre.titre == catalogue.texte(position, "titre")
+                and livre.auteur == catalogue.texte(position, "auteur")):
+            self._modifies.pop(livre_id, None)
+            self._mettre_en_cache(livre)
+        else:
+            self._cache.pop(livre_id, None)
+            self._modifies[livre_id] = livre
+
+    def __delitem__(self, livre_id: int) -> None:
+        """
+        Supprime un livre (en mémoire pour un livre du catalogue).
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Raises:
+            KeyError: Si le livre n'existe pas.
+
+        Returns:
+            None
+        """
+        if livre_id in self._ajoutes:
+            del self._ajoutes[livre_id]
+        elif livre_id not in self._supprimes and self.catalogue.position(livre_id) is not None:
+            self._supprimes.add(livre_id)
+            self._versions.pop(livre_id, None)
+            self._modifies.pop(livre_id, None)
+            self._cache.pop(livre_id, None)
+        else:
+            raise KeyError(livre_id)
+
+    def __contains__(self, livre_id: object) -> bool:
+        """
+        Vérifie si un livre existe, sans le construire.
+
+        Args:
+            livre_id (object): ID du livre.
+
+        Returns:
+            bool: True si le livre existe.
+        """
+        if livre_id in self._modifies or livre_id in self._ajoutes or livre_id in self._cache:
+            return True
+        return (isinstance(livre_id, int) and livre_id not in self._supprimes
+                and self.catalogue.position(livre_id) is not None)
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Parcourt les IDs, par ID croissant pour le catalogue puis les livres ajoutés.
+
+        Args:
+            Aucun
+
+        Returns:
+            Iterator[int]: Les IDs.
+        """
+        for livre_id in self.catalogue.ids:
+            if livre_id not in self._supprimes:
+                yield livre_id
+        yield from list(self._ajoutes)
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de livres.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre de livres.
+        """
+        return len(self.catalogue) - len(self._supprimes) + len(self._ajoutes)
+
+    def values(self) -> Iterator[Livre]:
+        """
+        Parcourt les livres par ID croissant pour le catalogue, puis les livres ajoutés.
+
+        Args:
+            Aucun
+
+        Returns:
+            Iterator[Livre]: Les livres (ceux tenus en mémoire sont les objets conservés).
+        """
+        catalogue, modifies, cache = self.catalogue, self._modifies, self._cache
+        for position, livre_id in enumerate(catalogue.ids):
+            if livre_id in self._supprimes:
+                continue
+            livre = modifies.get(livre_id) or cache.get(livre_id)
+            yield livre if livre is not None else self._construire(position, livre_id)
+        yield from list(self._ajoutes.values())
+
+    def items(self) -> Iterator[Tuple[int, Livre]]:
+        """
+        Parcourt les couples (id, livre), dans l'ordre de values.
+
+        Args:
+            Aucun
+
+        Returns:
+            Iterator[Tuple[int, Livre]]: Les couples.
+        """
+        return ((livre.id, livre) for livre in self.values())
+
+    def _construire(self, position: int, livre_id: int) -> Livre:
+        """
+        Reconstruit un livre depuis le catalogue, avec sa version.
+
+        Args:
+            position (int): Position du livre dans le catalogue.
+            livre_id (int): ID du livre.
+
+        Returns:
+            Livre: Un nouvel objet Livre.
+        """
+        livre = self.catalogue.livre(position)
+        livre.version = self._versions.get(livre_id, 0)
+        return livre
+
+    def statistiques_cache(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs du cache depuis l'ouverture.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[str, float]: "succes" (lectures servies depuis la mémoire), "echecs" (livres reconstruits
+                depuis le catalogue), "taux_succes", "evictions", "taille" et "capacite" du cache,
+                et "modifies" (taille de la couche des modifications, ajouts compris).
+        """
+        lectures = self.succes + self.echecs
+        return {
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "taux_succes": self.succes / lectures if lectures else 0.0,
+            "evictions": self.evictions,
+            "taille": len(self._cache),
+            "capacite": self.capacite_cache,
+            "modifies": len(self._modifies) + len(self._ajoutes),
+        }
+
+    def _mettre_en_cache(self, livre: Livre) -> None:
+        """
+        Place un livre identique au catalogue en tête du cache, en évinçant les moins récemment lus au-delà
+        de la capacité.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            None
+        """
+        if self.capacite_cache == 0:
+            return
+        cache = self._cache
+        cache[livre.id] = livre
+        cache.move_to_end(livre.id)
+        while len(cache) > self.capacite_cache:
+            cache.popitem(last=False)
+            self.evictions += 1
+
+
+class IndexTrigrammesMappe:
+    """
+    Index de trigrammes d'un champ (titre ou auteur) adossé à un CatalogueMappe, avec la même interface
+    qu'IndexTrigrammes : les livres ajoutés sont indexés en mémoire, les livres retirés du catalogue sont écartés.
+    """
+
+    def __init__(self, catalogue: CatalogueMappe, champ: str) -> None:
+        """
+        Crée l'index.
+
+        Args:
+            catalogue (CatalogueMappe): Catalogue de base.
+            champ (str): "titre" ou "auteur".
+
+        Returns:
+            None
+        """
+        self.catalogue = catalogue
+        self.champ = champ
+        self._ajouts = DictionnaireAuteurs() if champ == "auteur" else IndexTrigrammes()
+        self._retires: Set[int] = set()
+
+    def ajouter(self, livre_id: int, texte: str) -> Optional[str]:
+        """
+        Indexe le texte d'un livre (en mémoire).
+
+        Args:
+            livre_id (int): ID du livre.
+            texte (str): Texte à indexer.
+
+        Returns:
+            Optional[str]: Pour le champ auteur, le nom canonique de l'auteur (voir DictionnaireAuteurs.ajouter).
+        """
+        return self._ajouts.ajouter(livre_id, texte)
+
+    def retirer(self, livre_id: int, texte: str) -> None:
+        """
+        Retire un livre de l'index.
+
+        Args:
+            livre_id (int): ID du livre.
+            texte (str): Texte qui avait été indexé pour ce livre.
+
+        Returns:
+            None
+        """
+        self._ajouts.retirer(livre_id, texte)
+        if self.catalogue.position(livre_id) is not None:
+            self._retires.add(livre_id)
+
+    def fusionner(self, postings: Dict[str, Iterable[int]]) -> None:
+        """
+        Ajoute des postings construits ailleurs (en mémoire).
+
+        Args:
+            postings (Dict[str, Iterable[int]]): Trigramme -> IDs des livres qui le contiennent (champ titre).
+
+        Returns:
+            None
+        """
+        self._ajouts.fusionner(postings)
+
+    def candidats(self, query: str) -> Optional[Set[int]]:
+        """
+        Retourne les IDs des livres pouvant contenir la requête. On part de la plus courte liste du catalogue
+        et on vérifie chaque position dans les autres listes par dichotomie, sans construire d'ensemble
+        pour les trigrammes fréquents. Pour le champ auteur, le résultat est exact, comme celui
+        de DictionnaireAuteurs.candidats.
+
+        Args:
+            query (str): Chaîne recherchée.
+
+        Returns:
+            Optional[Set[int]]: Les IDs candidats, ou None si la requête est trop courte pour utiliser l'index.
+        """
+        q = query.lower()
+        if len(q) < TAILLE_NGRAMME:
+            return None
+        listes = sorted((self.catalogue.postings(self.champ, t) for t in trigrammes(q)), key=len)
+        catalogue = self.catalogue
+        ids = catalogue.ids
+        exact = self.champ == "auteur"
+        resultat = set()
+        for position in listes[0]:
+            if all(_contient(liste, position) for liste in listes[1:]):
+                livre_id = ids[position]
+                if livre_id not in self._retires and (not exact or q in catalogue.texte(position, "auteur").lower()):
+                    resultat.add(livre_id)
+        resultat |= self._ajouts.candidats(q)
+        return resultat
+
+
+def _contient(liste: memoryview, valeur: int) -> bool:
+    """
+    Vérifie par dichotomie si une liste triée contient une valeur.
+
+    Args:
+        liste (memoryview): Valeurs triées.
+        valeur (int): Valeur cherchée.
+
+    Returns:
+        bool: True si la valeur est présente.
+    """
+    i = bisect.bisect_left(liste, valeur)
+    return i < len(liste) and liste[i] == valeur
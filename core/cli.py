@@ -0,0 +1,245 @@
+"""
+Outil en ligne de commande pour administrer une bibliothèque persistée dans un dépôt (voir core/depot.py).
+
+    python -m bibliotheque_project importer livres livres.csv
+    python -m bibliotheque_project rechercher --champ auteur hugo
+    python -m bibliotheque_project emprunter 12 345
+    python -m bibliotheque_project statistiques
+
+Le dépôt est le dossier --depot, ou à défaut la variable d'environnement BIBLIOTHEQUE_DEPOT, ou ./bibliotheque_donnees.
+L'outil est pensé pour être appelé des milliers de fois depuis des scripts : seuls argparse, os et sys sont importés
+au démarrage, les autres modules l'étant par la commande qui en a besoin. rechercher lit l'index du dépôt par mmap
+sans construire la bibliothèque ; les autres commandes la chargent (instantané puis journal).
+Les modifications (emprunter, rendre, ajouter-livre, creer-utilisateur) sont ajoutées au journal ;
+importer et instantane écrivent un nouvel instantané.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+DEPOT_DEFAUT = "bibliotheque_donnees"
+TYPES_DONNEES = ["livres", "utilisateurs", "emprunts"]
+
+
+def _importer(depot, args) -> None:
+    """
+    Commande importer : importe un fichier puis écrit un nouvel instantané (sans passer par le journal).
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    from bibliotheque_project.core import import_export
+
+    biblio = depot.charger(journaliser=False)
+    importer = getattr(import_export, f"importer_{args.donnees}")
+    bilan = importer(biblio, args.fichier, format=args.format)
+    depot.compacter(biblio)
+    print(f"{bilan.lignes} lignes importées en {bilan.duree_s:.2f} s")
+
+
+def _exporter(depot, args) -> None:
+    """
+    Commande exporter.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    from bibliotheque_project.core import import_export
+
+    biblio = depot.charger(journaliser=False)
+    exporter = getattr(import_export, f"exporter_{args.donnees}")
+    bilan = exporter(biblio, args.fichier, format=args.format)
+    print(f"{bilan.lignes} lignes exportées en {bilan.duree_s:.2f} s")
+
+
+def _rechercher(depot, args) -> None:
+    """
+    Commande rechercher : affiche "id<TAB>titre<TAB>auteur" pour chaque livre trouvé.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    for livre in depot.rechercher(args.query, args.champ):
+        print(f"{livre['id']}\t{livre['titre']}\t{livre['auteur']}")
+
+
+def _emprunter(depot, args) -> None:
+    """
+    Commande emprunter : affiche la date de retour prévue.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    biblio = depot.charger()
+    biblio.emprunter(args.utilisateur_id, args.livre_id)
+    print(biblio.date_retour(args.livre_id).isoformat())
+
+
+def _rendre(depot, args) -> None:
+    """
+    Commande rendre.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    depot.charger().rendre(args.utilisateur_id, args.livre_id)
+
+
+def _ajouter_livre(depot, args) -> None:
+    """
+    Commande ajouter-livre : affiche l'ID du livre créé.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    print(depot.charger().ajouter_livre(args.titre, args.auteur).id)
+
+
+def _creer_utilisateur(depot, args) -> None:
+    """
+    Commande creer-utilisateur : affiche l'ID de l'utilisateur créé.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    print(depot.charger().creer_utilisateur(args.nom, args.categorie).id)
+
+
+def _statistiques(depot, args) -> None:
+    """
+    Commande statistiques : affiche en JSON les nombres de livres et d'utilisateurs et le résumé des emprunts.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    import json
+
+    biblio = depot.charger(journaliser=False)
+    print(json.dumps({"livres": biblio.nombre_total_livres(), **biblio.resume_emprunts()}, ensure_ascii=False))
+
+
+def _instantane(depot, args) -> None:
+    """
+    Commande instantane : écrit un nouvel instantané et vide le journal.
+
+    Args:
+        depot (DepotBibliotheque): Le dépôt.
+        args (argparse.Namespace): Arguments de la commande.
+
+    Returns:
+        None
+    """
+    print(depot.compacter(depot.charger()))
+
+
+def construire_parser() -> argparse.ArgumentParser:
+    """
+    Construit l'analyseur des arguments.
+
+    Args:
+        Aucun
+
+    Returns:
+        argparse.ArgumentParser: L'analyseur, une sous-commande par opération.
+    """
+    parser = argparse.ArgumentParser(prog="bibliotheque", description="Administration d'une bibliothèque persistée")
+    parser.add_argument("--depot", default=os.environ.get("BIBLIOTHEQUE_DEPOT", DEPOT_DEFAUT),
+                        help="Dossier du dépôt (par défaut $BIBLIOTHEQUE_DEPOT ou ./bibliotheque_donnees)")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    for nom, fonction, aide in (("importer", _importer, "Importe un fichier CSV ou JSON Lines"),
+                                ("exporter", _exporter, "Exporte vers un fichier CSV ou JSON Lines")):
+        commande = commandes.add_parser(nom, help=aide)
+        commande.add_argument("donnees", choices=TYPES_DONNEES)
+        commande.add_argument("fichier")
+        commande.add_argument("--format", choices=["csv", "jsonl"], help="Par défaut, déduit de l'extension")
+        commande.set_defaults(fonction=fonction)
+
+    commande = commandes.add_parser("rechercher", help="Recherche des livres (sans charger la bibliothèque)")
+    commande.add_argument("query")
+    commande.add_argument("--champ", choices=["titre", "auteur"], help="Par défaut, titre et auteur")
+    commande.set_defaults(fonction=_rechercher)
+
+    for nom, fonction, aide in (("emprunter", _emprunter, "Emprunte un livre"),
+                                ("rendre", _rendre, "Rend un livre")):
+        commande = commandes.add_parser(nom, help=aide)
+        commande.add_argument("utilisateur_id", type=int)
+        commande.add_argument("livre_id", type=int)
+        commande.set_defaults(fonction=fonction)
+
+    commande = commandes.add_parser("ajouter-livre", help="Ajoute un livre")
+    commande.add_argument("titre")
+    commande.add_argument("auteur")
+    commande.set_defaults(fonction=_ajouter_livre)
+
+    commande = commandes.add_parser("creer-utilisateur", help="Crée un utilisateur")
+    commande.add_argument("nom")
+    commande.add_argument("--categorie", default="standard")
+    commande.set_defaults(fonction=_creer_utilisateur)
+
+    commande = commandes.add_parser("statistiques", help="Affiche les statistiques en JSON")
+    commande.set_defaults(fonction=_statistiques)
+
+    commande = commandes.add_parser("instantane", help="Écrit un nouvel instantané et vide le journal")
+    commande.set_defaults(fonction=_instantane)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée en ligne de commande.
+
+    Args:
+        argv (List[str], optionnel): Arguments de la ligne de commande. Par défaut sys.argv[1:].
+
+    Returns:
+        int: Code de sortie (1 si la commande a échoué).
+    """
+    args = construire_parser().parse_args(argv)
+    from bibliotheque_project.core.depot import DepotBibliotheque
+
+    with DepotBibliotheque(args.depot) as depot:
+        try:
+            args.fonction(depot, args)
+        except (KeyError, ValueError, OSError) as e:
+            message = e.args[0] if isinstance(e, KeyError) and e.args else e
+            print(f"Erreur : {message}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
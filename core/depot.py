@@ -0,0 +1,282 @@
+"""
+Dépôt sur disque d'une Bibliotheque : un instantané complet et un journal des modifications.
+
+Organisation du dossier :
+- etat.json : nom de l'instantané courant, numéro de génération et séquence du dernier événement qu'il contient
+- instantane-<génération>/ : catalogue.bin, catalogue des livres ouvert par mmap (voir core/catalogue_mmap.py),
+  utilisateurs.jsonl et emprunts.jsonl (voir core/import_export.py)
+- journal.jsonl : événements du flux des modifications (voir core/flux_modifications.py) postérieurs à l'instantané
+
+Charger le dépôt ouvre le catalogue (sans relire les livres), importe le reste de l'instantané puis rejoue le journal ; les modifications suivantes sont ajoutées au journal.
+compacter écrit un nouvel instantané dans un nouveau dossier, bascule etat.json par un renommage atomique
+puis vide le journal : un arrêt brutal à n'importe quel moment laisse un état cohérent (les événements
+déjà contenus dans l'instantané sont ignorés grâce à leur séquence).
+
+Les recherches (rechercher) n'instancient pas la bibliothèque : elles utilisent directement les index de trigrammes
+du catalogue, puis les complètent par les livres ajoutés, modifiés ou supprimés depuis dans le journal.
+Les réservations, quotas personnalisés et œuvres ne sont pas conservés.
+"""
+import json
+import os
+import shutil
+from typing import Dict, Iterator, List, Optional
+
+from bibliotheque_project.core import flux_modifications as flux
+from bibliotheque_project.core.catalogue_mmap import CatalogueMappe, IndexTrigrammesMappe, ecrire_catalogue
+
+FICHIER_ETAT = "etat.json"
+FICHIER_JOURNAL = "journal.jsonl"
+FICHIER_CATALOGUE = "catalogue.bin"
+CHAMPS_RECHERCHE = ["titre", "auteur"]
+
+
+class DepotBibliotheque:
+    """
+    Dossier contenant l'état persistant d'une bibliothèque.
+    """
+
+    def __init__(self, dossier: str) -> None:
+        """
+        Ouvre (ou crée) le dépôt.
+
+        Args:
+            dossier (str): Dossier du dépôt, créé s'il n'existe pas.
+
+        Returns:
+            None
+        """
+        self.dossier = dossier
+        os.makedirs(dossier, exist_ok=True)
+        self._journal = None
+
+    def etat(self) -> Dict:
+        """
+        Retourne l'état du dépôt.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict: "instantane" (nom du dossier de l'instantané courant, None si aucun), "generation" et "sequence".
+        """
+        try:
+            with open(self._chemin(FICHIER_ETAT), encoding="utf-8") as fichier:
+                return json.load(fichier)
+        except FileNotFoundError:
+            return {"instantane": None, "generation": 0, "sequence": 0}
+
+    def charger(self, journaliser: bool = True):
+        """
+        Reconstruit la bibliothèque : ouverture du catalogue, import des utilisateurs et des emprunts
+        de l'instantané puis application du journal.
+
+        Args:
+            journaliser (bool, optionnel): Ajoute ensuite au journal chaque modification de la bibliothèque.
+                Par défaut True.
+
+        Returns:
+            Bibliotheque: La bibliothèque chargée.
+        """
+        from bibliotheque_project.core import import_export
+        from bibliotheque_project.core.bibliotheque import Bibliotheque
+        biblio = Bibliotheque()
+        etat = self.etat()
+        if etat["instantane"]:
+            instantane = self._chemin(etat["instantane"])
+            biblio.ouvrir_catalogue(os.path.join(instantane, FICHIER_CATALOGUE))
+            import_export.importer_utilisateurs(biblio, os.path.join(instantane, "utilisateurs.jsonl"))
+            import_export.importer_emprunts(biblio, os.path.join(instantane, "emprunts.jsonl"))
+        replique = flux.Replique(biblio)
+        replique.derniere_sequence = etat["sequence"]
+        replique.suivre(self._evenements())
+        biblio._sequence = replique.derniere_sequence
+        if journaliser:
+            self._journal = open(self._chemin(FICHIER_JOURNAL), "a", encoding="utf-8")
+            biblio.abonner(flux.EcrivainFlux(self._journal))
+        return biblio
+
+    def compacter(self, biblio) -> str:
+        """
+        Écrit un nouvel instantané de la bibliothèque et vide le journal.
+
+        Args:
+            biblio (Bibliotheque): Bibliothèque chargée depuis ce dépôt.
+
+        Returns:
+            str: Nom du dossier du nouvel instantané.
+        """
+        from bibliotheque_project.core import import_export
+
+        etat = self.etat()
+        generation = etat["generation"] + 1
+        nom = f"instantane-{generation:06d}"
+        dossier = self._chemin(nom)
+        shutil.rmtree(dossier, ignore_errors=True)  # Reste éventuel d'une compaction interrompue
+        os.makedirs(dossier)
+        # Les statuts sont reconstruits par la restauration des emprunts
+        ecrire_catalogue(biblio.iterer_livres(), os.path.join(dossier, FICHIER_CATALOGUE), conserver_status=False)
+        import_export.exporter_utilisateurs(biblio, os.path.join(dossier, "utilisateurs.jsonl"))
+        import_export.exporter_emprunts(biblio, os.path.join(dossier, "emprunts.jsonl"))
+        self._ecrire_atomique(FICHIER_ETAT, json.dumps({"instantane": nom, "generation": generation,
+                                                        "sequence": biblio._sequence}))
+        if self._journal is not None:
+            self._journal.flush()
+            self._journal.truncate(0)
+        else:
+            open(self._chemin(FICHIER_JOURNAL), "w").close()
+        if etat["instantane"]:
+            shutil.rmtree(self._chemin(etat["instantane"]), ignore_errors=True)
+        return nom
+
+    def rechercher(self, query: str, champ: Optional[str] = None) -> List[Dict]:
+        """
+        Recherche des livres sans charger la bibliothèque : même résultat que rechercher_par_titre,
+        rechercher_par_auteur (champ "titre" ou "auteur") ou rechercher_par_mot_clef (champ None).
+
+        Args:
+            query (str): Chaîne recherchée (insensible à la casse).
+            champ (str, optionnel): "titre", "auteur" ou None pour les deux.
+
+        Raises:
+            ValueError: Si le champ est inconnu.
+
+        Returns:
+            List[Dict]: Livres trouvés ("id", "titre", "auteur"), par ID croissant.
+        """
+        if champ is not None and champ not in CHAMPS_RECHERCHE:
+            raise ValueError(f"Champ de recherche inconnu : {champ!r}.")
+        noms = [champ] if champ else list(CHAMPS_RECHERCHE)
+        q = query.lower()
+
+        ajoutes: Dict[int, Dict] = {}
+        remplaces = set()  # Livres du catalogue supprimés ou modifiés depuis l'instantané
+        for evenement in self._evenements(self.etat()["sequence"]):
+            if evenement["type"] in (flux.LIVRE_AJOUTE, flux.LIVRE_MODIFIE):
+                ajoutes[evenement["livre_id"]] = {"id": evenement["livre_id"], "titre": evenement["titre"],
+                                                  "auteur": evenement["auteur"]}
+                remplaces.add(evenement["livre_id"])
+            elif evenement["type"] == flux.LIVRE_SUPPRIME:
+                ajoutes.pop(evenement["livre_id"], None)
+                remplaces.add(evenement["livre_id"])
+
+        resultats = [livre for livre in self._rechercher_catalogue(q, noms) if livre["id"] not in remplaces]
+        resultats.extend(livre for livre in ajoutes.values() if any(q in livre[nom].lower() for nom in noms))
+        resultats.sort(key=lambda livre: livre["id"])
+        return resultats
+
+    def fermer(self) -> None:
+        """
+        Ferme le journal ouvert par charger.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _rechercher_catalogue(self, q: str, noms: List[str]) -> Iterator[Dict]:
+        """
+        Recherche dans le catalogue de l'instantané : seuls les candidats des index de trigrammes sont vérifiés
+        (tout le catalogue pour une requête de moins de 3 caractères).
+
+        Args:
+            q (str): Requête en minuscules.
+            noms (List[str]): Champs à examiner.
+
+        Returns:
+            Iterator[Dict]: Livres trouvés ("id", "titre", "auteur"), par ID croissant.
+        """
+        instantane = self.etat()["instantane"]
+        if not instantane:
+            return
+        with CatalogueMappe(os.path.join(self._chemin(instantane), FICHIER_CATALOGUE)) as catalogue:
+            candidats = set()
+            for nom in noms:
+                ids = IndexTrigrammesMappe(catalogue, nom).candidats(q)
+                if ids is None:
+                    candidats = None
+                    break
+                candidats |= ids
+            positions = (range(len(catalogue)) if candidats is None
+                         else [catalogue.position(livre_id) for livre_id in sorted(candidats)])
+            for position in positions:
+                livre = catalogue.livre(position)
+                if any(q in getattr(livre, nom).lower() for nom in noms):
+                    yield {"id": livre.id, "titre": livre.titre, "auteur": livre.auteur}
+
+    def _evenements(self, apres: int = 0) -> Iterator[Dict]:
+        """
+        Lit les événements du journal.
+
+        Args:
+            apres (int, optionnel): Ignore les événements de séquence inférieure ou égale. Par défaut 0.
+
+        Returns:
+            Iterator[Dict]: Les événements, dans l'ordre.
+        """
+        try:
+            with open(self._chemin(FICHIER_JOURNAL), encoding="utf-8") as fichier:
+                for evenement in flux.lire_flux(fichier):
+                    if evenement["seq"] > apres:
+                        yield evenement
+        except FileNotFoundError:
+            return
+
+    def _ecrire_atomique(self, nom: str, contenu: str) -> None:
+        """
+        Écrit un fichier du dépôt par renommage atomique d'un fichier temporaire.
+
+        Args:
+            nom (str): Nom du fichier dans le dépôt.
+            contenu (str): Contenu à écrire.
+
+        Returns:
+            None
+        """
+        temporaire = self._chemin(nom + ".tmp")
+        with open(temporaire, "w", encoding="utf-8") as fichier:
+            fichier.write(contenu)
+            fichier.flush()
+            os.fsync(fichier.fileno())
+        os.replace(temporaire, self._chemin(nom))
+
+    def _chemin(self, nom: str) -> str:
+        """
+        Retourne le chemin d'un fichier du dépôt.
+
+        Args:
+            nom (str): Nom du fichier.
+
+        Returns:
+            str: Chemin complet.
+        """
+        return os.path.join(self.dossier, nom)
+
+    def __enter__(self) -> "DepotBibliotheque":
+        """
+        Permet d'utiliser le dépôt dans un bloc with.
+
+        Args:
+            Aucun
+
+        Returns:
+            DepotBibliotheque: Le dépôt lui-même.
+        """
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """
+        Ferme le journal à la sortie du bloc with.
+
+        Args:
+            *exc: Informations sur une éventuelle exception (ignorées).
+
+        Returns:
+            None
+        """
+        self.fermer()
+
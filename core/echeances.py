@@ -0,0 +1,154 @@
+import heapq
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class Echeance(NamedTuple):
+    """
+    Représente la date de retour prévue d'un emprunt en cours.
+    """
+    date_retour: datetime
+    livre_id: int
+    utilisateur_id: int
+
+
+class EcheancierEmprunts:
+    """
+    Ordonnanceur des dates de retour basé sur un tas-min.
+
+    Chaque livre ne pouvant être emprunté qu'une fois à la fois, les emprunts actifs sont indexés par livre_id.
+    Les retours sont gérés par suppression paresseuse : l'entrée reste dans le tas mais est ignorée
+    (puis jetée) lorsqu'elle remonte au sommet, ce qui garde chaque opération en O(log n).
+    Chaque emprunt reçoit un numéro croissant, porté par son entrée du tas : une entrée n'est active que si
+    son numéro est celui de l'emprunt en cours du livre, même si le livre a été rendu puis réemprunté
+    par le même utilisateur avec la même date de retour.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise un échéancier vide.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._tas: List[Tuple[datetime, int, int, int]] = []  # (date_retour, livre_id, numéro, utilisateur_id)
+        self._actifs: Dict[int, Tuple[datetime, int, int]] = {}  # livre_id -> (date_retour, utilisateur_id, numéro)
+        self._numero = 0
+
+    def ajouter(self, livre_id: int, utilisateur_id: int, date_retour: datetime) -> None:
+        """
+        Enregistre (ou remplace) l'échéance de l'emprunt d'un livre.
+
+        Args:
+            livre_id (int): ID du livre emprunté.
+            utilisateur_id (int): ID de l'emprunteur.
+            date_retour (datetime): Date de retour prévue.
+
+        Returns:
+            None
+        """
+        self._numero += 1
+        self._actifs[livre_id] = (date_retour, utilisateur_id, self._numero)
+        heapq.heappush(self._tas, (date_retour, livre_id, self._numero, utilisateur_id))
+
+    def retirer(self, livre_id: int) -> None:
+        """
+        Retire l'échéance d'un livre rendu. Ne fait rien si le livre n'a pas d'échéance.
+
+        Args:
+            livre_id (int): ID du livre rendu.
+
+        Returns:
+            None
+        """
+        if self._actifs.pop(livre_id, None) is None:
+            return
+        # On compacte le tas lorsque les entrées périmées deviennent majoritaires
+        if len(self._tas) > 2 * len(self._actifs) + 64:
+            self._tas = [entree for entree in self._tas if self._est_active(entree)]
+            heapq.heapify(self._tas)
+
+    def date_retour(self, livre_id: int) -> Optional[datetime]:
+        """
+        Retourne la date de retour prévue d'un livre emprunté.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            Optional[datetime]: La date de retour prévue, None si le livre n'a pas d'échéance.
+        """
+        actif = self._actifs.get(livre_id)
+        return actif[0] if actif is not None else None
+
+    def prochaines(self, n: int) -> List[Echeance]:
+        """
+        Retourne les n prochaines échéances, de la plus proche à la plus lointaine.
+
+        Args:
+            n (int): Nombre d'échéances souhaitées.
+
+        Returns:
+            List[Echeance]: Les n échéances les plus proches.
+        """
+        return self._extraire(lambda entree, nb: nb < n)
+
+    def en_retard(self, maintenant: datetime) -> List[Echeance]:
+        """
+        Retourne les emprunts dont la date de retour est dépassée, du plus ancien au plus récent.
+
+        Args:
+            maintenant (datetime): Date de référence.
+
+        Returns:
+            List[Echeance]: Les emprunts en retard à la date donnée.
+        """
+        return self._extraire(lambda entree, nb: entree[0] < maintenant)
+
+    def _extraire(self, continuer) -> List[Echeance]:
+        """
+        Dépile les entrées actives tant que continuer(entree, nb_deja_extraites) est vrai puis les rempile.
+        Les entrées périmées rencontrées sont définitivement jetées.
+
+        Args:
+            continuer (Callable): Prédicat d'arrêt de l'extraction.
+
+        Returns:
+            List[Echeance]: Les échéances extraites dans l'ordre chronologique.
+        """
+        extraites: List[Tuple[datetime, int, int, int]] = []
+        while self._tas and continuer(self._tas[0], len(extraites)):
+            entree = heapq.heappop(self._tas)
+            if self._est_active(entree):
+                extraites.append(entree)
+        for entree in extraites:
+            heapq.heappush(self._tas, entree)
+        return [Echeance(date_retour, livre_id, utilisateur_id) for date_retour, livre_id, _, utilisateur_id in extraites]
+
+    def _est_active(self, entree: Tuple[datetime, int, int, int]) -> bool:
+        """
+        Vérifie qu'une entrée du tas correspond toujours à l'emprunt en cours de son livre (même numéro d'emprunt).
+
+        Args:
+            entree (Tuple[datetime, int, int, int]): Entrée (date_retour, livre_id, numéro, utilisateur_id).
+
+        Returns:
+            bool: True si l'entrée est toujours valide.
+        """
+        actif = self._actifs.get(entree[1])
+        return actif is not None and actif[2] == entree[2]
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre d'emprunts suivis.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'échéances actives.
+        """
+        return len(self._actifs)
@@ -0,0 +1,258 @@
+"""
+Flux des modifications de la Bibliotheque (change data capture) et répliques en lecture seule.
+
+La bibliothèque principale publie un événement (dictionnaire sérialisable en JSON) après chaque modification :
+livre ajouté, modifié ou supprimé, statut modifié, utilisateur créé ou supprimé, emprunt, retour. Chaque événement porte
+un numéro de séquence croissant. EcrivainFlux les écrit en JSON Lines dans un fichier, un tube ou une socket
+locale ; une Replique les applique à sa propre bibliothèque (avec ses propres index de recherche) pour servir
+les lectures depuis un autre processus.
+"""
+import json
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO
+
+from bibliotheque_project.models.livre import Livre, StatusLivre
+from bibliotheque_project.models.utilisateur import Utilisateur
+
+LIVRE_AJOUTE = "livre_ajoute"
+LIVRE_SUPPRIME = "livre_supprime"
+LIVRE_MODIFIE = "livre_modifie"
+STATUT_MODIFIE = "statut_modifie"
+UTILISATEUR_CREE = "utilisateur_cree"
+UTILISATEUR_SUPPRIME = "utilisateur_supprime"
+EMPRUNT = "emprunt"
+RETOUR = "retour"
+FIN_ETAT_INITIAL = "fin_etat_initial"  # Clôt les événements (séquence 0) décrivant l'état existant
+
+METHODES_LECTURE = [
+    "rechercher_par_titre", "rechercher_par_auteur", "rechercher_par_mot_clef", "rechercher_par_requete",
+    "lister_tous_les_livres", "lister_livres_disponibles", "page_livres", "lister_utilisateurs",
+    "nombre_total_livres", "nombre_total_utilisateurs",
+    "distribution_emprunts_par_utilisateur", "histogramme_emprunts", "resume_emprunts", "top_emprunteurs",
+    "date_retour", "emprunts_en_retard", "prochaines_echeances", "instantane",
+]
+
+
+class EcrivainFlux:
+    """
+    Abonné qui écrit chaque événement sur une ligne JSON (fichier texte, tube, socket.makefile("w")...).
+    """
+
+    def __init__(self, sortie: TextIO, vider: bool = True) -> None:
+        """
+        Crée l'écrivain.
+
+        Args:
+            sortie (TextIO): Flux texte de destination.
+            vider (bool, optionnel): Vide le tampon après chaque événement, pour que les répliques
+                le reçoivent aussitôt. Par défaut True.
+
+        Returns:
+            None
+        """
+        self.sortie = sortie
+        self.vider = vider
+
+    def __call__(self, evenement: Dict) -> None:
+        """
+        Écrit un événement.
+
+        Args:
+            evenement (Dict): L'événement publié par la bibliothèque.
+
+        Returns:
+            None
+        """
+        self.sortie.write(json.dumps(evenement, ensure_ascii=False) + "\n")
+        if self.vider:
+            self.sortie.flush()
+
+
+def lire_flux(entree: TextIO) -> Iterator[Dict]:
+    """
+    Lit des événements écrits par EcrivainFlux, jusqu'à la fin du flux.
+
+    Args:
+        entree (TextIO): Flux texte à lire.
+
+    Returns:
+        Iterator[Dict]: Les événements, dans l'ordre.
+    """
+    for ligne in entree:
+        if ligne.strip():
+            yield json.loads(ligne)
+
+
+class Replique:
+    """
+    Copie en lecture seule d'une bibliothèque, tenue à jour en appliquant son flux de modifications.
+    Seules les méthodes de lecture (METHODES_LECTURE) sont exposées.
+    """
+
+    def __init__(self, biblio=None) -> None:
+        """
+        Crée une réplique vide.
+
+        Args:
+            biblio (Bibliotheque, optionnel): Bibliothèque interne à alimenter. Par défaut, une nouvelle bibliothèque.
+
+        Returns:
+            None
+        """
+        if biblio is None:
+            from bibliotheque_project.core.bibliotheque import Bibliotheque
+            biblio = Bibliotheque()
+        self._biblio = biblio
+        self.derniere_sequence: int = 0
+        self._appliquer_par_type: Dict[str, Callable[[Dict], None]] = {
+            LIVRE_AJOUTE: self._livre_ajoute,
+            LIVRE_SUPPRIME: lambda e: self._biblio.supprimer_livre(e["livre_id"]),
+            LIVRE_MODIFIE: lambda e: self._biblio.modifier_livre(e["livre_id"], e["titre"], e["auteur"]),
+            STATUT_MODIFIE: lambda e: self._biblio.modifier_status(e["livre_id"], StatusLivre(e["status"])),
+            UTILISATEUR_CREE: self._utilisateur_cree,
+            UTILISATEUR_SUPPRIME: lambda e: self._biblio.supprimer_utilisateur(e["utilisateur_id"]),
+            EMPRUNT: self._emprunt,
+            RETOUR: lambda e: self._biblio.rendre(e["utilisateur_id"], e["livre_id"]),
+        }
+
+    def appliquer(self, evenement: Dict) -> bool:
+        """
+        Applique un événement. Les événements déjà appliqués (séquence connue) sont ignorés,
+        ce qui permet de rejouer un flux sans risque.
+
+        Args:
+            evenement (Dict): L'événement à appliquer.
+
+        Raises:
+            ValueError: Si des événements manquent (trou dans les séquences) ou si le type est inconnu.
+
+        Returns:
+            bool: True si l'événement a été appliqué, False s'il était déjà connu.
+        """
+        sequence = evenement["seq"]
+        if evenement["type"] == FIN_ETAT_INITIAL:
+            self.derniere_sequence = sequence
+            return True
+        if sequence != 0:  # La séquence 0 est réservée aux événements décrivant l'état initial
+            if sequence <= self.derniere_sequence:
+                return False
+            if sequence > self.derniere_sequence + 1:
+                raise ValueError(f"Événements manquants entre {self.derniere_sequence} et {sequence}.")
+        appliquer = self._appliquer_par_type.get(evenement["type"])
+        if appliquer is None:
+            raise ValueError(f"Type d'événement inconnu : {evenement['type']!r}.")
+        appliquer(evenement)
+        if sequence != 0:
+            self.derniere_sequence = sequence
+        return True
+
+    def suivre(self, entree: Iterable[Dict]) -> int:
+        """
+        Applique tous les événements d'un flux (par exemple lire_flux(socket.makefile())) jusqu'à sa fin.
+
+        Args:
+            entree (Iterable[Dict]): Événements à appliquer.
+
+        Returns:
+            int: Nombre d'événements appliqués.
+        """
+        return sum(1 for evenement in entree if self.appliquer(evenement))
+
+    def __getattr__(self, nom: str):
+        """
+        Donne accès aux méthodes de lecture de la bibliothèque interne.
+
+        Args:
+            nom (str): Nom de la méthode.
+
+        Raises:
+            AttributeError: Si la méthode n'est pas une méthode de lecture.
+
+        Returns:
+            Callable: La méthode de lecture.
+        """
+        if nom in METHODES_LECTURE:
+            return getattr(self._biblio, nom)
+        raise AttributeError(f"La réplique est en lecture seule : {nom!r} n'est pas disponible.")
+
+    def _livre_ajoute(self, evenement: Dict) -> None:
+        """
+        Applique l'ajout d'un livre.
+
+        Args:
+            evenement (Dict): Événement livre_ajoute.
+
+        Returns:
+            None
+        """
+        livre = Livre(evenement["titre"], evenement["auteur"], livre_id=evenement["livre_id"])
+        self._biblio.ajouter_livres([livre])
+
+    def _utilisateur_cree(self, evenement: Dict) -> None:
+        """
+        Applique la création d'un utilisateur.
+
+        Args:
+            evenement (Dict): Événement utilisateur_cree.
+
+        Returns:
+            None
+        """
+        utilisateur = Utilisateur(evenement["nom"], evenement["categorie"], utilisateur_id=evenement["utilisateur_id"])
+        self._biblio.ajouter_utilisateurs([utilisateur])
+
+    def _emprunt(self, evenement: Dict) -> None:
+        """
+        Applique un emprunt (sans quotas : la bibliothèque principale les a déjà vérifiés).
+
+        Args:
+            evenement (Dict): Événement emprunt.
+
+        Returns:
+            None
+        """
+        date_retour = evenement.get("date_retour")
+        self._biblio.restaurer_emprunts([(evenement["utilisateur_id"], evenement["livre_id"],
+                                          datetime.fromisoformat(date_retour) if date_retour else None)])
+
+
+def evenement_livre_ajoute(livre: Livre) -> Dict:
+    """
+    Construit les données d'un événement livre_ajoute.
+
+    Args:
+        livre (Livre): Le livre ajouté.
+
+    Returns:
+        Dict: Données de l'événement (sans type ni séquence).
+    """
+    return {"livre_id": livre.id, "titre": livre.titre, "auteur": livre.auteur}
+
+
+def evenement_utilisateur_cree(utilisateur: Utilisateur) -> Dict:
+    """
+    Construit les données d'un événement utilisateur_cree.
+
+    Args:
+        utilisateur (Utilisateur): L'utilisateur créé.
+
+    Returns:
+        Dict: Données de l'événement (sans type ni séquence).
+    """
+    return {"utilisateur_id": utilisateur.id, "nom": utilisateur.nom, "categorie": utilisateur.categorie}
+
+
+def evenement_emprunt(utilisateur_id: int, livre_id: int, date_retour: Optional[datetime]) -> Dict:
+    """
+    Construit les données d'un événement emprunt.
+
+    Args:
+        utilisateur_id (int): ID de l'emprunteur.
+        livre_id (int): ID du livre.
+        date_retour (datetime, optionnel): Date de retour prévue.
+
+    Returns:
+        Dict: Données de l'événement (sans type ni séquence).
+    """
+    return {"utilisateur_id": utilisateur_id, "livre_id": livre_id,
+            "date_retour": date_retour.isoformat() if date_retour else None}
@@ -0,0 +1,344 @@
+"""
+Générateur de charge synthétique pour la Bibliotheque.
+
+Les opérations (emprunts, retours, recherches) sont produites à la volée, de façon reproductible (seed),
+avec une popularité des livres suivant une loi de Zipf : quelques titres concentrent la majorité des demandes.
+Rien n'est matérialisé en fonction du nombre de livres ou d'utilisateurs, ce qui permet de simuler
+des millions de livres et d'utilisateurs.
+"""
+import math
+import random
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+PROPORTIONS_DEFAUT = {"emprunter": 0.45, "rendre": 0.35, "rechercher": 0.20}
+
+
+class Operation(NamedTuple):
+    """
+    Représente une opération à exécuter sur la bibliothèque.
+    """
+    type: str
+    utilisateur_id: Optional[int] = None
+    livre_id: Optional[int] = None
+    requete: Optional[str] = None
+
+
+class LoiZipf:
+    """
+    Tirage de rangs 1..n selon une loi de Zipf (P(k) proportionnelle à 1 / k**s) en O(1) mémoire et en temps
+    constant par tirage, par la méthode de rejet-inversion de Hörmann et Derflinger.
+    """
+
+    def __init__(self, n: int, s: float, rnd: random.Random) -> None:
+        """
+        Prépare le tirage.
+
+        Args:
+            n (int): Nombre de rangs possibles.
+            s (float): Exposant de la loi (strictement positif).
+            rnd (random.Random): Générateur aléatoire utilisé.
+
+        Raises:
+            ValueError: Si n < 1 ou s <= 0.
+
+        Returns:
+            None
+        """
+        if n < 1 or s <= 0:
+            raise ValueError("La loi de Zipf nécessite n >= 1 et s > 0.")
+        self.n = n
+        self.s = s
+        self._rnd = rnd
+        self._h_integrale_x1 = self._h_integrale(1.5) - 1.0
+        self._h_integrale_n = self._h_integrale(n + 0.5)
+        self._seuil = 2.0 - self._h_integrale_inverse(self._h_integrale(2.5) - self._h(2.0))
+
+    def tirer(self) -> int:
+        """
+        Tire un rang.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Rang entre 1 (le plus fréquent) et n.
+        """
+        while True:
+            u = self._h_integrale_n + self._rnd.random() * (self._h_integrale_x1 - self._h_integrale_n)
+            x = self._h_integrale_inverse(u)
+            k = min(max(int(x + 0.5), 1), self.n)
+            if k - x <= self._seuil or u >= self._h_integrale(k + 0.5) - self._h(k):
+                return k
+
+    def _h(self, x: float) -> float:
+        """
+        Densité non normalisée h(x) = x**(-s).
+
+        Args:
+            x (float): Point d'évaluation.
+
+        Returns:
+            float: Valeur de h(x).
+        """
+        return math.exp(-self.s * math.log(x))
+
+    def _h_integrale(self, x: float) -> float:
+        """
+        Primitive H de h, utilisée pour l'inversion.
+
+        Args:
+            x (float): Point d'évaluation.
+
+        Returns:
+            float: Valeur de H(x).
+        """
+        log_x = math.log(x)
+        return _expm1_sur_x((1.0 - self.s) * log_x) * log_x
+
+    def _h_integrale_inverse(self, x: float) -> float:
+        """
+        Réciproque de la primitive H.
+
+        Args:
+            x (float): Valeur de H.
+
+        Returns:
+            float: Le point y tel que H(y) = x.
+        """
+        t = max(x * (1.0 - self.s), -1.0)
+        return math.exp(_log1p_sur_x(t) * x)
+
+
+def _log1p_sur_x(x: float) -> float:
+    """
+    Calcule log(1 + x) / x, prolongé par continuité en 0.
+
+    Args:
+        x (float): Point d'évaluation.
+
+    Returns:
+        float: Valeur de log(1 + x) / x.
+    """
+    if abs(x) > 1e-8:
+        return math.log1p(x) / x
+    return 1.0 - x * (0.5 - x * (1.0 / 3.0 - 0.25 * x))
+
+
+def _expm1_sur_x(x: float) -> float:
+    """
+    Calcule (exp(x) - 1) / x, prolongé par continuité en 0.
+
+    Args:
+        x (float): Point d'évaluation.
+
+    Returns:
+        float: Valeur de (exp(x) - 1) / x.
+    """
+    if abs(x) > 1e-8:
+        return math.expm1(x) / x
+    return 1.0 + x * 0.5 * (1.0 + x / 3.0 * (1.0 + 0.25 * x))
+
+
+class GenerateurCharge:
+    """
+    Produit un flux reproductible d'opérations (emprunter, rendre, rechercher) sur des livres et utilisateurs donnés.
+
+    Les livres demandés suivent une loi de Zipf ; le rang de popularité est associé à un livre par une permutation
+    affine (rang * a + b) mod n, sans table. Le générateur retient les emprunts qu'il a lui-même émis
+    pour produire des retours valides.
+    """
+
+    def __init__(self, ids_livres: Sequence[int], ids_utilisateurs: Sequence[int], seed: int = 42,
+                 exposant: float = 1.1, proportions: Optional[Dict[str, float]] = None,
+                 requetes: Optional[Sequence[str]] = None) -> None:
+        """
+        Prépare le générateur.
+
+        Args:
+            ids_livres (Sequence[int]): IDs des livres (un range évite de matérialiser la liste).
+            ids_utilisateurs (Sequence[int]): IDs des utilisateurs.
+            seed (int, optionnel): Seed pour reproductibilité. Par défaut 42.
+            exposant (float, optionnel): Exposant de la loi de Zipf. Par défaut 1.1.
+            proportions (Dict[str, float], optionnel): Poids de chaque type d'opération. Par défaut PROPORTIONS_DEFAUT.
+            requetes (Sequence[str], optionnel): Requêtes de recherche, tirées elles aussi selon Zipf.
+                Par défaut des fragments de titres "exemple <numéro>".
+
+        Raises:
+            ValueError: Si aucun livre ou aucun utilisateur n'est fourni.
+
+        Returns:
+            None
+        """
+        if not ids_livres or not ids_utilisateurs:
+            raise ValueError("Le générateur nécessite au moins un livre et un utilisateur.")
+        self._rnd = random.Random(seed)
+        self._ids_livres = ids_livres
+        self._ids_utilisateurs = ids_utilisateurs
+        self._zipf_livres = LoiZipf(len(ids_livres), exposant, self._rnd)
+        self._requetes = requetes if requetes is not None else [f"exemple {i}" for i in range(1, 1001)]
+        self._zipf_requetes = LoiZipf(len(self._requetes), exposant, self._rnd)
+        proportions = proportions or PROPORTIONS_DEFAUT
+        self._types: List[str] = list(proportions)
+        self._poids_cumules: List[float] = []
+        total = 0.0
+        for type_operation in self._types:
+            total += proportions[type_operation]
+            self._poids_cumules.append(total)
+        n = len(ids_livres)
+        self._multiplicateur = self._premier_avec(n, int(n * 0.618) + 1)
+        self._decalage = self._rnd.randrange(n)
+        self._emprunts: Dict[int, int] = {}  # livre_id -> utilisateur_id
+        self._livres_empruntes: List[int] = []  # Permet de tirer un emprunt en cours en O(1)
+        self._positions: Dict[int, int] = {}  # livre_id -> position dans _livres_empruntes
+
+    def operations(self, nombre: Optional[int] = None) -> Iterator[Operation]:
+        """
+        Produit des opérations à la volée.
+
+        Args:
+            nombre (int, optionnel): Nombre d'opérations à produire. Par défaut, flux infini.
+
+        Returns:
+            Iterator[Operation]: Les opérations générées.
+        """
+        produites = 0
+        while nombre is None or produites < nombre:
+            yield self.suivante()
+            produites += 1
+
+    def suivante(self) -> Operation:
+        """
+        Produit l'opération suivante.
+
+        Args:
+            Aucun
+
+        Returns:
+            Operation: L'opération générée.
+        """
+        type_operation = self._rnd.choices(self._types, cum_weights=self._poids_cumules)[0]
+        if type_operation == "rendre" and self._livres_empruntes:
+            livre_id = self._livres_empruntes[self._rnd.randrange(len(self._livres_empruntes))]
+            return Operation("rendre", self._oublier_emprunt(livre_id), livre_id)
+        if type_operation == "rechercher":
+            return Operation("rechercher", requete=self._requetes[self._zipf_requetes.tirer() - 1])
+
+        # Emprunt (y compris lorsqu'aucun retour n'est possible)
+        livre_id = self._livre_populaire()
+        utilisateur_id = self._ids_utilisateurs[self._rnd.randrange(len(self._ids_utilisateurs))]
+        if livre_id not in self._emprunts:
+            self._emprunts[livre_id] = utilisateur_id
+            self._positions[livre_id] = len(self._livres_empruntes)
+            self._livres_empruntes.append(livre_id)
+        return Operation("emprunter", utilisateur_id, livre_id)
+
+    def signaler_echec(self, operation: Operation) -> None:
+        """
+        Indique qu'une opération a échoué : un emprunt refusé n'est plus considéré comme en cours,
+        ce qui évite de générer ensuite un retour invalide.
+
+        Args:
+            operation (Operation): L'opération qui a échoué.
+
+        Returns:
+            None
+        """
+        if operation.type == "emprunter" and self._emprunts.get(operation.livre_id) == operation.utilisateur_id:
+            self._oublier_emprunt(operation.livre_id)
+
+    def _oublier_emprunt(self, livre_id: int) -> int:
+        """
+        Retire un emprunt en cours en O(1) (échange avec le dernier élément de la liste).
+
+        Args:
+            livre_id (int): ID du livre emprunté.
+
+        Returns:
+            int: ID de l'emprunteur.
+        """
+        position = self._positions.pop(livre_id)
+        dernier = self._livres_empruntes.pop()
+        if dernier != livre_id:
+            self._livres_empruntes[position] = dernier
+            self._positions[dernier] = position
+        return self._emprunts.pop(livre_id)
+
+    def _livre_populaire(self) -> int:
+        """
+        Tire un livre selon sa popularité.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: ID du livre tiré.
+        """
+        rang = self._zipf_livres.tirer() - 1
+        n = len(self._ids_livres)
+        return self._ids_livres[(rang * self._multiplicateur + self._decalage) % n]
+
+    @staticmethod
+    def _premier_avec(n: int, candidat: int) -> int:
+        """
+        Retourne le premier entier >= candidat premier avec n (pour que la permutation affine soit bijective).
+
+        Args:
+            n (int): Modulo de la permutation.
+            candidat (int): Valeur de départ.
+
+        Returns:
+            int: Un multiplicateur premier avec n.
+        """
+        while math.gcd(candidat, n) != 1:
+            candidat += 1
+        return candidat
+
+
+def executer(biblio, operations, debit_cible: Optional[float] = None,
+             sur_echec: Optional[Callable[[Operation], None]] = None) -> Dict:
+    """
+    Exécute un flux d'opérations sur une bibliothèque via ses méthodes publiques
+    (emprunter, rendre, rechercher_par_mot_clef), éventuellement à débit constant.
+
+    Args:
+        biblio: Toute implémentation exposant emprunter, rendre et rechercher_par_mot_clef.
+        operations (Iterable[Operation]): Opérations à exécuter.
+        debit_cible (float, optionnel): Nombre d'opérations par seconde visé. Par défaut, au plus vite.
+        sur_echec (Callable[[Operation], None], optionnel): Appelée pour chaque opération refusée
+            (par exemple GenerateurCharge.signaler_echec).
+
+    Returns:
+        Dict: Rapport avec le nombre d'opérations et d'erreurs par type, la durée et le débit obtenu.
+    """
+    actions = {
+        "emprunter": lambda op: biblio.emprunter(op.utilisateur_id, op.livre_id),
+        "rendre": lambda op: biblio.rendre(op.utilisateur_id, op.livre_id),
+        "rechercher": lambda op: biblio.rechercher_par_mot_clef(op.requete),
+    }
+    compteurs: Dict[str, int] = {}
+    erreurs: Dict[str, int] = {}
+    debut = time.perf_counter()
+    total = 0
+    for operation in operations:
+        if debit_cible:
+            # On attend l'instant prévu pour cette opération ; en retard, on enchaîne sans attendre
+            attente = debut + total / debit_cible - time.perf_counter()
+            if attente > 0:
+                time.sleep(attente)
+        try:
+            actions[operation.type](operation)
+        except (KeyError, ValueError):
+            erreurs[operation.type] = erreurs.get(operation.type, 0) + 1
+            if sur_echec is not None:
+                sur_echec(operation)
+        compteurs[operation.type] = compteurs.get(operation.type, 0) + 1
+        total += 1
+    duree = time.perf_counter() - debut
+    return {
+        "operations": compteurs,
+        "erreurs": erreurs,
+        "total": total,
+        "duree_s": duree,
+        "debit_ops_par_s": total / duree if duree > 0 else 0.0,
+    }
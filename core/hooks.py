@@ -0,0 +1,315 @@
+"""
+Points d'accroche (hooks) autour des méthodes publiques de la Bibliotheque.
+
+Un hook reçoit un objet Appel avant (avant) et après (apres) chaque appel des méthodes qu'il observe,
+avec la durée, le résultat ou l'exception. Les enveloppes sont posées sur l'instance uniquement,
+et seulement pour les méthodes qui ont au moins un hook : les autres ne coûtent rien de plus.
+
+Ce module fournit aussi JournalOperationsLentes, qui journalise les appels dépassant un seuil de durée
+et peut capturer par échantillonnage un profil cProfile des appels les plus lents.
+"""
+import cProfile
+import functools
+import heapq
+import io
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("bibliotheque_project.operations_lentes")
+
+
+class Appel:
+    """
+    Décrit un appel de méthode observé par les hooks.
+    """
+
+    def __init__(self, methode: str, args: tuple, kwargs: dict) -> None:
+        """
+        Crée la description d'un appel avant son exécution.
+
+        Args:
+            methode (str): Nom de la méthode appelée.
+            args (tuple): Arguments positionnels.
+            kwargs (dict): Arguments nommés.
+
+        Returns:
+            None
+        """
+        self.methode: str = methode
+        self.args: tuple = args
+        self.kwargs: dict = kwargs
+        self.duree_ns: int = 0
+        self.resultat: Any = None
+        self.erreur: Optional[BaseException] = None
+        self.contexte: Dict[Any, Any] = {}  # Données propres à chaque hook entre avant et apres
+
+    @property
+    def duree(self) -> float:
+        """
+        Durée de l'appel en secondes.
+
+        Args:
+            Aucun
+
+        Returns:
+            float: Durée de l'appel en secondes.
+        """
+        return self.duree_ns / 1e9
+
+
+class Hook:
+    """
+    Classe de base des hooks : les deux méthodes ne font rien et sont à redéfinir selon le besoin.
+    """
+
+    def avant(self, appel: Appel) -> None:
+        """
+        Appelée avant l'exécution de la méthode.
+
+        Args:
+            appel (Appel): L'appel sur le point d'être exécuté.
+
+        Returns:
+            None
+        """
+
+    def apres(self, appel: Appel) -> None:
+        """
+        Appelée après l'exécution de la méthode, y compris si elle a levé une exception.
+
+        Args:
+            appel (Appel): L'appel exécuté, avec sa durée et son résultat ou son erreur.
+
+        Returns:
+            None
+        """
+
+
+class GestionnaireHooks:
+    """
+    Pose et retire les enveloppes des méthodes d'un objet en fonction des hooks enregistrés.
+    """
+
+    def __init__(self, objet, methodes_exclues: Iterable[str] = ()) -> None:
+        """
+        Prépare la gestion des hooks d'un objet.
+
+        Args:
+            objet: Instance dont les méthodes seront observées.
+            methodes_exclues (Iterable[str], optionnel): Méthodes publiques à ne jamais observer.
+
+        Returns:
+            None
+        """
+        self._objet = objet
+        self._hooks: Dict[str, List[Hook]] = {}
+        exclues = set(methodes_exclues)
+        self.methodes_publiques: List[str] = [
+            nom for nom, valeur in vars(type(objet)).items()
+            if callable(valeur) and not nom.startswith("_") and nom not in exclues
+        ]
+
+    def ajouter(self, hook: Hook, methodes: Optional[Iterable[str]] = None) -> None:
+        """
+        Enregistre un hook sur des méthodes.
+
+        Args:
+            hook (Hook): Le hook à enregistrer.
+            methodes (Iterable[str], optionnel): Méthodes observées. Par défaut toutes les méthodes publiques.
+
+        Raises:
+            ValueError: Si une méthode n'est pas une méthode publique observable.
+
+        Returns:
+            None
+        """
+        methodes = list(self.methodes_publiques if methodes is None else methodes)
+        inconnues = [nom for nom in methodes if nom not in self.methodes_publiques]
+        if inconnues:
+            raise ValueError(f"Méthodes non observables : {', '.join(inconnues)}.")
+        for nom in methodes:
+            hooks = self._hooks.get(nom)
+            if hooks is None:
+                hooks = self._hooks[nom] = []
+                methode = getattr(type(self._objet), nom).__get__(self._objet)
+                setattr(self._objet, nom, _envelopper(nom, methode, hooks))
+            if hook not in hooks:
+                hooks.append(hook)
+
+    def retirer(self, hook: Hook) -> None:
+        """
+        Retire un hook de toutes les méthodes. Les méthodes qui n'ont plus de hook retrouvent leur coût d'origine.
+
+        Args:
+            hook (Hook): Le hook à retirer.
+
+        Returns:
+            None
+        """
+        for nom in list(self._hooks):
+            hooks = self._hooks[nom]
+            if hook in hooks:
+                hooks.remove(hook)
+            if not hooks:
+                del self._hooks[nom]
+                self._objet.__dict__.pop(nom, None)
+
+
+def _envelopper(nom: str, methode, hooks: List[Hook]):
+    """
+    Construit l'enveloppe d'une méthode liée qui notifie les hooks (liste partagée, modifiable ensuite).
+
+    Args:
+        nom (str): Nom de la méthode.
+        methode (Callable): Méthode liée à l'instance.
+        hooks (List[Hook]): Hooks à notifier.
+
+    Returns:
+        Callable: La méthode enveloppée.
+    """
+    horloge = time.perf_counter_ns
+
+    @functools.wraps(methode)
+    def enveloppe(*args, **kwargs):
+        appel = Appel(nom, args, kwargs)
+        for hook in hooks:
+            hook.avant(appel)
+        debut = horloge()
+        try:
+            appel.resultat = methode(*args, **kwargs)
+            return appel.resultat
+        except Exception as erreur:
+            appel.erreur = erreur
+            raise
+        finally:
+            appel.duree_ns = horloge() - debut
+            for hook in reversed(hooks):
+                hook.apres(appel)
+
+    return enveloppe
+
+
+class JournalOperationsLentes(Hook):
+    """
+    Journalise les appels dont la durée dépasse un seuil : méthode, arguments, taille du résultat et durée.
+
+    Optionnellement, une fraction des appels est profilée avec cProfile ; les profils des appels lents
+    les plus longs sont conservés.
+    """
+
+    def __init__(self, seuil: float = 0.5, taille_max: int = 1000, echantillonnage_profil: float = 0.0,
+                 nb_profils: int = 5, seed: Optional[int] = None) -> None:
+        """
+        Crée le journal.
+
+        Args:
+            seuil (float, optionnel): Durée (en secondes) à partir de laquelle un appel est journalisé. Par défaut 0.5.
+            taille_max (int, optionnel): Nombre maximal d'entrées conservées (les plus anciennes sont oubliées).
+            echantillonnage_profil (float, optionnel): Proportion d'appels profilés (entre 0 et 1). Par défaut 0.
+            nb_profils (int, optionnel): Nombre de profils d'appels lents conservés. Par défaut 5.
+            seed (int, optionnel): Seed de l'échantillonnage, pour reproductibilité.
+
+        Returns:
+            None
+        """
+        self.seuil: float = seuil
+        self.echantillonnage_profil: float = echantillonnage_profil
+        self.nb_profils: int = nb_profils
+        self.entrees: Deque[Dict[str, Any]] = deque(maxlen=taille_max)
+        self._profils: List[Tuple[float, int, Dict[str, Any]]] = []  # Tas-min sur la durée
+        self._compteur = itertools.count()
+        self._rnd = random.Random(seed)
+        self._local = threading.local()  # Un seul profil actif par thread (appels imbriqués)
+        self._verrou = threading.Lock()
+
+    def avant(self, appel: Appel) -> None:
+        """
+        Démarre éventuellement un profil cProfile pour cet appel.
+
+        Args:
+            appel (Appel): L'appel sur le point d'être exécuté.
+
+        Returns:
+            None
+        """
+        if self.echantillonnage_profil <= 0 or getattr(self._local, "profil_actif", False):
+            return
+        if self._rnd.random() < self.echantillonnage_profil:
+            profil = cProfile.Profile()
+            self._local.profil_actif = True
+            appel.contexte[id(self)] = profil
+            profil.enable()
+
+    def apres(self, appel: Appel) -> None:
+        """
+        Arrête le profil éventuel et journalise l'appel s'il dépasse le seuil.
+
+        Args:
+            appel (Appel): L'appel exécuté.
+
+        Returns:
+            None
+        """
+        profil = appel.contexte.pop(id(self), None)
+        if profil is not None:
+            profil.disable()
+            self._local.profil_actif = False
+        if appel.duree < self.seuil:
+            return
+        entree = {
+            "date": datetime.now().isoformat(timespec="milliseconds"),
+            "methode": appel.methode,
+            "arguments": _resumer_arguments(appel.args, appel.kwargs),
+            "taille_resultat": len(appel.resultat) if hasattr(appel.resultat, "__len__") else None,
+            "erreur": type(appel.erreur).__name__ if appel.erreur is not None else None,
+            "duree_s": appel.duree,
+        }
+        logger.warning("Opération lente : %s(%s) en %.3f s (résultat : %s éléments)", entree["methode"],
+                       entree["arguments"], entree["duree_s"], entree["taille_resultat"])
+        with self._verrou:
+            self.entrees.append(entree)
+            if profil is not None:
+                import pstats  # Importé seulement lorsqu'un profil est capturé
+
+                flux = io.StringIO()
+                pstats.Stats(profil, stream=flux).sort_stats("cumulative").print_stats(20)
+                element = (appel.duree, next(self._compteur), dict(entree, profil=flux.getvalue()))
+                if len(self._profils) < self.nb_profils:
+                    heapq.heappush(self._profils, element)
+                else:
+                    heapq.heappushpop(self._profils, element)
+
+    def profils(self) -> List[Dict[str, Any]]:
+        """
+        Retourne les profils conservés, du plus lent au plus rapide.
+
+        Args:
+            Aucun
+
+        Returns:
+            List[Dict[str, Any]]: Entrées du journal complétées du profil cProfile (texte pstats) sous la clé "profil".
+        """
+        with self._verrou:
+            return [entree for _, _, entree in sorted(self._profils, reverse=True)]
+
+
+def _resumer_arguments(args: tuple, kwargs: dict, longueur_max: int = 200) -> str:
+    """
+    Construit une représentation courte des arguments d'un appel.
+
+    Args:
+        args (tuple): Arguments positionnels.
+        kwargs (dict): Arguments nommés.
+        longueur_max (int, optionnel): Longueur maximale du texte. Par défaut 200.
+
+    Returns:
+        str: Les arguments séparés par des virgules, tronqués si besoin.
+    """
+    texte = ", ".join([repr(a) for a in args] + [f"{cle}={valeur!r}" for cle, valeur in kwargs.items()])
+    return texte if len(texte) <= longueur_max else texte[:longueur_max - 3] + "..."
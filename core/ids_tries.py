@@ -0,0 +1,126 @@
+"""
+Liste triée des IDs de livres, pour parcourir le catalogue par ID croissant à partir d'un curseur
+(pagination du service HTTP, instantanés) en O(log n + taille de la page), quelle que soit la valeur des IDs.
+
+Les IDs étant attribués en ordre croissant, un ajout est presque toujours un simple append. Une suppression
+laisse l'ID dans la liste (pierre tombale, écartée à la lecture) : la liste n'est compactée que lorsque
+les pierres tombales dépassent une proportion des entrées, comme pour index_secondaires.IndexValeur.
+"""
+import bisect
+from typing import Iterable, Iterator, List, Sequence, Set
+
+PROPORTION_PIERRES_TOMBALES = 0.25
+
+
+class IdsTries:
+    """
+    IDs triés, avec pierres tombales compactées paresseusement.
+    """
+
+    def __init__(self) -> None:
+        """
+        Crée une liste vide.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._ids: List[int] = []
+        self._retires: Set[int] = set()  # Pierres tombales
+
+    def ajouter(self, livre_id: int) -> None:
+        """
+        Ajoute un ID (sans effet s'il est déjà présent, par exemple comme pierre tombale).
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            None
+        """
+        ids = self._ids
+        if not ids or livre_id > ids[-1]:
+            ids.append(livre_id)
+            return
+        position = bisect.bisect_left(ids, livre_id)
+        if position < len(ids) and ids[position] == livre_id:
+            self._retires.discard(livre_id)  # Pierre tombale réutilisée
+        else:
+            ids.insert(position, livre_id)
+
+    def ajouter_tous(self, livres_ids: Iterable[int]) -> None:
+        """
+        Ajoute des IDs en une fois.
+
+        Args:
+            livres_ids (Iterable[int]): IDs des livres.
+
+        Returns:
+            None
+        """
+        nouveaux = sorted(livres_ids)
+        if not nouveaux:
+            return
+        if not self._ids or nouveaux[0] > self._ids[-1]:
+            self._ids.extend(nouveaux)
+            return
+        for livre_id in nouveaux:
+            self.ajouter(livre_id)
+
+    def retirer(self, livre_id: int) -> None:
+        """
+        Note la suppression d'un ID : il devient une pierre tombale.
+
+        Args:
+            livre_id (int): ID du livre supprimé.
+
+        Returns:
+            None
+        """
+        retires = self._retires
+        retires.add(livre_id)
+        if len(retires) > PROPORTION_PIERRES_TOMBALES * (len(self._ids) - len(retires)):
+            self._ids = [i for i in self._ids if i not in retires]
+            retires.clear()
+
+    def apres(self, curseur: int) -> Iterator[int]:
+        """
+        Parcourt les IDs strictement supérieurs au curseur, par ordre croissant, sans les pierres tombales.
+
+        Args:
+            curseur (int): ID de départ (exclu).
+
+        Returns:
+            Iterator[int]: Les IDs.
+        """
+        retires = self._retires
+        return (livre_id for livre_id in suite_apres(self._ids, curseur) if livre_id not in retires)
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre d'IDs (sans les pierres tombales).
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'IDs.
+        """
+        return len(self._ids) - len(self._retires)
+
+
+def suite_apres(ids: Sequence[int], curseur: int) -> Iterator[int]:
+    """
+    Parcourt une suite triée d'IDs à partir du premier ID strictement supérieur au curseur.
+
+    Args:
+        ids (Sequence[int]): IDs triés (liste, memoryview des IDs d'un catalogue...).
+        curseur (int): ID de départ (exclu).
+
+    Returns:
+        Iterator[int]: Les IDs.
+    """
+    for position in range(bisect.bisect_right(ids, curseur), len(ids)):
+        yield ids[position]
@@ -0,0 +1,536 @@
+"""
+Import et export en flux du catalogue : livres, utilisateurs et emprunts en cours, aux formats CSV et JSON Lines.
+
+Les fichiers sont lus et écrits ligne à ligne et traités par lots de taille fixe : la mémoire utilisée ne dépend
+pas de la taille du fichier. Chaque lot est inséré en une fois (ajouter_livres, ajouter_utilisateurs,
+restaurer_emprunts) et une fonction de progression reçoit le nombre de lignes traitées et le débit.
+
+Le format est déduit de l'extension (.csv, .jsonl ou .ndjson) ou passé explicitement.
+Les titres et auteurs importés sont normalisés (forme Unicode NFC, espaces superflus supprimés, voir normaliser),
+par importer_livres comme par importer_livres_parallele. Les exports parcourent les livres et les utilisateurs
+au fil de l'écriture, sans en construire la liste : la bibliothèque ne doit pas être modifiée pendant un export.
+Les livres sont exportés sans leur lien éventuel avec une œuvre : ils sont réimportés comme livres indépendants.
+
+Pour les très gros catalogues, importer_livres_parallele découpe le fichier en plages d'octets analysées
+par un pool de processus : chaque processus lit, normalise et indexe (trigrammes) ses lignes, puis le processus
+principal fusionne les livres et les index partiels dans la bibliothèque.
+"""
+import csv
+import json
+import os
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from bibliotheque_project.core.index_recherche import trigrammes
+from bibliotheque_project.models.livre import Livre
+from bibliotheque_project.models.utilisateur import Utilisateur
+
+CHAMPS_LIVRES = ["id", "titre", "auteur"]
+CHAMPS_UTILISATEURS = ["id", "nom", "categorie"]
+CHAMPS_EMPRUNTS = ["utilisateur_id", "livre_id", "date_retour"]
+TAILLE_LOT_DEFAUT = 10_000
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class Progression(NamedTuple):
+    """
+    État d'avancement d'un import ou d'un export.
+    """
+    lignes: int
+    duree_s: float
+    lignes_par_s: float
+
+
+def importer_livres(biblio, chemin: str, format: Optional[str] = None, taille_lot: int = TAILLE_LOT_DEFAUT,
+                    progression: Optional[Callable[[Progression], None]] = None) -> Progression:
+    """
+    Importe des livres (colonnes id, titre, auteur ; id peut être vide pour un ID automatique).
+    Titres et auteurs sont normalisés (voir normaliser).
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque de destination.
+        chemin (str): Fichier à lire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+        taille_lot (int, optionnel): Nombre de lignes insérées à la fois. Par défaut 10 000.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+
+    Raises:
+        ValueError: Si une ligne est invalide (son numéro est indiqué) ou si un ID est déjà utilisé.
+
+    Returns:
+        Progression: Bilan final de l'import.
+    """
+    def convertir(ligne: Dict) -> Livre:
+        return Livre(normaliser(ligne["titre"]), normaliser(ligne["auteur"]), livre_id=_entier_optionnel(ligne.get("id")))
+
+    return _importer(chemin, format, taille_lot, progression, convertir, biblio.ajouter_livres)
+
+
+def importer_utilisateurs(biblio, chemin: str, format: Optional[str] = None, taille_lot: int = TAILLE_LOT_DEFAUT,
+                          progression: Optional[Callable[[Progression], None]] = None) -> Progression:
+    """
+    Importe des utilisateurs (colonnes id, nom, categorie ; id et categorie peuvent être vides).
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque de destination.
+        chemin (str): Fichier à lire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+        taille_lot (int, optionnel): Nombre de lignes insérées à la fois. Par défaut 10 000.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+
+    Raises:
+        ValueError: Si une ligne est invalide (son numéro est indiqué) ou si un ID est déjà utilisé.
+
+    Returns:
+        Progression: Bilan final de l'import.
+    """
+    def convertir(ligne: Dict) -> Utilisateur:
+        return Utilisateur(ligne["nom"], ligne.get("categorie") or "standard",
+                           utilisateur_id=_entier_optionnel(ligne.get("id")))
+
+    return _importer(chemin, format, taille_lot, progression, convertir, biblio.ajouter_utilisateurs)
+
+
+def importer_emprunts(biblio, chemin: str, format: Optional[str] = None, taille_lot: int = TAILLE_LOT_DEFAUT,
+                      progression: Optional[Callable[[Progression], None]] = None) -> Progression:
+    """
+    Importe les emprunts en cours (colonnes utilisateur_id, livre_id, date_retour au format ISO 8601).
+    Les livres et utilisateurs concernés doivent avoir été importés auparavant.
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque de destination.
+        chemin (str): Fichier à lire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+        taille_lot (int, optionnel): Nombre de lignes restaurées à la fois. Par défaut 10 000.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+
+    Raises:
+        KeyError: Si un livre ou un utilisateur n'existe pas.
+        ValueError: Si une ligne est invalide ou si un livre n'est pas disponible.
+
+    Returns:
+        Progression: Bilan final de l'import.
+    """
+    def convertir(ligne: Dict) -> tuple:
+        date_retour = ligne.get("date_retour")
+        return (int(ligne["utilisateur_id"]), int(ligne["livre_id"]),
+                datetime.fromisoformat(date_retour) if date_retour else None)
+
+    return _importer(chemin, format, taille_lot, progression, convertir, biblio.restaurer_emprunts)
+
+
+def importer_livres_parallele(biblio, chemin: str, format: Optional[str] = None,
+                              nb_processus: Optional[int] = None, nb_morceaux: Optional[int] = None,
+                              progression: Optional[Callable[[Progression], None]] = None) -> Progression:
+    """
+    Importe des livres en répartissant la lecture, la normalisation (espaces, Unicode NFC) et l'indexation
+    des titres sur un pool de processus. Les plages d'octets sont traitées dans l'ordre du fichier.
+    Les lignes sans id reçoivent les mêmes IDs qu'avec importer_livres : l'ID suivant le plus grand ID déjà attribué,
+    IDs explicites des lignes précédentes compris. Un premier passage résume les IDs de chaque plage
+    pour que chaque processus connaisse le prochain ID libre au début de la sienne.
+    En CSV, les champs ne doivent pas contenir de retour à la ligne.
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque de destination.
+        chemin (str): Fichier à lire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+        nb_processus (int, optionnel): Nombre de processus. Par défaut le nombre de cœurs.
+        nb_morceaux (int, optionnel): Nombre de plages d'octets. Par défaut 4 par processus.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque plage fusionnée.
+
+    Raises:
+        ValueError: Si une ligne est invalide ou si un ID est déjà utilisé.
+
+    Returns:
+        Progression: Bilan final de l'import.
+    """
+    format = _format(chemin, format)
+    debut = time.perf_counter()
+    nb_processus = nb_processus or os.cpu_count() or 1
+    champs, debut_donnees = _entete(chemin, format)
+    morceaux = decouper(chemin, nb_morceaux or 4 * nb_processus, debut_donnees)
+    total = 0
+    with ProcessPoolExecutor(nb_processus) as pool:
+        # Premier passage : effet de chaque plage sur le prochain ID libre, pour attribuer les IDs sans concertation
+        resumes = list(pool.map(_resumer_ids, [(chemin, format, champs, d, f) for d, f in morceaux]))
+        taches, prochain_id = [], Livre._next_id
+        for (d, f), (nb_automatiques, borne) in zip(morceaux, resumes):
+            taches.append((chemin, format, champs, d, f, prochain_id))
+            prochain_id = max(prochain_id + nb_automatiques, borne)
+        for lignes, postings_titres in pool.map(_analyser_morceau, taches):
+            livres = [Livre(titre, auteur, livre_id=livre_id) for livre_id, titre, auteur in lignes]
+            biblio.ajouter_livres(livres, postings_titres)
+            total += len(livres)
+            if progression is not None:
+                progression(_progression(total, debut))
+    return _progression(total, debut)
+
+
+def decouper(chemin: str, nb_morceaux: int, debut_donnees: int = 0) -> List[Tuple[int, int]]:
+    """
+    Découpe un fichier en plages d'octets de tailles voisines, alignées sur des débuts de ligne.
+
+    Args:
+        chemin (str): Fichier à découper.
+        nb_morceaux (int): Nombre de plages souhaité (il peut y en avoir moins pour un petit fichier).
+        debut_donnees (int, optionnel): Position du premier octet à traiter (après un en-tête). Par défaut 0.
+
+    Returns:
+        List[Tuple[int, int]]: Plages [début, fin) couvrant le fichier à partir de debut_donnees.
+    """
+    taille = os.path.getsize(chemin)
+    bornes = [debut_donnees]
+    with open(chemin, "rb") as fichier:
+        for k in range(1, nb_morceaux):
+            position = debut_donnees + (taille - debut_donnees) * k // nb_morceaux
+            if position <= bornes[-1]:
+                continue
+            fichier.seek(position - 1)
+            fichier.readline()  # Avance jusqu'au début de la ligne suivante
+            position = fichier.tell()
+            if position >= taille:
+                break
+            if position > bornes[-1]:
+                bornes.append(position)
+    if taille > bornes[-1] or len(bornes) == 1:
+        bornes.append(taille)
+    return [(d, f) for d, f in zip(bornes, bornes[1:]) if f > d]
+
+
+def normaliser(texte: str) -> str:
+    """
+    Normalise un titre ou un auteur : forme Unicode NFC et espaces superflus supprimés.
+
+    Args:
+        texte (str): Texte lu.
+
+    Returns:
+        str: Texte normalisé.
+    """
+    return " ".join(unicodedata.normalize("NFC", texte).split())
+
+
+def _entete(chemin: str, format: str) -> Tuple[Optional[List[str]], int]:
+    """
+    Lit l'en-tête d'un fichier CSV.
+
+    Args:
+        chemin (str): Fichier à lire.
+        format (str): "csv" ou "jsonl".
+
+    Returns:
+        Tuple[Optional[List[str]], int]: Noms des colonnes (None en JSON Lines) et position du début des données.
+    """
+    if format != "csv":
+        return None, 0
+    with open(chemin, "rb") as fichier:
+        entete = fichier.readline()
+    return next(csv.reader([entete.decode("utf-8-sig")])), len(entete)
+
+
+def _lignes_morceau(chemin: str, format: str, champs: Optional[List[str]], debut: int,
+                    fin: int) -> Iterator[Tuple[Optional[int], Dict]]:
+    """
+    Lit les lignes non vides d'une plage d'octets, avec leur ID explicite.
+
+    Args:
+        chemin (str): Fichier à lire.
+        format (str): "csv" ou "jsonl".
+        champs (List[str], optionnel): Colonnes CSV (None en JSON Lines).
+        debut (int): Premier octet de la plage.
+        fin (int): Fin (exclue) de la plage.
+
+    Raises:
+        ValueError: Si une ligne est invalide.
+
+    Returns:
+        Iterator[Tuple[Optional[int], Dict]]: Pour chaque ligne, son ID (None s'il est vide) et ses champs.
+    """
+    with open(chemin, "rb") as fichier:
+        fichier.seek(debut)
+        texte = fichier.read(fin - debut).decode("utf-8")
+    lignes = texte.split("\n")
+    if lignes and lignes[-1] == "":
+        lignes.pop()
+    if format == "csv":
+        enregistrements = (dict(zip(champs, valeurs)) if valeurs else None for valeurs in csv.reader(lignes))
+    else:
+        enregistrements = (json.loads(ligne) if ligne.strip() else None for ligne in lignes)
+    for ligne in enregistrements:
+        if ligne is None:
+            continue
+        try:
+            livre_id = _entier_optionnel(ligne.get("id"))
+        except (ValueError, TypeError, AttributeError) as erreur:
+            raise ValueError(f"Ligne invalide à partir de l'octet {debut} de {chemin} : {erreur!r}") from erreur
+        yield livre_id, ligne
+
+
+def _resumer_ids(tache: tuple) -> Tuple[int, int]:
+    """
+    Résume l'effet d'une plage d'octets sur le prochain ID libre (exécuté dans un processus du pool) :
+    si ce prochain ID vaut n au début de la plage, il vaut max(n + nb_automatiques, borne) à la fin.
+
+    Args:
+        tache (tuple): Chemin, format, colonnes CSV, début et fin de la plage.
+
+    Raises:
+        ValueError: Si une ligne est invalide.
+
+    Returns:
+        Tuple[int, int]: Nombre de lignes sans ID (nb_automatiques) et borne.
+    """
+    nb_automatiques, borne = 0, 0
+    for livre_id, _ in _lignes_morceau(*tache):
+        if livre_id is None:
+            nb_automatiques += 1
+            borne += 1
+        elif livre_id + 1 > borne:
+            borne = livre_id + 1
+    return nb_automatiques, borne
+
+
+def _analyser_morceau(tache: tuple) -> Tuple[List[Tuple[int, str, str]], Dict[str, List[int]]]:
+    """
+    Lit, normalise et indexe les livres d'une plage d'octets (exécuté dans un processus du pool).
+
+    Args:
+        tache (tuple): Chemin, format, colonnes CSV, début et fin de la plage, prochain ID libre au début de la plage.
+
+    Raises:
+        ValueError: Si une ligne est invalide.
+
+    Returns:
+        Tuple: Les livres (id, titre, auteur) et l'index partiel (trigramme -> IDs) des titres.
+        Les auteurs sont rattachés au dictionnaire des auteurs par le processus principal.
+    """
+    chemin, format, champs, debut, fin, prochain_id = tache
+    livres, postings_titres = [], {}
+    for livre_id, ligne in _lignes_morceau(chemin, format, champs, debut, fin):
+        try:
+            titre, auteur = normaliser(ligne["titre"]), normaliser(ligne["auteur"])
+        except (KeyError, ValueError, TypeError, AttributeError) as erreur:
+            raise ValueError(f"Ligne invalide à partir de l'octet {debut} de {chemin} : {erreur!r}") from erreur
+        if livre_id is None:
+            livre_id = prochain_id
+        prochain_id = max(prochain_id, livre_id + 1)
+        livres.append((livre_id, titre, auteur))
+        for trigramme in trigrammes(titre.lower()):
+            postings_titres.setdefault(trigramme, []).append(livre_id)
+    return livres, postings_titres
+
+
+def exporter_livres(biblio, chemin: str, format: Optional[str] = None, taille_lot: int = TAILLE_LOT_DEFAUT,
+                    progression: Optional[Callable[[Progression], None]] = None) -> Progression:
+    """
+    Exporte tous les livres (colonnes id, titre, auteur).
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque à exporter.
+        chemin (str): Fichier à écrire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+        taille_lot (int, optionnel): Fréquence (en lignes) des appels à progression. Par défaut 10 000.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+
+    Returns:
+        Progression: Bilan final de l'export.
+    """
+    lignes = ({"id": livre.id, "titre": livre.titre, "auteur": livre.auteur}
+              for livre in biblio.iterer_livres())
+    return _exporter(chemin, format, CHAMPS_LIVRES, lignes, taille_lot, progression)
+
+
+def exporter_utilisateurs(biblio, chemin: str, format: Optional[str] = None, taille_lot: int = TAILLE_LOT_DEFAUT,
+                          progression: Optional[Callable[[Progression], None]] = None) -> Progression:
+    """
+    Exporte tous les utilisateurs (colonnes id, nom, categorie).
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque à exporter.
+        chemin (str): Fichier à écrire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+        taille_lot (int, optionnel): Fréquence (en lignes) des appels à progression. Par défaut 10 000.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+
+    Returns:
+        Progression: Bilan final de l'export.
+    """
+    lignes = ({"id": u.id, "nom": u.nom, "categorie": u.categorie} for u in biblio.iterer_utilisateurs())
+    return _exporter(chemin, format, CHAMPS_UTILISATEURS, lignes, taille_lot, progression)
+
+
+def exporter_emprunts(biblio, chemin: str, format: Optional[str] = None, taille_lot: int = TAILLE_LOT_DEFAUT,
+                      progression: Optional[Callable[[Progression], None]] = None) -> Progression:
+    """
+    Exporte les emprunts en cours (colonnes utilisateur_id, livre_id, date_retour).
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque à exporter.
+        chemin (str): Fichier à écrire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+        taille_lot (int, optionnel): Fréquence (en lignes) des appels à progression. Par défaut 10 000.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+
+    Returns:
+        Progression: Bilan final de l'export.
+    """
+    def lignes() -> Iterator[Dict]:
+        for u in biblio.iterer_utilisateurs():
+            for livre_id in u.livres_empruntes:
+                date_retour = biblio.date_retour(livre_id)
+                yield {"utilisateur_id": u.id, "livre_id": livre_id,
+                       "date_retour": date_retour.isoformat() if date_retour else ""}
+
+    return _exporter(chemin, format, CHAMPS_EMPRUNTS, lignes(), taille_lot, progression)
+
+
+def lire_lignes(chemin: str, format: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Lit un fichier CSV (avec en-tête) ou JSON Lines ligne à ligne.
+
+    Args:
+        chemin (str): Fichier à lire.
+        format (str, optionnel): "csv" ou "jsonl". Par défaut, déduit de l'extension.
+
+    Raises:
+        ValueError: Si le format est inconnu ou si une ligne JSON est invalide.
+
+    Returns:
+        Iterator[Dict]: Les lignes du fichier, sous forme de dictionnaires.
+    """
+    format = _format(chemin, format)
+    with open(chemin, encoding="utf-8", newline="") as fichier:
+        if format == "csv":
+            yield from csv.DictReader(fichier)
+        else:
+            for ligne in fichier:
+                if ligne.strip():
+                    yield json.loads(ligne)
+
+
+def _importer(chemin: str, format: Optional[str], taille_lot: int,
+              progression: Optional[Callable[[Progression], None]],
+              convertir: Callable[[Dict], object], inserer: Callable[[List], int]) -> Progression:
+    """
+    Lit un fichier par lots, convertit chaque ligne et insère chaque lot en une fois.
+
+    Args:
+        chemin (str): Fichier à lire.
+        format (str, optionnel): "csv", "jsonl" ou None.
+        taille_lot (int): Nombre de lignes par lot.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+        convertir (Callable[[Dict], object]): Convertit une ligne en objet à insérer.
+        inserer (Callable[[List], int]): Insère un lot.
+
+    Raises:
+        ValueError: Si une ligne est invalide (son numéro est indiqué).
+
+    Returns:
+        Progression: Bilan final.
+    """
+    debut = time.perf_counter()
+    total = 0
+    lignes = lire_lignes(chemin, format)
+    while True:
+        lot = []
+        try:
+            for ligne in islice(lignes, taille_lot):
+                lot.append(convertir(ligne))
+        except (KeyError, ValueError, TypeError) as erreur:
+            raise ValueError(f"Ligne {total + len(lot) + 1} invalide dans {chemin} : {erreur!r}") from erreur
+        if not lot:
+            break
+        inserer(lot)
+        total += len(lot)
+        if progression is not None:
+            progression(_progression(total, debut))
+    return _progression(total, debut)
+
+
+def _exporter(chemin: str, format: Optional[str], champs: List[str], lignes: Iterable[Dict], taille_lot: int,
+              progression: Optional[Callable[[Progression], None]]) -> Progression:
+    """
+    Écrit des lignes dans un fichier CSV ou JSON Lines.
+
+    Args:
+        chemin (str): Fichier à écrire.
+        format (str, optionnel): "csv", "jsonl" ou None.
+        champs (List[str]): Colonnes, dans l'ordre.
+        lignes (Iterable[Dict]): Lignes à écrire.
+        taille_lot (int): Fréquence (en lignes) des appels à progression.
+        progression (Callable[[Progression], None], optionnel): Appelée après chaque lot.
+
+    Returns:
+        Progression: Bilan final.
+    """
+    format = _format(chemin, format)
+    debut = time.perf_counter()
+    total = 0
+    with open(chemin, "w", encoding="utf-8", newline="") as fichier:
+        if format == "csv":
+            ecrivain = csv.DictWriter(fichier, fieldnames=champs)
+            ecrivain.writeheader()
+            ecrire = ecrivain.writerow
+        else:
+            def ecrire(ligne: Dict) -> None:
+                fichier.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+        for ligne in lignes:
+            ecrire(ligne)
+            total += 1
+            if progression is not None and total % taille_lot == 0:
+                progression(_progression(total, debut))
+    return _progression(total, debut)
+
+
+def _format(chemin: str, format: Optional[str]) -> str:
+    """
+    Détermine le format d'un fichier.
+
+    Args:
+        chemin (str): Chemin du fichier.
+        format (str, optionnel): Format imposé.
+
+    Raises:
+        ValueError: Si le format est inconnu ou ne peut pas être déduit.
+
+    Returns:
+        str: "csv" ou "jsonl".
+    """
+    if format is None:
+        extension = chemin[chemin.rfind("."):].lower() if "." in chemin else ""
+        format = FORMATS.get(extension)
+    if format not in ("csv", "jsonl"):
+        raise ValueError(f"Format inconnu pour {chemin} : utilisez 'csv' ou 'jsonl'.")
+    return format
+
+
+def _entier_optionnel(valeur) -> Optional[int]:
+    """
+    Convertit une valeur en entier, une valeur vide donnant None.
+
+    Args:
+        valeur: Valeur lue (chaîne, entier ou None).
+
+    Returns:
+        Optional[int]: L'entier, ou None si la valeur est vide.
+    """
+    return None if valeur in (None, "") else int(valeur)
+
+
+def _progression(lignes: int, debut: float) -> Progression:
+    """
+    Construit l'état d'avancement.
+
+    Args:
+        lignes (int): Nombre de lignes traitées.
+        debut (float): Instant de début (time.perf_counter).
+
+    Returns:
+        Progression: L'état d'avancement.
+    """
+    duree = time.perf_counter() - debut
+    return Progression(lignes, duree, lignes / duree if duree > 0 else 0.0)
@@ -0,0 +1,130 @@
+"""
+Index de trigrammes pour les recherches par sous-chaîne (titre, auteur).
+
+Chaque texte (mis en minuscules) est découpé en trigrammes ; l'index associe chaque trigramme à l'ensemble
+des IDs des livres qui le contiennent. Pour une requête d'au moins 3 caractères, les livres candidats sont
+l'intersection des ensembles de ses trigrammes : il suffit ensuite de vérifier la sous-chaîne sur ces seuls candidats,
+au lieu de parcourir tout le catalogue.
+"""
+from typing import Dict, Iterable, Optional, Set
+
+TAILLE_NGRAMME = 3
+
+
+def trigrammes(texte: str) -> Set[str]:
+    """
+    Retourne l'ensemble des trigrammes d'un texte.
+
+    Args:
+        texte (str): Texte déjà mis en minuscules.
+
+    Returns:
+        Set[str]: Les sous-chaînes de 3 caractères du texte.
+    """
+    return {texte[i:i + TAILLE_NGRAMME] for i in range(len(texte) - TAILLE_NGRAMME + 1)}
+
+
+class IndexTrigrammes:
+    """
+    Index inversé trigramme -> IDs de livres.
+    """
+
+    def __init__(self) -> None:
+        """
+        Crée un index vide.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._postings: Dict[str, Set[int]] = {}
+
+    def ajouter(self, livre_id: int, texte: str) -> None:
+        """
+        Indexe le texte d'un livre.
+
+        Args:
+            livre_id (int): ID du livre.
+            texte (str): Texte à indexer (titre ou auteur).
+
+        Returns:
+            None
+        """
+        postings = self._postings
+        for trigramme in trigrammes(texte.lower()):
+            ids = postings.get(trigramme)
+            if ids is None:
+                postings[trigramme] = {livre_id}
+            else:
+                ids.add(livre_id)
+
+    def retirer(self, livre_id: int, texte: str) -> None:
+        """
+        Retire un livre de l'index.
+
+        Args:
+            livre_id (int): ID du livre.
+            texte (str): Texte qui avait été indexé pour ce livre.
+
+        Returns:
+            None
+        """
+        for trigramme in trigrammes(texte.lower()):
+            ids = self._postings.get(trigramme)
+            if ids is not None:
+                ids.discard(livre_id)
+                if not ids:
+                    del self._postings[trigramme]
+
+    def fusionner(self, postings: Dict[str, Iterable[int]]) -> None:
+        """
+        Ajoute à l'index des postings construits ailleurs (par exemple par un processus d'import).
+
+        Args:
+            postings (Dict[str, Iterable[int]]): Trigramme -> IDs des livres qui le contiennent.
+
+        Returns:
+            None
+        """
+        for trigramme, ids in postings.items():
+            existants = self._postings.get(trigramme)
+            if existants is None:
+                self._postings[trigramme] = set(ids)
+            else:
+                existants.update(ids)
+
+    def candidats(self, query: str) -> Optional[Set[int]]:
+        """
+        Retourne les IDs des livres pouvant contenir la requête (sur-ensemble des résultats exacts).
+
+        Args:
+            query (str): Chaîne recherchée.
+
+        Returns:
+            Optional[Set[int]]: Les IDs candidats, ou None si la requête est trop courte pour utiliser l'index.
+        """
+        q = query.lower()
+        if len(q) < TAILLE_NGRAMME:
+            return None
+        ensembles = []
+        for trigramme in trigrammes(q):
+            ids = self._postings.get(trigramme)
+            if not ids:
+                return set()
+            ensembles.append(ids)
+        ensembles.sort(key=len)  # On part du plus petit ensemble
+        return ensembles[0].intersection(*ensembles[1:])
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de trigrammes distincts indexés.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre de trigrammes.
+        """
+        return len(self._postings)
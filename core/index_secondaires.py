@@ -0,0 +1,472 @@
+"""
+Index secondaires de la Bibliotheque, tenus à jour à chaque modification des livres.
+
+Un index secondaire est enregistré par Bibliotheque.ajouter_index ; la bibliothèque lui transmet ensuite chaque
+insertion, mise à jour (titre, auteur, statut) et suppression d'un livre. Un index peut être reconstruit en
+arrière-plan (Bibliotheque.reconstruire_index) : un nouvel état est rempli dans un thread à partir de la liste
+des livres, pendant que les modifications concurrentes continuent d'être appliquées à l'état courant et sont notées ;
+elles sont rejouées sur le nouvel état juste avant qu'il remplace l'ancien.
+
+IndexValeur associe une valeur calculée sur chaque livre (statut, initiale du titre, langue...) aux livres qui l'ont.
+Une suppression ou un changement de valeur ne retire pas l'ID de la liste de l'ancienne valeur : l'entrée devient
+une pierre tombale, ignorée à la lecture. Les listes ne sont compactées que lorsque les pierres tombales dépassent
+une proportion des entrées, si bien qu'une suppression ne coûte jamais une reconstruction.
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Hashable, List, Mapping, Optional, Sequence
+
+from bibliotheque_project.models.livre import Livre
+
+PROPORTION_PIERRES_TOMBALES = 0.25  # Compactage quand les entrées périmées dépassent 25 % des entrées vivantes
+_ABSENT = object()
+
+
+class IndexSecondaire(ABC):
+    """
+    Interface d'un index secondaire. Les rappels doivent être idempotents : pendant une reconstruction,
+    un même livre peut être inséré ou mis à jour deux fois.
+    """
+
+    def __init__(self, nom: str) -> None:
+        """
+        Crée l'index.
+
+        Args:
+            nom (str): Nom sous lequel l'index est enregistré dans la bibliothèque.
+
+        Returns:
+            None
+        """
+        self.nom = nom
+
+    @abstractmethod
+    def inserer(self, livre: Livre) -> None:
+        """
+        Indexe un livre ajouté à la bibliothèque.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def mettre_a_jour(self, livre: Livre) -> None:
+        """
+        Réindexe un livre dont le titre, l'auteur ou le statut a changé (ou l'indexe s'il ne l'était pas).
+        L'index doit garder ce qu'il a indexé : le livre est déjà modifié quand il est transmis.
+
+        Args:
+            livre (Livre): Le livre modifié.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def supprimer(self, livre_id: int) -> None:
+        """
+        Retire un livre supprimé de la bibliothèque (sans effet s'il n'est pas indexé).
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            None
+        """
+
+    @abstractmethod
+    def vide(self) -> "IndexSecondaire":
+        """
+        Retourne un index vide de même configuration, à remplir lors d'une reconstruction.
+
+        Args:
+            Aucun
+
+        Returns:
+            IndexSecondaire: Le nouvel index.
+        """
+
+    @abstractmethod
+    def adopter(self, autre: "IndexSecondaire") -> None:
+        """
+        Remplace l'état de l'index par celui d'un index reconstruit.
+
+        Args:
+            autre (IndexSecondaire): Index rempli, obtenu par vide().
+
+        Returns:
+            None
+        """
+
+
+class IndexValeur(IndexSecondaire):
+    """
+    Index valeur -> IDs des livres, la valeur étant calculée par une fonction du livre.
+    """
+
+    def __init__(self, nom: str, cle: Callable[[Livre], Hashable],
+                 proportion_compactage: float = PROPORTION_PIERRES_TOMBALES) -> None:
+        """
+        Crée un index vide.
+
+        Args:
+            nom (str): Nom de l'index.
+            cle (Callable[[Livre], Hashable]): Valeur indexée d'un livre.
+            proportion_compactage (float, optionnel): Proportion de pierres tombales au-delà de laquelle
+                les listes sont compactées. Par défaut PROPORTION_PIERRES_TOMBALES.
+
+        Returns:
+            None
+        """
+        super().__init__(nom)
+        self.cle = cle
+        self.proportion_compactage = proportion_compactage
+        self._listes: Dict[Hashable, List[int]] = {}  # Valeur -> IDs, y compris les entrées périmées
+        self._valeurs: Dict[int, Hashable] = {}  # ID -> valeur actuelle : fait foi pour écarter les pierres tombales
+        self.pierres_tombales = 0
+
+    def inserer(self, livre: Livre) -> None:
+        """
+        Indexe un livre ajouté, comme une mise à jour (sans effet s'il est déjà indexé avec la même valeur).
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            None
+        """
+        self.mettre_a_jour(livre)
+
+    def mettre_a_jour(self, livre: Livre) -> None:
+        """
+        Ajoute l'ID du livre à la liste de sa nouvelle valeur ; l'entrée de l'ancienne valeur devient
+        une pierre tombale.
+
+        Args:
+            livre (Livre): Le livre modifié.
+
+        Returns:
+            None
+        """
+        valeur = self.cle(livre)
+        if livre.id in self._valeurs:
+            if self._valeurs[livre.id] == valeur:
+                return
+            self.pierres_tombales += 1
+        self._valeurs[livre.id] = valeur
+        self._listes.setdefault(valeur, []).append(livre.id)
+        self._compacter_si_besoin()
+
+    def supprimer(self, livre_id: int) -> None:
+        """
+        Oublie la valeur du livre : son entrée devient une pierre tombale.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            None
+        """
+        if self._valeurs.pop(livre_id, _ABSENT) is not _ABSENT:
+            self.pierres_tombales += 1
+            self._compacter_si_besoin()
+
+    def vide(self) -> "IndexValeur":
+        """
+        Retourne un index vide de même nom, même fonction de valeur et même proportion de compactage.
+
+        Args:
+            Aucun
+
+        Returns:
+            IndexValeur: Le nouvel index.
+        """
+        return IndexValeur(self.nom, self.cle, self.proportion_compactage)
+
+    def adopter(self, autre: "IndexValeur") -> None:
+        """
+        Reprend les listes, les valeurs et le compte de pierres tombales d'un index reconstruit.
+
+        Args:
+            autre (IndexValeur): Index rempli, obtenu par vide().
+
+        Returns:
+            None
+        """
+        self._listes, self._valeurs, self.pierres_tombales = autre._listes, autre._valeurs, autre.pierres_tombales
+
+    def livres(self, valeur: Hashable) -> List[int]:
+        """
+        Retourne les IDs des livres qui ont une valeur.
+
+        Args:
+            valeur (Hashable): La valeur cherchée.
+
+        Returns:
+            List[int]: IDs des livres, triés.
+        """
+        valeurs = self._valeurs
+        return sorted({livre_id for livre_id in self._listes.get(valeur, ()) if valeurs.get(livre_id, _ABSENT) == valeur})
+
+    def compacter(self) -> None:
+        """
+        Réécrit les listes sans leurs pierres tombales.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        listes: Dict[Hashable, List[int]] = {}
+        for livre_id, valeur in self._valeurs.items():
+            listes.setdefault(valeur, []).append(livre_id)
+        self._listes = listes
+        self.pierres_tombales = 0
+
+    def _compacter_si_besoin(self) -> None:
+        """
+        Compacte les listes quand les pierres tombales dépassent la proportion fixée.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        if self.pierres_tombales > self.proportion_compactage * len(self._valeurs):
+            self.compacter()
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de livres indexés.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre de livres.
+        """
+        return len(self._valeurs)
+
+
+class GestionnaireIndex:
+    """
+    Index secondaires d'une bibliothèque : transmission des modifications et reconstructions.
+    """
+
+    def __init__(self) -> None:
+        """
+        Crée un gestionnaire sans index.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._index: Dict[str, IndexSecondaire] = {}
+        self._journaux: Dict[str, List[int]] = {}  # Par index en reconstruction : IDs modifiés entre-temps
+        self._verrou = threading.Lock()
+
+    def ajouter(self, index: IndexSecondaire) -> None:
+        """
+        Enregistre un index (vide : il est rempli par reconstruire).
+
+        Args:
+            index (IndexSecondaire): L'index.
+
+        Raises:
+            ValueError: Si un index porte déjà ce nom.
+
+        Returns:
+            None
+        """
+        with self._verrou:
+            if index.nom in self._index:
+                raise ValueError(f"Un index nommé {index.nom!r} existe déjà.")
+            self._index[index.nom] = index
+
+    def retirer(self, nom: str) -> None:
+        """
+        Retire un index ; une reconstruction en cours est abandonnée.
+
+        Args:
+            nom (str): Nom de l'index.
+
+        Raises:
+            KeyError: Si aucun index ne porte ce nom.
+
+        Returns:
+            None
+        """
+        with self._verrou:
+            self.obtenir(nom)
+            del self._index[nom]
+            self._journaux.pop(nom, None)
+
+    def obtenir(self, nom: str) -> IndexSecondaire:
+        """
+        Retourne un index.
+
+        Args:
+            nom (str): Nom de l'index.
+
+        Raises:
+            KeyError: Si aucun index ne porte ce nom.
+
+        Returns:
+            IndexSecondaire: L'index.
+        """
+        index = self._index.get(nom)
+        if index is None:
+            raise KeyError(f"Aucun index nommé {nom!r}.")
+        return index
+
+    def noms(self) -> List[str]:
+        """
+        Retourne les noms des index enregistrés.
+
+        Args:
+            Aucun
+
+        Returns:
+            List[str]: Les noms, dans l'ordre d'enregistrement.
+        """
+        return list(self._index)
+
+    def inserer(self, livres: Sequence[Livre]) -> None:
+        """
+        Transmet des livres ajoutés à tous les index.
+
+        Args:
+            livres (Sequence[Livre]): Les livres ajoutés.
+
+        Returns:
+            None
+        """
+        if not self._index:
+            return
+        with self._verrou:
+            for nom, index in self._index.items():
+                for livre in livres:
+                    index.inserer(livre)
+                self._noter(nom, (livre.id for livre in livres))
+
+    def mettre_a_jour(self, livre: Livre) -> None:
+        """
+        Transmet un livre modifié à tous les index.
+
+        Args:
+            livre (Livre): Le livre modifié.
+
+        Returns:
+            None
+        """
+        if not self._index:
+            return
+        with self._verrou:
+            for nom, index in self._index.items():
+                index.mettre_a_jour(livre)
+                self._noter(nom, (livre.id,))
+
+    def supprimer(self, livre_id: int) -> None:
+        """
+        Transmet la suppression d'un livre à tous les index.
+
+        Args:
+            livre_id (int): ID du livre supprimé.
+
+        Returns:
+            None
+        """
+        if not self._index:
+            return
+        with self._verrou:
+            for nom, index in self._index.items():
+                index.supprimer(livre_id)
+                self._noter(nom, (livre_id,))
+
+    def reconstruire(self, nom: str, livres: List[Livre], source: Mapping[int, Livre],
+                     en_arriere_plan: bool = True) -> Optional[threading.Thread]:
+        """
+        Reconstruit un index à partir d'une liste des livres : un index vide est rempli (dans un thread si demandé),
+        les livres modifiés entre-temps y sont réindexés d'après leur état actuel, puis il remplace l'état de l'index.
+
+        Args:
+            nom (str): Nom de l'index.
+            livres (List[Livre]): Livres de la bibliothèque au lancement de la reconstruction.
+            source (Mapping[int, Livre]): Livres actuels de la bibliothèque, relus pour les livres modifiés entre-temps.
+            en_arriere_plan (bool, optionnel): Reconstruit dans un thread. Par défaut True.
+
+        Raises:
+            KeyError: Si aucun index ne porte ce nom.
+            ValueError: Si une reconstruction de cet index est déjà en cours.
+
+        Returns:
+            Optional[threading.Thread]: Le thread de la reconstruction (déjà démarré), ou None si elle est terminée.
+        """
+        with self._verrou:
+            index = self.obtenir(nom)
+            if nom in self._journaux:
+                raise ValueError(f"L'index {nom!r} est déjà en reconstruction.")
+            journal = self._journaux[nom] = []
+
+        def reconstruire() -> None:
+            nouvel = index.vide()
+            try:
+                for livre in livres:
+                    nouvel.inserer(livre)
+            except BaseException:
+                with self._verrou:
+                    if self._journaux.get(nom) is journal:
+                        del self._journaux[nom]
+                raise
+            with self._verrou:
+                if self._journaux.get(nom) is not journal:  # Index retiré entre-temps
+                    return
+                del self._journaux[nom]
+                for livre_id in journal:
+                    livre = source.get(livre_id)
+                    if livre is None:
+                        nouvel.supprimer(livre_id)
+                    else:
+                        nouvel.mettre_a_jour(livre)
+                index.adopter(nouvel)
+
+        if not en_arriere_plan:
+            reconstruire()
+            return None
+        fil = threading.Thread(target=reconstruire, name=f"reconstruction-{nom}", daemon=True)
+        fil.start()
+        return fil
+
+    def _noter(self, nom: str, livres_ids) -> None:
+        """
+        Note des livres modifiés pendant la reconstruction d'un index (appelé sous le verrou).
+
+        Args:
+            nom (str): Nom de l'index.
+            livres_ids (Iterable[int]): IDs des livres modifiés.
+
+        Returns:
+            None
+        """
+        journal = self._journaux.get(nom)
+        if journal is not None:
+            journal.extend(livres_ids)
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre d'index enregistrés.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'index.
+        """
+        return len(self._index)
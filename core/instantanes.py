@@ -0,0 +1,348 @@
+"""
+Instantanés en lecture seule de la Bibliotheque, par copie à la première écriture.
+
+Créer un instantané ne copie rien : il retient seulement les bornes des IDs existants et le nombre de livres
+et d'utilisateurs. Tant qu'il est ouvert, la bibliothèque lui confie l'état figé (LivreFige, UtilisateurFige)
+de chaque livre ou utilisateur juste avant sa première modification (création, emprunt, retour, suppression).
+Une lecture prend l'état courant, puis le remplace par l'état conservé s'il y en a un : l'instantané voit
+le catalogue tel qu'il était à sa création, sans bloquer les écritures ni recopier tout le catalogue.
+Seuls les livres et utilisateurs sont couverts (pas les œuvres, réservations ni échéances).
+"""
+from collections import Counter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from bibliotheque_project.models.livre import Livre, StatusLivre
+from bibliotheque_project.models.utilisateur import Utilisateur
+
+ABSENT = None  # État conservé d'un enregistrement qui n'existait pas à la création de l'instantané
+
+
+class LivreFige(NamedTuple):
+    """
+    État figé d'un livre.
+    """
+    id: int
+    titre: str
+    auteur: str
+    status: StatusLivre
+    oeuvre_id: Optional[int]
+    exemplaire: Optional[int]
+
+    def est_disponible(self) -> bool:
+        """
+        Vérifie si le livre était disponible.
+
+        Args:
+            Aucun
+
+        Returns:
+            bool: True si le livre était disponible, False sinon.
+        """
+        return self.status == StatusLivre.DISPONIBLE
+
+
+class UtilisateurFige(NamedTuple):
+    """
+    État figé d'un utilisateur.
+    """
+    id: int
+    nom: str
+    categorie: str
+    livres_empruntes: Tuple[int, ...]
+
+    def nb_emprunts(self) -> int:
+        """
+        Retourne le nombre de livres empruntés.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Le nombre de livres empruntés.
+        """
+        return len(self.livres_empruntes)
+
+
+def figer_livre(livre: Optional[Livre]) -> Optional[LivreFige]:
+    """
+    Retourne l'état figé d'un livre.
+
+    Args:
+        livre (Livre, optionnel): Le livre, ou None s'il n'existe pas.
+
+    Returns:
+        Optional[LivreFige]: L'état figé, ou None.
+    """
+    if livre is None:
+        return ABSENT
+    return LivreFige(livre.id, livre.titre, livre.auteur, livre.status, livre.oeuvre_id, livre.exemplaire)
+
+
+def figer_utilisateur(utilisateur: Optional[Utilisateur]) -> Optional[UtilisateurFige]:
+    """
+    Retourne l'état figé d'un utilisateur.
+
+    Args:
+        utilisateur (Utilisateur, optionnel): L'utilisateur, ou None s'il n'existe pas.
+
+    Returns:
+        Optional[UtilisateurFige]: L'état figé, ou None.
+    """
+    if utilisateur is None:
+        return ABSENT
+    return UtilisateurFige(utilisateur.id, utilisateur.nom, utilisateur.categorie, tuple(utilisateur.livres_empruntes))
+
+
+class Instantane:
+    """
+    Vue figée des livres et utilisateurs d'une bibliothèque. À fermer (ou utiliser dans un bloc with)
+    pour que la bibliothèque cesse de lui conserver des états.
+    """
+
+    def __init__(self, biblio) -> None:
+        """
+        Crée l'instantané. Utiliser plutôt Bibliotheque.instantane(), qui l'enregistre auprès de la bibliothèque.
+
+        Args:
+            biblio (Bibliotheque): Bibliothèque observée.
+
+        Returns:
+            None
+        """
+        self._biblio = biblio
+        self._fin_livres: int = Livre._next_id  # Les IDs attribués ensuite n'existaient pas
+        self._fin_utilisateurs: int = Utilisateur._next_id
+        self._nb_livres: int = len(biblio._livres)
+        self._nb_utilisateurs: int = len(biblio._utilisateurs)
+        self._anciens_livres: Dict[int, Optional[LivreFige]] = {}
+        self._anciens_utilisateurs: Dict[int, Optional[UtilisateurFige]] = {}
+        self.ferme: bool = False
+
+    def conserver_livre(self, livre_id: int) -> None:
+        """
+        Conserve l'état actuel d'un livre s'il ne l'est pas déjà (appelé par la bibliothèque avant une modification).
+
+        Args:
+            livre_id (int): ID du livre sur le point d'être modifié.
+
+        Returns:
+            None
+        """
+        if livre_id < self._fin_livres and livre_id not in self._anciens_livres:
+            self._anciens_livres[livre_id] = figer_livre(self._biblio._livres.get(livre_id))
+
+    def conserver_utilisateur(self, utilisateur_id: int) -> None:
+        """
+        Conserve l'état actuel d'un utilisateur s'il ne l'est pas déjà (appelé par la bibliothèque avant une modification).
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur sur le point d'être modifié.
+
+        Returns:
+            None
+        """
+        if utilisateur_id < self._fin_utilisateurs and utilisateur_id not in self._anciens_utilisateurs:
+            self._anciens_utilisateurs[utilisateur_id] = figer_utilisateur(self._biblio._utilisateurs.get(utilisateur_id))
+
+    def livre(self, livre_id: int) -> Optional[LivreFige]:
+        """
+        Retourne l'état d'un livre à la création de l'instantané.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Raises:
+            ValueError: Si l'instantané est fermé.
+
+        Returns:
+            Optional[LivreFige]: L'état du livre, ou None s'il n'existait pas.
+        """
+        if self.ferme:
+            raise ValueError("L'instantané est fermé.")
+        if livre_id >= self._fin_livres:
+            return ABSENT
+        # L'état courant est lu avant de consulter les états conservés : une modification concurrente
+        # conserve l'ancien état avant de modifier le livre.
+        courant = figer_livre(self._biblio._livres.get(livre_id))
+        return self._anciens_livres.get(livre_id, courant)
+
+    def utilisateur(self, utilisateur_id: int) -> Optional[UtilisateurFige]:
+        """
+        Retourne l'état d'un utilisateur à la création de l'instantané.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Raises:
+            ValueError: Si l'instantané est fermé.
+
+        Returns:
+            Optional[UtilisateurFige]: L'état de l'utilisateur, ou None s'il n'existait pas.
+        """
+        if self.ferme:
+            raise ValueError("L'instantané est fermé.")
+        if utilisateur_id >= self._fin_utilisateurs:
+            return ABSENT
+        courant = figer_utilisateur(self._biblio._utilisateurs.get(utilisateur_id))
+        return self._anciens_utilisateurs.get(utilisateur_id, courant)
+
+    def livres(self) -> Iterator[LivreFige]:
+        """
+        Parcourt les livres de l'instantané par ID croissant. Le coût dépend du nombre de livres, pas de la valeur des IDs.
+
+        Args:
+            Aucun
+
+        Returns:
+            Iterator[LivreFige]: Les livres existants à la création de l'instantané.
+        """
+        for livre_id in self._ids(self._biblio._livres, self._fin_livres, self._anciens_livres):
+            livre = self.livre(livre_id)
+            if livre is not None:
+                yield livre
+
+    def utilisateurs(self) -> Iterator[UtilisateurFige]:
+        """
+        Parcourt les utilisateurs de l'instantané par ID croissant.
+
+        Args:
+            Aucun
+
+        Returns:
+            Iterator[UtilisateurFige]: Les utilisateurs existants à la création de l'instantané.
+        """
+        for utilisateur_id in self._ids(self._biblio._utilisateurs, self._fin_utilisateurs, self._anciens_utilisateurs):
+            utilisateur = self.utilisateur(utilisateur_id)
+            if utilisateur is not None:
+                yield utilisateur
+
+    @staticmethod
+    def _ids(courants, fin: int, anciens: Dict[int, object]) -> List[int]:
+        """
+        Retourne les IDs susceptibles d'appartenir à l'instantané : IDs actuels antérieurs à sa création et IDs
+        dont l'état a été conservé. Les IDs actuels sont relevés en premier : un enregistrement supprimé entre-temps
+        a été conservé avant sa suppression.
+
+        Args:
+            courants (Mapping[int, object]): Livres ou utilisateurs actuels de la bibliothèque.
+            fin (int): Premier ID attribué après la création de l'instantané.
+            anciens (Dict[int, object]): États conservés.
+
+        Returns:
+            List[int]: Les IDs, triés.
+        """
+        ids = {identifiant for identifiant in list(courants) if identifiant < fin}
+        ids.update(list(anciens))
+        return sorted(ids)
+
+    def lister_tous_les_livres(self) -> List[LivreFige]:
+        """
+        Retourne la liste de tous les livres de l'instantané.
+
+        Args:
+            Aucun
+
+        Returns:
+            List[LivreFige]: Les livres, par ID croissant.
+        """
+        return list(self.livres())
+
+    def lister_livres_disponibles(self) -> List[LivreFige]:
+        """
+        Retourne la liste des livres disponibles dans l'instantané.
+
+        Args:
+            Aucun
+
+        Returns:
+            List[LivreFige]: Les livres disponibles, par ID croissant.
+        """
+        return [livre for livre in self.livres() if livre.est_disponible()]
+
+    def nombre_total_livres(self) -> int:
+        """
+        Retourne le nombre de livres à la création de l'instantané.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre de livres.
+        """
+        return self._nb_livres
+
+    def nombre_total_utilisateurs(self) -> int:
+        """
+        Retourne le nombre d'utilisateurs à la création de l'instantané.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'utilisateurs.
+        """
+        return self._nb_utilisateurs
+
+    def distribution_emprunts_par_utilisateur(self) -> Dict[int, int]:
+        """
+        Retourne un dictionnaire {utilisateur_id: nombre_emprunts} à la création de l'instantané.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[int, int]: Distribution des emprunts par utilisateur.
+        """
+        return {u.id: u.nb_emprunts() for u in self.utilisateurs()}
+
+    def histogramme_emprunts(self) -> Dict[int, int]:
+        """
+        Retourne un histogramme des emprunts {nombre_emprunts: nombre_utilisateurs} à la création de l'instantané.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[int, int]: Histogramme des emprunts.
+        """
+        return dict(Counter(u.nb_emprunts() for u in self.utilisateurs()))
+
+    def fermer(self) -> None:
+        """
+        Ferme l'instantané : la bibliothèque cesse de lui conserver des états et ceux déjà conservés sont libérés.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        if not self.ferme:
+            self.ferme = True
+            self._biblio._fermer_instantane(self)
+            self._anciens_livres = {}
+            self._anciens_utilisateurs = {}
+
+    def __enter__(self) -> "Instantane":
+        """
+        Permet d'utiliser l'instantané dans un bloc with.
+
+        Args:
+            Aucun
+
+        Returns:
+            Instantane: L'instantané lui-même.
+        """
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """
+        Ferme l'instantané à la sortie du bloc with.
+
+        Args:
+            *exc: Informations sur une éventuelle exception (ignorées).
+
+        Returns:
+            None
+        """
+        self.fermer()
@@ -0,0 +1,351 @@
+"""
+Métriques opérationnelles de la Bibliotheque : nombre d'appels, nombre d'erreurs par type et histogrammes de latence
+par méthode, avec un export au format texte de Prometheus (fichier ou petit serveur HTTP local).
+
+L'instrumentation est optionnelle : elle passe par un hook (voir core/hooks.py) posé sur l'instance uniquement.
+Désactivée, les méthodes de la classe sont appelées directement et ne coûtent rien de plus.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from bibliotheque_project.core.hooks import Appel, Hook
+
+METHODES_MESUREES = [
+    "emprunter", "rendre",
+    "rechercher_par_titre", "rechercher_par_auteur", "rechercher_par_mot_clef", "rechercher_oeuvres",
+    "rechercher_par_requete", "rechercher_par_expression", "page_livres",
+    "nombre_total_livres", "nombre_total_utilisateurs",
+    "distribution_emprunts_par_utilisateur", "histogramme_emprunts", "resume_emprunts", "top_emprunteurs",
+]
+
+# Bornes (en secondes) des classes exportées vers Prometheus
+BORNES_PROMETHEUS = [1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                     1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+
+class HistogrammeLatence:
+    """
+    Histogramme de latences à précision relative constante, à la manière de HdrHistogram.
+
+    Les durées sont enregistrées en nanosecondes dans des classes log-linéaires : chaque puissance de 2
+    est découpée en 2**(bits_precision - 1) sous-classes, soit une erreur relative inférieure à 2**-(bits_precision - 1).
+    L'enregistrement ne fait que quelques opérations entières et la mémoire ne dépend pas du nombre de mesures.
+    """
+
+    def __init__(self, bits_precision: int = 5) -> None:
+        """
+        Crée un histogramme vide.
+
+        Args:
+            bits_precision (int, optionnel): Nombre de bits significatifs conservés. Par défaut 5 (~3 % d'erreur).
+
+        Returns:
+            None
+        """
+        self._bits = bits_precision
+        self._sous_classes = 1 << bits_precision
+        self._comptes: List[int] = []
+        self.nombre: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+
+    def enregistrer(self, duree_ns: int) -> None:
+        """
+        Enregistre une durée.
+
+        Args:
+            duree_ns (int): Durée en nanosecondes.
+
+        Returns:
+            None
+        """
+        index = self._index(duree_ns)
+        if index >= len(self._comptes):
+            self._comptes.extend([0] * (index + 1 - len(self._comptes)))
+        self._comptes[index] += 1
+        self.nombre += 1
+        self.total_ns += duree_ns
+        if duree_ns > self.max_ns:
+            self.max_ns = duree_ns
+
+    def quantile(self, q: float) -> float:
+        """
+        Retourne une estimation du quantile q des durées enregistrées.
+
+        Args:
+            q (float): Quantile entre 0 et 1 (0.99 pour le p99).
+
+        Returns:
+            float: Durée en secondes (borne haute de la classe contenant le quantile), 0 si l'histogramme est vide.
+        """
+        if self.nombre == 0:
+            return 0.0
+        rang = max(1, int(q * self.nombre + 0.5))
+        cumul = 0
+        for index, compte in enumerate(self._comptes):
+            cumul += compte
+            if cumul >= rang:
+                return min(self._borne_haute(index), self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def cumul_sous(self, borne_s: float) -> int:
+        """
+        Retourne le nombre de durées dont la classe est entièrement inférieure ou égale à une borne.
+
+        Args:
+            borne_s (float): Borne en secondes.
+
+        Returns:
+            int: Nombre de durées enregistrées sous la borne.
+        """
+        borne_ns = borne_s * 1e9
+        return sum(compte for index, compte in enumerate(self._comptes) if self._borne_haute(index) <= borne_ns)
+
+    def moyenne(self) -> float:
+        """
+        Retourne la durée moyenne.
+
+        Args:
+            Aucun
+
+        Returns:
+            float: Durée moyenne en secondes, 0 si l'histogramme est vide.
+        """
+        return self.total_ns / self.nombre / 1e9 if self.nombre else 0.0
+
+    def _index(self, duree_ns: int) -> int:
+        """
+        Calcule la classe d'une durée.
+
+        Args:
+            duree_ns (int): Durée en nanosecondes.
+
+        Returns:
+            int: Index de la classe.
+        """
+        if duree_ns < self._sous_classes:
+            return max(duree_ns, 0)
+        exposant = duree_ns.bit_length() - self._bits
+        demi = self._sous_classes >> 1
+        return self._sous_classes + (exposant - 1) * demi + (duree_ns >> exposant) - demi
+
+    def _borne_haute(self, index: int) -> int:
+        """
+        Calcule la plus grande durée appartenant à une classe.
+
+        Args:
+            index (int): Index de la classe.
+
+        Returns:
+            int: Borne haute de la classe en nanosecondes.
+        """
+        if index < self._sous_classes:
+            return index
+        demi = self._sous_classes >> 1
+        exposant = (index - self._sous_classes) // demi + 1
+        mantisse = (index - self._sous_classes) % demi + demi
+        return ((mantisse + 1) << exposant) - 1
+
+
+class Metriques:
+    """
+    Collecte le nombre d'appels, d'erreurs par type et les latences de chaque méthode instrumentée.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise des métriques vides.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._verrou = threading.Lock()
+        self._appels: Dict[str, int] = {}
+        self._erreurs: Dict[Tuple[str, str], int] = {}
+        self._latences: Dict[str, HistogrammeLatence] = {}
+
+    def enregistrer(self, methode: str, duree_ns: int, erreur: Optional[BaseException] = None) -> None:
+        """
+        Enregistre un appel de méthode.
+
+        Args:
+            methode (str): Nom de la méthode appelée.
+            duree_ns (int): Durée de l'appel en nanosecondes.
+            erreur (BaseException, optionnel): Exception levée par l'appel, le cas échéant.
+
+        Returns:
+            None
+        """
+        with self._verrou:
+            self._appels[methode] = self._appels.get(methode, 0) + 1
+            if erreur is not None:
+                cle = (methode, type(erreur).__name__)
+                self._erreurs[cle] = self._erreurs.get(cle, 0) + 1
+            histogramme = self._latences.get(methode)
+            if histogramme is None:
+                histogramme = self._latences[methode] = HistogrammeLatence()
+            histogramme.enregistrer(duree_ns)
+
+    def instantane(self) -> Dict[str, Dict]:
+        """
+        Retourne une copie des métriques courantes.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[str, Dict]: Par méthode : nombre d'appels, erreurs par type et résumé des latences (en secondes).
+        """
+        with self._verrou:
+            resultat = {}
+            for methode, appels in self._appels.items():
+                histogramme = self._latences[methode]
+                resultat[methode] = {
+                    "appels": appels,
+                    "erreurs": {type_erreur: n for (m, type_erreur), n in self._erreurs.items() if m == methode},
+                    "latence": {
+                        "moyenne_s": histogramme.moyenne(),
+                        "p50_s": histogramme.quantile(0.5),
+                        "p90_s": histogramme.quantile(0.9),
+                        "p99_s": histogramme.quantile(0.99),
+                        "max_s": histogramme.max_ns / 1e9,
+                    },
+                }
+            return resultat
+
+    def reinitialiser(self) -> None:
+        """
+        Remet toutes les métriques à zéro.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        with self._verrou:
+            self._appels.clear()
+            self._erreurs.clear()
+            self._latences.clear()
+
+    def exporter_prometheus(self) -> str:
+        """
+        Exporte les métriques au format texte de Prometheus.
+
+        Args:
+            Aucun
+
+        Returns:
+            str: Les métriques au format d'exposition texte de Prometheus.
+        """
+        lignes = [
+            "# HELP bibliotheque_appels_total Nombre d'appels par méthode.",
+            "# TYPE bibliotheque_appels_total counter",
+        ]
+        with self._verrou:
+            for methode, appels in sorted(self._appels.items()):
+                lignes.append(f'bibliotheque_appels_total{{methode="{methode}"}} {appels}')
+            lignes += [
+                "# HELP bibliotheque_erreurs_total Nombre d'erreurs par méthode et type d'exception.",
+                "# TYPE bibliotheque_erreurs_total counter",
+            ]
+            for (methode, type_erreur), n in sorted(self._erreurs.items()):
+                lignes.append(f'bibliotheque_erreurs_total{{methode="{methode}",type="{type_erreur}"}} {n}')
+            lignes += [
+                "# HELP bibliotheque_latence_secondes Latence des appels par méthode.",
+                "# TYPE bibliotheque_latence_secondes histogram",
+            ]
+            for methode, histogramme in sorted(self._latences.items()):
+                for borne in BORNES_PROMETHEUS:
+                    lignes.append(f'bibliotheque_latence_secondes_bucket{{methode="{methode}",le="{borne:g}"}} '
+                                  f'{histogramme.cumul_sous(borne)}')
+                lignes.append(f'bibliotheque_latence_secondes_bucket{{methode="{methode}",le="+Inf"}} '
+                              f'{histogramme.nombre}')
+                lignes.append(f'bibliotheque_latence_secondes_sum{{methode="{methode}"}} {histogramme.total_ns / 1e9}')
+                lignes.append(f'bibliotheque_latence_secondes_count{{methode="{methode}"}} {histogramme.nombre}')
+        return "\n".join(lignes) + "\n"
+
+    def ecrire_prometheus(self, chemin: str) -> None:
+        """
+        Écrit l'export Prometheus dans un fichier (remplacement atomique, adapté au textfile collector).
+
+        Args:
+            chemin (str): Chemin du fichier .prom à écrire.
+
+        Returns:
+            None
+        """
+        temporaire = f"{chemin}.tmp"
+        with open(temporaire, "w", encoding="utf-8") as fichier:
+            fichier.write(self.exporter_prometheus())
+        os.replace(temporaire, chemin)
+
+    def servir_prometheus(self, port: int = 0, hote: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Démarre dans un thread un serveur HTTP local exposant les métriques sur /metrics.
+
+        Args:
+            port (int, optionnel): Port d'écoute. Par défaut 0 (port libre choisi par le système).
+            hote (str, optionnel): Adresse d'écoute. Par défaut 127.0.0.1.
+
+        Returns:
+            ThreadingHTTPServer: Le serveur démarré (server_address donne le port, shutdown() l'arrête).
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Importé seulement si on sert les métriques
+
+        metriques = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                """Répond aux requêtes GET /metrics."""
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                corps = metriques.exporter_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, format: str, *args) -> None:
+                """Désactive le journal des requêtes sur la sortie d'erreur."""
+                pass
+
+        serveur = ThreadingHTTPServer((hote, port), Gestionnaire)
+        threading.Thread(target=serveur.serve_forever, daemon=True).start()
+        return serveur
+
+
+class HookMetriques(Hook):
+    """
+    Hook qui alimente des Metriques avec la durée et l'erreur éventuelle de chaque appel observé.
+    """
+
+    def __init__(self, metriques: Metriques) -> None:
+        """
+        Crée le hook.
+
+        Args:
+            metriques (Metriques): Métriques à alimenter.
+
+        Returns:
+            None
+        """
+        self.metriques: Metriques = metriques
+
+    def apres(self, appel: Appel) -> None:
+        """
+        Enregistre l'appel dans les métriques.
+
+        Args:
+            appel (Appel): L'appel exécuté.
+
+        Returns:
+            None
+        """
+        self.metriques.enregistrer(appel.methode, appel.duree_ns, appel.erreur)
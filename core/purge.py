@@ -0,0 +1,154 @@
+"""
+Purge en masse des livres ou des utilisateurs, par tranches de durée bornée.
+
+Une purge parcourt les IDs présents à son lancement. Chaque tranche examine les objets suivants et supprime ceux
+qui peuvent l'être (livre disponible, utilisateur sans emprunt, comme supprimer_livre / supprimer_utilisateur)
+et qui vérifient le prédicat, jusqu'à épuiser son budget de temps. L'état d'un objet est lu au moment où il est
+examiné : un livre emprunté entre deux tranches est épargné. Les suppressions passent par le même chemin interne
+que supprimer_livre / supprimer_utilisateur (index, réservations, flux des modifications, instantanés), sans
+revérifier l'existence de l'objet ni passer par les hooks.
+
+Entre deux tranches, le verrou éventuel (par exemple celui du service HTTP, ServeurBibliotheque.verrou) est relâché
+et la purge marque une pause : une requête en attente n'est jamais bloquée plus d'une tranche.
+"""
+import contextlib
+import time
+from typing import Callable, Optional
+
+BUDGET_TRANCHE = 0.005  # Durée maximale d'une tranche, en secondes
+PAUSE_ENTRE_TRANCHES = 0.001  # Laisse aux autres threads le temps de prendre le verrou
+LIVRES = "livres"
+UTILISATEURS = "utilisateurs"
+
+
+class Purge:
+    """
+    Purge par tranches des livres ou des utilisateurs d'une bibliothèque qui vérifient un prédicat.
+    """
+
+    def __init__(self, biblio, nature: str, predicat: Callable[[object], bool], budget: float = BUDGET_TRANCHE) -> None:
+        """
+        Prépare la purge : les IDs à examiner sont relevés maintenant.
+
+        Args:
+            biblio (Bibliotheque): La bibliothèque.
+            nature (str): LIVRES ou UTILISATEURS.
+            predicat (Callable[[object], bool]): Condition de suppression, appelée avec le livre ou l'utilisateur.
+            budget (float, optionnel): Durée maximale d'une tranche, en secondes. Par défaut BUDGET_TRANCHE.
+
+        Raises:
+            ValueError: Si la nature est inconnue ou le budget n'est pas strictement positif.
+
+        Returns:
+            None
+        """
+        if nature not in (LIVRES, UTILISATEURS):
+            raise ValueError(f"Nature de purge inconnue : {nature!r}.")
+        if budget <= 0:
+            raise ValueError("Le budget d'une tranche doit être strictement positif.")
+        self._biblio = biblio
+        self.nature = nature
+        self.predicat = predicat
+        self.budget = budget
+        objets = biblio.iterer_livres() if nature == LIVRES else biblio.iterer_utilisateurs()
+        self._ids = [objet.id for objet in objets]
+        self._position = 0
+        self.examines = 0
+        self.supprimes = 0
+        self.tranches = 0
+        self.duree_max = 0.0  # Durée de la plus longue tranche, en secondes
+
+    @property
+    def termine(self) -> bool:
+        """
+        Indique si tous les IDs ont été examinés.
+
+        Args:
+            Aucun
+
+        Returns:
+            bool: True si la purge est terminée.
+        """
+        return self._position >= len(self._ids)
+
+    def tranche(self) -> int:
+        """
+        Exécute une tranche : examine et supprime des objets jusqu'à épuiser le budget (au moins un objet par tranche).
+        L'appelant doit détenir le verrou de la bibliothèque, s'il y en a un.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'objets supprimés pendant la tranche.
+        """
+        biblio, ids, predicat = self._biblio, self._ids, self.predicat
+        # Lecture par la méthode de la classe : les hooks enregistrés sur l'instance ne sont pas appelés
+        if self.nature == LIVRES:
+            obtenir, supprimable, retirer = type(biblio).livre, _livre_supprimable, biblio._retirer_livre
+        else:
+            obtenir, supprimable, retirer = type(biblio).utilisateur, _utilisateur_supprimable, biblio._retirer_utilisateur
+        horloge = time.perf_counter
+        debut = horloge()
+        fin = debut + self.budget
+        position, supprimes = self._position, 0
+        while position < len(ids):
+            objet = obtenir(biblio, ids[position])
+            position += 1
+            if objet is not None and supprimable(objet) and predicat(objet):
+                retirer(objet)
+                supprimes += 1
+            if horloge() >= fin:
+                break
+        self.examines += position - self._position
+        self._position = position
+        self.supprimes += supprimes
+        self.tranches += 1
+        self.duree_max = max(self.duree_max, horloge() - debut)
+        return supprimes
+
+    def executer(self, verrou: Optional[contextlib.AbstractContextManager] = None,
+                 pause: float = PAUSE_ENTRE_TRANCHES) -> int:
+        """
+        Exécute les tranches jusqu'à la fin de la purge, en prenant le verrou pour chacune et en le relâchant entre deux.
+
+        Args:
+            verrou (AbstractContextManager, optionnel): Verrou qui protège la bibliothèque (threading.Lock...).
+            pause (float, optionnel): Attente entre deux tranches, en secondes. Par défaut PAUSE_ENTRE_TRANCHES.
+
+        Returns:
+            int: Nombre total d'objets supprimés.
+        """
+        verrou = verrou if verrou is not None else contextlib.nullcontext()
+        while not self.termine:
+            with verrou:
+                self.tranche()
+            if pause and not self.termine:
+                time.sleep(pause)
+        return self.supprimes
+
+
+def _livre_supprimable(livre) -> bool:
+    """
+    Vérifie qu'un livre peut être supprimé (il est disponible).
+
+    Args:
+        livre (Livre): Le livre.
+
+    Returns:
+        bool: True si le livre peut être supprimé.
+    """
+    return livre.est_disponible()
+
+
+def _utilisateur_supprimable(utilisateur) -> bool:
+    """
+    Vérifie qu'un utilisateur peut être supprimé (il n'a aucun livre emprunté).
+
+    Args:
+        utilisateur (Utilisateur): L'utilisateur.
+
+    Returns:
+        bool: True si l'utilisateur peut être supprimé.
+    """
+    return not utilisateur.livres_empruntes
@@ -0,0 +1,166 @@
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Optional
+
+from bibliotheque_project.models.utilisateur import Utilisateur
+
+
+class PolitiqueQuota:
+    """
+    Décrit les limites d'emprunt d'une catégorie d'utilisateurs.
+    """
+
+    def __init__(self, max_simultanes: Optional[int] = None, max_par_periode: Optional[int] = None,
+                 periode: timedelta = timedelta(days=30)) -> None:
+        """
+        Crée une politique de quota. Une limite à None n'est pas appliquée.
+
+        Args:
+            max_simultanes (int, optionnel): Nombre maximal de livres empruntés en même temps.
+            max_par_periode (int, optionnel): Nombre maximal d'emprunts sur une fenêtre glissante.
+            periode (timedelta, optionnel): Durée de la fenêtre glissante. Par défaut 30 jours.
+
+        Returns:
+            None
+        """
+        self.max_simultanes: Optional[int] = max_simultanes
+        self.max_par_periode: Optional[int] = max_par_periode
+        self.periode: timedelta = periode
+
+    def __repr__(self) -> str:
+        """
+        Fournit une représentation textuelle de la politique pour le débogage.
+
+        Args:
+            Aucun
+
+        Returns:
+            str: Représentation de la politique avec ses limites.
+        """
+        return (f"<PolitiqueQuota max_simultanes={self.max_simultanes} "
+                f"max_par_periode={self.max_par_periode} periode={self.periode}>")
+
+
+class GestionnaireQuotas:
+    """
+    Vérifie les quotas d'emprunt en O(1) amorti.
+
+    Le nombre d'emprunts en cours est la longueur de la liste d'emprunts de l'utilisateur.
+    Pour la fenêtre glissante, on conserve par utilisateur les dates de ses derniers emprunts
+    dans une deque bornée par le quota : les dates sorties de la fenêtre sont retirées en tête.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise un gestionnaire sans politique (aucune limite).
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._politiques: Dict[str, PolitiqueQuota] = {}
+        self._fenetres: Dict[int, Deque[datetime]] = {}
+
+    def definir_politique(self, categorie: str, politique: Optional[PolitiqueQuota]) -> None:
+        """
+        Définit (ou supprime avec None) la politique de quota d'une catégorie d'utilisateurs.
+
+        Args:
+            categorie (str): Catégorie d'utilisateurs concernée.
+            politique (PolitiqueQuota, optionnel): Politique à appliquer, None pour retirer toute limite.
+
+        Returns:
+            None
+        """
+        if politique is None:
+            self._politiques.pop(categorie, None)
+        else:
+            self._politiques[categorie] = politique
+
+    def politique(self, categorie: str) -> Optional[PolitiqueQuota]:
+        """
+        Retourne la politique de quota d'une catégorie.
+
+        Args:
+            categorie (str): Catégorie d'utilisateurs.
+
+        Returns:
+            Optional[PolitiqueQuota]: La politique, None si la catégorie n'est pas limitée.
+        """
+        return self._politiques.get(categorie)
+
+    def verifier(self, utilisateur: Utilisateur, maintenant: datetime) -> None:
+        """
+        Vérifie qu'un utilisateur peut emprunter un livre de plus.
+
+        Args:
+            utilisateur (Utilisateur): L'utilisateur qui souhaite emprunter.
+            maintenant (datetime): Date de l'emprunt.
+
+        Raises:
+            ValueError: Si l'un des quotas de la catégorie de l'utilisateur est atteint.
+
+        Returns:
+            None
+        """
+        politique = self._politiques.get(utilisateur.categorie)
+        if politique is None:
+            return
+        if politique.max_simultanes is not None and utilisateur.nb_emprunts() >= politique.max_simultanes:
+            raise ValueError(f"Quota atteint : {politique.max_simultanes} emprunts simultanés au maximum "
+                             f"pour la catégorie '{utilisateur.categorie}'.")
+        if politique.max_par_periode is not None:
+            fenetre = self._fenetre(utilisateur.id, politique, maintenant)
+            if len(fenetre) >= politique.max_par_periode:
+                raise ValueError(f"Quota atteint : {politique.max_par_periode} emprunts par période au maximum "
+                                 f"pour la catégorie '{utilisateur.categorie}'.")
+
+    def enregistrer(self, utilisateur: Utilisateur, maintenant: datetime) -> None:
+        """
+        Comptabilise un emprunt réussi dans la fenêtre glissante de l'utilisateur.
+
+        Args:
+            utilisateur (Utilisateur): L'emprunteur.
+            maintenant (datetime): Date de l'emprunt.
+
+        Returns:
+            None
+        """
+        politique = self._politiques.get(utilisateur.categorie)
+        if politique is not None and politique.max_par_periode is not None:
+            self._fenetre(utilisateur.id, politique, maintenant).append(maintenant)
+
+    def oublier(self, utilisateur_id: int) -> None:
+        """
+        Supprime les compteurs d'un utilisateur (par exemple à sa suppression).
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Returns:
+            None
+        """
+        self._fenetres.pop(utilisateur_id, None)
+
+    def _fenetre(self, utilisateur_id: int, politique: PolitiqueQuota, maintenant: datetime) -> Deque[datetime]:
+        """
+        Retourne la deque des dates d'emprunt de l'utilisateur encore dans la fenêtre glissante.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            politique (PolitiqueQuota): Politique appliquée à l'utilisateur.
+            maintenant (datetime): Date de référence.
+
+        Returns:
+            Deque[datetime]: Les dates d'emprunt dans la fenêtre, de la plus ancienne à la plus récente.
+        """
+        fenetre = self._fenetres.get(utilisateur_id)
+        if fenetre is None or fenetre.maxlen != politique.max_par_periode:
+            fenetre = deque(fenetre or (), maxlen=politique.max_par_periode)
+            self._fenetres[utilisateur_id] = fenetre
+        debut = maintenant - politique.periode
+        while fenetre and fenetre[0] <= debut:
+            fenetre.popleft()
+        return fenetre
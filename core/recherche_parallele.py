@@ -0,0 +1,259 @@
+"""
+Recherche parallèle par parcours complet, pour les très grands catalogues en mémoire.
+
+Les recherches qu'aucun index n'accélère (requêtes de moins de 3 caractères, expressions régulières) parcourent
+tout le catalogue. RechercheParallele copie les titres et auteurs dans un bloc de mémoire partagée
+(multiprocessing.shared_memory), découpé en plages de livres consécutifs ; un pool de processus parcourt les plages
+sans que le texte soit copié vers eux. Chaque processus renvoie les IDs des livres de sa plage qui semblent
+correspondre ; le processus principal les vérifie sur les livres eux-mêmes avec le même prédicat que le parcours
+séquentiel, dans l'ordre du parcours séquentiel : le résultat est identique.
+
+Le bloc suit les modifications par le flux des modifications (voir Bibliotheque.abonner) : un livre supprimé est
+écarté, un livre ajouté est vérifié directement par le processus principal, et le bloc est reconstruit à la
+recherche suivante quand ces écarts deviennent trop nombreux, ou dès qu'un livre du bloc change de titre ou d'auteur.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from bibliotheque_project.core import flux_modifications as flux
+from bibliotheque_project.models.livre import Livre
+
+SEPARATEUR_CHAMPS = "\x1f"  # Séparateurs ASCII d'unité et d'enregistrement, absents des textes usuels
+SEPARATEUR_LIVRES = "\x1e"
+CHAMPS = ("titre", "auteur")
+PROPORTION_ECARTS_MAX = 0.1  # Reconstruction quand les ajouts et suppressions dépassent 10 % du bloc
+
+_memoire_partagee: Optional[shared_memory.SharedMemory] = None  # Bloc ouvert par un processus du pool
+
+
+class RechercheParallele:
+    """
+    Bloc partagé des titres et auteurs d'une bibliothèque et pool de processus qui le parcourt.
+    """
+
+    def __init__(self, biblio, nb_processus: Optional[int] = None, nb_plages: Optional[int] = None) -> None:
+        """
+        Crée le pool et s'abonne aux modifications de la bibliothèque ; le bloc est construit à la première recherche.
+
+        Args:
+            biblio (Bibliotheque): La bibliothèque.
+            nb_processus (int, optionnel): Nombre de processus du pool. Par défaut le nombre de cœurs.
+            nb_plages (int, optionnel): Nombre de plages du bloc. Par défaut 4 par processus.
+
+        Returns:
+            None
+        """
+        self._biblio = biblio
+        nb_processus = nb_processus or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(nb_processus)
+        self._nb_plages = nb_plages or 4 * nb_processus
+        self._memoire: Optional[shared_memory.SharedMemory] = None
+        self._plages: List[Tuple[int, int]] = []
+        self._taille_bloc = 0
+        self._ajoutes: Dict[int, None] = {}  # IDs ajoutés depuis la construction du bloc, dans l'ordre
+        self._supprimes: Set[int] = set()
+        self._perime = True
+        biblio.abonner(self._sur_evenement)
+
+    def rechercher(self, requete: str, champs: Sequence[str], predicat: Callable[[Livre], bool],
+                   expression: bool = False) -> List[Livre]:
+        """
+        Retourne les livres qui vérifient le prédicat, dans l'ordre du parcours séquentiel de la bibliothèque.
+
+        Args:
+            requete (str): Chaîne recherchée, déjà en minuscules, ou expression régulière.
+            champs (Sequence[str]): Champs examinés ("titre", "auteur").
+            predicat (Callable[[Livre], bool]): Condition exacte, vérifiée sur chaque livre retenu.
+            expression (bool, optionnel): La requête est une expression régulière, appliquée aux textes d'origine.
+                Sinon, sous-chaîne cherchée dans les textes en minuscules. Par défaut False.
+
+        Returns:
+            List[Livre]: Les livres trouvés.
+        """
+        if self._perime or len(self._ajoutes) + len(self._supprimes) > PROPORTION_ECARTS_MAX * self._taille_bloc:
+            self._construire()
+        positions = [CHAMPS.index(champ) + 1 for champ in champs]
+        taches = [(self._memoire.name, debut, fin, requete, positions, expression) for debut, fin in self._plages]
+        livres = self._biblio._livres
+        resultats = []
+        for ids in self._pool.map(_analyser_plage, taches):
+            for livre_id in ids:
+                if livre_id not in self._supprimes:
+                    livre = livres.get(livre_id)
+                    if livre is not None and predicat(livre):
+                        resultats.append(livre)
+        for livre_id in self._ajoutes:
+            livre = livres.get(livre_id)
+            if livre is not None and predicat(livre):
+                resultats.append(livre)
+        return resultats
+
+    def fermer(self) -> None:
+        """
+        Se désabonne, arrête le pool et libère le bloc partagé.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._biblio.desabonner(self._sur_evenement)
+        self._pool.shutdown()
+        self._liberer()
+
+    def _construire(self) -> None:
+        """
+        Écrit les titres et auteurs de tous les livres dans un nouveau bloc partagé, dans l'ordre du parcours
+        séquentiel, une ligne "id, titre, auteur" par livre, et le découpe en plages.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        livres = self._biblio._livres
+        lignes = [f"{livre.id}{SEPARATEUR_CHAMPS}{_nettoyer(livre.titre)}{SEPARATEUR_CHAMPS}"
+                  f"{_nettoyer(livre.auteur)}{SEPARATEUR_LIVRES}" for livre in livres.values()]
+        taille_plage = max(1, -(-len(lignes) // self._nb_plages))
+        morceaux = ["".join(lignes[i:i + taille_plage]).encode("utf-8") for i in range(0, len(lignes), taille_plage)]
+        self._liberer()
+        self._memoire = shared_memory.SharedMemory(create=True, size=max(1, sum(len(m) for m in morceaux)))
+        self._plages = []
+        position = 0
+        for morceau in morceaux:
+            self._memoire.buf[position:position + len(morceau)] = morceau
+            self._plages.append((position, position + len(morceau)))
+            position += len(morceau)
+        self._taille_bloc = len(lignes)
+        self._ajoutes.clear()
+        self._supprimes.clear()
+        self._perime = False
+
+    def _liberer(self) -> None:
+        """
+        Libère le bloc partagé courant.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        if self._memoire is not None:
+            self._memoire.close()
+            self._memoire.unlink()
+            self._memoire = None
+
+    def _sur_evenement(self, evenement: Dict) -> None:
+        """
+        Tient compte d'une modification de la bibliothèque. Ne lève jamais d'exception : en cas d'erreur,
+        le bloc est déclaré périmé et sera reconstruit à la prochaine recherche.
+
+        Args:
+            evenement (Dict): Événement du flux des modifications.
+
+        Returns:
+            None
+        """
+        try:
+            self._appliquer(evenement)
+        except Exception:
+            self._perime = True
+
+    def _appliquer(self, evenement: Dict) -> None:
+        """
+        Note un livre ajouté, modifié ou supprimé depuis la construction du bloc.
+
+        Args:
+            evenement (Dict): Événement du flux des modifications.
+
+        Returns:
+            None
+        """
+        type_evenement = evenement["type"]
+        if type_evenement == flux.LIVRE_AJOUTE:
+            if evenement["livre_id"] in self._supprimes:
+                self._perime = True  # Un ID réinséré peut changer de place dans le parcours
+            else:
+                self._ajoutes[evenement["livre_id"]] = None
+        elif type_evenement == flux.LIVRE_MODIFIE:
+            if evenement["livre_id"] not in self._ajoutes:
+                self._perime = True  # Le texte du bloc n'est plus celui du livre
+        elif type_evenement == flux.LIVRE_SUPPRIME:
+            if evenement["livre_id"] in self._ajoutes:
+                del self._ajoutes[evenement["livre_id"]]
+            else:
+                self._supprimes.add(evenement["livre_id"])
+
+
+def _nettoyer(texte: str) -> str:
+    """
+    Remplace les séparateurs du bloc qui apparaîtraient dans un texte.
+
+    Args:
+        texte (str): Titre ou auteur.
+
+    Returns:
+        str: Le texte sans séparateur.
+    """
+    if SEPARATEUR_CHAMPS in texte or SEPARATEUR_LIVRES in texte:
+        return texte.replace(SEPARATEUR_CHAMPS, " ").replace(SEPARATEUR_LIVRES, " ")
+    return texte
+
+
+def _ouvrir_memoire(nom: str) -> shared_memory.SharedMemory:
+    """
+    Ouvre un bloc partagé dans un processus du pool, en refermant le bloc précédent.
+
+    Args:
+        nom (str): Nom du bloc.
+
+    Returns:
+        shared_memory.SharedMemory: Le bloc ouvert.
+    """
+    global _memoire_partagee
+    if _memoire_partagee is None or _memoire_partagee.name != nom:
+        if _memoire_partagee is not None:
+            _memoire_partagee.close()
+        _memoire_partagee = shared_memory.SharedMemory(name=nom)
+    return _memoire_partagee
+
+
+def _analyser_plage(tache: tuple) -> List[int]:
+    """
+    Parcourt une plage du bloc et retourne les IDs des livres dont un des champs demandés semble correspondre
+    (exécuté dans un processus du pool).
+
+    Args:
+        tache (tuple): Nom du bloc, début et fin de la plage, requête, positions des champs, expression ou non.
+
+    Returns:
+        List[int]: IDs retenus, dans l'ordre de la plage.
+    """
+    nom, debut, fin, requete, positions, expression = tache
+    texte = bytes(_ouvrir_memoire(nom).buf[debut:fin]).decode("utf-8")
+    ids = []
+    if expression:
+        motif = re.compile(requete)
+        for ligne in texte.split(SEPARATEUR_LIVRES)[:-1]:
+            champs = ligne.split(SEPARATEUR_CHAMPS)
+            if any(motif.search(champs[i]) for i in positions):
+                ids.append(int(champs[0]))
+        return ids
+    texte = texte.lower()  # Les positions sont lues dans le texte en minuscules, jamais dans l'original
+    position = texte.find(requete)
+    while position != -1:
+        debut_ligne = texte.rfind(SEPARATEUR_LIVRES, 0, position) + 1
+        fin_ligne = texte.find(SEPARATEUR_LIVRES, position)
+        if fin_ligne == -1:
+            break
+        champs = texte[debut_ligne:fin_ligne].split(SEPARATEUR_CHAMPS)
+        if len(champs) == 3 and any(requete in champs[i] for i in positions):
+            ids.append(int(champs[0]))
+        position = texte.find(requete, fin_ligne + 1)
+    return ids
@@ -0,0 +1,258 @@
+import heapq
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class MoteurRecommandations:
+    """
+    Moteur "les utilisateurs qui ont emprunté ce livre ont aussi emprunté".
+
+    Pour chaque livre, on maintient un dictionnaire creux {livre_voisin: nombre d'utilisateurs ayant emprunté les deux}.
+    Seuls les derniers livres distincts de chaque utilisateur (taille_historique) participent aux co-emprunts,
+    et chaque liste de voisins est élaguée aux k_max meilleurs dès qu'elle dépasse 2 * k_max entrées :
+    la mémoire reste bornée et chaque emprunt coûte O(taille_historique) en amorti.
+    """
+
+    def __init__(self, taille_historique: int = 50, k_max: int = 20) -> None:
+        """
+        Initialise un moteur vide.
+
+        Args:
+            taille_historique (int, optionnel): Nombre de livres distincts retenus par utilisateur. Par défaut 50.
+            k_max (int, optionnel): Nombre de voisins conservés par livre après élagage. Par défaut 20.
+
+        Returns:
+            None
+        """
+        self.taille_historique: int = taille_historique
+        self.k_max: int = k_max
+        self._historiques: Dict[int, "OrderedDict[int, None]"] = {}
+        self._voisins: Dict[int, Dict[int, int]] = {}
+        self._popularite: Dict[int, int] = {}
+
+    def enregistrer_emprunt(self, utilisateur_id: int, livre_id: int) -> None:
+        """
+        Met à jour les co-emprunts et la popularité après un emprunt.
+
+        Args:
+            utilisateur_id (int): ID de l'emprunteur.
+            livre_id (int): ID du livre emprunté.
+
+        Returns:
+            None
+        """
+        self._popularite[livre_id] = self._popularite.get(livre_id, 0) + 1
+        historique = self._historiques.setdefault(utilisateur_id, OrderedDict())
+        if livre_id in historique:
+            # Paire déjà comptée pour cet utilisateur : on rafraîchit seulement l'historique
+            historique.move_to_end(livre_id)
+            return
+        for autre_id in historique:
+            self._incrementer(autre_id, livre_id)
+            self._incrementer(livre_id, autre_id)
+        historique[livre_id] = None
+        if len(historique) > self.taille_historique:
+            historique.popitem(last=False)
+
+    def recommandations(self, livre_id: int, k: int, filtre: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """
+        Retourne les k livres les plus souvent co-empruntés avec un livre donné.
+
+        Args:
+            livre_id (int): ID du livre de référence.
+            k (int): Nombre de recommandations souhaitées.
+            filtre (Callable[[int], bool], optionnel): Prédicat sur l'ID d'un voisin pour l'accepter.
+
+        Returns:
+            List[int]: IDs des livres recommandés, du plus au moins co-emprunté (à égalité, par ID croissant).
+        """
+        return [voisin for voisin, _ in _meilleurs(self._voisins.get(livre_id, {}), k, filtre)]
+
+    def populaires(self, k: int, filtre: Optional[Callable[[int], bool]] = None) -> List[int]:
+        """
+        Retourne les k livres les plus empruntés.
+
+        Args:
+            k (int): Nombre de livres souhaités.
+            filtre (Callable[[int], bool], optionnel): Prédicat sur l'ID d'un livre pour l'accepter.
+
+        Returns:
+            List[int]: IDs des livres les plus empruntés (à égalité, par ID croissant).
+        """
+        return [livre_id for livre_id, _ in _meilleurs(self._popularite, k, filtre)]
+
+    def nombre_emprunts(self, livre_id: int) -> int:
+        """
+        Retourne le nombre d'emprunts d'un livre.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            int: Nombre d'emprunts enregistrés (0 pour un livre jamais emprunté).
+        """
+        return self._popularite.get(livre_id, 0)
+
+    def oublier_livre(self, livre_id: int) -> None:
+        """
+        Retire un livre des voisins et de la popularité (par exemple lorsqu'il est supprimé du catalogue).
+        Les références restantes dans les listes des autres livres sont filtrées à la lecture.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            None
+        """
+        self._voisins.pop(livre_id, None)
+        self._popularite.pop(livre_id, None)
+
+    def reconstruire(self, evenements: Iterable[Tuple[int, int]], paires_par_lot: int = 1_000_000) -> None:
+        """
+        Recalcule entièrement les co-emprunts à partir d'un historique d'emprunts (utilisateur_id, livre_id),
+        dans l'ordre chronologique, avec des opérations NumPy vectorisées (reconstruction nocturne).
+        Comme en mode incrémental, seuls les taille_historique derniers livres distincts de chaque utilisateur
+        sont pris en compte et chaque livre garde ses k_max meilleurs voisins.
+
+        Les paires de co-emprunts (h² pour un utilisateur de h livres retenus, h <= taille_historique) sont
+        produites par lots d'utilisateurs d'au plus paires_par_lot paires, et leurs comptes fusionnés après
+        chaque lot : la mémoire de travail est en O(nombre d'événements + paires_par_lot + taille_historique²
+        + nombre de couples de livres distincts), et non en O(somme des h² sur tous les utilisateurs).
+
+        Args:
+            evenements (Iterable[Tuple[int, int]]): Emprunts (utilisateur_id, livre_id) du plus ancien au plus récent.
+            paires_par_lot (int, optionnel): Nombre maximal de paires produites à la fois (un utilisateur n'est
+                jamais coupé entre deux lots). Par défaut 1 000 000.
+
+        Returns:
+            None
+        """
+        import numpy as np
+
+        paires = np.array(list(evenements), dtype=np.int64).reshape(-1, 2)
+        self._historiques = {}
+        self._voisins = {}
+        self._popularite = {}
+        if len(paires) == 0:
+            return
+        utilisateurs, livres = paires[:, 0], paires[:, 1]
+
+        ids_livres, nb_emprunts = np.unique(livres, return_counts=True)
+        self._popularite = dict(zip(ids_livres.tolist(), nb_emprunts.tolist()))
+
+        # Dernière occurrence de chaque couple (utilisateur, livre), puis tri par utilisateur et chronologie
+        base = int(livres.max()) + 1
+        cles = utilisateurs * base + livres
+        _, premiers_a_rebours = np.unique(cles[::-1], return_index=True)
+        positions = len(cles) - 1 - premiers_a_rebours
+        positions = positions[np.lexsort((positions, utilisateurs[positions]))]
+        utilisateurs, livres = utilisateurs[positions], livres[positions]
+
+        # On ne garde que les taille_historique derniers livres distincts de chaque utilisateur
+        rang_depuis_fin = self._rangs(utilisateurs[::-1])[::-1]
+        garder = rang_depuis_fin < self.taille_historique
+        utilisateurs, livres = utilisateurs[garder], livres[garder]
+        for utilisateur_id, livre_id in zip(utilisateurs.tolist(), livres.tolist()):
+            self._historiques.setdefault(utilisateur_id, OrderedDict())[livre_id] = None
+
+        # Comptage des paires, lot d'utilisateurs par lot d'utilisateurs
+        _, debuts, tailles = np.unique(utilisateurs, return_index=True, return_counts=True)
+        paires_cumulees = np.cumsum(tailles * tailles)
+        couples = np.empty(0, dtype=np.int64)
+        comptes = np.empty(0, dtype=np.int64)
+        premier = 0
+        while premier < len(tailles):
+            deja = paires_cumulees[premier - 1] if premier else 0
+            dernier = max(premier + 1, int(np.searchsorted(paires_cumulees, deja + paires_par_lot, side="right")))
+            debut, fin = debuts[premier], debuts[dernier - 1] + tailles[dernier - 1]
+            codes = self._paires(livres[debut:fin], debuts[premier:dernier] - debut, tailles[premier:dernier], base)
+            couples, inverse = np.unique(np.concatenate((couples, codes)), return_inverse=True)
+            comptes = np.bincount(inverse, weights=np.concatenate((comptes, np.ones(len(codes), dtype=np.int64))),
+                                  minlength=len(couples)).astype(np.int64)
+            premier = dernier
+        if len(couples) == 0:
+            return
+
+        # Conservation des k_max meilleurs voisins par livre
+        a, b = couples // base, couples % base
+        ordre = np.lexsort((b, -comptes, a))
+        a, b, comptes = a[ordre], b[ordre], comptes[ordre]
+        garder = self._rangs(a) < self.k_max
+        for livre_id, voisin_id, compte in zip(a[garder].tolist(), b[garder].tolist(), comptes[garder].tolist()):
+            self._voisins.setdefault(livre_id, {})[voisin_id] = compte
+
+    @staticmethod
+    def _paires(livres, debuts, tailles, base: int):
+        """
+        Produit le produit cartésien des livres de chaque utilisateur, sans boucle Python ni paire (x, x).
+
+        Args:
+            livres (numpy.ndarray): Livres retenus, groupés par utilisateur.
+            debuts (numpy.ndarray): Position du premier livre de chaque utilisateur.
+            tailles (numpy.ndarray): Nombre de livres de chaque utilisateur.
+            base (int): Base de codage d'un couple (a, b) en a * base + b.
+
+        Returns:
+            numpy.ndarray: Codes des couples ordonnés (a, b), a et b empruntés par un même utilisateur.
+        """
+        import numpy as np
+
+        tailles_par_element = np.repeat(tailles, tailles)
+        debuts_par_element = np.repeat(debuts, tailles)
+        gauche = np.repeat(np.arange(len(livres)), tailles_par_element)
+        debut_bloc = np.repeat(np.cumsum(tailles_par_element) - tailles_par_element, tailles_par_element)
+        droite = np.repeat(debuts_par_element, tailles_par_element) + np.arange(len(gauche)) - debut_bloc
+        distincts = gauche != droite
+        return livres[gauche[distincts]] * base + livres[droite[distincts]]
+
+    @staticmethod
+    def _rangs(groupes):
+        """
+        Retourne le rang de chaque élément au sein de son groupe, les groupes étant contigus.
+
+        Args:
+            groupes (numpy.ndarray): Identifiants de groupe, triés par groupe.
+
+        Returns:
+            numpy.ndarray: Rang (0, 1, 2...) de chaque élément dans son groupe.
+        """
+        import numpy as np
+
+        _, debuts, tailles = np.unique(groupes, return_index=True, return_counts=True)
+        return np.arange(len(groupes)) - np.repeat(np.sort(debuts), tailles[np.argsort(debuts)])
+
+    def _incrementer(self, livre_id: int, voisin_id: int) -> None:
+        """
+        Incrémente le co-emprunt (livre_id, voisin_id) et élague la liste de voisins si elle devient trop longue.
+
+        Args:
+            livre_id (int): ID du livre.
+            voisin_id (int): ID du livre co-emprunté.
+
+        Returns:
+            None
+        """
+        voisins = self._voisins.setdefault(livre_id, {})
+        voisins[voisin_id] = voisins.get(voisin_id, 0) + 1
+        if len(voisins) > 2 * self.k_max:
+            self._voisins[livre_id] = dict(_meilleurs(voisins, self.k_max))
+
+
+def _meilleurs(compteurs: Dict[int, int], k: int,
+               filtre: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, int]]:
+    """
+    Retourne les k couples (id, compte) de plus grand compte (à égalité, par ID croissant) qui passent le filtre,
+    par sélection partielle (tas de taille k) plutôt que par un tri complet.
+
+    Args:
+        compteurs (Dict[int, int]): Compte par ID.
+        k (int): Nombre de couples souhaités.
+        filtre (Callable[[int], bool], optionnel): Prédicat sur l'ID pour l'accepter.
+
+    Returns:
+        List[Tuple[int, int]]: Les couples, du plus grand au plus petit compte.
+    """
+    candidats = compteurs.items()
+    if filtre is not None:
+        candidats = (item for item in candidats if filtre(item[0]))
+    return heapq.nlargest(k, candidats, key=lambda item: (item[1], -item[0]))
@@ -0,0 +1,563 @@
+"""
+Langage de requêtes du catalogue : opérateurs booléens, phrases, préfixes de champ, jokers et expressions régulières.
+
+Syntaxe :
+    hugo misérables             les deux termes (ET implicite)
+    hugo OR camus               l'un ou l'autre (aussi OU)
+    hugo AND NOT misérables     ET, NOT / NON, ou "-misérables"
+    "le rouge"                  phrase exacte
+    auteur:hugo titre:paris     terme limité à un champ (titre ou auteur ; par défaut les deux)
+    mis*bles  r?ve              jokers : * (suite quelconque) et ? (un caractère)
+    /^Les [A-Z]/                expression régulière (module re, sensible à la casse)
+    (hugo OR camus) -peste      parenthèses
+
+Les termes, phrases et jokers sont insensibles à la casse et cherchés comme sous-chaînes, comme dans
+rechercher_par_mot_clef. Une requête est compilée en un arbre de noeuds ; chaque noeud sait vérifier un livre
+et calculer ses candidats à partir des index (trigrammes des titres, dictionnaire des auteurs) : ET intersecte,
+OU réunit, NON retranche quand l'ensemble retranché est exact. Seuls les livres candidats sont vérifiés ;
+le catalogue n'est parcouru en entier que si aucun index ne restreint la requête (terme de moins de 3 caractères
+sur le titre, expression régulière, négation seule). Les requêtes compilées sont gardées dans un cache LRU.
+"""
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Set, Tuple
+
+from bibliotheque_project.models.livre import Livre
+
+CHAMPS = ("titre", "auteur")
+TAILLE_CACHE_REQUETES = 256
+OPERATEURS_ET = ("AND", "ET")
+OPERATEURS_OU = ("OR", "OU")
+OPERATEURS_NON = ("NOT", "NON")
+_JETON = re.compile(r'\s*(?:(?P<parenthese>[()])|(?P<moins>-)(?=[^\s()])|(?P<champ>titre|auteur):'
+                    r'|"(?P<phrase>[^"]*)"|/(?P<expression>(?:\\.|[^/\\])*)/|(?P<mot>[^\s()"]+))')
+_JOKERS = re.compile(r"[*?]")
+
+Candidats = Tuple[Optional[Set[int]], bool]  # IDs candidats (None : aucun index ne s'applique) et exactitude
+
+
+class Noeud(ABC):
+    """
+    Noeud d'une requête compilée.
+    """
+
+    @abstractmethod
+    def verifier(self, livre: Livre) -> bool:
+        """
+        Vérifie si un livre satisfait le noeud.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            bool: True si le livre correspond.
+        """
+
+    @abstractmethod
+    def candidats(self, index_titres, auteurs) -> Candidats:
+        """
+        Calcule les IDs des livres pouvant satisfaire le noeud à partir des index.
+
+        Args:
+            index_titres (IndexTrigrammes): Index des titres de la bibliothèque.
+            auteurs (DictionnaireAuteurs): Dictionnaire des auteurs de la bibliothèque.
+
+        Returns:
+            Candidats: Sur-ensemble des IDs des livres trouvés (None si aucun index ne s'applique),
+                et True si l'ensemble est exactement celui des livres trouvés.
+        """
+
+
+class Terme(Noeud):
+    """
+    Sous-chaîne (mot ou phrase) cherchée dans un champ ou dans les deux, sans tenir compte de la casse.
+    """
+
+    def __init__(self, texte: str, champ: Optional[str] = None) -> None:
+        """
+        Crée le terme.
+
+        Args:
+            texte (str): Sous-chaîne cherchée.
+            champ (str, optionnel): "titre" ou "auteur" ; par défaut les deux.
+
+        Returns:
+            None
+        """
+        self.texte = texte.lower()
+        self.champs = (champ,) if champ else CHAMPS
+
+    def verifier(self, livre: Livre) -> bool:
+        """
+        Vérifie si le terme apparaît dans l'un des champs du livre.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            bool: True si le terme apparaît.
+        """
+        return any(self.texte in getattr(livre, champ).lower() for champ in self.champs)
+
+    def candidats(self, index_titres, auteurs) -> Candidats:
+        """
+        Réunit les candidats des index de chaque champ.
+
+        Args:
+            index_titres (IndexTrigrammes): Index des titres de la bibliothèque.
+            auteurs (DictionnaireAuteurs): Dictionnaire des auteurs de la bibliothèque.
+
+        Returns:
+            Candidats: IDs des livres pouvant contenir le terme (None si un champ n'a pas d'index utilisable),
+                exacts seulement si le terme ne porte que sur l'auteur.
+        """
+        ids: Set[int] = set()
+        exact = True
+        for champ in self.champs:
+            ids_champ = index_titres.candidats(self.texte) if champ == "titre" else auteurs.candidats(self.texte)
+            if ids_champ is None:
+                return None, False
+            ids |= ids_champ
+            exact = exact and champ == "auteur"  # Les candidats des trigrammes d'un titre restent à vérifier
+        return ids, exact
+
+
+class Motif(Noeud):
+    """
+    Expression régulière cherchée dans un champ ou dans les deux. Les fragments littéraux d'un terme à jokers
+    (au moins 3 caractères) restreignent les candidats par les index.
+    """
+
+    def __init__(self, expression: "re.Pattern", champ: Optional[str] = None, fragments: Tuple[str, ...] = ()) -> None:
+        """
+        Crée le motif.
+
+        Args:
+            expression (re.Pattern): Expression compilée.
+            champ (str, optionnel): "titre" ou "auteur" ; par défaut les deux.
+            fragments (Tuple[str, ...], optionnel): Sous-chaînes présentes dans tout texte qui correspond.
+
+        Returns:
+            None
+        """
+        self.expression = expression
+        self.champs = (champ,) if champ else CHAMPS
+        self.fragments = fragments
+
+    def verifier(self, livre: Livre) -> bool:
+        """
+        Vérifie si l'expression trouve une correspondance dans l'un des champs du livre.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            bool: True si l'expression correspond.
+        """
+        return any(self.expression.search(getattr(livre, champ)) for champ in self.champs)
+
+    def candidats(self, index_titres, auteurs) -> Candidats:
+        """
+        Intersecte les candidats des fragments littéraux du motif.
+
+        Args:
+            index_titres (IndexTrigrammes): Index des titres de la bibliothèque.
+            auteurs (DictionnaireAuteurs): Dictionnaire des auteurs de la bibliothèque.
+
+        Returns:
+            Candidats: IDs des livres contenant tous les fragments (None sans fragment indexable), jamais exacts.
+        """
+        ids: Optional[Set[int]] = None
+        for fragment in self.fragments:
+            ids_fragment, _ = Terme(fragment, self.champs[0] if len(self.champs) == 1 else None).candidats(
+                index_titres, auteurs)
+            if ids_fragment is not None:
+                ids = ids_fragment if ids is None else ids & ids_fragment
+        return ids, False
+
+
+class Et(Noeud):
+    """
+    Conjonction : intersection des candidats, dont on retranche ceux des négations exactes.
+    """
+
+    def __init__(self, noeuds: List[Noeud]) -> None:
+        """
+        Crée la conjonction.
+
+        Args:
+            noeuds (List[Noeud]): Les opérandes.
+
+        Returns:
+            None
+        """
+        self.noeuds = noeuds
+
+    def verifier(self, livre: Livre) -> bool:
+        """
+        Vérifie si le livre satisfait tous les opérandes.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            bool: True si tous les opérandes correspondent.
+        """
+        return all(noeud.verifier(livre) for noeud in self.noeuds)
+
+    def candidats(self, index_titres, auteurs) -> Candidats:
+        """
+        Intersecte les candidats des opérandes et retranche ceux des négations exactes.
+
+        Args:
+            index_titres (IndexTrigrammes): Index des titres de la bibliothèque.
+            auteurs (DictionnaireAuteurs): Dictionnaire des auteurs de la bibliothèque.
+
+        Returns:
+            Candidats: Intersection des candidats (None si aucun opérande n'en a), exacte si tous les opérandes le sont.
+        """
+        ids: Optional[Set[int]] = None
+        exact = True
+        exclus: List[Set[int]] = []
+        for noeud in self.noeuds:
+            if isinstance(noeud, Non):
+                ids_noeud, exact_noeud = noeud.noeud.candidats(index_titres, auteurs)
+                if ids_noeud is not None and exact_noeud:
+                    exclus.append(ids_noeud)
+                else:
+                    exact = False
+                continue
+            ids_noeud, exact_noeud = noeud.candidats(index_titres, auteurs)
+            if ids_noeud is None:
+                exact = False
+                continue
+            exact = exact and exact_noeud
+            ids = ids_noeud if ids is None else ids & ids_noeud
+        if ids is None:
+            return None, False
+        for ids_exclus in exclus:
+            ids = ids - ids_exclus
+        return ids, exact
+
+
+class Ou(Noeud):
+    """
+    Disjonction : réunion des candidats, si chaque opérande en a.
+    """
+
+    def __init__(self, noeuds: List[Noeud]) -> None:
+        """
+        Crée la disjonction.
+
+        Args:
+            noeuds (List[Noeud]): Les opérandes.
+
+        Returns:
+            None
+        """
+        self.noeuds = noeuds
+
+    def verifier(self, livre: Livre) -> bool:
+        """
+        Vérifie si le livre satisfait au moins un opérande.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            bool: True si un opérande correspond.
+        """
+        return any(noeud.verifier(livre) for noeud in self.noeuds)
+
+    def candidats(self, index_titres, auteurs) -> Candidats:
+        """
+        Réunit les candidats des opérandes.
+
+        Args:
+            index_titres (IndexTrigrammes): Index des titres de la bibliothèque.
+            auteurs (DictionnaireAuteurs): Dictionnaire des auteurs de la bibliothèque.
+
+        Returns:
+            Candidats: Réunion des candidats (None si un opérande n'en a pas), exacte si tous les opérandes le sont.
+        """
+        ids: Set[int] = set()
+        exact = True
+        for noeud in self.noeuds:
+            ids_noeud, exact_noeud = noeud.candidats(index_titres, auteurs)
+            if ids_noeud is None:
+                return None, False
+            ids |= ids_noeud
+            exact = exact and exact_noeud
+        return ids, exact
+
+
+class Non(Noeud):
+    """
+    Négation. Seule, elle ne restreint pas les candidats ; dans une conjonction, voir Et.
+    """
+
+    def __init__(self, noeud: Noeud) -> None:
+        """
+        Crée la négation.
+
+        Args:
+            noeud (Noeud): L'opérande.
+
+        Returns:
+            None
+        """
+        self.noeud = noeud
+
+    def verifier(self, livre: Livre) -> bool:
+        """
+        Vérifie si le livre ne satisfait pas l'opérande.
+
+        Args:
+            livre (Livre): Le livre.
+
+        Returns:
+            bool: True si l'opérande ne correspond pas.
+        """
+        return not self.noeud.verifier(livre)
+
+    def candidats(self, index_titres, auteurs) -> Candidats:
+        """
+        Une négation seule ne restreint pas les candidats.
+
+        Args:
+            index_titres (IndexTrigrammes): Index des titres de la bibliothèque.
+            auteurs (DictionnaireAuteurs): Dictionnaire des auteurs de la bibliothèque.
+
+        Returns:
+            Candidats: Toujours (None, False).
+        """
+        return None, False
+
+
+class _Analyseur:
+    """
+    Analyseur par descente récursive : ou := et (OR et)* ; et := non ([AND] non)* ; non := (NOT | -) non | primaire ;
+    primaire := ( ou ) | [champ:] (mot | "phrase" | /expression/).
+    """
+
+    def __init__(self, texte: str) -> None:
+        """
+        Découpe la requête en jetons (type, valeur).
+
+        Args:
+            texte (str): La requête.
+
+        Raises:
+            ValueError: Si un guillemet ou une barre oblique n'est pas refermé.
+
+        Returns:
+            None
+        """
+        self.jetons: List[Tuple[str, str]] = []
+        position = 0
+        texte = texte.rstrip()
+        while position < len(texte):
+            jeton = _JETON.match(texte, position)
+            if jeton is None or jeton.end() == position:
+                raise ValueError(f"Requête invalide à la position {position} : {texte[position:]!r}.")
+            type_jeton = jeton.lastgroup
+            valeur = jeton.group(type_jeton)
+            if type_jeton == "mot" and valeur in OPERATEURS_ET + OPERATEURS_OU + OPERATEURS_NON:
+                type_jeton = valeur
+            self.jetons.append((type_jeton, valeur))
+            position = jeton.end()
+        self.position = 0
+
+    def analyser(self) -> Noeud:
+        """
+        Construit l'arbre de la requête.
+
+        Args:
+            Aucun
+
+        Raises:
+            ValueError: Si la requête est vide ou mal formée.
+
+        Returns:
+            Noeud: La racine de l'arbre.
+        """
+        if not self.jetons:
+            raise ValueError("Requête vide.")
+        noeud = self._ou()
+        if self.position < len(self.jetons):
+            raise ValueError(f"Jeton inattendu : {self.jetons[self.position][1]!r}.")
+        return noeud
+
+    def _suivant(self) -> Optional[str]:
+        """
+        Retourne le type du jeton courant, sans le consommer.
+
+        Args:
+            Aucun
+
+        Returns:
+            Optional[str]: Type du jeton, None en fin de requête.
+        """
+        return self.jetons[self.position][0] if self.position < len(self.jetons) else None
+
+    def _fin_groupe(self) -> bool:
+        """
+        Indique si la conjonction en cours est terminée (fin de requête, OU ou parenthèse fermante).
+
+        Args:
+            Aucun
+
+        Returns:
+            bool: True si la conjonction est terminée.
+        """
+        return self._suivant() in (None,) + OPERATEURS_OU or self.jetons[self.position] == ("parenthese", ")")
+
+    def _ou(self) -> Noeud:
+        """
+        Analyse une disjonction : ou := et (OR et)*.
+
+        Args:
+            Aucun
+
+        Raises:
+            ValueError: Si la requête est mal formée.
+
+        Returns:
+            Noeud: La disjonction, ou son unique opérande.
+        """
+        noeuds = [self._et()]
+        while self._suivant() in OPERATEURS_OU:
+            self.position += 1
+            noeuds.append(self._et())
+        return noeuds[0] if len(noeuds) == 1 else Ou(noeuds)
+
+    def _et(self) -> Noeud:
+        """
+        Analyse une conjonction : et := non ([AND] non)*.
+
+        Args:
+            Aucun
+
+        Raises:
+            ValueError: Si la requête est mal formée.
+
+        Returns:
+            Noeud: La conjonction, ou son unique opérande.
+        """
+        noeuds = [self._non()]
+        while not self._fin_groupe():
+            if self._suivant() in OPERATEURS_ET:
+                self.position += 1
+            noeuds.append(self._non())
+        return noeuds[0] if len(noeuds) == 1 else Et(noeuds)
+
+    def _non(self) -> Noeud:
+        """
+        Analyse une négation éventuelle : non := (NOT | -) non | primaire.
+
+        Args:
+            Aucun
+
+        Raises:
+            ValueError: Si la requête est mal formée.
+
+        Returns:
+            Noeud: La négation, ou le primaire.
+        """
+        if self._suivant() in ("moins",) + OPERATEURS_NON:
+            self.position += 1
+            return Non(self._non())
+        return self._primaire()
+
+    def _primaire(self) -> Noeud:
+        """
+        Analyse un groupe entre parenthèses ou un terme, éventuellement préfixé d'un champ.
+
+        Args:
+            Aucun
+
+        Raises:
+            ValueError: Si un terme manque, si une parenthèse n'est pas refermée
+                ou si une expression régulière est invalide.
+
+        Returns:
+            Noeud: Le noeud du groupe ou du terme.
+        """
+        if self._suivant() is None:
+            raise ValueError("Requête incomplète : un terme est attendu.")
+        type_jeton, valeur = self.jetons[self.position]
+        self.position += 1
+        if type_jeton == "parenthese" and valeur == "(":
+            noeud = self._ou()
+            if self._suivant() is None or self.jetons[self.position] != ("parenthese", ")"):
+                raise ValueError("Parenthèse non refermée.")
+            self.position += 1
+            return noeud
+        champ = None
+        if type_jeton == "champ":
+            champ = valeur
+            if self._suivant() not in ("mot", "phrase", "expression"):
+                raise ValueError(f"Terme attendu après {champ}:.")
+            type_jeton, valeur = self.jetons[self.position]
+            self.position += 1
+        if type_jeton == "phrase":
+            return Terme(valeur, champ)
+        if type_jeton == "expression":
+            try:
+                return Motif(re.compile(valeur), champ)
+            except re.error as e:
+                raise ValueError(f"Expression régulière invalide : {e}.") from None
+        if type_jeton == "mot":
+            if _JOKERS.search(valeur):
+                return _joker(valeur, champ)
+            return Terme(valeur, champ)
+        raise ValueError(f"Jeton inattendu : {valeur!r}.")
+
+
+def _joker(mot: str, champ: Optional[str]) -> Motif:
+    """
+    Traduit un terme à jokers (* et ?) en motif insensible à la casse.
+
+    Args:
+        mot (str): Le terme.
+        champ (str, optionnel): Champ du terme.
+
+    Returns:
+        Motif: Le motif, avec les fragments littéraux d'au moins 3 caractères.
+    """
+    fragments = _JOKERS.split(mot)
+    source = "".join(re.escape(fragment) + {"*": ".*", "?": "."}.get(joker, "")
+                     for fragment, joker in zip(fragments, _JOKERS.findall(mot) + [""]))
+    return Motif(re.compile(source, re.IGNORECASE), champ, tuple(f for f in fragments if len(f) >= 3))
+
+
+_cache: "OrderedDict[str, Noeud]" = OrderedDict()
+_verrou_cache = threading.Lock()
+
+
+def compiler(texte: str) -> Noeud:
+    """
+    Compile une requête, ou la reprend du cache des requêtes compilées.
+
+    Args:
+        texte (str): La requête.
+
+    Raises:
+        ValueError: Si la requête est vide ou mal formée.
+
+    Returns:
+        Noeud: La requête compilée.
+    """
+    with _verrou_cache:
+        noeud = _cache.get(texte)
+        if noeud is not None:
+            _cache.move_to_end(texte)
+            return noeud
+    noeud = _Analyseur(texte).analyser()
+    with _verrou_cache:
+        _cache[texte] = noeud
+        if len(_cache) > TAILLE_CACHE_REQUETES:
+            _cache.popitem(last=False)
+    return noeud
@@ -0,0 +1,163 @@
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set
+
+
+class FileReservations:
+    """
+    Files d'attente FIFO des réservations, une par livre, avec un index des réservations par utilisateur.
+
+    Chaque file est un OrderedDict {utilisateur_id: None} : ajout en fin, retrait en tête
+    et annulation d'une réservation quelconque se font en O(1).
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise des files de réservations vides.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._files: Dict[int, "OrderedDict[int, None]"] = {}
+        self._par_utilisateur: Dict[int, Set[int]] = {}
+
+    def reserver(self, utilisateur_id: int, livre_id: int) -> int:
+        """
+        Ajoute un utilisateur en fin de file d'attente d'un livre.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre réservé.
+
+        Raises:
+            ValueError: Si l'utilisateur a déjà réservé ce livre.
+
+        Returns:
+            int: Position de l'utilisateur dans la file (1 = prochain servi).
+        """
+        file = self._files.setdefault(livre_id, OrderedDict())
+        if utilisateur_id in file:
+            raise ValueError(f"L'utilisateur id={utilisateur_id} a déjà réservé le livre id={livre_id}.")
+        file[utilisateur_id] = None
+        self._par_utilisateur.setdefault(utilisateur_id, set()).add(livre_id)
+        return len(file)
+
+    def annuler(self, utilisateur_id: int, livre_id: int) -> None:
+        """
+        Annule la réservation d'un utilisateur sur un livre.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre.
+
+        Raises:
+            ValueError: Si l'utilisateur n'a pas réservé ce livre.
+
+        Returns:
+            None
+        """
+        file = self._files.get(livre_id)
+        if file is None or utilisateur_id not in file:
+            raise ValueError(f"L'utilisateur id={utilisateur_id} n'a pas réservé le livre id={livre_id}.")
+        del file[utilisateur_id]
+        if not file:
+            del self._files[livre_id]
+        self._retirer_de_l_index(utilisateur_id, livre_id)
+
+    def suivant(self, livre_id: int, accepte: Optional[Callable[[int], bool]] = None) -> Optional[int]:
+        """
+        Retire et retourne le premier utilisateur de la file d'attente d'un livre accepté par `accepte`.
+        La file est parcourue sans copie et le parcours s'arrête au premier utilisateur accepté :
+        les utilisateurs refusés gardent leur place.
+
+        Args:
+            livre_id (int): ID du livre.
+            accepte (Callable[[int], bool], optionnel): Reçoit l'ID d'un utilisateur en attente et indique
+                s'il peut être servi ; ne doit pas modifier les réservations. Par défaut, le premier de la file.
+
+        Returns:
+            Optional[int]: ID du prochain utilisateur, None si personne (d'accepté) n'attend ce livre.
+        """
+        file = self._files.get(livre_id)
+        if not file:
+            return None
+        if accepte is None:
+            utilisateur_id = next(iter(file))
+        else:
+            utilisateur_id = next((u for u in file if accepte(u)), None)
+            if utilisateur_id is None:
+                return None
+        del file[utilisateur_id]
+        if not file:
+            del self._files[livre_id]
+        self._retirer_de_l_index(utilisateur_id, livre_id)
+        return utilisateur_id
+
+    def file(self, livre_id: int) -> List[int]:
+        """
+        Retourne la file d'attente d'un livre dans l'ordre de passage.
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            List[int]: IDs des utilisateurs en attente.
+        """
+        return list(self._files.get(livre_id, ()))
+
+    def reservations(self, utilisateur_id: int) -> List[int]:
+        """
+        Retourne les livres réservés par un utilisateur.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Returns:
+            List[int]: IDs des livres réservés, triés.
+        """
+        return sorted(self._par_utilisateur.get(utilisateur_id, ()))
+
+    def annuler_utilisateur(self, utilisateur_id: int) -> None:
+        """
+        Annule toutes les réservations d'un utilisateur.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Returns:
+            None
+        """
+        for livre_id in self.reservations(utilisateur_id):
+            self.annuler(utilisateur_id, livre_id)
+
+    def annuler_livre(self, livre_id: int) -> None:
+        """
+        Supprime la file d'attente d'un livre (par exemple lorsqu'il est retiré du catalogue).
+
+        Args:
+            livre_id (int): ID du livre.
+
+        Returns:
+            None
+        """
+        for utilisateur_id in self._files.pop(livre_id, ()):
+            self._retirer_de_l_index(utilisateur_id, livre_id)
+
+    def _retirer_de_l_index(self, utilisateur_id: int, livre_id: int) -> None:
+        """
+        Retire un livre de l'index des réservations d'un utilisateur.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre.
+
+        Returns:
+            None
+        """
+        livres = self._par_utilisateur.get(utilisateur_id)
+        if livres is not None:
+            livres.discard(livre_id)
+            if not livres:
+                del self._par_utilisateur[utilisateur_id]
@@ -0,0 +1,681 @@
+"""
+Service HTTP/JSON local au-dessus d'une Bibliotheque, et client correspondant.
+
+Le serveur parle HTTP/1.1 avec connexions persistantes (keep-alive) : un client réutilise la même connexion TCP
+pour toutes ses requêtes. Routes :
+- GET  /livres?curseur=&limite=&disponibles=   page de livres par ID croissant, avec le curseur de la page suivante
+- GET  /livres/export                          tout le catalogue en JSON Lines, envoyé par morceaux (chunked)
+- GET  /recherche?titre=|auteur=|mot_clef=     recherche de livres
+- GET  /utilisateur?utilisateur_id=            un utilisateur et ses emprunts
+- GET  /statistiques                           nombres de livres et d'utilisateurs, résumé des emprunts
+- POST /emprunter, /rendre                     corps JSON {"utilisateur_id": ..., "livre_id": ...}, et facultativement
+                                               "version_livre" / "version_utilisateur" (mise à jour conditionnelle)
+- POST /lot                                    corps {"operations": [{"operation": "emprunter", "params": {...}}, ...]}
+
+Une route correspond à une opération de OPERATIONS ; /lot exécute plusieurs opérations en une seule requête et
+une seule prise du verrou, chacune ayant son propre résultat ou sa propre erreur. La Bibliotheque n'étant pas
+thread-safe, les opérations sont sérialisées par un verrou ; l'export relâche le verrou entre deux pages.
+Les erreurs sont renvoyées en JSON : 404 pour une KeyError, 409 pour un ConflitVersion, 400 pour une autre ValueError.
+Livres et utilisateurs portent leur version : un client peut lire un livre, décider, puis emprunter en passant
+la version lue, sans qu'aucun verrou soit tenu entre ses deux requêtes ; s'il a été devancé, il reçoit un 409.
+"""
+import argparse
+import http.client
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlencode
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque, ConflitVersion
+from bibliotheque_project.models.livre import Livre
+
+LIMITE_DEFAUT = 100
+LIMITE_MAX = 1000
+TAILLE_LOT_MAX = 1000
+
+
+def livre_en_json(livre: Livre) -> Dict:
+    """
+    Convertit un livre en dictionnaire sérialisable en JSON.
+
+    Args:
+        livre (Livre): Le livre.
+
+    Returns:
+        Dict: Clés "id", "titre", "auteur", "status" et "version".
+    """
+    return {"id": livre.id, "titre": livre.titre, "auteur": livre.auteur, "status": livre.status.value,
+            "version": livre.version}
+
+
+def _entier(params: Dict, nom: str, defaut: Optional[int] = None) -> int:
+    """
+    Lit un paramètre entier.
+
+    Args:
+        params (Dict): Paramètres de l'opération.
+        nom (str): Nom du paramètre.
+        defaut (int, optionnel): Valeur si le paramètre est absent. Par défaut, le paramètre est obligatoire.
+
+    Raises:
+        ValueError: Si le paramètre est absent (sans valeur par défaut) ou n'est pas un entier.
+
+    Returns:
+        int: La valeur du paramètre.
+    """
+    valeur = params.get(nom)
+    if valeur is None or valeur == "":
+        if defaut is None:
+            raise ValueError(f"Paramètre {nom!r} manquant.")
+        return defaut
+    try:
+        return int(valeur)
+    except (TypeError, ValueError):
+        raise ValueError(f"Paramètre {nom!r} invalide : {valeur!r}.") from None
+
+
+def _lister_livres(biblio: Bibliotheque, params: Dict) -> Dict:
+    """
+    Opération lister_livres : une page de livres.
+
+    Args:
+        biblio (Bibliotheque): La bibliothèque.
+        params (Dict): "curseur" (optionnel), "limite" (optionnel, au plus LIMITE_MAX), "disponibles" (optionnel).
+
+    Returns:
+        Dict: "livres" et "curseur" (à passer pour la page suivante, None après la dernière page).
+    """
+    limite = min(max(_entier(params, "limite", LIMITE_DEFAUT), 1), LIMITE_MAX)
+    disponibles = str(params.get("disponibles", "")).lower() in ("1", "true", "oui")
+    page = biblio.page_livres(_entier(params, "curseur", 0), limite, disponibles)
+    return {"livres": [livre_en_json(livre) for livre in page],
+            "curseur": page[-1].id if len(page) == limite else None}
+
+
+def _rechercher(biblio: Bibliotheque, params: Dict) -> Dict:
+    """
+    Opération rechercher : recherche par titre, auteur, mot-clé ou requête (voir core/requete.py).
+
+    Args:
+        biblio (Bibliotheque): La bibliothèque.
+        params (Dict): Exactement un paramètre parmi "titre", "auteur", "mot_clef" et "requete" ; "limite" (optionnel).
+
+    Raises:
+        ValueError: Si aucun ou plusieurs critères sont fournis, si le critère n'est pas une chaîne
+            ou si la requête est mal formée.
+
+    Returns:
+        Dict: "livres" (au plus limite) et "total" (nombre de résultats).
+    """
+    recherches = {"titre": biblio.rechercher_par_titre, "auteur": biblio.rechercher_par_auteur,
+                  "mot_clef": biblio.rechercher_par_mot_clef, "requete": biblio.rechercher_par_requete}
+    criteres = [nom for nom in recherches if params.get(nom)]
+    if len(criteres) != 1:
+        raise ValueError("Indiquer exactement un critère parmi titre, auteur, mot_clef et requete.")
+    valeur = params[criteres[0]]
+    if not isinstance(valeur, str):
+        raise ValueError(f"Le critère {criteres[0]!r} doit être une chaîne : {valeur!r}.")
+    resultats = recherches[criteres[0]](valeur)
+    limite = min(max(_entier(params, "limite", LIMITE_DEFAUT), 1), LIMITE_MAX)
+    return {"livres": [livre_en_json(livre) for livre in resultats[:limite]], "total": len(resultats)}
+
+
+def _utilisateur(biblio: Bibliotheque, params: Dict) -> Dict:
+    """
+    Opération utilisateur : un utilisateur et ses emprunts.
+
+    Args:
+        biblio (Bibliotheque): La bibliothèque.
+        params (Dict): "utilisateur_id".
+
+    Raises:
+        KeyError: Si l'utilisateur n'existe pas.
+
+    Returns:
+        Dict: "id", "nom", "categorie", "livres_empruntes" et "version".
+    """
+    utilisateur_id = _entier(params, "utilisateur_id")
+    if utilisateur_id not in biblio._utilisateurs:
+        raise KeyError(f"Utilisateur {utilisateur_id} introuvable.")
+    u = biblio._utilisateurs[utilisateur_id]
+    return {"id": u.id, "nom": u.nom, "categorie": u.categorie, "livres_empruntes": list(u.livres_empruntes),
+            "version": u.version}
+
+
+def _emprunter(biblio: Bibliotheque, params: Dict) -> Dict:
+    """
+    Opération emprunter.
+
+    Args:
+        biblio (Bibliotheque): La bibliothèque.
+        params (Dict): "utilisateur_id" et "livre_id" ; "version_livre" et "version_utilisateur" (optionnels)
+            pour n'emprunter que si le livre et l'utilisateur n'ont pas changé.
+
+    Raises:
+        ConflitVersion: Si une version fournie ne correspond plus.
+
+    Returns:
+        Dict: "date_retour" (ISO 8601) et "version" (nouvelle version du livre).
+    """
+    utilisateur_id, livre_id = _entier(params, "utilisateur_id"), _entier(params, "livre_id")
+    if params.get("version_livre") is not None:
+        biblio.emprunter_si_version(utilisateur_id, livre_id, _entier(params, "version_livre"),
+                                    _version_utilisateur(params))
+    else:
+        biblio.emprunter(utilisateur_id, livre_id)
+    return {"date_retour": biblio.date_retour(livre_id).isoformat(), "version": biblio._livres[livre_id].version}
+
+
+def _rendre(biblio: Bibliotheque, params: Dict) -> Dict:
+    """
+    Opération rendre.
+
+    Args:
+        biblio (Bibliotheque): La bibliothèque.
+        params (Dict): "utilisateur_id" et "livre_id" ; "version_livre" et "version_utilisateur" (optionnels)
+            pour ne rendre que si le livre et l'utilisateur n'ont pas changé.
+
+    Raises:
+        ConflitVersion: Si une version fournie ne correspond plus.
+
+    Returns:
+        Dict: "attribue_a" (ID de l'utilisateur à qui le livre a été attribué via les réservations, ou None).
+    """
+    utilisateur_id, livre_id = _entier(params, "utilisateur_id"), _entier(params, "livre_id")
+    if params.get("version_livre") is not None:
+        return {"attribue_a": biblio.rendre_si_version(utilisateur_id, livre_id, _entier(params, "version_livre"),
+                                                       _version_utilisateur(params))}
+    return {"attribue_a": biblio.rendre(utilisateur_id, livre_id)}
+
+
+def _version_utilisateur(params: Dict) -> Optional[int]:
+    """
+    Lit le paramètre optionnel "version_utilisateur".
+
+    Args:
+        params (Dict): Paramètres de l'opération.
+
+    Raises:
+        ValueError: Si le paramètre n'est pas un entier.
+
+    Returns:
+        Optional[int]: La version, ou None si elle n'est pas fournie.
+    """
+    if params.get("version_utilisateur") is None:
+        return None
+    return _entier(params, "version_utilisateur")
+
+
+def _statistiques(biblio: Bibliotheque, params: Dict) -> Dict:
+    """
+    Opération statistiques.
+
+    Args:
+        biblio (Bibliotheque): La bibliothèque.
+        params (Dict): Ignorés.
+
+    Returns:
+        Dict: "livres" et le résumé des emprunts (voir Bibliotheque.resume_emprunts, qui donne aussi "utilisateurs").
+    """
+    return {"livres": biblio.nombre_total_livres(), **biblio.resume_emprunts()}
+
+
+OPERATIONS: Dict[str, Callable[[Bibliotheque, Dict], Dict]] = {
+    "lister_livres": _lister_livres,
+    "rechercher": _rechercher,
+    "utilisateur": _utilisateur,
+    "emprunter": _emprunter,
+    "rendre": _rendre,
+    "statistiques": _statistiques,
+}
+
+ROUTES: Dict[Tuple[str, str], str] = {
+    ("GET", "/livres"): "lister_livres",
+    ("GET", "/recherche"): "rechercher",
+    ("GET", "/utilisateur"): "utilisateur",
+    ("GET", "/statistiques"): "statistiques",
+    ("POST", "/emprunter"): "emprunter",
+    ("POST", "/rendre"): "rendre",
+}
+
+
+def _erreur_en_json(erreur: Exception) -> Dict:
+    """
+    Convertit une erreur d'opération en dictionnaire sérialisable.
+
+    Args:
+        erreur (Exception): L'erreur levée.
+
+    Returns:
+        Dict: "erreur" (message) et "type" (nom de l'exception) ; pour un ConflitVersion, aussi "nature",
+            "objet_id", "version_attendue" et "version_actuelle".
+    """
+    message = erreur.args[0] if erreur.args else type(erreur).__name__
+    donnees = {"erreur": str(message), "type": type(erreur).__name__}
+    if isinstance(erreur, ConflitVersion):
+        donnees.update(nature=erreur.nature, objet_id=erreur.objet_id, version_attendue=erreur.version_attendue,
+                       version_actuelle=erreur.version_actuelle)
+    return donnees
+
+
+def _code_erreur(erreur: Exception) -> int:
+    """
+    Retourne le code HTTP d'une erreur d'opération.
+
+    Args:
+        erreur (Exception): L'erreur levée.
+
+    Returns:
+        int: 404 pour une KeyError, 409 pour un ConflitVersion, 400 sinon.
+    """
+    if isinstance(erreur, KeyError):
+        return 404
+    return 409 if isinstance(erreur, ConflitVersion) else 400
+
+
+class ServeurBibliotheque(ThreadingHTTPServer):
+    """
+    Serveur HTTP exposant une bibliothèque ; un thread par connexion.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, biblio: Bibliotheque, adresse: Tuple[str, int]) -> None:
+        """
+        Crée le serveur (sans le démarrer).
+
+        Args:
+            biblio (Bibliotheque): Bibliothèque servie.
+            adresse (Tuple[str, int]): Adresse et port d'écoute.
+
+        Returns:
+            None
+        """
+        self.biblio = biblio
+        self.verrou = threading.Lock()
+        super().__init__(adresse, GestionnaireRequetes)
+
+    def executer(self, operation: str, params: Dict) -> Dict:
+        """
+        Exécute une opération sous le verrou de la bibliothèque.
+
+        Args:
+            operation (str): Nom de l'opération (clé de OPERATIONS).
+            params (Dict): Paramètres de l'opération.
+
+        Raises:
+            KeyError, ValueError: Erreurs de l'opération.
+
+        Returns:
+            Dict: Résultat de l'opération.
+        """
+        with self.verrou:
+            return OPERATIONS[operation](self.biblio, params)
+
+    def executer_lot(self, operations: List[Dict]) -> List[Dict]:
+        """
+        Exécute plusieurs opérations en une seule prise du verrou. Une opération en échec n'interrompt pas le lot.
+
+        Args:
+            operations (List[Dict]): Opérations {"operation": nom, "params": {...}}.
+
+        Raises:
+            ValueError: Si les opérations ne sont pas une liste, ou si le lot dépasse TAILLE_LOT_MAX opérations.
+
+        Returns:
+            List[Dict]: Pour chaque opération, {"resultat": ...} ou {"erreur": ..., "type": ...} ; une opération
+                qui n'est pas un objet, ou dont les paramètres ne sont pas un objet, reçoit une erreur.
+        """
+        if not isinstance(operations, list):
+            raise ValueError("Le champ 'operations' doit être une liste.")
+        if len(operations) > TAILLE_LOT_MAX:
+            raise ValueError(f"Un lot contient au plus {TAILLE_LOT_MAX} opérations.")
+        resultats = []
+        with self.verrou:
+            for operation in operations:
+                try:
+                    if not isinstance(operation, dict):
+                        raise ValueError(f"Une opération doit être un objet JSON : {operation!r}.")
+                    fonction = OPERATIONS.get(operation.get("operation"))
+                    if fonction is None:
+                        raise ValueError(f"Opération inconnue : {operation.get('operation')!r}.")
+                    params = operation.get("params") or {}
+                    if not isinstance(params, dict):
+                        raise ValueError(f"Les paramètres d'une opération doivent être un objet JSON : {params!r}.")
+                    resultats.append({"resultat": fonction(self.biblio, params)})
+                except (KeyError, ValueError) as e:
+                    resultats.append(_erreur_en_json(e))
+        return resultats
+
+    def pages_export(self, taille_page: int = LIMITE_MAX) -> Iterator[List[Dict]]:
+        """
+        Parcourt tout le catalogue par pages, en ne tenant le verrou que le temps de lire chaque page.
+
+        Args:
+            taille_page (int, optionnel): Nombre de livres par page. Par défaut LIMITE_MAX.
+
+        Returns:
+            Iterator[List[Dict]]: Les pages de livres (dictionnaires de livre_en_json).
+        """
+        curseur = 0
+        while True:
+            with self.verrou:
+                page = [livre_en_json(livre) for livre in self.biblio.page_livres(curseur, taille_page)]
+            if not page:
+                return
+            yield page
+            curseur = page[-1]["id"]
+
+
+class GestionnaireRequetes(BaseHTTPRequestHandler):
+    """
+    Traite les requêtes d'une connexion (persistante en HTTP/1.1).
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Réponses courtes : ne pas attendre l'accusé de réception du paquet précédent
+
+    def do_GET(self) -> None:
+        """Répond aux requêtes GET."""
+        url = urlsplit(self.path)
+        if url.path == "/livres/export":
+            self._exporter()
+            return
+        self._traiter("GET", url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self) -> None:
+        """Répond aux requêtes POST."""
+        try:
+            longueur = int(self.headers.get("Content-Length") or 0)
+            if longueur < 0:
+                raise ValueError
+        except ValueError:
+            self.close_connection = True  # Corps de longueur inconnue : la connexion ne peut pas être réutilisée
+            self._repondre(400, {"erreur": "En-tête Content-Length invalide.", "type": "ValueError"})
+            return
+        corps = self.rfile.read(longueur) if longueur else b""
+        try:
+            params = json.loads(corps) if corps else {}
+            if not isinstance(params, dict):
+                raise ValueError("Le corps de la requête doit être un objet JSON.")
+        except ValueError as e:
+            self._repondre(400, _erreur_en_json(e))
+            return
+        path = urlsplit(self.path).path
+        if path == "/lot":
+            try:
+                self._repondre(200, {"resultats": self.server.executer_lot(params.get("operations", []))})
+            except ValueError as e:
+                self._repondre(400, _erreur_en_json(e))
+            return
+        self._traiter("POST", path, params)
+
+    def _traiter(self, methode: str, chemin: str, params: Dict) -> None:
+        """
+        Exécute l'opération associée à une route et envoie la réponse.
+
+        Args:
+            methode (str): Méthode HTTP.
+            chemin (str): Chemin de la requête.
+            params (Dict): Paramètres (chaîne de requête ou corps JSON).
+
+        Returns:
+            None
+        """
+        operation = ROUTES.get((methode, chemin))
+        if operation is None:
+            self._repondre(404, {"erreur": f"Route inconnue : {methode} {chemin}.", "type": "KeyError"})
+            return
+        try:
+            self._repondre(200, self.server.executer(operation, params))
+        except (KeyError, ValueError) as e:
+            self._repondre(_code_erreur(e), _erreur_en_json(e))
+
+    def _repondre(self, code: int, donnees: Dict) -> None:
+        """
+        Envoie une réponse JSON avec sa longueur, pour que la connexion reste ouverte.
+
+        Args:
+            code (int): Code HTTP.
+            donnees (Dict): Corps de la réponse.
+
+        Returns:
+            None
+        """
+        corps = json.dumps(donnees, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def _exporter(self) -> None:
+        """
+        Envoie tout le catalogue en JSON Lines, une page par morceau (Transfer-Encoding: chunked) :
+        la mémoire utilisée ne dépend pas de la taille du catalogue.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for page in self.server.pages_export():
+            morceau = "".join(json.dumps(livre, ensure_ascii=False) + "\n" for livre in page).encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(morceau), morceau))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format: str, *args) -> None:
+        """Désactive le journal des requêtes sur la sortie d'erreur."""
+        pass
+
+
+def servir(biblio: Bibliotheque, port: int = 0, hote: str = "127.0.0.1") -> ServeurBibliotheque:
+    """
+    Démarre le service dans un thread.
+
+    Args:
+        biblio (Bibliotheque): Bibliothèque servie.
+        port (int, optionnel): Port d'écoute. Par défaut 0 (port libre choisi par le système).
+        hote (str, optionnel): Adresse d'écoute. Par défaut 127.0.0.1.
+
+    Returns:
+        ServeurBibliotheque: Le serveur démarré (server_address donne le port, shutdown() l'arrête).
+    """
+    serveur = ServeurBibliotheque(biblio, (hote, port))
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    return serveur
+
+
+class ClientBibliotheque:
+    """
+    Client du service, sur une connexion persistante. Expose emprunter, rendre et rechercher_par_mot_clef
+    comme une Bibliotheque (utilisable avec generateur_charge.executer) ; les erreurs du serveur
+    sont relevées en KeyError (404), ConflitVersion (409) ou ValueError (400). Un client ne doit pas être partagé
+    entre threads.
+    """
+
+    def __init__(self, hote: str, port: int, timeout: float = 30.0) -> None:
+        """
+        Crée le client (la connexion est ouverte à la première requête).
+
+        Args:
+            hote (str): Adresse du serveur.
+            port (int): Port du serveur.
+            timeout (float, optionnel): Délai maximal d'une requête en secondes. Par défaut 30.
+
+        Returns:
+            None
+        """
+        self._connexion = http.client.HTTPConnection(hote, port, timeout=timeout)
+
+    def requete(self, methode: str, chemin: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Envoie une requête et lit sa réponse JSON.
+
+        Args:
+            methode (str): "GET" ou "POST".
+            chemin (str): Chemin de la route.
+            params (Dict, optionnel): Paramètres, en chaîne de requête (GET) ou en corps JSON (POST).
+
+        Raises:
+            KeyError: Si le serveur répond 404.
+            ConflitVersion: Si le serveur répond 409.
+            ValueError: Si le serveur répond par une autre erreur.
+
+        Returns:
+            Dict: Le corps de la réponse.
+        """
+        params = params or {}
+        if methode == "GET":
+            if params:
+                chemin = f"{chemin}?{urlencode(params)}"
+            self._connexion.request("GET", chemin)
+        else:
+            self._connexion.request(methode, chemin, body=json.dumps(params).encode("utf-8"),
+                                    headers={"Content-Type": "application/json"})
+        reponse = self._connexion.getresponse()
+        donnees = json.loads(reponse.read())
+        if reponse.status == 404:
+            raise KeyError(donnees["erreur"])
+        if reponse.status == 409:
+            raise ConflitVersion(donnees["nature"], donnees["objet_id"], donnees["version_attendue"],
+                                 donnees["version_actuelle"])
+        if reponse.status >= 400:
+            raise ValueError(donnees["erreur"])
+        return donnees
+
+    def emprunter(self, utilisateur_id: int, livre_id: int, version_livre: Optional[int] = None) -> Dict:
+        """
+        Emprunte un livre.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre.
+            version_livre (int, optionnel): N'emprunte que si le livre a encore cette version. Par défaut non vérifiée.
+
+        Returns:
+            Dict: "date_retour" et "version".
+        """
+        return self.requete("POST", "/emprunter", {"utilisateur_id": utilisateur_id, "livre_id": livre_id,
+                                                   "version_livre": version_livre})
+
+    def rendre(self, utilisateur_id: int, livre_id: int, version_livre: Optional[int] = None) -> Dict:
+        """
+        Rend un livre.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            livre_id (int): ID du livre.
+            version_livre (int, optionnel): Ne rend que si le livre a encore cette version. Par défaut non vérifiée.
+
+        Returns:
+            Dict: "attribue_a".
+        """
+        return self.requete("POST", "/rendre", {"utilisateur_id": utilisateur_id, "livre_id": livre_id,
+                                                "version_livre": version_livre})
+
+    def rechercher_par_mot_clef(self, query: str) -> List[Dict]:
+        """
+        Recherche des livres par mot-clé.
+
+        Args:
+            query (str): Mot-clé recherché.
+
+        Returns:
+            List[Dict]: Les livres trouvés (au plus LIMITE_DEFAUT).
+        """
+        return self.requete("GET", "/recherche", {"mot_clef": query})["livres"]
+
+    def lot(self, operations: List[Tuple[str, Dict]]) -> List[Dict]:
+        """
+        Exécute plusieurs opérations en une seule requête.
+
+        Args:
+            operations (List[Tuple[str, Dict]]): Couples (nom de l'opération, paramètres).
+
+        Returns:
+            List[Dict]: Pour chaque opération, {"resultat": ...} ou {"erreur": ..., "type": ...}.
+        """
+        corps = {"operations": [{"operation": nom, "params": params} for nom, params in operations]}
+        return self.requete("POST", "/lot", corps)["resultats"]
+
+    def livres(self, disponibles: bool = False, taille_page: int = LIMITE_MAX) -> Iterator[Dict]:
+        """
+        Parcourt tous les livres en suivant les curseurs de pagination.
+
+        Args:
+            disponibles (bool, optionnel): Ne parcourt que les livres disponibles. Par défaut False.
+            taille_page (int, optionnel): Nombre de livres par requête. Par défaut LIMITE_MAX.
+
+        Returns:
+            Iterator[Dict]: Les livres, par ID croissant.
+        """
+        curseur = 0
+        while curseur is not None:
+            params = {"curseur": curseur, "limite": taille_page}
+            if disponibles:
+                params["disponibles"] = 1
+            page = self.requete("GET", "/livres", params)
+            yield from page["livres"]
+            curseur = page["curseur"]
+
+    def fermer(self) -> None:
+        """
+        Ferme la connexion.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._connexion.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée en ligne de commande : charge éventuellement un catalogue puis sert la bibliothèque.
+
+    Args:
+        argv (List[str], optionnel): Arguments de la ligne de commande. Par défaut sys.argv[1:].
+
+    Returns:
+        int: Code de sortie.
+    """
+    from bibliotheque_project.core import import_export
+
+    parser = argparse.ArgumentParser(description="Service HTTP/JSON de la Bibliotheque")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--livres", help="Fichier CSV ou JSON Lines des livres à charger")
+    parser.add_argument("--utilisateurs", help="Fichier CSV ou JSON Lines des utilisateurs à charger")
+    parser.add_argument("--emprunts", help="Fichier CSV ou JSON Lines des emprunts à charger")
+    args = parser.parse_args(argv)
+
+    biblio = Bibliotheque()
+    if args.livres:
+        import_export.importer_livres(biblio, args.livres)
+    if args.utilisateurs:
+        import_export.importer_utilisateurs(biblio, args.utilisateurs)
+    if args.emprunts:
+        import_export.importer_emprunts(biblio, args.emprunts)
+    serveur = ServeurBibliotheque(biblio, (args.hote, args.port))
+    print(f"Bibliothèque servie sur http://{args.hote}:{serveur.server_address[1]}")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
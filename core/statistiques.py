@@ -0,0 +1,287 @@
+"""
+Statistiques des emprunts en cours, calculées par opérations NumPy vectorisées.
+
+Les IDs des utilisateurs et leur nombre d'emprunts sont tenus dans deux tableaux d'entiers denses (array('q')),
+un dictionnaire donnant la position de chaque ID : la mémoire et le coût des statistiques dépendent du nombre
+d'utilisateurs, pas de la valeur de leurs IDs. Chaque emprunt, retour, ajout ou suppression coûte O(1)
+et les statistiques sur des millions d'utilisateurs ne font aucune boucle Python.
+NumPy n'est importé qu'au calcul des statistiques ; les tableaux sont copiés sous verrou, si bien qu'un ajout
+concurrent d'utilisateur n'est jamais bloqué par une vue NumPy sur leur mémoire.
+"""
+import threading
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+
+class StatistiquesEmprunts:
+    """
+    Compteurs d'emprunts en cours par utilisateur et statistiques associées.
+    """
+
+    def __init__(self) -> None:
+        """
+        Crée des compteurs vides.
+
+        Args:
+            Aucun
+
+        Returns:
+            None
+        """
+        self._positions: Dict[int, int] = {}  # ID -> position dans les tableaux
+        self._ids = array("q")
+        self._comptes = array("q")
+        self._verrou = threading.Lock()  # Sérialise les changements de taille et les copies vers NumPy
+
+    def ajouter_utilisateur(self, utilisateur_id: int, nb_emprunts: int = 0) -> None:
+        """
+        Enregistre un utilisateur (ou remplace son nombre d'emprunts s'il l'est déjà).
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            nb_emprunts (int, optionnel): Nombre d'emprunts en cours. Par défaut 0.
+
+        Returns:
+            None
+        """
+        position = self._positions.get(utilisateur_id)
+        if position is not None:
+            self._comptes[position] = nb_emprunts
+            return
+        with self._verrou:
+            self._positions[utilisateur_id] = len(self._ids)
+            self._ids.append(utilisateur_id)
+            self._comptes.append(nb_emprunts)
+
+    def retirer_utilisateur(self, utilisateur_id: int) -> None:
+        """
+        Oublie un utilisateur : le dernier utilisateur des tableaux prend sa place.
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+
+        Returns:
+            None
+        """
+        position = self._positions.pop(utilisateur_id, None)
+        if position is None:
+            return
+        with self._verrou:
+            dernier_id, dernier_compte = self._ids.pop(), self._comptes.pop()
+            if position < len(self._ids):
+                self._ids[position] = dernier_id
+                self._comptes[position] = dernier_compte
+                self._positions[dernier_id] = position
+
+    def modifier(self, utilisateur_id: int, delta: int) -> None:
+        """
+        Ajoute delta au nombre d'emprunts en cours d'un utilisateur (+1 à l'emprunt, -1 au retour).
+
+        Args:
+            utilisateur_id (int): ID de l'utilisateur.
+            delta (int): Variation du nombre d'emprunts.
+
+        Returns:
+            None
+        """
+        self._comptes[self._positions[utilisateur_id]] += delta
+
+    def distribution(self) -> Dict[int, int]:
+        """
+        Retourne le nombre d'emprunts de chaque utilisateur.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[int, int]: {utilisateur_id: nombre_emprunts}, par ID croissant.
+        """
+        np = _numpy()
+        ids, valeurs = self._tableaux(np)
+        ordre = np.argsort(ids)
+        return dict(zip(ids[ordre].tolist(), valeurs[ordre].tolist()))
+
+    def histogramme(self) -> Dict[int, int]:
+        """
+        Retourne l'histogramme des emprunts.
+
+        Args:
+            Aucun
+
+        Returns:
+            Dict[int, int]: {nombre_emprunts: nombre_utilisateurs}, sans les nombres d'emprunts absents.
+        """
+        np = _numpy()
+        comptes = np.bincount(self._valeurs(np))
+        valeurs = np.flatnonzero(comptes)
+        return dict(zip(valeurs.tolist(), comptes[valeurs].tolist()))
+
+    def histogramme_classes(self, nb_classes_max: int = 50) -> Tuple[List[float], List[int], int]:
+        """
+        Retourne l'histogramme prêt à tracer : une barre par nombre d'emprunts tant qu'il y a au plus nb_classes_max
+        valeurs distinctes, sinon des classes de largeur entière regroupant plusieurs nombres d'emprunts.
+
+        Args:
+            nb_classes_max (int, optionnel): Nombre maximal de barres. Par défaut 50.
+
+        Returns:
+            Tuple[List[float], List[int], int]: Centres des barres, nombre d'utilisateurs par barre
+                et largeur des classes (1 sans regroupement).
+        """
+        histogramme = self.histogramme()
+        if len(histogramme) <= nb_classes_max:
+            return list(histogramme), list(histogramme.values()), 1
+        np = _numpy()
+        valeurs = self._valeurs(np)
+        largeur = -(-(int(valeurs.max()) + 1) // nb_classes_max)  # Division entière arrondie au-dessus
+        effectifs = np.bincount(valeurs // largeur)
+        classes = np.flatnonzero(effectifs)
+        return (classes * largeur + (largeur - 1) / 2).tolist(), effectifs[classes].tolist(), largeur
+
+    def moyenne(self) -> float:
+        """
+        Retourne le nombre moyen d'emprunts par utilisateur.
+
+        Args:
+            Aucun
+
+        Returns:
+            float: Moyenne, 0 s'il n'y a aucun utilisateur.
+        """
+        np = _numpy()
+        valeurs = self._valeurs(np)
+        return float(valeurs.mean()) if len(valeurs) else 0.0
+
+    def percentiles(self, quantiles: Iterable[float] = (50, 90, 99)) -> Dict[float, float]:
+        """
+        Retourne des percentiles du nombre d'emprunts par utilisateur (interpolation linéaire).
+
+        Args:
+            quantiles (Iterable[float], optionnel): Percentiles souhaités, entre 0 et 100. Par défaut 50, 90 et 99.
+
+        Returns:
+            Dict[float, float]: {percentile: valeur}, 0 pour chacun s'il n'y a aucun utilisateur.
+        """
+        np = _numpy()
+        quantiles = list(quantiles)
+        valeurs = self._valeurs(np)
+        if len(valeurs) == 0:
+            return {q: 0.0 for q in quantiles}
+        return dict(zip(quantiles, np.percentile(valeurs, quantiles).tolist()))
+
+    def gini(self) -> float:
+        """
+        Retourne le coefficient de Gini des emprunts : 0 si tous les utilisateurs empruntent autant,
+        proche de 1 si quelques utilisateurs concentrent tous les emprunts.
+
+        Args:
+            Aucun
+
+        Returns:
+            float: Coefficient de Gini, 0 s'il n'y a aucun emprunt.
+        """
+        np = _numpy()
+        valeurs = np.sort(self._valeurs(np))
+        total = int(valeurs.sum())
+        if total == 0:
+            return 0.0
+        n = len(valeurs)
+        rangs = np.arange(1, n + 1, dtype=np.float64)
+        return float(2.0 * np.dot(rangs, valeurs) / (n * total) - (n + 1) / n)
+
+    def concentration(self, fraction: float = 0.1) -> float:
+        """
+        Retourne la part des emprunts détenue par la fraction des plus gros emprunteurs.
+
+        Args:
+            fraction (float, optionnel): Fraction des utilisateurs considérée (0.1 pour les 10 % premiers).
+
+        Returns:
+            float: Part des emprunts, entre 0 et 1 (0 s'il n'y a aucun emprunt).
+        """
+        np = _numpy()
+        valeurs = self._valeurs(np)
+        total = int(valeurs.sum())
+        k = int(np.ceil(fraction * len(valeurs)))
+        if total == 0 or k == 0:
+            return 0.0
+        plus_gros = np.partition(valeurs, len(valeurs) - k)[len(valeurs) - k:]
+        return float(plus_gros.sum() / total)
+
+    def top_emprunteurs(self, n: int = 10) -> List[Tuple[int, int]]:
+        """
+        Retourne les n utilisateurs ayant le plus d'emprunts en cours.
+
+        Args:
+            n (int, optionnel): Nombre d'utilisateurs. Par défaut 10.
+
+        Returns:
+            List[Tuple[int, int]]: Couples (utilisateur_id, nombre_emprunts), du plus grand au plus petit
+                nombre d'emprunts (à égalité, par ID croissant).
+        """
+        np = _numpy()
+        ids, valeurs = self._tableaux(np)
+        if n <= 0 or len(ids) == 0:
+            return []
+        if n < len(ids):
+            # Présélection en O(nombre d'utilisateurs), en gardant tous les ex æquo du n-ième
+            seuil = np.partition(valeurs, len(valeurs) - n)[len(valeurs) - n]
+            garder = valeurs >= seuil
+            ids, valeurs = ids[garder], valeurs[garder]
+        ordre = np.lexsort((ids, -valeurs))[:n]
+        return list(zip(ids[ordre].tolist(), valeurs[ordre].tolist()))
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre d'utilisateurs suivis.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'utilisateurs.
+        """
+        return len(self._ids)
+
+    def _tableaux(self, np):
+        """
+        Copies NumPy des IDs et des nombres d'emprunts, prises sous verrou : aucune vue sur la mémoire
+        des tableaux ne survit, qui les empêcherait de grandir.
+
+        Args:
+            np (module): Le module numpy.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: IDs des utilisateurs et leur nombre d'emprunts, dans le même ordre.
+        """
+        with self._verrou:
+            if not self._ids:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+            return (np.frombuffer(self._ids, dtype=np.int64).copy(),
+                    np.frombuffer(self._comptes, dtype=np.int64).copy())
+
+    def _valeurs(self, np):
+        """
+        Nombre d'emprunts des utilisateurs existants (copie).
+
+        Args:
+            np (module): Le module numpy.
+
+        Returns:
+            numpy.ndarray: Nombre d'emprunts de chaque utilisateur, dans l'ordre des tableaux.
+        """
+        return self._tableaux(np)[1]
+
+
+def _numpy():
+    """
+    Importe NumPy à la demande, pour ne pas ralentir l'import de la bibliothèque.
+
+    Args:
+        Aucun
+
+    Returns:
+        module: Le module numpy.
+    """
+    import numpy
+    return numpy
@@ -8,10 +8,12 @@ Scénario couvert:
 - applique toutes les fonctions de base (ajout, suppression, modification de statut, emprunt, retour)
 - vérifie et illustre les conditions empêchant certaines suppressions (livre emprunté / utilisateur avec emprunts)
 - affiche les erreurs attendues et les succès
+- exécute une charge synthétique (loi de Zipf) avec le générateur de charge
 """
 
 from bibliotheque_project.core.bibliotheque import Bibliotheque
 from bibliotheque_project.models.livre import StatusLivre
+from bibliotheque_project.core.generateur_charge import GenerateurCharge, executer
 import random
 
 
@@ -69,6 +71,8 @@ def generate_users(biblio: Bibliotheque):
 def random_emprunts(biblio: Bibliotheque, utilisateurs, livres, max_per_user=6, seed: int = 42):
     """
     Distribue des emprunts aléatoires mais reproductibles via seed.
+    Chaque utilisateur tire des livres au hasard (sans remélanger toute la liste) jusqu'à en avoir emprunté nb,
+    en passant uniquement par les méthodes publiques des livres et de la bibliothèque.
 
     Args:
         biblio (Bibliotheque): Instance de la bibliothèque.
@@ -83,15 +87,14 @@ def random_emprunts(biblio: Bibliotheque, utilisateurs, livres, max_per_user=6,
     rnd = random.Random(seed)
     for utilisateur in utilisateurs:
         nb = rnd.randint(0, max_per_user)
-        candidate_ids = [livre.id for livre in livres]
-        rnd.shuffle(candidate_ids)
-        for lid in candidate_ids:
+        # Nombre de tirages borné : le coût ne dépend plus du nombre total de livres
+        for _ in range(4 * nb):
             if nb <= 0:
                 break
-            livre = biblio._livres.get(lid)
-            if livre and livre.status == StatusLivre.DISPONIBLE:
+            livre = livres[rnd.randrange(len(livres))]
+            if livre.est_disponible():
                 try:
-                    biblio.emprunter(utilisateur.id, lid)
+                    biblio.emprunter(utilisateur.id, livre.id)
                     nb -= 1
                 except Exception:
                     pass
@@ -220,6 +223,15 @@ def run_demo():
     except Exception as e:
         print("Impossible d'afficher (headless) :", e)
 
+    sep("12. Charge synthétique (popularité selon une loi de Zipf)")
+    generateur = GenerateurCharge([livre.id for livre in biblio.lister_tous_les_livres()],
+                                  [utilisateur.id for utilisateur in biblio.lister_utilisateurs()],
+                                  seed=seed, requetes=["exemple 1", "auteur a", "livre"])
+    rapport = executer(biblio, generateur.operations(1000), sur_echec=generateur.signaler_echec)
+    print("Opérations exécutées:", rapport["operations"])
+    print("Erreurs (livre indisponible, etc.):", rapport["erreurs"])
+    print(f"Débit: {rapport['debit_ops_par_s']:.0f} opérations/s")
+
     sep("Fin de la démo ALÉATOIRE avec vérifications")
 
 
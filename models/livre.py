@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 
 #On défini un enum pour représenter le status du livre
 class StatusLivre(Enum):
@@ -9,11 +10,14 @@ class StatusLivre(Enum):
 class Livre:
     """
     Représente un livre dans la bibliothèque caractérisé par un ID unique automatique, un titre, un auteur et un statut.
+    Sa version augmente à chaque changement de statut, pour les mises à jour conditionnelles
+    (voir Bibliotheque.emprunter_si_version).
     """
 
     _next_id = 1  # On auto-incrémente l'ID pour qu'il soit unique
 
-    def __init__(self, titre: str, auteur: str, status: StatusLivre = StatusLivre.DISPONIBLE) -> None:
+    def __init__(self, titre: str, auteur: str, status: StatusLivre = StatusLivre.DISPONIBLE,
+                 livre_id: Optional[int] = None) -> None:
         """
         Crée un nouveau livre caractérisé par un ID unique automatique, un titre, un auteur et un statut (disponible par défaut).
 
@@ -21,15 +25,22 @@ class Livre:
             titre (str): Le titre du livre.
             auteur (str): L'auteur du livre.
             status (StatusLivre, optionnel): Statut du livre. Par défaut StatusLivre.DISPONIBLE.
+            livre_id (int, optionnel): ID imposé (par exemple lors d'un import). Les IDs automatiques suivants
+                lui seront supérieurs.
 
         Returns:
             None
         """
-        self.id: int = Livre._next_id
-        Livre._next_id += 1
+        if livre_id is None:
+            livre_id = Livre._next_id
+        self.id: int = livre_id
+        Livre._next_id = max(Livre._next_id, livre_id + 1)
         self.titre: str = titre
         self.auteur: str = auteur
         self.status: StatusLivre = status
+        self.oeuvre_id: Optional[int] = None  # Œuvre dont le livre est un exemplaire, le cas échéant
+        self.exemplaire: Optional[int] = None  # Position de l'exemplaire dans son œuvre
+        self.version: int = 0
 
     def est_disponible(self) -> bool:
         """
@@ -60,6 +71,7 @@ class Livre:
         if not self.est_disponible():
             raise ValueError(f"Le livre '{self.titre}' (id={self.id}) n'est pas disponible.")
         self.status = StatusLivre.EMPRUNTE
+        self.version += 1
 
     def rendre(self) -> None:
         """
@@ -72,6 +84,7 @@ class Livre:
             None
         """
         self.status = StatusLivre.DISPONIBLE
+        self.version += 1
 
     def __repr__(self) -> str:
         """"
@@ -0,0 +1,148 @@
+from typing import List, Optional
+
+# Codes du vecteur de statuts des exemplaires (un octet par exemplaire)
+EXEMPLAIRE_DISPONIBLE = 0
+EXEMPLAIRE_EMPRUNTE = 1
+EXEMPLAIRE_RETIRE = 2
+
+
+class Oeuvre:
+    """
+    Représente une œuvre (un titre) dont la bibliothèque possède un ou plusieurs exemplaires physiques.
+    Le titre et l'auteur sont stockés une seule fois ; chaque exemplaire est un Livre qui partage ces chaînes.
+    """
+
+    _next_id = 1  # On auto-incrémente l'ID pour qu'il soit unique
+
+    def __init__(self, titre: str, auteur: str) -> None:
+        """
+        Crée une œuvre sans exemplaire, caractérisée par un ID unique automatique, un titre et un auteur.
+
+        Args:
+            titre (str): Le titre de l'œuvre.
+            auteur (str): L'auteur de l'œuvre.
+
+        Returns:
+            None
+        """
+        self.id: int = Oeuvre._next_id
+        Oeuvre._next_id += 1
+        self.titre: str = titre
+        self.auteur: str = auteur
+        self.exemplaires: List[int] = []  # ID du Livre de chaque exemplaire, indexé par position
+        self._statuts = bytearray()  # Un octet de statut par exemplaire
+        self._dans_pile = bytearray()  # 1 si la position est présente dans _libres
+        self._libres: List[int] = []  # Pile des positions potentiellement disponibles
+        self._nb_disponibles = 0
+
+    def ajouter_exemplaire(self, livre_id: int) -> int:
+        """
+        Ajoute un exemplaire disponible à l'œuvre.
+
+        Args:
+            livre_id (int): ID du Livre représentant l'exemplaire.
+
+        Returns:
+            int: Position de l'exemplaire dans l'œuvre.
+        """
+        position = len(self.exemplaires)
+        self.exemplaires.append(livre_id)
+        self._statuts.append(EXEMPLAIRE_DISPONIBLE)
+        self._dans_pile.append(1)
+        self._libres.append(position)
+        self._nb_disponibles += 1
+        return position
+
+    def prendre_exemplaire(self) -> Optional[int]:
+        """
+        Retourne un exemplaire disponible en O(1) amorti, sans modifier son statut.
+        Les positions devenues indisponibles sont retirées de la pile au passage.
+
+        Args:
+            Aucun
+
+        Returns:
+            Optional[int]: ID du Livre d'un exemplaire disponible, None si aucun n'est disponible.
+        """
+        while self._libres:
+            position = self._libres[-1]
+            if self._statuts[position] == EXEMPLAIRE_DISPONIBLE:
+                return self.exemplaires[position]
+            self._libres.pop()
+            self._dans_pile[position] = 0
+        return None
+
+    def definir_disponibilite(self, position: int, disponible: bool) -> None:
+        """
+        Met à jour le statut d'un exemplaire (disponible ou emprunté). Sans effet sur un exemplaire retiré.
+
+        Args:
+            position (int): Position de l'exemplaire.
+            disponible (bool): True si l'exemplaire est disponible.
+
+        Returns:
+            None
+        """
+        ancien = self._statuts[position]
+        nouveau = EXEMPLAIRE_DISPONIBLE if disponible else EXEMPLAIRE_EMPRUNTE
+        if ancien == nouveau or ancien == EXEMPLAIRE_RETIRE:
+            return
+        self._statuts[position] = nouveau
+        if disponible:
+            self._nb_disponibles += 1
+            if not self._dans_pile[position]:
+                self._dans_pile[position] = 1
+                self._libres.append(position)
+        else:
+            self._nb_disponibles -= 1
+
+    def retirer_exemplaire(self, position: int) -> None:
+        """
+        Marque un exemplaire comme retiré du catalogue.
+
+        Args:
+            position (int): Position de l'exemplaire.
+
+        Returns:
+            None
+        """
+        if self._statuts[position] == EXEMPLAIRE_DISPONIBLE:
+            self._nb_disponibles -= 1
+        self._statuts[position] = EXEMPLAIRE_RETIRE
+
+    def nb_exemplaires(self) -> int:
+        """
+        Retourne le nombre d'exemplaires présents dans le catalogue (hors exemplaires retirés).
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'exemplaires.
+        """
+        return len(self._statuts) - self._statuts.count(EXEMPLAIRE_RETIRE)
+
+    def nb_disponibles(self) -> int:
+        """
+        Retourne le nombre d'exemplaires disponibles à l'emprunt.
+
+        Args:
+            Aucun
+
+        Returns:
+            int: Nombre d'exemplaires disponibles.
+        """
+        return self._nb_disponibles
+
+    def __repr__(self) -> str:
+        """
+        Fournit une représentation textuelle de l'œuvre pour le débogage.
+
+        Args:
+            Aucun
+
+        Returns:
+            str: Représentation de l'œuvre avec l'ID, le titre, l'auteur et la disponibilité.
+        """
+        return (f"<Oeuvre id={self.id} titre={self.titre!r} auteur={self.auteur!r} "
+                f"disponibles={self.nb_disponibles()}/{self.nb_exemplaires()}>")
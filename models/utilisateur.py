@@ -1,27 +1,35 @@
-from typing import List
+from typing import List, Optional
 
 class Utilisateur:
     """
-    Représente un utilisateur de la bibliothèque caractérisé par un ID unique, un nom et une liste de livres empruntés
+    Représente un utilisateur de la bibliothèque caractérisé par un ID unique, un nom, une catégorie et une liste de livres empruntés
+    Sa version augmente à chaque emprunt ou retour, pour les mises à jour conditionnelles.
     """
 
     _next_id = 1 #Auto-incrémente l'ID pour qu'il soit unique
 
-    def __init__(self, nom: str)->None:
+    def __init__(self, nom: str, categorie: str = "standard", utilisateur_id: Optional[int] = None)->None:
         """
-        Crée un nouvel utilisateur avec un ID unique attribué automatiquement, un nom et
+        Crée un nouvel utilisateur avec un ID unique attribué automatiquement, un nom, une catégorie et
         une liste de livres empruntés qui est vide au départ car il n'a emprunté aucun livre avant d'etre crée.
 
         Args:
             nom (str): Nom de l'utilisateur.
+            categorie (str, optionnel): Catégorie de l'utilisateur, utilisée pour les quotas. Par défaut "standard".
+            utilisateur_id (int, optionnel): ID imposé (par exemple lors d'un import). Les IDs automatiques suivants
+                lui seront supérieurs.
 
         Returns:
             None
         """
-        self.id: int = Utilisateur._next_id
-        Utilisateur._next_id += 1
+        if utilisateur_id is None:
+            utilisateur_id = Utilisateur._next_id
+        self.id: int = utilisateur_id
+        Utilisateur._next_id = max(Utilisateur._next_id, utilisateur_id + 1)
         self.nom: str = nom
+        self.categorie: str = categorie
         self.livres_empruntes: List[int] = []
+        self.version: int = 0
 
     def emprunter_livre(self, livre_id: int) -> None:
         """
@@ -40,6 +48,7 @@ class Utilisateur:
         if livre_id in self.livres_empruntes:
             raise ValueError(f"L'utilisateur {self.nom} (id={self.id}) a déjà emprunté le livre id={livre_id}.")
         self.livres_empruntes.append(livre_id)
+        self.version += 1
 
     def rendre_livre(self, livre_id: int) -> None:
         """
@@ -59,6 +68,7 @@ class Utilisateur:
             self.livres_empruntes.remove(livre_id)
         except ValueError:
             raise ValueError(f"Le livre id={livre_id} n'est pas dans la liste d'emprunts de {self.nom} (id={self.id}).")
+        self.version += 1
 
     def nb_emprunts(self) -> int:
         """
@@ -0,0 +1,45 @@
+import pytest
+
+from bibliotheque_project.core.auteurs import DictionnaireAuteurs
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.models.livre import Livre
+
+
+def test_dictionnaire_ajout_retrait():
+    """
+    Vérifie qu'un auteur est créé une fois, que ses livres sont retrouvés par une requête sur son nom,
+    et qu'il est oublié quand son dernier livre est retiré.
+    """
+    auteurs = DictionnaireAuteurs()
+    nom = auteurs.ajouter(1, "Victor Hugo")
+    assert auteurs.ajouter(2, "".join(["Victor ", "Hugo"])) is nom
+    auteurs.ajouter(3, "Albert Camus")
+
+    assert len(auteurs) == 2
+    assert auteurs.candidats("HUGO") == {1, 2}
+    assert auteurs.candidats("u") == {1, 2, 3}  # Requête courte : résultat exact tout de même
+    assert auteurs.livres(auteurs.identifiant("Victor Hugo")) == [1, 2]
+
+    auteurs.retirer(1, "Victor Hugo")
+    auteurs.retirer(2, "Victor Hugo")
+    assert auteurs.candidats("hugo") == set()
+    assert len(auteurs) == 1
+    with pytest.raises(KeyError):
+        auteurs.identifiant("Victor Hugo")
+
+
+def test_bibliotheque_partage_les_noms_d_auteur():
+    """
+    Vérifie que les livres d'un même auteur partagent le même nom, y compris après un import par lots,
+    et que la recherche par auteur suit les suppressions.
+    """
+    biblio = Bibliotheque()
+    a = biblio.ajouter_livre("Les Misérables", "Victor Hugo")
+    biblio.ajouter_livres([Livre("Notre-Dame de Paris", "".join(["Victor", " Hugo"])), Livre("La Peste", "Camus")])
+    b = biblio._livres[2]
+    assert b.auteur is a.auteur
+
+    assert [l.id for l in biblio.rechercher_par_auteur("hugo")] == [1, 2]
+    assert [l.id for l in biblio.rechercher_par_mot_clef("hugo")] == [1, 2]
+    biblio.supprimer_livre(1)
+    assert [l.id for l in biblio.rechercher_par_auteur("vic")] == [2]
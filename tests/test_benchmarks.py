@@ -0,0 +1,65 @@
+import json
+from bibliotheque_project.benchmarks import bench_bibliotheque, charge_serveur
+from bibliotheque_project.core.serveur import servir
+
+
+def test_executer_benchmarks():
+    """
+    Vérifie que les benchmarks couvrent toutes les opérations mesurées et produisent des résultats sérialisables.
+    """
+    resultats = bench_bibliotheque.executer_benchmarks([200], repetitions=2)
+    operations = resultats["resultats"]["200"]
+
+    attendues = ["ajouter_livre", "rechercher_par_titre", "rechercher_par_auteur", "rechercher_par_mot_clef",
+                 "lister_livres_disponibles", "emprunter", "rendre"] + bench_bibliotheque.STATISTIQUES
+    for operation in attendues:
+        assert operations[operation]["mediane_s"] >= 0
+    assert json.loads(json.dumps(resultats)) == resultats
+
+
+def test_comparer():
+    """
+    Vérifie la détection des régressions entre deux séries de résultats.
+    """
+    reference = {"resultats": {"1000": {"emprunter": {"mediane_s": 1.0}, "rendre": {"mediane_s": 1.0}}}}
+    actuel = {"resultats": {"1000": {"emprunter": {"mediane_s": 1.5}, "rendre": {"mediane_s": 1.1},
+                                     "nouvelle_operation": {"mediane_s": 3.0}}}}
+
+    regressions = bench_bibliotheque.comparer(reference, actuel, seuil=1.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("emprunter")
+
+
+def test_main(tmp_path):
+    """
+    Vérifie que le script écrit ses résultats en JSON et signale les régressions par son code de sortie.
+    """
+    sortie = tmp_path / "bench.json"
+    assert bench_bibliotheque.main(["--tailles", "100", "--repetitions", "1", "--sortie", str(sortie)]) == 0
+    resultats = json.loads(sortie.read_text(encoding="utf-8"))
+    assert "100" in resultats["resultats"]
+
+    # Une référence très rapide provoque une régression
+    for mesure in resultats["resultats"]["100"].values():
+        mesure["mediane_s"] = 1e-12
+    sortie.write_text(json.dumps(resultats), encoding="utf-8")
+    assert bench_bibliotheque.main(["--tailles", "100", "--repetitions", "1", "--comparer", str(sortie)]) == 1
+
+
+def test_charge_serveur():
+    """
+    Vérifie que le test de charge du service mesure débits et latences, avec et sans lots.
+    """
+    biblio = bench_bibliotheque.construire_bibliotheque(200)
+    serveur = servir(biblio)
+    try:
+        hote, port = serveur.server_address[:2]
+        for taille_lot in (1, 10):
+            rapport = charge_serveur.executer_charge(hote, port, range(1, 201), range(1, 21),
+                                                     nb_clients=2, duree=0.3, taille_lot=taille_lot)
+            assert rapport["operations"] > 0 and rapport["requetes_par_s"] > 0
+            assert all(mesure["p99_ms"] >= mesure["p50_ms"] for mesure in rapport["latences"].values())
+        assert list(rapport["latences"]) == ["lot"]
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
@@ -2,7 +2,10 @@ import pytest
 from collections import Counter
 from bibliotheque_project.core.bibliotheque import Bibliotheque
 from bibliotheque_project.models.livre import Livre, StatusLivre
+from bibliotheque_project.models.utilisateur import Utilisateur
+from bibliotheque_project.core.quotas import PolitiqueQuota
 from unittest.mock import patch
+from datetime import datetime, timedelta
 
 def test_ajouter_livre():
     """
@@ -577,3 +580,395 @@ def test_affiche_utilisateurs(capsys):
     assert f"ID : {u2.id} | Nom : {u2.nom}" in captured.out
     # Vérifie la présence de la liste des emprunts (vide au départ)
     assert "emprunts: []" in captured.out
+
+def test_echeances_emprunts():
+    """
+    Vérifie que emprunter enregistre une date de retour, que rendre la retire
+    et que les emprunts en retard et les prochaines échéances sont correctement retournés.
+    """
+    biblio = Bibliotheque(duree_emprunt=timedelta(days=14))
+    u1 = biblio.creer_utilisateur("Alice")
+    livre1 = biblio.ajouter_livre("1984", "George Orwell")
+    livre2 = biblio.ajouter_livre("Le Petit Prince", "Antoine de Saint-Exupéry")
+    livre3 = biblio.ajouter_livre("Harry Potter", "J.K. Rowling")
+
+    # Date de retour explicite ou calculée avec la durée d'emprunt
+    debut = datetime.now()
+    biblio.emprunter(u1.id, livre1.id, date_retour=datetime(2020, 1, 1))
+    biblio.emprunter(u1.id, livre2.id)
+    biblio.emprunter(u1.id, livre3.id, date_retour=datetime(2019, 6, 1))
+    assert biblio.date_retour(livre1.id) == datetime(2020, 1, 1)
+    assert biblio.date_retour(livre2.id) >= debut + timedelta(days=14)
+
+    # Emprunts en retard du plus ancien au plus récent
+    retards = biblio.emprunts_en_retard()
+    assert [e.livre_id for e in retards] == [livre3.id, livre1.id]
+    assert all(e.utilisateur_id == u1.id for e in retards)
+
+    # Rendre un livre retire son échéance
+    biblio.rendre(u1.id, livre3.id)
+    assert biblio.date_retour(livre3.id) is None
+    assert [e.livre_id for e in biblio.prochaines_echeances(5)] == [livre1.id, livre2.id]
+
+def test_reservations():
+    """
+    Vérifie la réservation d'un livre emprunté et son attribution automatique au retour.
+    Cas testés : réservation d'un livre disponible, double réservation, attribution FIFO,
+    utilisateur supprimé dans la file.
+    """
+    biblio = Bibliotheque()
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    u3 = biblio.creer_utilisateur("Charlie")
+    livre = biblio.ajouter_livre("1984", "George Orwell")
+
+    # Un livre disponible ne se réserve pas
+    with pytest.raises(ValueError):
+        biblio.reserver(u2.id, livre.id)
+
+    biblio.emprunter(u1.id, livre.id)
+
+    # L'emprunteur ne peut pas réserver son propre livre
+    with pytest.raises(ValueError):
+        biblio.reserver(u1.id, livre.id)
+
+    assert biblio.reserver(u2.id, livre.id) == 1
+    assert biblio.reserver(u3.id, livre.id) == 2
+    assert biblio.reservations_utilisateur(u2.id) == [livre.id]
+
+    # Au retour, le livre est attribué au premier de la file
+    assert biblio.rendre(u1.id, livre.id) == u2.id
+    assert livre.id in u2.livres_empruntes
+    assert livre.status == StatusLivre.EMPRUNTE
+    assert biblio.file_reservations(livre.id) == [u3.id]
+
+    # Sans file d'attente, le livre redevient disponible
+    biblio.annuler_reservation(u3.id, livre.id)
+    assert biblio.rendre(u2.id, livre.id) is None
+    assert livre.est_disponible()
+
+
+def test_reservations_utilisateur_supprime():
+    """
+    Vérifie que la suppression d'un utilisateur annule ses réservations.
+    """
+    biblio = Bibliotheque()
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    u3 = biblio.creer_utilisateur("Charlie")
+    livre = biblio.ajouter_livre("1984", "George Orwell")
+
+    biblio.emprunter(u1.id, livre.id)
+    biblio.reserver(u2.id, livre.id)
+    biblio.reserver(u3.id, livre.id)
+    biblio.supprimer_utilisateur(u2.id)
+
+    assert biblio.file_reservations(livre.id) == [u3.id]
+    assert biblio.rendre(u1.id, livre.id) == u3.id
+
+
+def test_reservation_quota_atteint():
+    """
+    Vérifie qu'au retour, un utilisateur en attente dont le quota est atteint est passé
+    mais garde sa place dans la file.
+    """
+    biblio = Bibliotheque()
+    biblio.definir_quota("etudiant", PolitiqueQuota(max_simultanes=1))
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob", categorie="etudiant")
+    u3 = biblio.creer_utilisateur("Charlie")
+    livre = biblio.ajouter_livre("1984", "George Orwell")
+    autre = biblio.ajouter_livre("Dune", "Frank Herbert")
+
+    biblio.emprunter(u1.id, livre.id)
+    biblio.reserver(u2.id, livre.id)
+    biblio.reserver(u3.id, livre.id)
+    biblio.emprunter(u2.id, autre.id)
+
+    assert biblio.rendre(u1.id, livre.id) == u3.id
+    assert biblio.file_reservations(livre.id) == [u2.id]
+    assert biblio.reservations_utilisateur(u2.id) == [livre.id]
+
+    # Personne ne peut l'emprunter : le livre reste disponible et Bob reste en file
+    biblio.rendre(u3.id, livre.id)
+    assert livre.est_disponible() and biblio.file_reservations(livre.id) == [u2.id]
+
+def test_oeuvres_et_exemplaires():
+    """
+    Vérifie l'emprunt d'exemplaires d'une œuvre et la disponibilité agrégée.
+    Cas testés : emprunt de tous les exemplaires, retour, recherche dédupliquée, suppression d'un exemplaire.
+    """
+    biblio = Bibliotheque()
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    oeuvre = biblio.ajouter_oeuvre("1984", "George Orwell", nb_exemplaires=2)
+
+    # Chaque exemplaire est un livre partageant les chaînes de l'œuvre
+    assert biblio.nombre_total_livres() == 2
+    assert all(livre.titre is oeuvre.titre for livre in biblio.lister_tous_les_livres())
+
+    # Emprunt des deux exemplaires puis plus aucun disponible
+    exemplaire1 = biblio.emprunter_oeuvre(u1.id, oeuvre.id)
+    exemplaire2 = biblio.emprunter_oeuvre(u2.id, oeuvre.id)
+    assert exemplaire1.id != exemplaire2.id
+    assert oeuvre.nb_disponibles() == 0
+    with pytest.raises(ValueError):
+        biblio.emprunter_oeuvre(u1.id, oeuvre.id)
+    with pytest.raises(KeyError):
+        biblio.emprunter_oeuvre(u1.id, 999)
+
+    # Le retour d'un exemplaire le rend à nouveau empruntable
+    biblio.rendre(u1.id, exemplaire1.id)
+    assert oeuvre.nb_disponibles() == 1
+    assert biblio.emprunter_oeuvre(u1.id, oeuvre.id) is exemplaire1
+
+    # Recherche dédupliquée au niveau de l'œuvre
+    biblio.ajouter_livre("Animal Farm", "George Orwell")
+    assert len(biblio.rechercher_par_auteur("orwell")) == 3
+    assert biblio.rechercher_oeuvres("orwell") == [oeuvre]
+
+    # Suppression d'un exemplaire disponible
+    biblio.rendre(u2.id, exemplaire2.id)
+    biblio.supprimer_livre(exemplaire2.id)
+    assert oeuvre.nb_exemplaires() == 1
+    assert oeuvre.nb_disponibles() == 0
+
+def test_quotas_emprunts():
+    """
+    Vérifie que emprunter applique la politique de quota de la catégorie de l'utilisateur.
+    """
+    biblio = Bibliotheque()
+    biblio.definir_quota("etudiant", PolitiqueQuota(max_simultanes=1))
+    u1 = biblio.creer_utilisateur("Alice", categorie="etudiant")
+    u2 = biblio.creer_utilisateur("Bob")
+    livre1 = biblio.ajouter_livre("1984", "George Orwell")
+    livre2 = biblio.ajouter_livre("Le Petit Prince", "Antoine de Saint-Exupéry")
+
+    biblio.emprunter(u1.id, livre1.id)
+    with pytest.raises(ValueError, match="Quota atteint"):
+        biblio.emprunter(u1.id, livre2.id)
+    # Le livre refusé reste disponible
+    assert livre2.est_disponible()
+
+    # Les utilisateurs d'une autre catégorie ne sont pas limités
+    biblio.emprunter(u2.id, livre2.id)
+    assert u2.livres_empruntes == [livre2.id]
+
+def test_recommandations():
+    """
+    Vérifie les recommandations de co-emprunts et les livres populaires,
+    et que les livres supprimés ne sont plus recommandés.
+    """
+    biblio = Bibliotheque()
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    livre1 = biblio.ajouter_livre("1984", "George Orwell")
+    livre2 = biblio.ajouter_livre("Le Petit Prince", "Antoine de Saint-Exupéry")
+    livre3 = biblio.ajouter_livre("Harry Potter", "J.K. Rowling")
+
+    biblio.emprunter(u1.id, livre1.id)
+    biblio.emprunter(u1.id, livre2.id)
+    biblio.rendre(u1.id, livre1.id)
+    biblio.emprunter(u2.id, livre1.id)
+    biblio.emprunter(u2.id, livre3.id)
+
+    assert biblio.recommandations(livre1.id) == [livre2, livre3]
+    assert biblio.livres_populaires(1) == [livre1]
+
+    # Un livre supprimé n'est plus recommandé
+    biblio.rendre(u2.id, livre3.id)
+    biblio.supprimer_livre(livre3.id)
+    assert biblio.recommandations(livre1.id) == [livre2]
+
+
+def test_ajouts_par_lots_et_restauration_emprunts():
+    """
+    Vérifie l'ajout par lots de livres et d'utilisateurs (tout ou rien en cas de doublon)
+    et la restauration d'emprunts en cours.
+    """
+    biblio = Bibliotheque()
+    assert biblio.ajouter_livres([Livre("A", "X", livre_id=5), Livre("B", "Y", livre_id=6)]) == 2
+    with pytest.raises(ValueError):
+        biblio.ajouter_livres([Livre("C", "Z", livre_id=7), Livre("D", "Z", livre_id=6)])
+    assert sorted(biblio._livres) == [5, 6]
+    assert biblio.ajouter_utilisateurs([Utilisateur("Alice", utilisateur_id=3)]) == 1
+
+    retour = datetime(2030, 1, 1)
+    with pytest.raises(ValueError):
+        biblio.restaurer_emprunts([(3, 5, retour), (3, 5, retour)])
+    assert biblio._livres[5].est_disponible()
+    assert biblio.restaurer_emprunts([(3, 5, retour), (3, 6, None)]) == 2
+    assert biblio._utilisateurs[3].livres_empruntes == [5, 6]
+    assert biblio.date_retour(5) == retour
+    assert not biblio._livres[6].est_disponible()
+
+
+def test_recherches_indexees():
+    """
+    Vérifie que les recherches par l'index de trigrammes restent à jour après ajouts, exemplaires et suppressions,
+    et que les requêtes courtes parcourent tout le catalogue.
+    """
+    biblio = Bibliotheque()
+    l1 = biblio.ajouter_livre("Le Petit Prince", "Saint-Exupéry")
+    l2 = biblio.ajouter_livre("La Peste", "Albert Camus")
+    oeuvre = biblio.ajouter_oeuvre("Petit Pays", "Gaël Faye", nb_exemplaires=2)
+
+    assert [livre.titre for livre in biblio.rechercher_par_titre("petit")] == ["Le Petit Prince", "Petit Pays", "Petit Pays"]
+    assert biblio.rechercher_par_auteur("camus") == [l2]
+    assert biblio.rechercher_par_mot_clef("pe") == biblio.rechercher_par_titre("pe")
+    assert len(biblio.rechercher_par_mot_clef("pe")) == 4
+
+    biblio.supprimer_livre(l1.id)
+    biblio.supprimer_livre(oeuvre.exemplaires[0])
+    assert [livre.id for livre in biblio.rechercher_par_mot_clef("petit")] == [oeuvre.exemplaires[1]]
+    assert biblio.rechercher_par_mot_clef("exupéry") == []
+
+
+def test_resume_et_top_emprunteurs():
+    """
+    Vérifie le résumé des emprunts et le classement des emprunteurs, tenus à jour par emprunts, retours
+    et suppressions d'utilisateurs.
+    """
+    biblio = Bibliotheque()
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    u3 = biblio.creer_utilisateur("Charlie")
+    livres = [biblio.ajouter_livre(f"Livre {i}", "Auteur") for i in range(4)]
+    for livre in livres[:3]:
+        biblio.emprunter(u1.id, livre.id)
+    biblio.emprunter(u2.id, livres[3].id)
+    biblio.rendre(u1.id, livres[0].id)
+    biblio.supprimer_utilisateur(u3.id)
+
+    resume = biblio.resume_emprunts([50])
+    assert resume["utilisateurs"] == 2
+    assert resume["moyenne"] == 1.5
+    assert resume["percentiles"] == {50: 1.5}
+    assert resume["gini"] == pytest.approx(1 / 6)
+    assert biblio.top_emprunteurs(1) == [(u1, 2)]
+    assert biblio.histogramme_emprunts() == {2: 1, 1: 1}
+    assert biblio.distribution_emprunts_par_utilisateur() == {u1.id: 2, u2.id: 1}
+
+
+def test_enregistrer_histogramme_emprunts(tmp_path):
+    """
+    Vérifie l'enregistrement de l'histogramme sans fenêtre, en PNG dans un tampon et en SVG dans un fichier,
+    y compris avec regroupement en classes.
+    """
+    import io
+    biblio = Bibliotheque()
+    with pytest.raises(ValueError):
+        biblio.enregistrer_histogramme_emprunts(io.BytesIO())
+
+    utilisateurs = [biblio.creer_utilisateur(f"U{i}") for i in range(30)]
+    for i, u in enumerate(utilisateurs):
+        for j in range(i):
+            livre = biblio.ajouter_livre(f"Livre {i}-{j}", "Auteur")
+            biblio.emprunter(u.id, livre.id)
+
+    tampon = io.BytesIO()
+    with patch("matplotlib.pyplot.show") as mock_show:
+        biblio.enregistrer_histogramme_emprunts(tampon, nb_classes_max=10)
+        mock_show.assert_not_called()
+    assert tampon.getvalue().startswith(b"\x89PNG")
+
+    chemin = tmp_path / "histogramme.svg"
+    biblio.enregistrer_histogramme_emprunts(str(chemin))
+    assert "<svg" in chemin.read_text(encoding="utf-8")
+
+
+def test_versions_et_mises_a_jour_conditionnelles():
+    """
+    Vérifie que chaque changement de statut augmente la version du livre et de l'utilisateur,
+    et qu'une mise à jour conditionnelle échoue sans rien modifier si une version a changé.
+    """
+    from bibliotheque_project.core.bibliotheque import ConflitVersion
+    biblio = Bibliotheque()
+    livre = biblio.ajouter_livre("Dune", "Herbert")
+    alice = biblio.creer_utilisateur("Alice")
+    bob = biblio.creer_utilisateur("Bob")
+    assert (livre.version, alice.version) == (0, 0)
+
+    # Alice et Bob lisent tous deux la version 0 ; Alice emprunte la première
+    assert biblio.emprunter_si_version(alice.id, livre.id, 0, version_utilisateur=0) == 1
+    assert alice.version == 1
+    with pytest.raises(ConflitVersion) as erreur:
+        biblio.emprunter_si_version(bob.id, livre.id, 0)
+    assert (erreur.value.version_attendue, erreur.value.version_actuelle) == (0, 1)
+    assert bob.livres_empruntes == []
+
+    with pytest.raises(ConflitVersion):
+        biblio.rendre_si_version(alice.id, livre.id, 1, version_utilisateur=0)
+    assert biblio.rendre_si_version(alice.id, livre.id, 1) is None
+    assert livre.version == 2 and alice.version == 2
+
+    assert biblio.modifier_status_si_version(livre.id, StatusLivre.EMPRUNTE, 2) == 3
+    with pytest.raises(ValueError):  # ConflitVersion est une ValueError
+        biblio.modifier_status_si_version(livre.id, StatusLivre.DISPONIBLE, 2)
+    with pytest.raises(KeyError):
+        biblio.emprunter_si_version(alice.id, 999, 0)
+
+
+def test_modifier_livre():
+    """
+    Vérifie que la modification du titre et de l'auteur met à jour les recherches et la version du livre,
+    et qu'un exemplaire d'œuvre ne peut pas être modifié isolément.
+    """
+    biblio = Bibliotheque()
+    livre = biblio.ajouter_livre("Les Miserables", "V. Hugo")
+    autre = biblio.ajouter_livre("Notre-Dame de Paris", "Victor Hugo")
+    instantane = biblio.instantane()
+
+    assert biblio.modifier_livre(livre.id, titre="Les Misérables", auteur="Victor Hugo") is livre
+    assert livre.version == 1 and livre.auteur is autre.auteur
+    assert biblio.rechercher_par_titre("miserables") == []
+    assert biblio.rechercher_par_titre("misérables") == [livre]
+    assert biblio.rechercher_par_auteur("v. hugo") == []
+    assert biblio.rechercher_par_auteur("victor") == [livre, autre]
+    assert instantane.livre(livre.id).titre == "Les Miserables"
+    biblio.modifier_livre(livre.id, titre="Les Misérables")  # Sans changement : version inchangée
+    assert livre.version == 1
+
+    exemplaire = biblio.ajouter_exemplaire(biblio.ajouter_oeuvre("Dune", "Herbert", 0).id)
+    with pytest.raises(ValueError):
+        biblio.modifier_livre(exemplaire.id, titre="Dune II")
+    with pytest.raises(KeyError):
+        biblio.modifier_livre(999, titre="Inconnu")
+
+
+def test_page_livres():
+    """
+    Vérifie que la pagination par curseur suit l'ordre des IDs, même très espacés, et ignore les livres supprimés.
+    """
+    biblio = Bibliotheque()
+    biblio.ajouter_livres([Livre("Lointain", "A", livre_id=20_000_000), Livre("Proche", "B", livre_id=5)])
+    for i in range(5):
+        biblio.ajouter_livre(f"Titre {i}", "C")
+    biblio.emprunter(biblio.creer_utilisateur("Alice").id, 5)
+    biblio.supprimer_livre(20_000_002)
+
+    assert [l.id for l in biblio.page_livres(0, 10)] == [5, 20_000_000, 20_000_001, 20_000_003, 20_000_004, 20_000_005]
+    assert [l.id for l in biblio.page_livres(5, 2)] == [20_000_000, 20_000_001]
+    assert [l.id for l in biblio.page_livres(0, 2, disponibles=True)] == [20_000_000, 20_000_001]
+    assert biblio.page_livres(20_000_005, 10) == []
+    for livre_id in (20_000_001, 20_000_003, 20_000_004):  # Compactage des IDs supprimés
+        biblio.supprimer_livre(livre_id)
+    biblio.ajouter_livres([Livre("Retour", "D", livre_id=20_000_003)])
+    assert [l.id for l in biblio.page_livres(0, 10)] == [5, 20_000_000, 20_000_003, 20_000_005]
+
+
+def test_iterer_et_lire_par_id():
+    """
+    Vérifie que iterer_livres / iterer_utilisateurs parcourent les mêmes objets que les listes,
+    et que livre / utilisateur retournent l'objet ou None.
+    """
+    biblio = Bibliotheque()
+    livres = [biblio.ajouter_livre(f"Titre {i}", "Auteur") for i in range(3)]
+    u = biblio.creer_utilisateur("Alice")
+
+    assert list(biblio.iterer_livres()) == biblio.lister_tous_les_livres() == livres
+    assert list(biblio.iterer_utilisateurs()) == [u]
+    assert biblio.livre(livres[1].id) is livres[1]
+    assert biblio.livre(999) is None
+    assert biblio.utilisateur(u.id) is u
+    assert biblio.utilisateur(999) is None
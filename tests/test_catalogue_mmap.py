@@ -0,0 +1,95 @@
+import pytest
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.catalogue_mmap import CatalogueMappe, ecrire_catalogue
+from bibliotheque_project.models.livre import StatusLivre
+
+LIVRES = [("Les Misérables", "Victor Hugo"), ("Notre-Dame de Paris", "Victor Hugo"), ("L'Étranger", "Albert Camus"),
+          ("La Peste", "Albert Camus"), ("Le Rouge et le Noir", "Stendhal"), ("Les Rêveries", "Rousseau")]
+
+
+def _bibliotheques(tmp_path):
+    """Construit une bibliothèque en mémoire et une bibliothèque ouverte sur son catalogue."""
+    memoire = Bibliotheque()
+    for titre, auteur in LIVRES:
+        memoire.ajouter_livre(titre, auteur)
+    memoire.emprunter(memoire.creer_utilisateur("Alice").id, 3)
+    chemin = str(tmp_path / "catalogue.bin")
+    assert ecrire_catalogue(memoire._livres.values(), chemin) == len(LIVRES)
+    mappee = Bibliotheque()
+    assert mappee.ouvrir_catalogue(chemin) == len(LIVRES)
+    return memoire, mappee
+
+
+def test_lecture_et_recherches(tmp_path):
+    """Un catalogue ouvert par mmap donne les mêmes livres, statuts et résultats de recherche qu'en mémoire."""
+    memoire, mappee = _bibliotheques(tmp_path)
+    assert mappee.nombre_total_livres() == len(LIVRES)
+    assert [(l.id, l.titre, l.auteur, l.status) for l in mappee.lister_tous_les_livres()] == \
+           [(l.id, l.titre, l.auteur, l.status) for l in memoire.lister_tous_les_livres()]
+    assert mappee._livres[3].status == StatusLivre.EMPRUNTE
+    for query in ["hugo", "ÉTRANG", "le ", "rê", "x", "introuvable"]:
+        assert [l.id for l in mappee.rechercher_par_mot_clef(query)] == \
+               [l.id for l in memoire.rechercher_par_mot_clef(query)]
+    assert [l.id for l in mappee.rechercher_par_auteur("camus")] == [3, 4]
+    with pytest.raises(KeyError):
+        mappee._livres[42]
+
+
+def test_couche_en_memoire(tmp_path):
+    """Ajouts, suppressions, emprunts et modifications sont gardés en mémoire au-dessus du catalogue."""
+    _, mappee = _bibliotheques(tmp_path)
+    nouveau = mappee.ajouter_livre("Hugo et moi", "Anonyme")
+    assert nouveau.id == len(LIVRES) + 1
+    mappee.supprimer_livre(1)
+    assert [l.id for l in mappee.rechercher_par_mot_clef("hugo")] == [2, nouveau.id]
+    u = mappee.creer_utilisateur("Bob")
+    mappee.emprunter(u.id, 2)
+    assert mappee._livres[2].status == StatusLivre.EMPRUNTE
+    assert 2 not in [l.id for l in mappee.lister_livres_disponibles()]
+    assert mappee.nombre_total_livres() == len(LIVRES)
+
+    mappee.modifier_livre(3, titre="L'Étranger (poche)", auteur="A. Camus")
+    assert [l.id for l in mappee.rechercher_par_auteur("albert camus")] == [4]
+    assert [l.id for l in mappee.rechercher_par_mot_clef("a. camus")] == [3]
+    assert [l.id for l in mappee.rechercher_par_titre("étranger")] == [3]
+    mappee._livres._cache.clear()
+    assert mappee._livres[3].titre == "L'Étranger (poche)"
+    assert [l.id for l in mappee.page_livres(0, 4)] == [2, 3, 4, 5]
+    assert [l.id for l in mappee.page_livres(5, 10)] == [6, nouveau.id]
+    assert [l.id for l in mappee.page_livres(0, 10, disponibles=True)] == [4, 5, 6, nouveau.id]
+
+
+def test_cache_borne_et_ecriture_immediate(tmp_path):
+    """Le cache garde les livres les plus récemment lus ; les livres modifiés ne sont jamais évincés."""
+    memoire, _ = _bibliotheques(tmp_path)
+    biblio = Bibliotheque()
+    biblio.ouvrir_catalogue(str(tmp_path / "catalogue.bin"), capacite_cache=2)
+    u = biblio.creer_utilisateur("Bob")
+    biblio.emprunter(u.id, 1)  # Échec puis écriture immédiate dans la couche des modifications
+    for livre_id in [2, 4, 2, 5, 6]:
+        biblio._livres[livre_id]
+    stats = biblio.statistiques_cache()
+    assert (stats["echecs"], stats["succes"], stats["evictions"]) == (5, 1, 2)  # Seul le second 2 est un succès ; 4 puis 2 évincés
+    assert stats["taille"] == 2 and stats["modifies"] == 1
+    assert biblio._livres[1].status == StatusLivre.EMPRUNTE
+
+    biblio.rendre(u.id, 1)  # Redevenu identique au catalogue : retour dans le cache
+    stats = biblio.statistiques_cache()
+    assert stats["modifies"] == 0 and stats["taille"] == 2
+    biblio._livres._cache.clear()  # Évincé puis relu : la version est conservée
+    assert biblio._livres[1].version == 2
+    assert memoire.statistiques_cache() is None
+    with pytest.raises(ValueError):
+        Bibliotheque().ouvrir_catalogue(str(tmp_path / "catalogue.bin"), capacite_cache=-1)
+
+
+def test_fichier_invalide(tmp_path):
+    """Un fichier qui n'est pas un catalogue est refusé, de même qu'un catalogue ouvert sur une bibliothèque non vide."""
+    chemin = tmp_path / "autre.bin"
+    chemin.write_bytes(b"pas un catalogue" * 10)
+    with pytest.raises(ValueError):
+        CatalogueMappe(str(chemin))
+    _, mappee = _bibliotheques(tmp_path)
+    with pytest.raises(ValueError):
+        mappee.ouvrir_catalogue(str(tmp_path / "catalogue.bin"))
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+from bibliotheque_project.core.cli import main
+
+
+def test_commandes(tmp_path, capsys):
+    """Import, recherche, emprunt, retour et statistiques via la ligne de commande."""
+    depot = str(tmp_path / "depot")
+    livres = tmp_path / "livres.csv"
+    livres.write_text("id,titre,auteur\n1,Germinal,Zola\n2,Nana,Zola\n3,Candide,Voltaire\n", encoding="utf-8")
+    assert main(["--depot", depot, "importer", "livres", str(livres)]) == 0
+    assert main(["--depot", depot, "creer-utilisateur", "Alice"]) == 0
+    capsys.readouterr()
+
+    assert main(["--depot", depot, "rechercher", "--champ", "auteur", "zola"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["1\tGerminal\tZola", "2\tNana\tZola"]
+    assert main(["--depot", depot, "emprunter", "1", "2"]) == 0
+    assert main(["--depot", depot, "emprunter", "1", "2"]) == 1
+    assert "Erreur" in capsys.readouterr().err
+    assert main(["--depot", depot, "statistiques"]) == 0
+    assert '"moyenne": 1.0' in capsys.readouterr().out
+    assert main(["--depot", depot, "rendre", "1", "2"]) == 0
+    assert main(["--depot", depot, "instantane"]) == 0
+
+
+def test_demarrage_sans_modules_lourds():
+    """Lancer l'outil n'importe ni matplotlib, ni numpy, ni la Bibliotheque avant d'en avoir besoin."""
+    code = ("import sys; from bibliotheque_project.core import cli; "
+            "print(any(m.split('.')[0] in ('matplotlib', 'numpy') or m.endswith('core.bibliotheque') for m in sys.modules))")
+    sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert sortie.stdout.strip() == "False"
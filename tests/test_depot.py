@@ -0,0 +1,43 @@
+import json
+
+from bibliotheque_project.core.depot import DepotBibliotheque
+
+
+def test_journal_et_compaction(tmp_path):
+    """Les modifications journalisées sont rejouées au chargement, et conservées après compaction."""
+    with DepotBibliotheque(str(tmp_path)) as depot:
+        biblio = depot.charger()
+        livre = biblio.ajouter_livre("Le Petit Prince", "Saint-Exupéry")
+        u = biblio.creer_utilisateur("Alice")
+        biblio.emprunter(u.id, livre.id)
+    with DepotBibliotheque(str(tmp_path)) as depot:
+        biblio = depot.charger()
+        assert biblio._utilisateurs[u.id].livres_empruntes == [livre.id]
+        depot.compacter(biblio)
+        biblio.rendre(u.id, livre.id)
+    assert json.loads((tmp_path / "etat.json").read_text())["sequence"] == 3
+    with DepotBibliotheque(str(tmp_path)) as depot:
+        biblio = depot.charger()
+        assert biblio.lister_livres_disponibles()[0].titre == "Le Petit Prince"
+        assert biblio._sequence == 4
+
+
+def test_rechercher_sans_charger(tmp_path):
+    """La recherche par mmap donne les mêmes résultats que la bibliothèque, journal compris."""
+    with DepotBibliotheque(str(tmp_path)) as depot:
+        biblio = depot.charger()
+        for titre, auteur in [("L'Étranger", "Camus"), ("La Peste", "Camus"), ("Étranges rêves", "Inconnu")]:
+            biblio.ajouter_livre(titre, auteur)
+        depot.compacter(biblio)
+        biblio.supprimer_livre(2)
+        biblio.ajouter_livre("L'Étrangère", "Autrice")
+
+        assert [l["id"] for l in depot.rechercher("ÉTRANGE")] == [l.id for l in biblio.rechercher_par_mot_clef("ÉTRANGE")]
+        assert [l["id"] for l in depot.rechercher("camus", "auteur")] == [1]
+        assert depot.rechercher("camus", "titre") == []
+        assert depot.rechercher("l'étrang", "titre")[1] == {"id": 4, "titre": "L'Étrangère", "auteur": "Autrice"}
+
+        biblio.modifier_livre(1, titre="L'Étranger (édition annotée)")  # Livre du catalogue modifié après l'instantané
+        biblio.modifier_livre(3, auteur="Camus")
+        assert [l["id"] for l in depot.rechercher("camus", "auteur")] == [1, 3]
+        assert depot.rechercher("annotée")[0]["titre"] == "L'Étranger (édition annotée)"
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+from bibliotheque_project.core.echeances import Echeance, EcheancierEmprunts
+
+T0 = datetime(2025, 1, 1)
+
+
+def test_prochaines():
+    """
+    Vérifie que prochaines(n) retourne les n échéances les plus proches dans l'ordre chronologique
+    sans les retirer de l'échéancier.
+    """
+    echeancier = EcheancierEmprunts()
+    echeancier.ajouter(1, 10, T0 + timedelta(days=3))
+    echeancier.ajouter(2, 11, T0 + timedelta(days=1))
+    echeancier.ajouter(3, 12, T0 + timedelta(days=2))
+
+    assert echeancier.prochaines(2) == [
+        Echeance(T0 + timedelta(days=1), 2, 11),
+        Echeance(T0 + timedelta(days=2), 3, 12),
+    ]
+    # Les échéances sont toujours présentes après consultation
+    assert len(echeancier) == 3
+    assert [e.livre_id for e in echeancier.prochaines(10)] == [2, 3, 1]
+
+
+def test_en_retard():
+    """
+    Vérifie que en_retard retourne uniquement les emprunts dont la date de retour est dépassée.
+    """
+    echeancier = EcheancierEmprunts()
+    echeancier.ajouter(1, 10, T0 - timedelta(days=2))
+    echeancier.ajouter(2, 11, T0 + timedelta(days=1))
+    echeancier.ajouter(3, 12, T0 - timedelta(days=5))
+
+    assert [e.livre_id for e in echeancier.en_retard(T0)] == [3, 1]
+    assert echeancier.en_retard(T0 - timedelta(days=10)) == []
+
+
+def test_retirer():
+    """
+    Vérifie qu'un livre rendu n'apparait plus dans les échéances, y compris après un nouvel emprunt
+    du même livre avec une autre date (les anciennes entrées du tas sont ignorées).
+    """
+    echeancier = EcheancierEmprunts()
+    echeancier.ajouter(1, 10, T0)
+    echeancier.retirer(1)
+    assert echeancier.date_retour(1) is None
+    assert echeancier.prochaines(5) == []
+
+    # Nouvel emprunt du même livre : seule la nouvelle échéance compte
+    echeancier.ajouter(1, 11, T0 + timedelta(days=7))
+    assert echeancier.prochaines(5) == [Echeance(T0 + timedelta(days=7), 1, 11)]
+
+    # Retirer un livre sans échéance ne fait rien
+    echeancier.retirer(999)
+    assert len(echeancier) == 1
+
+    # Rendu puis réemprunté par le même utilisateur avec la même date : une seule échéance
+    echeancier.retirer(1)
+    echeancier.ajouter(1, 11, T0 + timedelta(days=7))
+    assert echeancier.prochaines(5) == [Echeance(T0 + timedelta(days=7), 1, 11)]
+    assert echeancier.en_retard(T0 + timedelta(days=30)) == [Echeance(T0 + timedelta(days=7), 1, 11)]
+
+
+def test_compactage():
+    """
+    Vérifie que le tas est compacté lorsque de nombreux emprunts sont rendus.
+    """
+    echeancier = EcheancierEmprunts()
+    for livre_id in range(1, 501):
+        echeancier.ajouter(livre_id, 1, T0 + timedelta(minutes=livre_id))
+    for livre_id in range(1, 500):
+        echeancier.retirer(livre_id)
+
+    assert len(echeancier._tas) < 200
+    assert echeancier.prochaines(3) == [Echeance(T0 + timedelta(minutes=500), 500, 1)]
@@ -0,0 +1,129 @@
+import io
+import socket
+import threading
+
+import pytest
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.flux_modifications import EcrivainFlux, Replique, lire_flux
+from bibliotheque_project.models.livre import StatusLivre
+
+
+def test_replique_suit_les_modifications():
+    """Une réplique abonnée reste identique à la bibliothèque principale, index de recherche compris."""
+    biblio = Bibliotheque()
+    replique = Replique()
+    biblio.abonner(replique.appliquer)
+    l1 = biblio.ajouter_livre("Le Petit Prince", "Saint-Exupéry")
+    l2 = biblio.ajouter_livre("Vol de nuit", "Saint-Exupéry")
+    l3 = biblio.ajouter_livre("1984", "Orwell")
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    biblio.emprunter(u1.id, l1.id)
+    biblio.emprunter(u2.id, l2.id)
+    biblio.rendre(u2.id, l2.id)
+    biblio.modifier_status(l3.id, StatusLivre.EMPRUNTE)
+    biblio.supprimer_utilisateur(u2.id)
+    biblio.modifier_livre(l3.id, titre="Nineteen Eighty-Four", auteur="George Orwell")
+
+    assert replique.derniere_sequence == 11
+    assert [l.id for l in replique.rechercher_par_mot_clef("george")] == [l3.id]
+    assert [l.id for l in replique.rechercher_par_auteur("exupéry")] == [l1.id, l2.id]
+    assert [l.id for l in replique.lister_livres_disponibles()] == [l2.id]
+    assert replique.distribution_emprunts_par_utilisateur() == {u1.id: 1}
+    assert replique.date_retour(l1.id) == biblio.date_retour(l1.id)
+
+
+def test_sequences_doublons_et_trous():
+    """Les événements déjà appliqués sont ignorés ; un trou dans les séquences lève une ValueError."""
+    biblio = Bibliotheque()
+    evenements = []
+    biblio.abonner(evenements.append)
+    biblio.ajouter_livre("Titre A", "Auteur A")
+    biblio.ajouter_livre("Titre B", "Auteur B")
+    biblio.ajouter_livre("Titre C", "Auteur C")
+
+    replique = Replique()
+    assert replique.appliquer(evenements[0])
+    assert not replique.appliquer(evenements[0])
+    with pytest.raises(ValueError):
+        replique.appliquer(evenements[2])
+    assert replique.suivre(evenements) == 2
+    assert replique.nombre_total_livres() == 3
+
+
+def test_abonne_tardif_recoit_l_etat_initial():
+    """Un abonné tardif reçoit l'état existant puis les modifications suivantes."""
+    biblio = Bibliotheque()
+    biblio.abonner(lambda e: None)
+    l1 = biblio.ajouter_livre("Titre A", "Auteur A")
+    l2 = biblio.ajouter_livre("Titre B", "Auteur B")
+    u = biblio.creer_utilisateur("Alice")
+    biblio.emprunter(u.id, l1.id)
+    biblio.modifier_status(l2.id, StatusLivre.EMPRUNTE)
+
+    replique = Replique()
+    biblio.abonner(replique.appliquer, rejouer_etat=True)
+    assert replique.derniere_sequence == 5
+    assert replique.lister_livres_disponibles() == []
+    biblio.rendre(u.id, l1.id)
+    assert replique.derniere_sequence == 6
+    assert [l.id for l in replique.lister_livres_disponibles()] == [l1.id]
+    biblio.desabonner(replique.appliquer)
+    biblio.supprimer_livre(l1.id)
+    assert replique.nombre_total_livres() == 2
+
+
+def test_replique_via_socket():
+    """Le flux peut être transmis en JSON Lines par une socket locale à une réplique qui le suit dans un autre thread."""
+    emetteur, recepteur = socket.socketpair()
+    biblio = Bibliotheque()
+    sortie = emetteur.makefile("w", encoding="utf-8")
+    biblio.abonner(EcrivainFlux(sortie))
+    replique = Replique()
+    lecteur = threading.Thread(target=replique.suivre,
+                               args=(lire_flux(recepteur.makefile("r", encoding="utf-8")),))
+    lecteur.start()
+    livre = biblio.ajouter_livre("L'Étranger", "Camus")
+    u = biblio.creer_utilisateur("Alice")
+    biblio.emprunter(u.id, livre.id)
+    sortie.close()
+    emetteur.close()
+    lecteur.join(timeout=5)
+    recepteur.close()
+    assert replique.derniere_sequence == 3
+    assert replique.rechercher_par_titre("étranger")[0].id == livre.id
+    assert replique.lister_livres_disponibles() == []
+
+
+def test_replique_en_lecture_seule():
+    """Les méthodes de modification ne sont pas exposées par la réplique."""
+    replique = Replique()
+    with pytest.raises(AttributeError):
+        replique.ajouter_livre("Titre", "Auteur")
+    ecrit = io.StringIO()
+    EcrivainFlux(ecrit)({"seq": 1, "type": "retour", "utilisateur_id": 1, "livre_id": 2})
+    assert next(lire_flux(io.StringIO(ecrit.getvalue())))["livre_id"] == 2
+
+
+def test_abonne_en_erreur_desabonne():
+    """Un abonné qui lève n'interrompt pas un retour : le livre passe au suivant de la file et l'abonné est écarté."""
+    biblio = Bibliotheque()
+    alice, bob = biblio.creer_utilisateur("Alice"), biblio.creer_utilisateur("Bob")
+    livre = biblio.ajouter_livre("Dune", "Herbert")
+    biblio.emprunter(alice.id, livre.id)
+    biblio.reserver(bob.id, livre.id)
+    recus = []
+
+    def casse(evenement):
+        raise BrokenPipeError("réplique déconnectée")
+
+    biblio.abonner(casse)
+    biblio.abonner(recus.append)
+    assert biblio.rendre(alice.id, livre.id) == bob.id
+    assert bob.livres_empruntes == [livre.id] and livre.status == StatusLivre.EMPRUNTE
+    assert [e["type"] for e in recus] == ["retour", "emprunt"]
+    assert [abonne for abonne, _ in biblio.abonnes_en_echec] == [casse]
+    assert isinstance(biblio.abonnes_en_echec[0][1], BrokenPipeError)
+    biblio.rendre(bob.id, livre.id)
+    assert len(biblio.abonnes_en_echec) == 1 and recus[-1]["type"] == "retour"
@@ -0,0 +1,75 @@
+import random
+import time
+from collections import Counter
+import pytest
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.generateur_charge import GenerateurCharge, LoiZipf, Operation, executer
+
+
+def test_loi_zipf():
+    """
+    Vérifie que les tirages restent dans [1, n] et que les premiers rangs sont les plus fréquents,
+    dans un rapport proche de celui de la loi de Zipf.
+    """
+    loi = LoiZipf(100, 1.0, random.Random(1))
+    tirages = Counter(loi.tirer() for _ in range(20000))
+    assert min(tirages) >= 1 and max(tirages) <= 100
+    assert tirages[1] > tirages[2] > tirages[10]
+    assert 1.7 < tirages[1] / tirages[2] < 2.3
+
+    with pytest.raises(ValueError):
+        LoiZipf(0, 1.0, random.Random(1))
+
+
+def test_generateur_reproductible():
+    """
+    Vérifie qu'une même seed produit la même suite d'opérations, sans matérialiser les IDs (range).
+    """
+    premier = list(GenerateurCharge(range(1, 10_000_001), range(1, 1_000_001), seed=3).operations(500))
+    second = list(GenerateurCharge(range(1, 10_000_001), range(1, 1_000_001), seed=3).operations(500))
+    assert premier == second
+    assert {op.type for op in premier} == {"emprunter", "rendre", "rechercher"}
+
+
+def test_retours_valides():
+    """
+    Vérifie que chaque retour généré correspond à un emprunt généré auparavant et non encore rendu.
+    """
+    generateur = GenerateurCharge(range(1, 50), range(1, 10), seed=5)
+    en_cours = {}
+    for op in generateur.operations(2000):
+        if op.type == "emprunter" and op.livre_id not in en_cours:
+            en_cours[op.livre_id] = op.utilisateur_id
+        elif op.type == "rendre":
+            assert en_cours.pop(op.livre_id) == op.utilisateur_id
+
+
+def test_executer():
+    """
+    Vérifie l'exécution d'une charge sur une bibliothèque : aucun retour invalide grâce au signalement des échecs,
+    et respect approximatif du débit cible.
+    """
+    biblio = Bibliotheque()
+    livres = [biblio.ajouter_livre(f"Livre Exemple {i}", "Auteur A").id for i in range(1, 101)]
+    utilisateurs = [biblio.creer_utilisateur(f"Utilisateur_{i}").id for i in range(1, 21)]
+
+    generateur = GenerateurCharge(livres, utilisateurs, seed=1)
+    rapport = executer(biblio, generateur.operations(2000), sur_echec=generateur.signaler_echec)
+    assert rapport["total"] == 2000
+    assert sum(rapport["operations"].values()) == 2000
+    assert "rendre" not in rapport["erreurs"]
+
+    # Débit cible : 200 opérations à 2000 op/s prennent au moins 0.1 s
+    debut = time.perf_counter()
+    executer(biblio, generateur.operations(200), debit_cible=2000, sur_echec=generateur.signaler_echec)
+    assert time.perf_counter() - debut >= 0.09
+
+
+def test_executer_erreurs():
+    """
+    Vérifie que les opérations refusées par la bibliothèque sont comptées comme erreurs par type.
+    """
+    biblio = Bibliotheque()
+    rapport = executer(biblio, [Operation("emprunter", 1, 1), Operation("rechercher", requete="x")])
+    assert rapport["erreurs"] == {"emprunter": 1}
+    assert rapport["operations"] == {"emprunter": 1, "rechercher": 1}
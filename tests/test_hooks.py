@@ -0,0 +1,129 @@
+import logging
+import pytest
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.hooks import Hook, JournalOperationsLentes
+
+
+class HookEnregistreur(Hook):
+    """Hook de test qui retient les appels observés."""
+
+    def __init__(self):
+        self.avants = []
+        self.apres_appels = []
+
+    def avant(self, appel):
+        self.avants.append(appel.methode)
+
+    def apres(self, appel):
+        self.apres_appels.append((appel.methode, appel.resultat, type(appel.erreur).__name__ if appel.erreur else None,
+                                  appel.duree_ns))
+
+
+def test_hook_avant_apres():
+    """
+    Vérifie qu'un hook est appelé avant et après les méthodes observées, avec résultat, erreur et durée.
+    """
+    biblio = Bibliotheque()
+    livre = biblio.ajouter_livre("Dune", "Herbert")
+    u = biblio.creer_utilisateur("Alice")
+    hook = HookEnregistreur()
+    biblio.ajouter_hook(hook, ["emprunter", "rechercher_par_titre"])
+
+    assert biblio.rechercher_par_titre("dune") == [livre]
+    biblio.emprunter(u.id, livre.id)
+    with pytest.raises(ValueError):
+        biblio.emprunter(u.id, livre.id)
+    biblio.rendre(u.id, livre.id)  # Méthode non observée
+
+    assert hook.avants == ["rechercher_par_titre", "emprunter", "emprunter"]
+    assert [a[:3] for a in hook.apres_appels] == [
+        ("rechercher_par_titre", [livre], None), ("emprunter", None, None), ("emprunter", None, "ValueError")]
+    assert all(duree >= 0 for *_, duree in hook.apres_appels)
+
+
+def test_hook_toutes_methodes_et_retrait():
+    """
+    Vérifie qu'un hook sans liste observe toutes les méthodes publiques, et que son retrait
+    rend les méthodes d'origine.
+    """
+    biblio = Bibliotheque()
+    hook = HookEnregistreur()
+    biblio.ajouter_hook(hook)
+    biblio.creer_utilisateur("Alice")
+    biblio.nombre_total_utilisateurs()
+    assert hook.avants == ["creer_utilisateur", "nombre_total_utilisateurs"]
+    assert "activer_metriques" not in biblio._hooks.methodes_publiques
+
+    with pytest.raises(ValueError):
+        biblio.ajouter_hook(hook, ["methode_inexistante"])
+
+    biblio.retirer_hook(hook)
+    assert "creer_utilisateur" not in vars(biblio)
+    biblio.creer_utilisateur("Bob")
+    assert hook.avants == ["creer_utilisateur", "nombre_total_utilisateurs"]
+
+
+def test_hooks_et_metriques_cumules():
+    """
+    Vérifie que les métriques (elles-mêmes un hook) cohabitent avec un autre hook.
+    """
+    biblio = Bibliotheque()
+    hook = HookEnregistreur()
+    biblio.ajouter_hook(hook, ["nombre_total_livres"])
+    metriques = biblio.activer_metriques()
+    biblio.nombre_total_livres()
+    biblio.desactiver_metriques()
+    biblio.nombre_total_livres()
+
+    assert metriques.instantane()["nombre_total_livres"]["appels"] == 1
+    assert hook.avants == ["nombre_total_livres", "nombre_total_livres"]
+
+
+def test_journal_operations_lentes(caplog):
+    """
+    Vérifie que seules les opérations au-delà du seuil sont journalisées, avec arguments et taille du résultat.
+    """
+    biblio = Bibliotheque()
+    for i in range(50):
+        biblio.ajouter_livre(f"Titre {i}", "Auteur")
+    journal = JournalOperationsLentes(seuil=0.0, taille_max=2)
+    biblio.ajouter_hook(journal, ["rechercher_par_auteur", "rechercher_par_titre"])
+
+    with caplog.at_level(logging.WARNING, logger="bibliotheque_project.operations_lentes"):
+        biblio.rechercher_par_titre("Titre 4")
+        biblio.rechercher_par_auteur("auteur")
+        biblio.rechercher_par_auteur("inconnu")
+
+    assert len(journal.entrees) == 2  # Les plus anciennes sont oubliées
+    entree = journal.entrees[0]
+    assert entree["methode"] == "rechercher_par_auteur"
+    assert entree["arguments"] == "'auteur'"
+    assert entree["taille_resultat"] == 50
+    assert "Opération lente" in caplog.text
+
+    journal.seuil = 10.0
+    biblio.rechercher_par_titre("Titre")
+    assert len(journal.entrees) == 2
+
+
+def test_journal_profils():
+    """
+    Vérifie que les profils cProfile des appels les plus lents sont conservés, du plus lent au plus rapide,
+    et qu'un appel imbriqué ne démarre pas un second profil.
+    """
+    biblio = Bibliotheque()
+    livre = biblio.ajouter_livre("Dune", "Herbert")
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    journal = JournalOperationsLentes(seuil=0.0, echantillonnage_profil=1.0, nb_profils=2, seed=1)
+    biblio.ajouter_hook(journal)
+
+    biblio.emprunter(u1.id, livre.id)
+    biblio.reserver(u2.id, livre.id)
+    assert biblio.rendre(u1.id, livre.id) == u2.id  # Attribue le livre à Bob via emprunter (appel imbriqué)
+
+    profils = journal.profils()
+    assert len(profils) == 2
+    assert profils[0]["duree_s"] >= profils[1]["duree_s"]
+    assert all("function calls" in p["profil"] for p in profils)
+    assert u2.livres_empruntes == [livre.id]
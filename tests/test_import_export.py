@@ -0,0 +1,173 @@
+import json
+from datetime import datetime
+import pytest
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core import import_export
+from bibliotheque_project.models.livre import Livre
+
+
+def construire():
+    biblio = Bibliotheque()
+    l1 = biblio.ajouter_livre("Le Petit Prince", "Saint-Exupéry")
+    l2 = biblio.ajouter_livre("Dune, tome 1", 'Frank "Herbert"')
+    biblio.ajouter_livre("1984", "Orwell")
+    u1 = biblio.creer_utilisateur("Alice", "etudiant")
+    biblio.creer_utilisateur("Bob")
+    biblio.emprunter(u1.id, l1.id, date_retour=datetime(2030, 1, 15, 12, 0))
+    biblio.emprunter(u1.id, l2.id, date_retour=datetime(2030, 2, 1))
+    return biblio
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_aller_retour(tmp_path, extension):
+    """
+    Vérifie qu'un export suivi d'un import reconstruit le catalogue, les utilisateurs et les emprunts en cours.
+    """
+    source = construire()
+    chemins = {nom: str(tmp_path / f"{nom}.{extension}") for nom in ("livres", "utilisateurs", "emprunts")}
+    assert import_export.exporter_livres(source, chemins["livres"]).lignes == 3
+    assert import_export.exporter_utilisateurs(source, chemins["utilisateurs"]).lignes == 2
+    assert import_export.exporter_emprunts(source, chemins["emprunts"]).lignes == 2
+
+    Livre._next_id = 1  # Comme dans un nouveau processus
+    cible = Bibliotheque()
+    import_export.importer_livres(cible, chemins["livres"], taille_lot=2)
+    import_export.importer_utilisateurs(cible, chemins["utilisateurs"])
+    import_export.importer_emprunts(cible, chemins["emprunts"])
+
+    assert [(l.id, l.titre, l.auteur, l.status) for l in cible.lister_tous_les_livres()] == \
+        [(l.id, l.titre, l.auteur, l.status) for l in source.lister_tous_les_livres()]
+    assert [(u.id, u.nom, u.categorie) for u in cible.lister_utilisateurs()] == [(1, "Alice", "etudiant"), (2, "Bob", "standard")]
+    assert cible._utilisateurs[1].livres_empruntes == [1, 2]
+    assert cible.date_retour(1) == datetime(2030, 1, 15, 12, 0)
+    # Les IDs automatiques continuent après les IDs importés
+    assert cible.ajouter_livre("Nouveau", "Auteur").id == 4
+
+
+def test_import_par_lots_et_progression(tmp_path):
+    """
+    Vérifie que l'import procède par lots, signale sa progression et accepte des IDs vides.
+    """
+    chemin = tmp_path / "catalogue.csv"
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        fichier.write("id,titre,auteur\n")
+        for i in range(25):
+            fichier.write(f",Titre {i},Auteur {i % 3}\n")
+    biblio = Bibliotheque()
+    etapes = []
+    bilan = import_export.importer_livres(biblio, str(chemin), taille_lot=10, progression=etapes.append)
+
+    assert [etape.lignes for etape in etapes] == [10, 20, 25]
+    assert bilan.lignes == 25 and bilan.lignes_par_s >= 0
+    assert biblio.nombre_total_livres() == 25
+    assert len(biblio.rechercher_par_auteur("auteur 1")) == 8
+
+
+def test_import_erreurs(tmp_path):
+    """
+    Vérifie les erreurs : ligne invalide (numéro indiqué), ID déjà utilisé, emprunt d'un livre inconnu, format inconnu.
+    """
+    biblio = Bibliotheque()
+    chemin = tmp_path / "livres.jsonl"
+    chemin.write_text(json.dumps({"id": 1, "titre": "A", "auteur": "B"}) + "\n" + json.dumps({"titre": "C"}) + "\n",
+                      encoding="utf-8")
+    with pytest.raises(ValueError, match="Ligne 2"):
+        import_export.importer_livres(biblio, str(chemin))
+    assert biblio.nombre_total_livres() == 0
+
+    existant = biblio.ajouter_livre("Existant", "X")
+    chemin.write_text(json.dumps({"id": existant.id, "titre": "A", "auteur": "B"}) + "\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="déjà utilisés"):
+        import_export.importer_livres(biblio, str(chemin))
+
+    emprunts = tmp_path / "emprunts.csv"
+    emprunts.write_text("utilisateur_id,livre_id,date_retour\n1,99,\n", encoding="utf-8")
+    with pytest.raises(KeyError):
+        import_export.importer_emprunts(biblio, str(emprunts))
+
+    with pytest.raises(ValueError, match="Format inconnu"):
+        import_export.exporter_livres(biblio, str(tmp_path / "livres.xml"))
+
+
+def test_decouper(tmp_path):
+    """
+    Vérifie que les plages d'octets couvrent tout le fichier et commencent chacune en début de ligne.
+    """
+    chemin = tmp_path / "livres.csv"
+    chemin.write_bytes(b"id,titre,auteur\n" + b"".join(f",Titre {i},Auteur\n".encode() for i in range(100)))
+    contenu = chemin.read_bytes()
+    plages = import_export.decouper(str(chemin), 7, debut_donnees=16)
+
+    assert plages[0][0] == 16 and plages[-1][1] == len(contenu)
+    assert all(fin == debut for (_, fin), (debut, _) in zip(plages, plages[1:]))
+    assert all(contenu[debut - 1:debut] == b"\n" for debut, _ in plages)
+    assert import_export.decouper(str(chemin), 500, debut_donnees=16)[-1][1] == len(contenu)
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_import_parallele(tmp_path, extension):
+    """
+    Vérifie que l'import parallèle donne les mêmes livres (normalisés) et les mêmes recherches qu'un import séquentiel.
+    """
+    chemin = tmp_path / f"livres.{extension}"
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        if extension == "csv":
+            fichier.write("id,titre,auteur\n")
+        for i in range(500):
+            titre, auteur = f"Titre  {i} ", f"Auteur {i % 7}"
+            if extension == "csv":
+                fichier.write(f",{titre},{auteur}\n")
+            else:
+                fichier.write(json.dumps({"titre": titre, "auteur": auteur}) + "\n")
+
+    biblio = Bibliotheque()
+    etapes = []
+    bilan = import_export.importer_livres_parallele(biblio, str(chemin), nb_processus=2, nb_morceaux=5,
+                                                    progression=etapes.append)
+
+    assert bilan.lignes == 500 and etapes[-1].lignes == 500
+    livres = biblio.lister_tous_les_livres()
+    assert sorted(livre.id for livre in livres) == list(range(1, 501))
+    assert biblio._livres[43].titre == "Titre 42"
+    assert [livre.id for livre in biblio.rechercher_par_titre("titre 42")] == [43] + list(range(421, 431))
+    assert len(biblio.rechercher_par_auteur("auteur 3")) == 71
+    assert biblio.ajouter_livre("Nouveau", "Auteur").id == 501
+
+    Livre._next_id = 1
+    sequentielle = Bibliotheque()
+    import_export.importer_livres(sequentielle, str(chemin))
+    assert [(l.id, l.titre, l.auteur) for l in sequentielle.lister_tous_les_livres()] == \
+           [(l.id, l.titre, l.auteur) for l in livres]
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_import_parallele_ids_mixtes(tmp_path, extension):
+    """
+    Vérifie qu'avec des IDs explicites et des lignes sans ID, l'import parallèle attribue les mêmes IDs
+    que l'import séquentiel, y compris quand un ID explicite d'une plage précède les lignes d'une autre.
+    """
+    chemin = tmp_path / f"livres.{extension}"
+    lignes = [(2, "A", "X"), (None, "B", "Y")]
+    lignes += [(100 * i + 3 if i % 37 == 0 else None, f"Titre {i}", "Auteur") for i in range(1, 300)]
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        if extension == "csv":
+            fichier.write("id,titre,auteur\n")
+        for livre_id, titre, auteur in lignes:
+            if extension == "csv":
+                fichier.write(f"{'' if livre_id is None else livre_id},{titre},{auteur}\n")
+            else:
+                fichier.write(json.dumps({"id": livre_id, "titre": titre, "auteur": auteur}) + "\n")
+            if livre_id == 2:
+                fichier.write("\n")  # Une ligne vide ne consomme pas d'ID
+
+    sequentielle = Bibliotheque()
+    import_export.importer_livres(sequentielle, str(chemin))
+    attendus = [(l.id, l.titre) for l in sequentielle.lister_tous_les_livres()]
+    suivant = Livre._next_id
+    assert attendus[:2] == [(2, "A"), (3, "B")]
+
+    Livre._next_id = 1
+    parallele = Bibliotheque()
+    import_export.importer_livres_parallele(parallele, str(chemin), nb_processus=2, nb_morceaux=7)
+    assert sorted((l.id, l.titre) for l in parallele.lister_tous_les_livres()) == sorted(attendus)
+    assert Livre._next_id == suivant
@@ -0,0 +1,32 @@
+from bibliotheque_project.core.index_recherche import IndexTrigrammes, trigrammes
+
+
+def test_trigrammes():
+    """
+    Vérifie le découpage en trigrammes.
+    """
+    assert trigrammes("dune") == {"dun", "une"}
+    assert trigrammes("du") == set()
+
+
+def test_candidats_ajout_retrait_fusion():
+    """
+    Vérifie que les candidats contiennent les livres possédant tous les trigrammes de la requête,
+    et que retrait et fusion mettent l'index à jour.
+    """
+    index = IndexTrigrammes()
+    index.ajouter(1, "Le Petit Prince")
+    index.ajouter(2, "Petite Poucette")
+    index.ajouter(3, "Dune")
+
+    assert index.candidats("petit") == {1, 2}
+    assert index.candidats("PRINCE") == {1}
+    assert index.candidats("xyz") == set()
+    assert index.candidats("pe") is None  # Requête trop courte : parcours complet nécessaire
+
+    index.retirer(1, "Le Petit Prince")
+    assert index.candidats("petit") == {2}
+    assert index.candidats("prince") == set()
+
+    index.fusionner({"pet": [4], "eti": [4], "tit": [4]})
+    assert index.candidats("petit") == {2, 4}
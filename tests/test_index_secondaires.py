@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.index_secondaires import IndexSecondaire, IndexValeur
+from bibliotheque_project.models.livre import Livre, StatusLivre
+
+
+def _attendu(biblio, cle):
+    """Valeur -> IDs des livres, calculé par un parcours complet."""
+    resultat = {}
+    for livre in biblio._livres.values():
+        resultat.setdefault(cle(livre), []).append(livre.id)
+    return resultat
+
+
+def _initiale(livre):
+    """Initiale du titre, en minuscule."""
+    return livre.titre[:1].lower()
+
+
+def test_pierres_tombales_compactees_paresseusement():
+    """Suppressions et changements de valeur laissent des pierres tombales, compactées au-delà de la proportion."""
+    index = IndexValeur("initiale", _initiale, proportion_compactage=1.0)
+    livres = [Livre(titre, "X", livre_id=i) for i, titre in enumerate(["Alpha", "Arbre", "Bois", "Cerf"], 1)]
+    for livre in livres:
+        index.inserer(livre)
+    index.supprimer(2)
+    livres[0].titre = "Bravo"
+    index.mettre_a_jour(livres[0])
+    assert index.pierres_tombales == 2 and len(index) == 3
+    assert index.livres("a") == [] and index.livres("b") == [1, 3]
+    index.supprimer(4)  # 3 pierres tombales pour 2 livres : compactage
+    assert index.pierres_tombales == 0 and index._listes == {"b": [1, 3]}
+    index.supprimer(42)
+    assert index.pierres_tombales == 0
+
+
+def test_bibliotheque_tient_les_index_a_jour():
+    """Ajouts, emprunts, retours, modifications et suppressions sont transmis aux index secondaires."""
+    biblio = Bibliotheque()
+    biblio.ajouter_livre("Alpha", "A")
+    statut = IndexValeur("statut", lambda livre: livre.status)
+    biblio.ajouter_index(statut)
+    biblio.ajouter_index(IndexValeur("initiale", _initiale))
+    biblio.ajouter_livres([Livre("Bravo", "B"), Livre("Charlie", "C")])
+    u = biblio.creer_utilisateur("Alice")
+    biblio.emprunter(u.id, 2)
+    biblio.emprunter(u.id, 3)
+    biblio.rendre(u.id, 2)
+    biblio.modifier_livre(1, titre="Delta")
+    biblio.modifier_status(1, StatusLivre.EMPRUNTE)
+    biblio.supprimer_livre(2)
+
+    assert statut.livres(StatusLivre.EMPRUNTE) == [1, 3]
+    assert statut.livres(StatusLivre.DISPONIBLE) == []
+    initiale = biblio.index_secondaire("initiale")
+    for valeur, ids in _attendu(biblio, _initiale).items():
+        assert initiale.livres(valeur) == ids
+    assert initiale.livres("a") == [] and initiale.livres("b") == []
+    biblio.retirer_index("initiale")
+    biblio.ajouter_livre("Echo", "E")
+    assert len(statut) == 3
+
+
+def test_reconstruction_en_arriere_plan():
+    """Un index reconstruit dans un thread tient compte des modifications faites pendant la reconstruction."""
+    biblio = Bibliotheque()
+    biblio.ajouter_livres([Livre(f"{lettre}{i}", "X") for i, lettre in enumerate("abcdefgh" * 5)])
+    commence, reprendre = threading.Event(), threading.Event()
+
+    def cle(livre):
+        if threading.current_thread() is not threading.main_thread():
+            commence.set()
+            reprendre.wait()
+        return _initiale(livre)
+
+    index = IndexValeur("initiale", cle)
+    fil = biblio.ajouter_index(index, en_arriere_plan=True)
+    commence.wait()
+    premiers = list(biblio._livres)[:3]
+    biblio.supprimer_livre(premiers[0])
+    biblio.modifier_livre(premiers[1], titre="zèbre")
+    nouveau = biblio.ajouter_livre("zoo", "Y")
+    reprendre.set()
+    fil.join()
+
+    assert index.livres("z") == [premiers[1], nouveau.id]
+    for valeur, ids in _attendu(biblio, _initiale).items():
+        assert index.livres(valeur) == ids
+    assert index.livres("a") == sorted(l.id for l in biblio._livres.values() if l.titre.startswith("a"))
+
+
+def test_index_secondaire_abstrait():
+    """
+    Vérifie qu'un index secondaire doit définir tous les rappels pour être instancié.
+    """
+    with pytest.raises(TypeError):
+        IndexSecondaire("vide")
+
+    class SansAdopter(IndexSecondaire):
+        def inserer(self, livre):
+            pass
+
+        def mettre_a_jour(self, livre):
+            pass
+
+        def supprimer(self, livre_id):
+            pass
+
+        def vide(self):
+            return SansAdopter(self.nom)
+
+    with pytest.raises(TypeError):
+        SansAdopter("incomplet")
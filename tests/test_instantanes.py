@@ -0,0 +1,138 @@
+import threading
+import pytest
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.models.livre import Livre, StatusLivre
+
+
+def test_instantane_fige():
+    """
+    Vérifie qu'un instantané voit la bibliothèque telle qu'elle était à sa création,
+    malgré emprunts, retours, ajouts et suppressions ultérieurs.
+    """
+    biblio = Bibliotheque()
+    l1 = biblio.ajouter_livre("1984", "George Orwell")
+    l2 = biblio.ajouter_livre("Dune", "Frank Herbert")
+    l3 = biblio.ajouter_livre("Fondation", "Isaac Asimov")
+    u1 = biblio.creer_utilisateur("Alice")
+    u2 = biblio.creer_utilisateur("Bob")
+    biblio.emprunter(u1.id, l1.id)
+
+    instantane = biblio.instantane()
+    biblio.rendre(u1.id, l1.id)
+    biblio.emprunter(u2.id, l2.id)
+    biblio.supprimer_livre(l3.id)
+    biblio.ajouter_livre("Nouveau", "Auteur")
+    biblio.creer_utilisateur("Charlie")
+
+    assert [livre.id for livre in instantane.livres()] == [l1.id, l2.id, l3.id]
+    assert [livre.id for livre in instantane.lister_livres_disponibles()] == [l2.id, l3.id]
+    assert instantane.livre(l1.id).status == StatusLivre.EMPRUNTE
+    assert instantane.utilisateur(u1.id).livres_empruntes == (l1.id,)
+    assert instantane.distribution_emprunts_par_utilisateur() == {u1.id: 1, u2.id: 0}
+    assert instantane.histogramme_emprunts() == {1: 1, 0: 1}
+    assert instantane.nombre_total_livres() == 3
+    assert instantane.nombre_total_utilisateurs() == 2
+
+    # La bibliothèque, elle, a bien changé
+    assert biblio.distribution_emprunts_par_utilisateur() == {u1.id: 0, u2.id: 1, 3: 0}
+
+    instantane.fermer()
+    with pytest.raises(ValueError):
+        instantane.livre(l1.id)
+    assert len(biblio._instantanes) == 0
+
+
+def test_instantane_ids_imposes_et_plusieurs_instantanes():
+    """
+    Vérifie qu'un livre ajouté après l'instantané avec un ID imposé inférieur reste invisible,
+    et que plusieurs instantanés ouverts conservent chacun leur propre état.
+    """
+    biblio = Bibliotheque()
+    for i in range(5):
+        biblio.ajouter_livre(f"Livre {i}", "Auteur")
+    biblio.supprimer_livre(3)
+    u = biblio.creer_utilisateur("Alice")
+
+    with biblio.instantane() as premier:
+        biblio.ajouter_livres([Livre("Réimporté", "Auteur", livre_id=3)])
+        biblio.emprunter(u.id, 1)
+        with biblio.instantane() as second:
+            biblio.rendre(u.id, 1)
+            assert premier.livre(3) is None
+            assert premier.livre(1).est_disponible()
+            assert second.livre(3).titre == "Réimporté"
+            assert not second.livre(1).est_disponible()
+            assert [livre.id for livre in premier.livres()] == [1, 2, 4, 5]
+    assert len(biblio._instantanes) == 0
+
+    biblio.ajouter_livres([Livre("Lointain", "Auteur", livre_id=20_000_000)])
+    with biblio.instantane() as troisieme:
+        biblio.supprimer_livre(2)
+        biblio.ajouter_livre("Après", "Auteur")
+        assert [livre.id for livre in troisieme.livres()] == [1, 2, 3, 4, 5, 20_000_000]
+
+
+def test_instantane_pendant_ecritures_concurrentes():
+    """
+    Vérifie qu'un rapport parcourant un instantané reste cohérent pendant que d'autres threads empruntent et rendent.
+    """
+    biblio = Bibliotheque()
+    livres = [biblio.ajouter_livre(f"Livre {i}", "Auteur") for i in range(300)]
+    utilisateurs = [biblio.creer_utilisateur(f"U{i}") for i in range(30)]
+    for i, livre in enumerate(livres[:150]):
+        biblio.emprunter(utilisateurs[i % 30].id, livre.id)
+    attendu = biblio.histogramme_emprunts()
+
+    arret = threading.Event()
+
+    def ecrire():
+        i = 0
+        while not arret.is_set():
+            livre = livres[150 + i % 150]
+            u = utilisateurs[i % 30]
+            biblio.emprunter(u.id, livre.id)
+            biblio.rendre(u.id, livre.id)
+            i += 1
+
+    with biblio.instantane() as instantane:
+        ecrivain = threading.Thread(target=ecrire)
+        ecrivain.start()
+        try:
+            for _ in range(20):
+                assert instantane.histogramme_emprunts() == attendu
+                assert len(instantane.lister_livres_disponibles()) == 150
+        finally:
+            arret.set()
+            ecrivain.join()
+
+
+def test_instantane_jamais_au_milieu_d_une_modification():
+    """
+    Vérifie qu'un instantané demandé par un autre thread pendant un emprunt voit l'emprunt entier ou pas du tout :
+    jamais un livre emprunté absent de la liste de son emprunteur.
+    """
+    from unittest.mock import patch
+    from bibliotheque_project.models.utilisateur import Utilisateur
+    biblio = Bibliotheque()
+    livre = biblio.ajouter_livre("1984", "George Orwell")
+    u = biblio.creer_utilisateur("Alice")
+    original = Utilisateur.emprunter_livre
+    fils, etats = [], []
+
+    def lire_instantane():
+        instantane = biblio.instantane()
+        etats.append((instantane.livre(livre.id).est_disponible(),
+                      livre.id in instantane.utilisateur(u.id).livres_empruntes))
+
+    def emprunter_livre(utilisateur, livre_id):
+        # Le livre est déjà marqué emprunté : un instantané créé maintenant verrait un état à moitié appliqué
+        fil = threading.Thread(target=lire_instantane)
+        fil.start()
+        fil.join(0.2)
+        fils.append(fil)
+        original(utilisateur, livre_id)
+
+    with patch.object(Utilisateur, "emprunter_livre", emprunter_livre):
+        biblio.emprunter(u.id, livre.id)
+    fils[0].join()
+    assert etats == [(False, True)]
@@ -46,3 +46,13 @@ def test_rendre():
     livre2 = Livre("Harry Potter", "J.K. Rowling", status=StatusLivre.DISPONIBLE)
     livre2.rendre()
     assert livre2.status == StatusLivre.DISPONIBLE
+
+def test_id_impose():
+    """
+    Vérifie qu'un ID imposé est utilisé et que les IDs automatiques suivants lui sont supérieurs.
+    """
+    livre = Livre("Dune", "Frank Herbert", livre_id=10)
+    assert livre.id == 10
+    assert Livre("Fondation", "Isaac Asimov").id == 11
+    assert Livre("Ancien", "Auteur", livre_id=3).id == 3
+    assert Livre("Suivant", "Auteur").id == 12
@@ -0,0 +1,102 @@
+import urllib.request
+import pytest
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.metriques import HistogrammeLatence, Metriques
+
+
+def test_histogramme_latence():
+    """
+    Vérifie que les quantiles de l'histogramme sont exacts à la précision relative près.
+    """
+    histogramme = HistogrammeLatence()
+    assert histogramme.quantile(0.5) == 0.0
+
+    for duree_ns in range(1, 100_001):
+        histogramme.enregistrer(duree_ns * 1000)  # de 1 µs à 100 ms
+
+    assert histogramme.nombre == 100_000
+    assert histogramme.quantile(0.5) == pytest.approx(0.05, rel=0.04)
+    assert histogramme.quantile(0.99) == pytest.approx(0.099, rel=0.04)
+    assert histogramme.quantile(1.0) == pytest.approx(0.1)
+    assert histogramme.moyenne() == pytest.approx(0.05, rel=0.01)
+    assert histogramme.cumul_sous(1.0) == 100_000
+    # Mémoire bornée : quelques centaines de classes pour 100 000 mesures
+    assert len(histogramme._comptes) < 1000
+
+
+def test_index_et_bornes():
+    """
+    Vérifie que chaque durée tombe dans une classe dont la borne haute est supérieure ou égale à la durée
+    avec une erreur relative bornée.
+    """
+    histogramme = HistogrammeLatence(bits_precision=5)
+    for duree_ns in [0, 1, 31, 32, 33, 63, 64, 1000, 123_456, 10 ** 9]:
+        borne = histogramme._borne_haute(histogramme._index(duree_ns))
+        assert duree_ns <= borne <= duree_ns * 1.07 + 1
+
+
+def test_activer_metriques():
+    """
+    Vérifie le comptage des appels, des erreurs par type et la désactivation de l'instrumentation.
+    """
+    biblio = Bibliotheque()
+    metriques = biblio.activer_metriques()
+    u = biblio.creer_utilisateur("Alice")
+    livre = biblio.ajouter_livre("1984", "George Orwell")
+
+    biblio.emprunter(u.id, livre.id)
+    with pytest.raises(ValueError):
+        biblio.emprunter(u.id, livre.id)
+    with pytest.raises(KeyError):
+        biblio.emprunter(u.id, 999)
+    biblio.rechercher_par_titre("19")
+    biblio.histogramme_emprunts()
+    biblio.rechercher_par_requete("orwell")
+    biblio.resume_emprunts()
+    biblio.top_emprunteurs(3)
+
+    instantane = metriques.instantane()
+    assert instantane["emprunter"]["appels"] == 3
+    assert instantane["emprunter"]["erreurs"] == {"ValueError": 1, "KeyError": 1}
+    assert instantane["rechercher_par_titre"]["appels"] == 1
+    assert instantane["histogramme_emprunts"]["latence"]["max_s"] > 0
+    assert all(instantane[nom]["appels"] == 1 for nom in ("rechercher_par_requete", "resume_emprunts", "top_emprunteurs"))
+    assert "ajouter_livre" not in instantane
+
+    # Désactivée, l'instrumentation n'est plus présente sur l'instance
+    biblio.desactiver_metriques()
+    assert "emprunter" not in vars(biblio)
+    biblio.rendre(u.id, livre.id)
+    assert "rendre" not in metriques.instantane()
+
+
+def test_exporter_prometheus(tmp_path):
+    """
+    Vérifie l'export au format texte de Prometheus, dans un fichier et via le serveur HTTP local.
+    """
+    metriques = Metriques()
+    metriques.enregistrer("emprunter", 2_000)
+    metriques.enregistrer("emprunter", 3_000_000, ValueError("indisponible"))
+
+    texte = metriques.exporter_prometheus()
+    assert 'bibliotheque_appels_total{methode="emprunter"} 2' in texte
+    assert 'bibliotheque_erreurs_total{methode="emprunter",type="ValueError"} 1' in texte
+    assert 'bibliotheque_latence_secondes_bucket{methode="emprunter",le="2.5e-06"} 1' in texte
+    assert 'bibliotheque_latence_secondes_bucket{methode="emprunter",le="+Inf"} 2' in texte
+    assert 'bibliotheque_latence_secondes_count{methode="emprunter"} 2' in texte
+
+    chemin = tmp_path / "bibliotheque.prom"
+    metriques.ecrire_prometheus(str(chemin))
+    assert chemin.read_text(encoding="utf-8") == texte
+
+    serveur = metriques.servir_prometheus()
+    try:
+        port = serveur.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as reponse:
+            assert reponse.read().decode("utf-8") == texte
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
+
+    metriques.reinitialiser()
+    assert metriques.instantane() == {}
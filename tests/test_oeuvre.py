@@ -0,0 +1,63 @@
+from bibliotheque_project.models.oeuvre import Oeuvre
+
+
+def test_ajouter_exemplaire():
+    """
+    Vérifie que l'ajout d'exemplaires met à jour le nombre d'exemplaires et de disponibles.
+    """
+    oeuvre = Oeuvre("1984", "George Orwell")
+    assert oeuvre.nb_exemplaires() == 0
+    assert oeuvre.prendre_exemplaire() is None
+
+    assert oeuvre.ajouter_exemplaire(10) == 0
+    assert oeuvre.ajouter_exemplaire(11) == 1
+    assert oeuvre.nb_exemplaires() == 2
+    assert oeuvre.nb_disponibles() == 2
+
+
+def test_prendre_exemplaire():
+    """
+    Vérifie que prendre_exemplaire retourne toujours un exemplaire disponible
+    et None lorsque tous les exemplaires sont empruntés.
+    """
+    oeuvre = Oeuvre("1984", "George Orwell")
+    for livre_id in (10, 11, 12):
+        oeuvre.ajouter_exemplaire(livre_id)
+
+    empruntes = []
+    for _ in range(3):
+        livre_id = oeuvre.prendre_exemplaire()
+        empruntes.append(livre_id)
+        oeuvre.definir_disponibilite(oeuvre.exemplaires.index(livre_id), False)
+    assert sorted(empruntes) == [10, 11, 12]
+    assert oeuvre.nb_disponibles() == 0
+    assert oeuvre.prendre_exemplaire() is None
+
+    # Retour d'un exemplaire : il redevient le seul candidat
+    oeuvre.definir_disponibilite(1, True)
+    assert oeuvre.prendre_exemplaire() == 11
+    assert oeuvre.nb_disponibles() == 1
+
+    # Changements de statut répétés : la pile reste bornée
+    for _ in range(10):
+        oeuvre.definir_disponibilite(1, False)
+        oeuvre.definir_disponibilite(1, True)
+    assert len(oeuvre._libres) <= 3
+
+
+def test_retirer_exemplaire():
+    """
+    Vérifie qu'un exemplaire retiré n'est plus compté ni proposé à l'emprunt.
+    """
+    oeuvre = Oeuvre("1984", "George Orwell")
+    oeuvre.ajouter_exemplaire(10)
+    oeuvre.ajouter_exemplaire(11)
+
+    oeuvre.retirer_exemplaire(1)
+    assert oeuvre.nb_exemplaires() == 1
+    assert oeuvre.nb_disponibles() == 1
+
+    # Un exemplaire retiré ne redevient pas disponible
+    oeuvre.definir_disponibilite(1, True)
+    assert oeuvre.nb_disponibles() == 1
+    assert oeuvre.prendre_exemplaire() == 10
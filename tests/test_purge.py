@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.purge import LIVRES, Purge
+from bibliotheque_project.models.livre import Livre
+
+
+def _bibliotheque(nb_livres=40, nb_utilisateurs=10):
+    """Bibliothèque dont les livres pairs ont été empruntés une fois, et le livre 1 l'est encore."""
+    biblio = Bibliotheque()
+    biblio.ajouter_livres([Livre(f"Titre {i}", f"Auteur {i % 3}") for i in range(nb_livres)])
+    for i in range(nb_utilisateurs):
+        biblio.creer_utilisateur(f"Utilisateur {i}")
+    for livre_id in range(2, nb_livres + 1, 2):
+        biblio.emprunter(1, livre_id)
+        biblio.rendre(1, livre_id)
+    biblio.emprunter(2, 1)
+    return biblio
+
+
+def test_purge_des_livres_jamais_empruntes():
+    """Seuls les livres disponibles jamais empruntés sont supprimés, des index comme du catalogue."""
+    biblio = _bibliotheque()
+    assert biblio.purger_livres(lambda livre: biblio.nombre_emprunts_livre(livre.id) == 0) == 19
+    assert sorted(biblio._livres) == [1] + list(range(2, 41, 2))  # Le livre 1, emprunté, est épargné
+    assert [l.id for l in biblio.rechercher_par_titre("titre 3")] == [4, 32, 34, 36, 38, 40]
+    assert biblio.rechercher_par_auteur("auteur 1") == [biblio._livres[i] for i in range(2, 41, 6)]
+
+
+def test_purge_des_utilisateurs_inactifs():
+    """Les utilisateurs sans emprunt créés avant un ID donné sont supprimés ; un emprunteur est épargné."""
+    biblio = _bibliotheque()
+    assert biblio.purger_utilisateurs(lambda u: u.id < 6) == 4
+    assert sorted(biblio._utilisateurs) == [2, 6, 7, 8, 9, 10]
+    with pytest.raises(ValueError):
+        biblio.purger_utilisateurs(lambda u: True, budget=0)
+
+
+def test_tranches_bornees_et_verrou_relache():
+    """Avec un budget minuscule, la purge avance par tranches et relâche le verrou entre deux tranches."""
+    biblio = _bibliotheque(nb_livres=500)
+    evenements = []
+    biblio.abonner(evenements.append)
+    purge = Purge(biblio, LIVRES, lambda livre: livre.id % 2 == 1, budget=1e-5)
+    verrou = threading.Lock()
+    tranches_vues = []
+
+    def lecteur():
+        while not purge.termine:
+            with verrou:
+                tranches_vues.append(purge.tranches)
+            time.sleep(1e-4)
+
+    fil = threading.Thread(target=lecteur)
+    fil.start()
+    assert purge.executer(verrou, pause=1e-4) == 249  # Tous les impairs, sauf le livre 1 emprunté
+    fil.join()
+    assert purge.tranches > 10 and purge.examines == 500
+    assert len(set(tranches_vues)) > 1  # Le lecteur a pris le verrou entre des tranches différentes
+    assert len(evenements) == 249 and biblio.nombre_total_livres() == 251
@@ -0,0 +1,57 @@
+import pytest
+from datetime import datetime, timedelta
+from bibliotheque_project.core.quotas import GestionnaireQuotas, PolitiqueQuota
+from bibliotheque_project.models.utilisateur import Utilisateur
+
+T0 = datetime(2025, 1, 1)
+
+
+def test_sans_politique():
+    """
+    Vérifie qu'une catégorie sans politique n'est pas limitée.
+    """
+    quotas = GestionnaireQuotas()
+    u = Utilisateur("Alice")
+    for i in range(100):
+        quotas.verifier(u, T0)
+        quotas.enregistrer(u, T0)
+        u.emprunter_livre(i)
+
+
+def test_max_simultanes():
+    """
+    Vérifie la limite du nombre de livres empruntés en même temps.
+    """
+    quotas = GestionnaireQuotas()
+    quotas.definir_politique("etudiant", PolitiqueQuota(max_simultanes=2))
+    u = Utilisateur("Alice", categorie="etudiant")
+    u.emprunter_livre(1)
+    u.emprunter_livre(2)
+
+    with pytest.raises(ValueError, match="Quota atteint"):
+        quotas.verifier(u, T0)
+
+    # Après un retour, l'utilisateur peut de nouveau emprunter
+    u.rendre_livre(1)
+    quotas.verifier(u, T0)
+
+
+def test_max_par_periode():
+    """
+    Vérifie la limite d'emprunts sur une fenêtre glissante et la sortie des anciens emprunts de la fenêtre.
+    """
+    quotas = GestionnaireQuotas()
+    quotas.definir_politique("standard", PolitiqueQuota(max_par_periode=2, periode=timedelta(days=7)))
+    u = Utilisateur("Alice")
+
+    quotas.enregistrer(u, T0)
+    quotas.enregistrer(u, T0 + timedelta(days=3))
+    with pytest.raises(ValueError, match="par période"):
+        quotas.verifier(u, T0 + timedelta(days=5))
+
+    # Le premier emprunt sort de la fenêtre au bout de 7 jours
+    quotas.verifier(u, T0 + timedelta(days=7))
+
+    # Retirer la politique lève toute limite
+    quotas.definir_politique("standard", None)
+    quotas.verifier(u, T0 + timedelta(days=5))
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.models.livre import Livre
+
+MOTS = ["la", "le", "nuit", "été", "Ødegaard", "ÉTÉ", "ß", "x", "rouge", "noir"]
+
+
+@pytest.fixture
+def bibliotheques():
+    """Fournit deux bibliothèques identiques, la seconde avec la recherche parallèle activée."""
+    rng = random.Random(7)
+    sequentielle, parallele = Bibliotheque(), Bibliotheque()
+    for i in range(400):
+        titre = " ".join(rng.choice(MOTS) for _ in range(3))
+        auteur = rng.choice(MOTS).capitalize()
+        sequentielle.ajouter_livre(titre, auteur)
+    parallele.ajouter_livres([Livre(l.titre, l.auteur, livre_id=l.id) for l in sequentielle.lister_tous_les_livres()])
+    parallele.activer_recherche_parallele(nb_processus=2, seuil=0)
+    yield sequentielle, parallele
+    parallele.desactiver_recherche_parallele()
+
+
+def _ids(livres):
+    """Retourne les IDs d'une liste de livres, dans l'ordre."""
+    return [livre.id for livre in livres]
+
+
+def test_resultats_identiques(bibliotheques):
+    """Les parcours parallèles donnent exactement les résultats séquentiels, expressions régulières comprises."""
+    sequentielle, parallele = bibliotheques
+    for query in ["é", "Ét", "ss", "x", "", "n"]:
+        assert _ids(parallele.rechercher_par_titre(query)) == _ids(sequentielle.rechercher_par_titre(query))
+        assert _ids(parallele.rechercher_par_mot_clef(query)) == _ids(sequentielle.rechercher_par_mot_clef(query))
+    for motif, champ in [(r"^(la|le) ", "titre"), (r"(?i)ødeg", None), (r"r$", "auteur")]:
+        assert _ids(parallele.rechercher_par_expression(motif, champ)) == \
+               _ids(sequentielle.rechercher_par_expression(motif, champ))
+    with pytest.raises(ValueError):
+        parallele.rechercher_par_expression("(")
+
+
+def test_suivi_des_modifications(bibliotheques):
+    """Ajouts, suppressions et modifications faits après la construction du bloc partagé sont pris en compte."""
+    sequentielle, parallele = bibliotheques
+    parallele.rechercher_par_titre("x")  # Construit le bloc
+    for biblio in (sequentielle, parallele):
+        biblio.supprimer_livre(3)
+        biblio.ajouter_livres([Livre("xx nouveau", "Auteur", livre_id=900)])
+        biblio.supprimer_livre(10)
+    assert _ids(parallele.rechercher_par_titre("x")) == _ids(sequentielle.rechercher_par_titre("x"))
+    assert _ids(parallele.rechercher_par_expression("nouveau")) == [900]
+    for biblio in (sequentielle, parallele):
+        biblio.modifier_livre(20, titre="xx modifié")
+    assert _ids(parallele.rechercher_par_expression("modifié")) == [20]
@@ -0,0 +1,87 @@
+import random
+from bibliotheque_project.core.recommandations import MoteurRecommandations
+
+
+def test_co_emprunts():
+    """
+    Vérifie que les recommandations sont classées par nombre d'utilisateurs ayant emprunté les deux livres
+    et qu'un même utilisateur ne compte qu'une fois par paire.
+    """
+    moteur = MoteurRecommandations()
+    # Utilisateur 1 : livres 1, 2, 3 ; utilisateur 2 : livres 1, 2 ; utilisateur 3 : livres 1, 4
+    for utilisateur_id, livre_id in [(1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (3, 1), (3, 4), (1, 2)]:
+        moteur.enregistrer_emprunt(utilisateur_id, livre_id)
+
+    assert moteur.recommandations(1, 3) == [2, 3, 4]
+    assert moteur.recommandations(2, 1) == [1]
+    assert moteur.recommandations(99, 3) == []
+    assert moteur.recommandations(1, 3, filtre=lambda livre_id: livre_id != 2) == [3, 4]
+    assert moteur.populaires(2) == [1, 2]
+
+
+def test_elagage():
+    """
+    Vérifie que la liste de voisins d'un livre reste bornée par 2 * k_max.
+    """
+    moteur = MoteurRecommandations(k_max=3)
+    for utilisateur_id in range(1, 50):
+        moteur.enregistrer_emprunt(utilisateur_id, 1)
+        moteur.enregistrer_emprunt(utilisateur_id, 100 + utilisateur_id)
+
+    assert len(moteur._voisins[1]) <= 6
+    assert len(moteur.recommandations(1, 10)) <= 6
+
+
+def test_reconstruire_identique_incremental():
+    """
+    Vérifie que la reconstruction vectorisée donne les mêmes recommandations que le mode incrémental
+    tant que ni l'historique ni les listes de voisins ne sont tronqués.
+    """
+    rnd = random.Random(7)
+    evenements = [(rnd.randint(1, 30), rnd.randint(1, 40)) for _ in range(300)]
+
+    incremental = MoteurRecommandations(taille_historique=1000, k_max=1000)
+    for utilisateur_id, livre_id in evenements:
+        incremental.enregistrer_emprunt(utilisateur_id, livre_id)
+
+    reconstruit = MoteurRecommandations(taille_historique=1000, k_max=1000)
+    reconstruit.reconstruire(evenements)
+
+    for livre_id in range(1, 41):
+        assert reconstruit.recommandations(livre_id, 10) == incremental.recommandations(livre_id, 10)
+    assert reconstruit.populaires(10) == incremental.populaires(10)
+
+    # Un historique vide remet le moteur à zéro
+    reconstruit.reconstruire([])
+    assert reconstruit.recommandations(1, 10) == []
+
+
+def test_reconstruire_historique_borne():
+    """
+    Vérifie que la reconstruction ne retient que les derniers livres distincts de chaque utilisateur
+    et garde au plus k_max voisins par livre.
+    """
+    moteur = MoteurRecommandations(taille_historique=2, k_max=1)
+    moteur.reconstruire([(1, 1), (1, 2), (1, 3), (2, 2), (2, 3), (2, 4)])
+
+    # L'utilisateur 1 ne garde que les livres 2 et 3 : le livre 1 n'a aucun voisin
+    assert moteur.recommandations(1, 5) == []
+    assert moteur.recommandations(2, 5) == [3]
+    assert len(moteur.recommandations(3, 5)) == 1
+    assert list(moteur._historiques[2]) == [3, 4]
+
+
+def test_reconstruire_par_lots():
+    """
+    Vérifie que la reconstruction par petits lots d'utilisateurs donne les mêmes co-emprunts qu'en un seul lot.
+    """
+    rnd = random.Random(11)
+    evenements = [(rnd.randint(1, 40), rnd.randint(1, 60)) for _ in range(500)]
+
+    un_lot = MoteurRecommandations(taille_historique=8, k_max=5)
+    un_lot.reconstruire(evenements)
+    par_lots = MoteurRecommandations(taille_historique=8, k_max=5)
+    par_lots.reconstruire(evenements, paires_par_lot=20)
+
+    assert par_lots._voisins == un_lot._voisins
+    assert par_lots._historiques == un_lot._historiques
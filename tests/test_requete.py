@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from bibliotheque_project.core import requete
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.models.livre import Livre
+
+LIVRES = [("Les Misérables", "Victor Hugo"), ("Notre-Dame de Paris", "Victor Hugo"), ("L'Étranger", "Albert Camus"),
+          ("La Peste", "Albert Camus"), ("Le Rouge et le Noir", "Stendhal"), ("Les Rêveries", "Rousseau"),
+          ("Paris est une fête", "Hemingway")]
+
+
+@pytest.fixture
+def biblio():
+    """Bibliothèque de quelques classiques."""
+    biblio = Bibliotheque()
+    for titre, auteur in LIVRES:
+        biblio.ajouter_livre(titre, auteur)
+    return biblio
+
+
+def _ids(livres):
+    """IDs d'une liste de livres."""
+    return [livre.id for livre in livres]
+
+
+def test_syntaxe(biblio):
+    """Opérateurs, phrases, champs, jokers et expressions régulières donnent les livres attendus."""
+    assert _ids(biblio.rechercher_par_requete("hugo paris")) == [2]
+    assert _ids(biblio.rechercher_par_requete("hugo AND paris")) == [2]
+    assert _ids(biblio.rechercher_par_requete("hugo OR camus")) == [1, 2, 3, 4]
+    assert _ids(biblio.rechercher_par_requete("hugo OU stendhal -misérables")) == [1, 2, 5]  # OU lie moins que ET
+    assert _ids(biblio.rechercher_par_requete("(hugo OU stendhal) -misérables")) == [2, 5]
+    assert _ids(biblio.rechercher_par_requete('"le rouge"')) == [5]
+    assert _ids(biblio.rechercher_par_requete("titre:paris")) == [2, 7]
+    assert _ids(biblio.rechercher_par_requete("auteur:paris")) == []
+    assert _ids(biblio.rechercher_par_requete("mis*bles r?v")) == []
+    assert _ids(biblio.rechercher_par_requete("mis*bles OR r?ve")) == [1, 6]
+    assert _ids(biblio.rechercher_par_requete(r"/^L[ae]s? / NOT (camus OR rousseau)")) == [1, 5]
+    assert _ids(biblio.rechercher_par_requete("NOT e")) == []
+    assert _ids(biblio.rechercher_par_requete("Notre-Dame")) == [2]
+    for invalide in ["", "hugo AND", "(hugo", "hugo)", '"hugo', "/(/", "titre:"]:
+        with pytest.raises(ValueError):
+            biblio.rechercher_par_requete(invalide)
+
+
+def test_compilation_vers_les_index(biblio):
+    """Les termes d'auteur et leurs combinaisons sont exacts ; un titre donne des candidats ; une négation seule, aucun."""
+    def candidats(texte):
+        return requete.compiler(texte).candidats(biblio._index_titres, biblio._auteurs)
+
+    assert candidats("auteur:hugo OR auteur:camus") == ({1, 2, 3, 4}, True)
+    assert candidats("auteur:victor -auteur:camus") == ({1, 2}, True)
+    assert candidats("titre:peste") == ({4}, False)
+    assert candidats("titre:pe")[0] is None
+    assert candidats("-hugo")[0] is None
+    assert candidats("mis*bles") == ({1}, False)
+    assert requete.compiler("hugo OR camus") is requete.compiler("hugo OR camus")
+
+
+def test_identique_a_un_parcours_complet():
+    """Sur un catalogue aléatoire, chaque requête donne le même résultat qu'un parcours complet de son prédicat."""
+    rng = random.Random(3)
+    mots = ["le", "la", "nuit", "jour", "mer", "Été", "rouge", "noir", "ville"]
+    biblio = Bibliotheque()
+    biblio.ajouter_livres([Livre(" ".join(rng.choices(mots, k=3)), f"Auteur {rng.choice(mots)}") for _ in range(300)])
+    biblio.supprimer_livre(5)
+    for texte in ["nuit", "nuit mer", "nuit OR -jour", "auteur:été -titre:la", "(rouge OR noir) auteur:ville",
+                  "n*t", "/^la/ OR auteur:mer", '"jour mer"', "NOT (auteur:nuit OR auteur:jour) titre:rouge"]:
+        noeud = requete.compiler(texte)
+        attendu = [livre.id for livre in biblio._livres.values() if noeud.verifier(livre)]
+        assert _ids(biblio.rechercher_par_requete(texte)) == attendu, texte
+
+
+def test_noeud_abstrait():
+    """
+    Vérifie qu'un noeud doit définir verifier() et candidats() pour être instancié.
+    """
+    with pytest.raises(TypeError):
+        requete.Noeud()
+
+    class Incomplet(requete.Noeud):
+        def verifier(self, livre):
+            return True
+
+    with pytest.raises(TypeError):
+        Incomplet()
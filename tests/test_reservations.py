@@ -0,0 +1,91 @@
+import pytest
+from bibliotheque_project.core.reservations import FileReservations
+
+
+def test_reserver_et_suivant():
+    """
+    Vérifie que les réservations sont servies dans l'ordre d'arrivée (FIFO)
+    et qu'un utilisateur ne peut pas réserver deux fois le même livre.
+    """
+    reservations = FileReservations()
+    assert reservations.reserver(1, 10) == 1
+    assert reservations.reserver(2, 10) == 2
+    assert reservations.reserver(3, 10) == 3
+
+    # Double réservation interdite
+    with pytest.raises(ValueError):
+        reservations.reserver(2, 10)
+
+    assert reservations.file(10) == [1, 2, 3]
+    assert reservations.suivant(10) == 1
+    assert reservations.suivant(10) == 2
+    assert reservations.file(10) == [3]
+
+    # File vide ou inexistante
+    assert reservations.suivant(10) == 3
+    assert reservations.suivant(10) is None
+    assert reservations.suivant(99) is None
+
+
+def test_index_par_utilisateur():
+    """
+    Vérifie que l'index des réservations par utilisateur suit les ajouts, annulations et retraits de file.
+    """
+    reservations = FileReservations()
+    reservations.reserver(1, 10)
+    reservations.reserver(1, 20)
+    reservations.reserver(2, 20)
+    assert reservations.reservations(1) == [10, 20]
+
+    reservations.annuler(1, 20)
+    assert reservations.reservations(1) == [10]
+    assert reservations.file(20) == [2]
+
+    # Annuler une réservation inexistante
+    with pytest.raises(ValueError):
+        reservations.annuler(1, 20)
+
+    reservations.suivant(10)
+    assert reservations.reservations(1) == []
+
+
+def test_annuler_utilisateur_et_livre():
+    """
+    Vérifie l'annulation de toutes les réservations d'un utilisateur ou d'un livre.
+    """
+    reservations = FileReservations()
+    reservations.reserver(1, 10)
+    reservations.reserver(1, 20)
+    reservations.reserver(2, 10)
+
+    reservations.annuler_utilisateur(1)
+    assert reservations.file(10) == [2]
+    assert reservations.file(20) == []
+
+    reservations.annuler_livre(10)
+    assert reservations.file(10) == []
+    assert reservations.reservations(2) == []
+
+
+def test_suivant_accepte():
+    """
+    Vérifie que suivant() s'arrête au premier utilisateur accepté, sans consulter la suite de la file,
+    et que les utilisateurs refusés gardent leur place.
+    """
+    reservations = FileReservations()
+    for utilisateur_id in (1, 2, 3, 4):
+        reservations.reserver(utilisateur_id, 10)
+    consultes = []
+
+    def accepte(utilisateur_id):
+        consultes.append(utilisateur_id)
+        return utilisateur_id >= 2
+
+    assert reservations.suivant(10, accepte) == 2
+    assert consultes == [1, 2]
+    assert reservations.file(10) == [1, 3, 4]
+    assert reservations.reservations(2) == []
+
+    # Personne n'est accepté : la file est inchangée
+    assert reservations.suivant(10, lambda utilisateur_id: False) is None
+    assert reservations.file(10) == [1, 3, 4]
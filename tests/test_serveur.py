@@ -0,0 +1,108 @@
+import pytest
+
+from bibliotheque_project.core.bibliotheque import Bibliotheque
+from bibliotheque_project.core.serveur import ClientBibliotheque, servir
+
+
+@pytest.fixture
+def service():
+    """Démarre un serveur sur une petite bibliothèque et fournit un client."""
+    biblio = Bibliotheque()
+    for i in range(25):
+        biblio.ajouter_livre(f"Titre {i}", f"Auteur {i % 3}")
+    biblio.creer_utilisateur("Alice")
+    biblio.creer_utilisateur("Bob")
+    serveur = servir(biblio)
+    client = ClientBibliotheque(*serveur.server_address[:2])
+    yield biblio, client
+    client.fermer()
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def test_emprunter_rendre_et_erreurs(service):
+    """Les emprunts et retours passent par le service ; les erreurs deviennent KeyError ou ValueError côté client."""
+    biblio, client = service
+    assert "date_retour" in client.emprunter(1, 3)
+    assert biblio._utilisateurs[1].livres_empruntes == [3]
+    with pytest.raises(ValueError):
+        client.emprunter(2, 3)
+    with pytest.raises(KeyError):
+        client.emprunter(99, 4)
+    assert client.requete("GET", "/utilisateur", {"utilisateur_id": 1})["livres_empruntes"] == [3]
+    assert client.rendre(1, 3) == {"attribue_a": None}
+    with pytest.raises(KeyError):
+        client.requete("GET", "/inconnue")
+
+
+def test_pagination_recherche_et_statistiques(service):
+    """La pagination par curseur parcourt tout le catalogue ; recherches et statistiques sont exposées."""
+    biblio, client = service
+    client.emprunter(1, 5)
+    assert [livre["id"] for livre in client.livres(taille_page=10)] == list(range(1, 26))
+    assert len(list(client.livres(disponibles=True, taille_page=7))) == 24
+    page = client.requete("GET", "/livres", {"limite": 10})
+    assert page["curseur"] == 10
+    resultat = client.requete("GET", "/recherche", {"auteur": "auteur 1", "limite": 2})
+    assert resultat["total"] == 8 and len(resultat["livres"]) == 2
+    resultat = client.requete("GET", "/recherche", {"requete": 'auteur:"auteur 1" -"titre 1"'})
+    assert [livre["id"] for livre in resultat["livres"]] == \
+           [livre.id for livre in biblio.rechercher_par_requete('auteur:"auteur 1" -"titre 1"')]
+    statistiques = client.requete("GET", "/statistiques")
+    assert statistiques["livres"] == 25 and statistiques["utilisateurs"] == 2
+
+
+def test_lot_et_export(service):
+    """Un lot exécute plusieurs opérations en une requête ; l'export renvoie tout le catalogue en JSON Lines."""
+    biblio, client = service
+    resultats = client.lot([("emprunter", {"utilisateur_id": 1, "livre_id": 1}),
+                            ("emprunter", {"utilisateur_id": 2, "livre_id": 1}),
+                            ("rechercher", {"titre": "titre 2"}),
+                            ("inconnue", {})])
+    assert "resultat" in resultats[0]
+    assert resultats[1]["type"] == "ValueError"
+    assert resultats[2]["resultat"]["total"] == 6
+    assert "erreur" in resultats[3]
+    resultats = client.requete("POST", "/lot", {"operations": [1, {"operation": "statistiques", "params": [1]}]})
+    assert [r["type"] for r in resultats["resultats"]] == ["ValueError", "ValueError"]
+    resultats = client.lot([("rechercher", {"titre": 5}), ("rechercher", {"requete": ["hugo"]}),
+                            ("rechercher", {"titre": "titre 2"})])
+    assert [r.get("type") for r in resultats] == ["ValueError", "ValueError", None]
+    with pytest.raises(ValueError):
+        client.requete("POST", "/lot", {"operations": 5})  # 400, la connexion reste utilisable
+    assert biblio._livres[1].est_disponible() is False
+
+    client.requete("GET", "/statistiques")  # La connexion persistante sert encore après l'export
+    client._connexion.request("GET", "/livres/export")
+    lignes = client._connexion.getresponse().read().decode("utf-8").splitlines()
+    assert len(lignes) == 25
+    assert client.requete("GET", "/livres", {"limite": 1})["curseur"] == 1
+
+
+def test_content_length_invalide(service):
+    """Un en-tête Content-Length invalide reçoit un 400 au lieu d'interrompre la connexion sans réponse."""
+    import http.client
+    biblio, client = service
+    connexion = http.client.HTTPConnection(client._connexion.host, client._connexion.port)
+    connexion.putrequest("POST", "/emprunter")
+    connexion.putheader("Content-Length", "abc")
+    connexion.endheaders()
+    reponse = connexion.getresponse()
+    assert reponse.status == 400 and b"Content-Length" in reponse.read()
+    connexion.close()
+    assert client.requete("GET", "/statistiques")["livres"] == 25
+
+
+def test_emprunt_conditionnel(service):
+    """Un emprunt avec une version périmée est refusé par un 409, relevé en ConflitVersion côté client."""
+    from bibliotheque_project.core.bibliotheque import ConflitVersion
+    biblio, client = service
+    version = client.requete("GET", "/livres", {"limite": 1})["livres"][0]["version"]
+    assert client.emprunter(1, 1, version_livre=version)["version"] == version + 1
+    with pytest.raises(ConflitVersion) as erreur:
+        client.rendre(1, 1, version_livre=version)
+    assert erreur.value.version_actuelle == version + 1
+    assert client.rendre(1, 1, version_livre=version + 1) == {"attribue_a": None}
+    resultats = client.lot([("emprunter", {"utilisateur_id": 2, "livre_id": 1, "version_livre": 0})])
+    assert resultats[0]["type"] == "ConflitVersion"
+    assert client.requete("GET", "/utilisateur", {"utilisateur_id": 1})["version"] == 2
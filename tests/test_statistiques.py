@@ -0,0 +1,115 @@
+import random
+from collections import Counter
+import pytest
+from bibliotheque_project.core.statistiques import StatistiquesEmprunts
+
+
+def construire(comptes):
+    stats = StatistiquesEmprunts()
+    for utilisateur_id, nb in comptes.items():
+        stats.ajouter_utilisateur(utilisateur_id)
+        stats.modifier(utilisateur_id, nb)
+    return stats
+
+
+def test_distribution_et_histogramme_identiques_au_calcul_python():
+    """
+    Vérifie que distribution et histogramme correspondent exactement au calcul Python par utilisateur,
+    y compris après suppressions et avec des IDs non contigus.
+    """
+    rnd = random.Random(3)
+    comptes = {utilisateur_id: rnd.choice([0, 0, 1, 2, 5]) for utilisateur_id in rnd.sample(range(1, 5000), 1000)}
+    stats = construire(comptes)
+    for utilisateur_id in list(comptes)[:100]:
+        stats.retirer_utilisateur(utilisateur_id)
+        del comptes[utilisateur_id]
+
+    assert len(stats) == 900
+    assert stats.distribution() == dict(sorted(comptes.items()))
+    assert stats.histogramme() == dict(Counter(comptes.values()))
+    assert stats.moyenne() == pytest.approx(sum(comptes.values()) / len(comptes))
+
+
+def test_statistiques_vides():
+    """
+    Vérifie les résultats sans utilisateur.
+    """
+    stats = StatistiquesEmprunts()
+    assert stats.distribution() == {}
+    assert stats.histogramme() == {}
+    assert stats.moyenne() == 0.0
+    assert stats.percentiles([50]) == {50: 0.0}
+    assert stats.gini() == 0.0
+    assert stats.concentration() == 0.0
+    assert stats.top_emprunteurs(3) == []
+
+
+def test_percentiles_gini_concentration():
+    """
+    Vérifie percentiles, coefficient de Gini et concentration sur des exemples calculés à la main.
+    """
+    stats = construire({1: 0, 2: 1, 3: 2, 4: 3, 5: 4})
+    assert stats.percentiles([0, 50, 100, 90]) == {0: 0.0, 50: 2.0, 100: 4.0, 90: pytest.approx(3.6)}
+    # Gini de (0, 1, 2, 3, 4) : 2 * (1*0 + 2*1 + 3*2 + 4*3 + 5*4) / (5 * 10) - 6/5 = 0.4
+    assert stats.gini() == pytest.approx(0.4)
+    assert construire({1: 2, 2: 2}).gini() == pytest.approx(0.0)
+    assert construire({i: (10 if i == 1 else 0) for i in range(1, 11)}).gini() == pytest.approx(0.9)
+    # Les 20 % premiers (1 utilisateur sur 5) détiennent 4 emprunts sur 10
+    assert stats.concentration(0.2) == pytest.approx(0.4)
+
+
+def test_top_emprunteurs():
+    """
+    Vérifie le classement des plus gros emprunteurs, les ex æquo étant départagés par ID.
+    """
+    stats = construire({7: 3, 2: 5, 9: 3, 4: 1, 5: 3})
+    assert stats.top_emprunteurs(3) == [(2, 5), (5, 3), (7, 3)]
+    assert stats.top_emprunteurs(10) == [(2, 5), (5, 3), (7, 3), (9, 3), (4, 1)]
+    assert stats.top_emprunteurs(0) == []
+
+
+def test_histogramme_classes():
+    """
+    Vérifie qu'au-delà du nombre maximal de barres, les nombres d'emprunts sont regroupés en classes
+    de largeur entière sans perdre d'utilisateur.
+    """
+    stats = construire({1: 0, 2: 1, 3: 1, 4: 3})
+    assert stats.histogramme_classes(10) == ([0, 1, 3], [1, 2, 1], 1)
+
+    stats = construire({i: i for i in range(1, 101)})  # 100 valeurs distinctes (1 à 100)
+    centres, effectifs, largeur = stats.histogramme_classes(10)
+    assert largeur == 11
+    assert len(centres) <= 10
+    assert sum(effectifs) == 100
+    assert centres[0] == 5.0 and effectifs[0] == 10  # Classe 0..10 : utilisateurs 1 à 10
+
+
+def test_ids_espaces_et_ajouts_concurrents():
+    """
+    Vérifie que la mémoire dépend du nombre d'utilisateurs et non de leurs IDs, et qu'un ajout d'utilisateur
+    pendant le calcul des statistiques ne lève pas BufferError.
+    """
+    import threading
+    stats = construire({5_000_000: 2, 3: 1})
+    assert len(stats._comptes) == 2
+    assert stats.distribution() == {3: 1, 5_000_000: 2}
+    assert stats.top_emprunteurs(1) == [(5_000_000, 2)]
+    stats.retirer_utilisateur(3)
+    stats.modifier(5_000_000, 1)
+    assert stats.distribution() == {5_000_000: 3}
+
+    erreurs = []
+
+    def ajouter():
+        try:
+            for utilisateur_id in range(1, 20_000):
+                stats.ajouter_utilisateur(utilisateur_id, 1)
+        except BufferError as erreur:
+            erreurs.append(erreur)
+
+    fil = threading.Thread(target=ajouter)
+    fil.start()
+    while fil.is_alive():
+        stats.histogramme()
+    fil.join()
+    assert erreurs == [] and len(stats) == 20_000
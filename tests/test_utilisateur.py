@@ -50,3 +50,10 @@ def test_nb_emprunts():
     # Cas 3 : rendre un livre
     u.rendre_livre(1)
     assert u.nb_emprunts() == 1
+
+def test_categorie():
+    """
+    Vérifie que la catégorie de l'utilisateur vaut "standard" par défaut et peut être choisie.
+    """
+    assert Utilisateur("Alice").categorie == "standard"
+    assert Utilisateur("Bob", categorie="etudiant").categorie == "etudiant"